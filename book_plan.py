@@ -10,8 +10,12 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
     import jsonschema  # type: ignore
+    from musequill.services.backend.planner.schema_registry import SchemaRegistry
+    from musequill.services.backend.validators.plan_repair import PlanFragmentRepairer, schema_issues
 except Exception:
     jsonschema = None  # validation becomes best-effort
+    SchemaRegistry = None
+    PlanFragmentRepairer = None
 
 import json
 import math
@@ -21,9 +25,15 @@ from typing import Any, Dict, List, Tuple, Optional
 
 import requests
 
+from musequill.services.backend.llm.endpoint_pool import endpoint_urls, shared_pool
+from musequill.services.backend.planner.constrained import PLANNER_STATS, RepairStats, ollama_format_schema
+from musequill.services.backend.planner.word_budget import allocate_words
+from musequill.services.backend.utils.payloads import scan_json
+
 # ---------- CONFIG ----------
 
 OLLAMA_URL = "http://localhost:11434"
+OLLAMA_POOL = shared_pool(endpoint_urls(OLLAMA_URL))  # more nodes via OLLAMA_BASE_URLS
 OLLAMA_MODEL = "llama3.3:70b"
 TIMEOUT_S = 120
 MAX_RETRIES = 3
@@ -48,6 +58,7 @@ JSON_STOP_TOKENS = [
 DEFAULT_TOTAL_CHAPTERS = 24
 ACT_CHAPTER_SPLIT = {"I": 12, "II": 9, "III": 3}  # sums to 24
 ACT_WORD_SPLIT = {"I": 0.45, "II": 0.40, "III": 0.15}  # children pacing profile
+MIN_CHAPTER_WORDS = 300  # matches the chapter_plan word_count schema minimum
 
 MAX_RETRIES = 2
 TIMEOUT_S = 180
@@ -138,6 +149,7 @@ def plan_book(
     summary_text: str,
     max_total_words: int = 60000,
     expected_chapters: Optional[int] = None,
+    stats: Optional[RepairStats] = None,
 ) -> Dict[str, Any]:
     """
     Build a locked schema, pre-seed a full chapter skeleton (I->II->III),
@@ -149,7 +161,11 @@ def plan_book(
     chat_fn:
         Callable(messages, schema, skeleton, timeout_seconds) -> raw_model_output (str)
         Typically your `ollama_chat_strict`.
+    stats:
+        Generation/repair counters; defaults to the shared PLANNER_STATS.
     """
+    stats = stats if stats is not None else PLANNER_STATS
+    stats.start_plan()
     tone = _safe_get(book_model, "tone.type", default="witty")
     pace = _safe_get(book_model, "pace.type", default="fast paced")
 
@@ -190,8 +206,12 @@ def plan_book(
     last_err = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            raw = ollama_chat_strict(messages, run_schema, skeleton, TIMEOUT_S)
-            obj = try_parse_json(raw)
+            raw = ollama_chat_strict(messages, run_schema, skeleton, TIMEOUT_S, stats)
+            try:
+                obj = try_parse_json(raw)
+            except ValueError:
+                stats.record_validation_failure()
+                raise
 
             # 1) Strip accidental top-level extras like title/author/blueprint
             obj = _strip_unknown_top_level_keys(obj, run_schema)
@@ -225,8 +245,18 @@ def plan_book(
             )
             obj = _strip_unknown_top_level_keys(obj, run_schema)
 
-            # 8) Validate
-            _validate_against_schema(obj, run_schema)
+            # 8) Validate; regenerate only failing fragments before retrying the whole plan
+            try:
+                _validate_against_schema(obj, run_schema)
+            except Exception:
+                stats.record_validation_failure()
+                obj = repair_plan_fragments(obj, run_schema, stats=stats)
+                try:
+                    _validate_against_schema(obj, run_schema)
+                except Exception:
+                    stats.record_validation_failure()
+                    raise
+            stats.record_accepted()
             return obj
 
         except Exception as e:
@@ -467,7 +497,8 @@ def build_chapter_seed(expected_chapters: int,
 def seed_into_skeleton(schema: Dict[str, Any],
                        chapter_seed: List[Dict[str, Any]]) -> str:
     """Create an instance skeleton string from schema and splice the chapter seed."""
-    sk = json.loads(_json_skeleton(schema))
+    skeleton = _SCHEMAS.get(schema).skeleton if _SCHEMAS is not None else _json_skeleton(schema)
+    sk = json.loads(skeleton)
     sk["chapter_plan"] = chapter_seed
     sk["research_selection"] = {"mythic_figures": [], "locales": []}
     return json.dumps(sk, ensure_ascii=False, separators=(",", ":"))
@@ -607,51 +638,58 @@ def enforce_word_budget(plan: Dict[str, Any]) -> Dict[str, Any]:
         if not bucket:
             continue
         target = max(int(targets.get(act, 0)), 0)
-        # Current sum
-        cur_sum = sum(max(int(ch.get("word_count", 0)), 0) for ch in bucket)
-        if cur_sum == 0:
-            # even split
-            even = target // len(bucket) if bucket else 0
-            for ch in bucket:
-                ch["word_count"] = max(300, even)
-        else:
-            ratio = target / cur_sum if cur_sum > 0 else 1.0
-            # Scale and round; adjust remainder to the largest chapters
-            scaled = [max(300, int(round(c["word_count"] * ratio))) for c in bucket]
-            diff = target - sum(scaled)
-            if diff != 0:
-                # distribute the difference
-                # sort indices by descending current size (greedy adjust)
-                order = sorted(range(len(bucket)), key=lambda i: bucket[i]["word_count"], reverse=True)
-                sign = 1 if diff > 0 else -1
-                for i in range(abs(diff)):
-                    idx = order[i % len(order)]
-                    scaled[idx] = max(300, scaled[idx] + sign)
-            for ch, wc in zip(bucket, scaled):
-                ch["word_count"] = wc
+        # The model's own word_counts act as pacing weights; all-zero splits evenly
+        weights = [max(int(ch.get("word_count", 0)), 0) for ch in bucket]
+        for ch, wc in zip(bucket, allocate_words(target, weights, minimum=MIN_CHAPTER_WORDS)):
+            ch["word_count"] = wc
 
     plan["chapter_plan"] = by_act["I"] + by_act["II"] + by_act["III"]
     return plan
 
 
 def _validate_against_schema(obj: Dict[str, Any], schema: Dict[str, Any]) -> None:
-    if jsonschema is None:
+    if _SCHEMAS is None:
         return
-    jsonschema.validate(instance=obj, schema=schema)
+    _SCHEMAS.get(schema).validate(obj)
 
 
 # ----------------------------
 # Utility helpers
 # ----------------------------
 
+def repair_plan_fragments(obj: Dict[str, Any], run_schema: Dict[str, Any],
+                          timeout: int = TIMEOUT_S, stats: Optional[RepairStats] = None) -> Dict[str, Any]:
+    """
+    Regenerate only the sub-objects named by schema errors (one chapter, the acts map, ...)
+    and splice them back. Returns ``obj`` unchanged when errors are not fragment-local.
+    """
+    if _SCHEMAS is None or PlanFragmentRepairer is None:
+        return obj
+    stats = stats if stats is not None else PLANNER_STATS
+    compiled = _SCHEMAS.get(run_schema)
+    issues = schema_issues(compiled.validator.iter_errors(obj))
+    repairer = PlanFragmentRepairer(schema=compiled.format_schema, pinned_keys=("ch", "act"))
+
+    def generate(prompt: str, fragment: Any) -> str:
+        payload = {
+            "model": OLLAMA_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": False,
+            "options": {"temperature": 0, "stop": JSON_STOP_TOKENS},
+            "format": {"type": "object", "properties": {"fragment": fragment.schema},
+                       "required": ["fragment"]} if STRUCTURED_OK else "json",
+        }
+        text = _post_json("/api/chat", payload, timeout)
+        stats.record_generation(text, repair=True)
+        return text
+
+    outcome = repairer.repair_sync(obj, issues, generate)
+    return outcome.plan if outcome.applicable and outcome.changed else obj
+
+
 def try_parse_json(raw: str) -> Dict[str, Any]:
-    # Strip accidental pre/post text
-    raw = raw.strip()
-    start = raw.find("{")
-    end = raw.rfind("}")
-    if start >= 0 and end >= 0 and end >= start:
-        raw = raw[start:end+1]
-    return json.loads(raw)
+    # Skip accidental pre/post text; raises json.JSONDecodeError if no object closes
+    return scan_json(raw, "{")
 
 
 def _safe_get(root: Dict[str, Any], dotted: str, default: Any = None) -> Any:
@@ -725,12 +763,19 @@ def _json_skeleton(schema: Dict[str, Any]) -> str:
     return json.dumps(instance, ensure_ascii=False, separators=(",", ":"))
 
 
+# Validators and skeletons compiled once per schema content hash (None without jsonschema)
+_SCHEMAS = SchemaRegistry(skeleton_builder=_json_skeleton) if SchemaRegistry is not None else None
+
+
 # ---------- OLLAMA CALLS (STRICT) ----------
 
-def _post_json(url: str, payload: Dict[str, Any], timeout: int) -> str:
-    r = requests.post(url, json=payload, timeout=timeout)
-    r.raise_for_status()
-    data = r.json()
+def _post_json(path: str, payload: Dict[str, Any], timeout: int) -> str:
+    def send(base_url: str) -> Dict[str, Any]:
+        r = requests.post(f"{base_url}{path}", json=payload, timeout=timeout)
+        r.raise_for_status()
+        return r.json()
+
+    data = OLLAMA_POOL.call(payload["model"], send)
     if "message" in data:
         return data.get("message", {}).get("content", "")
     if "response" in data:
@@ -740,13 +785,19 @@ def _post_json(url: str, payload: Dict[str, Any], timeout: int) -> str:
 def ollama_chat_strict(messages: List[Dict[str, str]],
                        run_schema: Dict[str, Any],
                        skeleton: str,
-                       timeout: int = TIMEOUT_S) -> str:
+                       timeout: int = TIMEOUT_S,
+                       stats: Optional[RepairStats] = None) -> str:
     """
-    (1) Try structured chat (format=run_schema).
+    (1) Try constrained decoding (format derived from run_schema).
     (2) If invalid, retry with a coercion user message including the skeleton.
     (3) Fallback to /api/generate with format='json'.
     """
+    stats = stats if stats is not None else PLANNER_STATS
     options = {"temperature": 0, "stop": JSON_STOP_TOKENS}
+    if _SCHEMAS is not None:
+        format_schema = _SCHEMAS.get(run_schema).format_schema
+    else:
+        format_schema = ollama_format_schema(run_schema)
 
     if STRUCTURED_OK:
         payload = {
@@ -754,9 +805,10 @@ def ollama_chat_strict(messages: List[Dict[str, str]],
             "messages": messages,
             "stream": False,
             "options": options,
-            "format": run_schema
+            "format": format_schema
         }
-        txt = _post_json(f"{OLLAMA_URL}/api/chat", payload, timeout)
+        txt = _post_json("/api/chat", payload, timeout)
+        stats.record_generation(txt)
         if txt.strip().startswith("{"):
             return txt
 
@@ -773,9 +825,10 @@ def ollama_chat_strict(messages: List[Dict[str, str]],
         "messages": msgs2,
         "stream": False,
         "options": options,
-        "format": run_schema if STRUCTURED_OK else "json"
+        "format": format_schema if STRUCTURED_OK else "json"
     }
-    txt2 = _post_json(f"{OLLAMA_URL}/api/chat", payload2, timeout)
+    txt2 = _post_json("/api/chat", payload2, timeout)
+    stats.record_generation(txt2)
     if txt2.strip().startswith("{"):
         return txt2
 
@@ -788,4 +841,6 @@ def ollama_chat_strict(messages: List[Dict[str, str]],
         "options": options,
         "format": "json"
     }
-    return _post_json(f"{OLLAMA_URL}/api/generate", payload3, timeout)
+    txt3 = _post_json("/api/generate", payload3, timeout)
+    stats.record_generation(txt3)
+    return txt3
@@ -11,8 +11,6 @@ from poc.llm_ollama import llm
 # Public API
 # ----------------------------
 
-cached_characters: Dict[str, str] = {}
-
 def make_chapter_brief(
     *,
     book_model: Dict[str, Any],
@@ -212,22 +210,24 @@ def _safety_profile(audience: Dict[str, Any]) -> Dict[str, Any]:
     return {"peril_level": "moderate", "solutions_visible": False, "age_floor": lo, "age_ceiling": hi}
 
 def _normalize_research(selection: Optional[Dict[str, Any]], corpus: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-    global cached_characters
     # Merge plan-level selection with corpus; be permissive about shapes.
     figures, locales, topics = [], [], []
 
+    # Describe every figure in one batched QA call; answers are cached per corpus fingerprint
+    descriptions: Dict[str, str] = {}
+    if corpus is not None:
+        names = [x.get("name") if isinstance(x, dict) else str(x)
+                 for x in ((selection or {}).get("mythic_figures", []) + (selection or {}).get("figures", [])
+                           + corpus.get("figures", []))]
+        qa = QASession(llm)
+        qa.add_context("research_character", json.dumps(corpus))
+        answers = qa.ask_many([f"Who is {name}" for name in names if name])
+        descriptions = {name: answers[f"Who is {name}"] for name in names if name}
+
     def norm_fig(x):
-        description: Optional[str] = None
         character_name = x.get("name") if isinstance(x, dict) else str(x)
-        if character_name not in cached_characters:
-            if corpus is not None:
-                qa = QASession(llm)
-                qa.add_context("research_character", json.dumps(corpus))
-                description = qa.ask(f"Who is {x.get("name") if isinstance(x, dict) else str(x)}")
-            if description is not None:
-                cached_characters[character_name] = description
-        if character_name in cached_characters:
-            character_name = f'{character_name} - {cached_characters[character_name]}'
+        if character_name in descriptions:
+            character_name = f'{character_name} - {descriptions[character_name]}'
         return {
             "name": character_name,
             "role": (x.get("role") if isinstance(x, dict) else None),
@@ -406,9 +406,12 @@ def _guess_protagonist_name(book_model: Dict[str, Any], book_summary: str) -> st
     qa = QASession(llm_fn=llm)  # or your preferred local model
     qa.add_context("book_summary", book_summary)
 
-    answer = qa.ask("Who is the main character in the book?")
-
-    description = qa.ask("Describe the main character in one sentence.")
+    answers = qa.ask_many([
+        "Who is the main character in the book?",
+        "Describe the main character in one sentence.",
+    ])
+    answer = answers["Who is the main character in the book?"]
+    description = answers["Describe the main character in one sentence."]
 
     return f'{answer.strip() or "Unnamed Protagonist"} - {description.strip() or "No description available."}'
 
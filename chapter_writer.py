@@ -9,6 +9,8 @@ import os, re, math, textwrap, unicodedata
 from datetime import datetime
 
 from continuity import make_story_to_date_summary, get_prev_chapter_text
+from musequill.services.backend.writers.book_terms import describe_hits
+from musequill.services.backend.writers.text_profile import text_profile
 
 LLMFn = Callable[[str], str]  # Your LLM: def complete(prompt: str) -> str
 
@@ -25,16 +27,10 @@ banned_ngrams = [
 # chapter_writer.py
 
 def count_ngrams(text: str, n: int = 3) -> Dict[str, int]:
-    words = re.findall(r"[A-Za-z']+", text.lower())
-    grams = [" ".join(words[i:i+n]) for i in range(len(words)-n+1)]
-    freq = {}
-    for g in grams:
-        freq[g] = freq.get(g, 0) + 1
-    return freq
+    return dict(text_profile(text).ngrams(n))
 
 def find_banned(text: str, banned: List[str]) -> List[str]:
-    low = text.lower()
-    return [p for p in banned if p.lower() in low]
+    return text_profile(text).contains(banned)
 
 def extract_qa(text: str) -> Tuple[str, str]:
     m = re.search(r"```qa(.*?)```", text, flags=re.S)
@@ -44,24 +40,27 @@ def extract_qa(text: str) -> Tuple[str, str]:
 
 def needs_revision(chapter_text: str, banned_phrases: List[str], target_words: int) -> List[str]:
     issues = []
-    word_count = len(re.findall(r"\b\w+\b", chapter_text))
+    profile = text_profile(chapter_text)
+    word_count = profile.word_count
     if not (0.75*target_words <= word_count <= 1.25*target_words):
         issues.append(f"length off target ({word_count} vs {target_words}).")
-    dupes = [g for g,c in count_ngrams(chapter_text, 4).items() if c>=3]
+    dupes = profile.repeated_ngrams(4, 3)
     if dupes:
         issues.append(f"repetitive 4-grams ({len(dupes)}) found.")
-    banned_hit = find_banned(chapter_text, banned_phrases)
+    banned_hit = profile.contains(banned_phrases)
     if banned_hit:
         issues.append(f"banned phrases used: {', '.join(banned_hit)}.")
-    if chapter_text.count("# ") != 1:
+    if profile.h1_count != 1:
         issues.append("missing or multiple H1 titles.")
-    if "###" not in chapter_text:
+    if not profile.h3_count:
         issues.append("no scene headings (###).")
     return issues
 
 def revision_prompt(original: str, issues: List[str], brief: Dict[str,Any], banned: List[str]) -> str:
     bullets = "\n".join([f"- {i}" for i in issues])
     banned_bullets = "\n".join([f"- {p}" for p in banned])
+    located = describe_hits(original, text_profile(original).phrase_hits(banned))
+    located_bullets = "\n".join([f"- {line}" for line in located]) or "- none"
     return f"""Revise the chapter below to fix the listed issues without changing canon or POV constraints.
 Fixes required:
 {bullets}
@@ -69,6 +68,9 @@ Fixes required:
 Avoid these phrases entirely:
 {banned_bullets}
 
+Banned phrases found in the draft (rewrite these passages):
+{located_bullets}
+
 Keep structure (H1 title; `###` scene headings). Keep length within ±10% of target {brief['meta']['target_words']} words.
 
 === BEGIN CHAPTER ===
@@ -226,6 +228,8 @@ def write_all_chapters_with_qc(
     prev_chapter:str|None = None
 
     manuscript_dir = os.path.join(out_dir, "manuscript")
+    # Chapter -> act, so the story-so-far summary keeps one node per act
+    acts = {int(b["meta"]["chapter_number"]): b["meta"].get("act") for b in chapter_briefs}
 
     for brief in sorted(chapter_briefs, key=lambda b: b["meta"]["chapter_number"]):
         chapter_num = int(brief["meta"]["chapter_number"])
@@ -249,6 +253,7 @@ def write_all_chapters_with_qc(
             upto_chapter_num=chapter_num,
             max_words=280,  # keep compact
             prior_summary_path="summaries/story_so_far.md",
+            acts=acts,
         )
 
         prev_chapter = get_prev_chapter_text(manuscript_dir, chapter_num)
@@ -516,8 +521,7 @@ def strip_dialogue(text: str) -> str:
 
 
 def count_words(text: str) -> int:
-    # Simple word count
-    return len(re.findall(r"\b\w+\b", text))
+    return text_profile(text).word_count
 
 
 # ---------- Summaries / Continuity ----------
@@ -1,6 +1,6 @@
 # continuity.py
 from __future__ import annotations
-import glob, os, re
+import hashlib, json, os, re
 from typing import List, Tuple, Dict, Any
 
 from musequill.services.backend.model import BookModelType
@@ -11,40 +11,48 @@ def _extract_qa(text: str) -> str:
     m = QA_RE.search(text)
     return (m.group(1).strip() if m else "").strip()
 
-def _load_previous_chapters(manuscript_dir: str, upto_chapter_num: int) -> List[Tuple[int, str]]:
-    files = sorted(glob.glob(os.path.join(manuscript_dir, "Chapter_*.md")))
-    out = []
-    for path in files:
+CACHE_NAME = ".continuity_cache.json"
+SNIPPET_CHARS = 400
+
+def _chapter_files(manuscript_dir: str, upto_chapter_num: int) -> Dict[int, os.DirEntry]:
+    """Chapter number -> directory entry for Chapter_*.md files before `upto_chapter_num` (no reads)."""
+    out: Dict[int, os.DirEntry] = {}
+    if not os.path.isdir(manuscript_dir):
+        return out
+    for entry in os.scandir(manuscript_dir):
+        if not (entry.name.startswith("Chapter_") and entry.name.endswith(".md")):
+            continue
         try:
-            num = int(os.path.basename(path).split("_")[1].split(".")[0])
+            num = int(entry.name.split("_")[1].split(".")[0])
         except Exception:
             continue
         if num < upto_chapter_num:
-            with open(path, "r", encoding="utf-8") as f:
-                out.append((num, f.read()))
-    return sorted(out, key=lambda x: x[0])
+            out[num] = entry
+    return out
 
 def _build_summary_prompt(book_model: BookModelType,
                           prior_summaries_bullets: str,
-                          chapter_snippets: List[Tuple[int, str]],
-                          max_words: int) -> str:
-    # Use last 1–3 full chapters for rich context + any QA “progress” notes
-    recent = chapter_snippets[-3:] if chapter_snippets else []
+                          chapter_notes: List[Tuple[int, str, str]],
+                          max_words: int,
+                          earlier_acts: str = "") -> str:
+    # Use last 1–3 chapters (qa "progress" notes + opening snippet) for rich context
+    recent = chapter_notes[-3:] if chapter_notes else []
     recent_blocks = []
-    for num, txt in recent:
-        qa = _extract_qa(txt)
+    for num, qa, snippet in recent:
         recent_blocks.append(f"### Chapter {num}\n"
                              f"- Key progress (from qa):\n{qa if qa else '(no qa)'}\n"
-                             f"- Snippet (first ~400 chars):\n{txt[:400]}")
+                             f"- Snippet (first ~{SNIPPET_CHARS} chars):\n{snippet}")
 
     pov_type = book_model.pov.type
-    return f"""Summarize the story so far for continuity.
+    scope = "the current act so far" if earlier_acts else "the story so far"
+    earlier = (f"\n# Earlier acts (context only; do not repeat)\n{earlier_acts}\n" if earlier_acts else "")
+    return f"""Summarize {scope} for continuity.
 
 # Canon (for guardrails; do not invent beyond this)
 - Structure: {book_model.structure.type}
 - POV: {pov_type} (keep summary objective; no character inner thoughts)
 - Audience: {book_model.audience.type} {book_model.audience.age}
-
+{earlier}
 # Prior continuity (carry forward, compress if needed)
 {prior_summaries_bullets}
 
@@ -62,36 +70,156 @@ Write concise bullets covering only facts established on-page:
 - Tone/motifs in play (1–2 items)
 Do not critique or speculate. No inner monologue. End with: 'Next immediate objective: …'"""
 
+class StorySoFar:
+    """
+    Incremental, hierarchical story-so-far summaries for one manuscript directory.
+
+    Per chapter the cache keeps the file's size/mtime/sha256, its qa block, its
+    opening snippet and the rolling summary of its act through that chapter.
+    Only new or changed chapter files are read (unchanged ones are recognised by
+    stat, then by hash), and only chapters from the first change onward are
+    re-summarised, one LLM call each.
+
+    Levels:
+      - chapter: summary of the current act through that chapter, built from
+        the previous chapter's summary plus the cached notes of the last 3 chapters
+      - act: the last chapter summary of an act, frozen once the next act starts
+      - book: closed acts in order, followed by the current act's summary
+    """
+
+    def __init__(self, manuscript_dir: str, cache_path: str | None = None):
+        self.manuscript_dir = manuscript_dir
+        self.cache_path = cache_path or os.path.join(manuscript_dir, CACHE_NAME)
+        self.chapters: Dict[int, Dict[str, Any]] = {}
+        if os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.chapters = {int(k): v for k, v in data.get("chapters", {}).items()}
+            except (OSError, ValueError):
+                self.chapters = {}
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump({"chapters": {str(k): v for k, v in sorted(self.chapters.items())}},
+                      f, ensure_ascii=False, indent=1)
+
+    def refresh(self, upto_chapter_num: int) -> int | None:
+        """Sync cached notes with the files before `upto_chapter_num`; returns the first changed chapter."""
+        files = _chapter_files(self.manuscript_dir, upto_chapter_num)
+        changed = [n for n in self.chapters if n < upto_chapter_num and n not in files]
+        for n in changed:
+            del self.chapters[n]
+        for num, entry in files.items():
+            st = entry.stat()
+            cached = self.chapters.get(num)
+            if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+                continue
+            with open(entry.path, "r", encoding="utf-8") as f:
+                text = f.read()
+            sha = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            if cached and cached["sha"] == sha:
+                cached.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+                continue
+            self.chapters[num] = {
+                "sha": sha, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                "qa": _extract_qa(text), "snippet": text[:SNIPPET_CHARS],
+            }
+            changed.append(num)
+        first = min(changed) if changed else None
+        if first is not None:
+            # Every rolling summary from the first change onward is stale
+            for n, node in self.chapters.items():
+                if n >= first:
+                    node.pop("summary", None)
+        return first
+
+    def _acts(self, nums: List[int]) -> List[Tuple[str, List[int]]]:
+        groups: List[Tuple[str, List[int]]] = []
+        for n in nums:
+            act = self.chapters[n].get("act") or "I"
+            if not groups or groups[-1][0] != act:
+                groups.append((act, []))
+            groups[-1][1].append(n)
+        return groups
+
+    @staticmethod
+    def _render(closed: List[Tuple[str, str]], current: str) -> str:
+        if not closed:
+            return current
+        blocks = [f"## Act {act} (complete)\n{summary}" for act, summary in closed]
+        return "\n\n".join(blocks + ([f"## Current act\n{current}"] if current else []))
+
+    def summary(self, llm_fn, book_model: BookModelType, upto_chapter_num: int,
+                max_words: int = 250, acts: Dict[int, str] | None = None) -> str:
+        self.refresh(upto_chapter_num)
+        nums = sorted(n for n in self.chapters if n < upto_chapter_num)
+        if not nums:
+            return ""
+        for n in nums:
+            act = (acts or {}).get(n) or self.chapters[n].get("act") or "I"
+            if self.chapters[n].get("act") != act:
+                self.chapters[n]["act"] = act
+                for later in nums:
+                    if later >= n:
+                        self.chapters[later].pop("summary", None)
+
+        closed: List[Tuple[str, str]] = []
+        current = ""
+        dirty = False
+        groups = self._acts(nums)
+        for index, (act, members) in enumerate(groups):
+            if index:
+                closed.append((groups[index - 1][0], current))  # the previous act is complete
+                current = ""
+            for n in members:
+                node = self.chapters[n]
+                if "summary" not in node:
+                    lo = nums.index(n)
+                    notes = [(m, self.chapters[m]["qa"], self.chapters[m]["snippet"])
+                             for m in nums[max(0, lo - 2):lo + 1]]
+                    prompt = _build_summary_prompt(book_model, current, notes, max_words,
+                                                   earlier_acts=self._render(closed, ""))
+                    node["summary"] = llm_fn(prompt, temperature=0.2, top_p=0.9, top_k=40).strip()
+                    dirty = True
+                current = node["summary"]
+        if dirty:
+            self._save()
+        return self._render(closed, current)
+
+_SUMMARIZERS: Dict[str, StorySoFar] = {}
+
 def make_story_to_date_summary(llm_fn,
                                book_model: BookModelType,
                                manuscript_dir: str,
                                upto_chapter_num: int,
                                max_words: int = 250,
-                               prior_summary_path: str | None = None) -> str:
+                               prior_summary_path: str | None = None,
+                               acts: Dict[int, str] | None = None) -> str:
     """
     Returns a compact continuity summary up to (but not including) chapter `upto_chapter_num`.
     If nothing has been written yet (ch 1), returns an empty string.
+
+    Summaries are incremental (see StorySoFar): a call after writing one more
+    chapter reads that chapter file only and makes one LLM call. Pass `acts`
+    (chapter number -> act label) to keep per-act summaries.
     """
-    prev = _load_previous_chapters(manuscript_dir, upto_chapter_num)
-    if not prev:
+    key = os.path.abspath(manuscript_dir)
+    summarizer = _SUMMARIZERS.get(key)
+    if summarizer is None:
+        summarizer = _SUMMARIZERS[key] = StorySoFar(manuscript_dir)
+    summary = summarizer.summary(llm_fn, book_model, upto_chapter_num, max_words, acts)
+    if not summary:
         return ""  # chapter 1: nothing to summarize yet
 
-    # Load last saved summary (optional) to build a hierarchical, rolling summary
-    prior_summaries_bullets = ""
-    if prior_summary_path and os.path.exists(prior_summary_path):
-        with open(prior_summary_path, "r", encoding="utf-8") as f:
-            prior_summaries_bullets = f.read().strip()
-
-    prompt = _build_summary_prompt(book_model, prior_summaries_bullets, prev, max_words)
-    summary = llm_fn(prompt, temperature=0.2, top_p=0.9, top_k=40)
-
-    # Keep it around for the next call if you like
+    # Keep it around for anything that reads the latest summary from disk
     if prior_summary_path:
-        os.makedirs(os.path.dirname(prior_summary_path), exist_ok=True)
+        os.makedirs(os.path.dirname(prior_summary_path) or ".", exist_ok=True)
         with open(prior_summary_path, "w", encoding="utf-8") as f:
-            f.write(summary.strip())
+            f.write(summary)
 
-    return summary.strip()
+    return summary
 
 def get_prev_chapter_text(manuscript_dir: str, chapter_num: int) -> str | None:
     """Fetch the full text of the immediately preceding chapter, if any."""
@@ -3,7 +3,10 @@ from typing import Dict, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 import json
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class AudienceType(str, Enum):
     """Comprehensive target audience types for book generation."""
     
@@ -481,12 +484,35 @@ class AudienceType(str, Enum):
         normalized_value = value.lower().strip().replace("-", "_").replace(" ", "_")
         
         # Direct match
-        for audience in cls:
-            if audience.value == normalized_value:
-                return audience
+        audience = cls._VALUE_INDEX.get(normalized_value)
+        if audience is not None:
+            return audience
         
         # Fuzzy matching
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        if normalized_value in fuzzy_matches:
+            return fuzzy_matches[normalized_value]
+        
+        # Partial matching
+        for key, audience in fuzzy_matches.items():
+            if key in normalized_value or normalized_value in key:
+                return audience
+        
+        # Check if the normalized value contains any audience as a substring
+        for audience in cls._MEMBERS:
+            if audience.value in normalized_value or normalized_value in audience.value:
+                return audience
+        
+        available_audiences = [a.value for a in cls]
+        raise ValueError(
+            f"Unknown audience type: '{value}'. "
+            f"Available types include: {', '.join(sorted(available_audiences[:10]))}..."
+        )
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'AudienceType']:
+        return {
             # General variations
             "general": cls.GENERAL_READERS,
             "mainstream": cls.MAINSTREAM_AUDIENCE,
@@ -598,25 +624,6 @@ class AudienceType(str, Enum):
             "adventurer": cls.ADVENTURERS,
             "lifestyle": cls.LIFESTYLE_READERS,
         }
-        
-        if normalized_value in fuzzy_matches:
-            return fuzzy_matches[normalized_value]
-        
-        # Partial matching
-        for key, audience in fuzzy_matches.items():
-            if key in normalized_value or normalized_value in key:
-                return audience
-        
-        # Check if the normalized value contains any audience as a substring
-        for audience in cls:
-            if audience.value in normalized_value or normalized_value in audience.value:
-                return audience
-        
-        available_audiences = [a.value for a in cls]
-        raise ValueError(
-            f"Unknown audience type: '{value}'. "
-            f"Available types include: {', '.join(sorted(available_audiences[:10]))}..."
-        )
     
     @classmethod
     def get_audiences_for_genre(cls, genre: str) -> List['AudienceType']:
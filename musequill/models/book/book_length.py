@@ -2,7 +2,10 @@ from enum import Enum
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class BookLength(str, Enum):
     """Comprehensive book length categories with industry-standard word counts for AI generation."""
     
@@ -294,12 +297,38 @@ class BookLength(str, Enum):
         normalized_value = value.lower().strip().replace("-", "_").replace(" ", "_")
         
         # Direct match
-        for length in cls:
-            if length.value == normalized_value:
-                return length
+        length = cls._VALUE_INDEX.get(normalized_value)
+        if length is not None:
+            return length
         
         # Fuzzy matching with common variations
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        # Check fuzzy matches
+        if normalized_value in fuzzy_matches:
+            return fuzzy_matches[normalized_value]
+        
+        # Partial matching
+        for key, length in fuzzy_matches.items():
+            if key in normalized_value or normalized_value in key:
+                return length
+        
+        # Check if the normalized value contains any length as a substring
+        for length in cls._MEMBERS:
+            clean_length_value = length.value.replace("_", "")
+            clean_input = normalized_value.replace("_", "")
+            if clean_length_value in clean_input or clean_input in clean_length_value:
+                return length
+        
+        available_lengths = [length.value for length in cls]
+        raise ValueError(
+            f"Unknown book length: '{value}'. "
+            f"Available lengths include: {', '.join(sorted(available_lengths[:10]))}..."
+        )
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'BookLength']:
+        return {
             # Fiction variations
             "flash": cls.FLASH_FICTION,
             "micro": cls.MICRO_FICTION,
@@ -354,28 +383,6 @@ class BookLength(str, Enum):
             "chapbook": cls.POETRY_CHAPBOOK,
             "graphic": cls.GRAPHIC_NOVEL_SCRIPT,
         }
-        
-        # Check fuzzy matches
-        if normalized_value in fuzzy_matches:
-            return fuzzy_matches[normalized_value]
-        
-        # Partial matching
-        for key, length in fuzzy_matches.items():
-            if key in normalized_value or normalized_value in key:
-                return length
-        
-        # Check if the normalized value contains any length as a substring
-        for length in cls:
-            clean_length_value = length.value.replace("_", "")
-            clean_input = normalized_value.replace("_", "")
-            if clean_length_value in clean_input or clean_input in clean_length_value:
-                return length
-        
-        available_lengths = [length.value for length in cls]
-        raise ValueError(
-            f"Unknown book length: '{value}'. "
-            f"Available lengths include: {', '.join(sorted(available_lengths[:10]))}..."
-        )
     
     @classmethod
     def from_word_count(cls, word_count: int) -> 'BookLength':
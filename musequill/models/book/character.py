@@ -2,11 +2,14 @@ from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple, Union
 import re
 
+from .lookup_tables import alias_table, frozen_lookup_tables
+
 
 # ============================================================================
 # Character Development Enumerations
 # ============================================================================
 
+@frozen_lookup_tables
 class CharacterRole(str, Enum):
     """Character role types in narrative structure."""
     PROTAGONIST = "protagonist"
@@ -119,13 +122,22 @@ class CharacterRole(str, Enum):
         value_lower = value.lower().strip()
         
         # Direct value matching
-        try:
-            return cls(value_lower)
-        except ValueError:
-            pass
+        member = cls._VALUE_INDEX.get(value_lower)
+        if member is not None:
+            return member
+        
+        # Fuzzy matching with prioritized longer matches (pre-sorted longest first)
+        sorted_mappings = cls._aliases_by_length
+        
+        for keyword, role in sorted_mappings:
+            if keyword in value_lower:
+                return role
         
-        # Fuzzy matching with prioritized longer matches
-        mappings = {
+        raise ValueError(f"Unknown character role: {value}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'CharacterRole']:
+        return {
             # Primary roles
             "main character": cls.PROTAGONIST,
             "main characters": cls.PROTAGONISTS,
@@ -189,15 +201,10 @@ class CharacterRole(str, Enum):
             "contrast character": cls.FOIL,
             "opposite": cls.FOIL,
         }
-        
-        # Sort by length (longest first) for better matching
-        sorted_mappings = sorted(mappings.items(), key=lambda x: len(x[0]), reverse=True)
-        
-        for keyword, role in sorted_mappings:
-            if keyword in value_lower:
-                return role
-        
-        raise ValueError(f"Unknown character role: {value}")
+
+    @alias_table
+    def _aliases_by_length(cls) -> Tuple[Tuple[str, 'CharacterRole'], ...]:
+        return sorted(cls._fuzzy_aliases.items(), key=lambda x: len(x[0]), reverse=True)
 
     @classmethod
     def get_primary_roles(cls) -> List['CharacterRole']:
@@ -227,6 +234,7 @@ class CharacterRole(str, Enum):
         return f"CharacterRole.{self.name}"
 
 
+@frozen_lookup_tables
 class CharacterArchetype(str, Enum):
     """Character archetypes based on psychology and mythology."""
     THE_HERO = "the_hero"
@@ -343,17 +351,26 @@ class CharacterArchetype(str, Enum):
         value_lower = value.lower().strip()
         
         # Direct value matching
-        try:
-            return cls(value_lower)
-        except ValueError:
-            pass
+        member = cls._VALUE_INDEX.get(value_lower)
+        if member is not None:
+            return member
         
         # Remove "the" prefix for matching
         if value_lower.startswith("the "):
             value_lower = value_lower[4:]
         
         # Fuzzy matching
-        mappings = {
+        mappings = cls._fuzzy_aliases
+        
+        for keyword, archetype in mappings.items():
+            if keyword in value_lower:
+                return archetype
+        
+        raise ValueError(f"Unknown character archetype: {value}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'CharacterArchetype']:
+        return {
             "hero": cls.THE_HERO,
             "champion": cls.THE_HERO,
             "warrior": cls.THE_HERO,
@@ -399,12 +416,6 @@ class CharacterArchetype(str, Enum):
             "inventor": cls.THE_CREATOR,
             "builder": cls.THE_CREATOR,
         }
-        
-        for keyword, archetype in mappings.items():
-            if keyword in value_lower:
-                return archetype
-        
-        raise ValueError(f"Unknown character archetype: {value}")
 
     @classmethod
     def get_positive_archetypes(cls) -> List['CharacterArchetype']:
@@ -1,7 +1,11 @@
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Dict, List, Optional, Pattern, Set, Tuple, Union
+import re
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class ConflictType(str, Enum):
     """Types of conflict in stories."""
     PERSON_VS_PERSON = "person_vs_person"
@@ -109,15 +113,29 @@ class ConflictType(str, Enum):
         value_lower = value.lower().strip()
         
         # Direct value matching
-        try:
-            return cls(value_lower)
-        except ValueError:
-            pass
+        member = cls._VALUE_INDEX.get(value_lower)
+        if member is not None:
+            return member
         
         # Fuzzy matching with prioritized longer matches
-        import re
+        # First check word-boundary sensitive keywords
+        for pattern, conflict_type in cls._word_boundary_patterns:
+            if pattern.search(value_lower):
+                return conflict_type
+        
+        # Mappings are pre-sorted by keyword length (longest first) to prioritize specific matches
+        sorted_mappings = cls._aliases_by_length
+        
+        # Then check general substring matches, starting with longest keywords
+        for keyword, conflict_type in sorted_mappings:
+            if keyword in value_lower:
+                return conflict_type
         
-        mappings = {
+        raise ValueError(f"Unknown conflict type: {value}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'ConflictType']:
+        return {
             # Person vs Person variants
             "character vs character": cls.PERSON_VS_PERSON,
             "protagonist vs antagonist": cls.PERSON_VS_PERSON,
@@ -183,26 +201,21 @@ class ConflictType(str, Enum):
             "faith": cls.PERSON_VS_GOD,
             "sacred": cls.PERSON_VS_GOD,
         }
-        
+
+    @alias_table
+    def _aliases_by_length(cls) -> Tuple[Tuple[str, 'ConflictType'], ...]:
+        return sorted(cls._fuzzy_aliases.items(), key=lambda x: len(x[0]), reverse=True)
+
+    @alias_table
+    def _word_boundary_patterns(cls) -> Tuple[Tuple[Pattern, 'ConflictType'], ...]:
         # Special handling for word-boundary sensitive keywords
         word_boundary_keywords = {
             "ai": cls.PERSON_VS_TECHNOLOGY,  # Match "ai" only as whole word
         }
-        
-        # First check word-boundary sensitive keywords
-        for keyword, conflict_type in word_boundary_keywords.items():
-            if re.search(r'\b' + re.escape(keyword) + r'\b', value_lower):
-                return conflict_type
-        
-        # Sort mappings by keyword length (longest first) to prioritize specific matches
-        sorted_mappings = sorted(mappings.items(), key=lambda x: len(x[0]), reverse=True)
-        
-        # Then check general substring matches, starting with longest keywords
-        for keyword, conflict_type in sorted_mappings:
-            if keyword in value_lower:
-                return conflict_type
-        
-        raise ValueError(f"Unknown conflict type: {value}")
+        return [
+            (re.compile(r'\b' + re.escape(keyword) + r'\b'), conflict_type)
+            for keyword, conflict_type in word_boundary_keywords.items()
+        ]
 
     @classmethod
     def get_conflicts_for_genre(cls, genre: str) -> List['ConflictType']:
@@ -4,7 +4,10 @@ from dataclasses import dataclass, field
 import json
 from datetime import datetime
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class ContentWarning(str, Enum):
     """Content warnings for sensitive material in books."""
     
@@ -588,12 +591,35 @@ class ContentWarning(str, Enum):
         normalized_value = value.lower().strip().replace("-", "_").replace(" ", "_")
         
         # Direct match
-        for warning in cls:
-            if warning.value == normalized_value:
-                return warning
+        warning = cls._VALUE_INDEX.get(normalized_value)
+        if warning is not None:
+            return warning
         
         # Fuzzy matching
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        if normalized_value in fuzzy_matches:
+            return fuzzy_matches[normalized_value]
+        
+        # Partial matching
+        for key, warning in fuzzy_matches.items():
+            if key in normalized_value or normalized_value in key:
+                return warning
+        
+        # Check if the normalized value contains any warning as a substring
+        for warning in cls._MEMBERS:
+            if warning.value in normalized_value or normalized_value in warning.value:
+                return warning
+        
+        available_warnings = [w.value for w in cls]
+        raise ValueError(
+            f"Unknown content warning: '{value}'. "
+            f"Available warnings include: {', '.join(sorted(available_warnings[:10]))}..."
+        )
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'ContentWarning']:
+        return {
             # Violence variations
             "violent": cls.VIOLENCE,
             "graphic": cls.GRAPHIC_VIOLENCE,
@@ -680,25 +706,6 @@ class ContentWarning(str, Enum):
             "adult": cls.ADULT_CONTENT,
             "children": cls.NOT_SUITABLE_FOR_CHILDREN,
         }
-        
-        if normalized_value in fuzzy_matches:
-            return fuzzy_matches[normalized_value]
-        
-        # Partial matching
-        for key, warning in fuzzy_matches.items():
-            if key in normalized_value or normalized_value in key:
-                return warning
-        
-        # Check if the normalized value contains any warning as a substring
-        for warning in cls:
-            if warning.value in normalized_value or normalized_value in warning.value:
-                return warning
-        
-        available_warnings = [w.value for w in cls]
-        raise ValueError(
-            f"Unknown content warning: '{value}'. "
-            f"Available warnings include: {', '.join(sorted(available_warnings[:10]))}..."
-        )
     
     @classmethod
     def get_warnings_for_genre(cls, genre: str) -> List['ContentWarning']:
@@ -1,11 +1,15 @@
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple, Union
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Set, Tuple, Union
 import json
 from dataclasses import dataclass
 
+from .lookup_tables import alias_table, frozen_lookup_tables
+
 # Import all the genre and subgenre enums
 # (In practice, these would be imported from separate files)
 
+@frozen_lookup_tables
 class GenreType(str, Enum):
     """Optimized genre types for AI book generation based on market popularity and demand."""
     
@@ -246,12 +250,44 @@ class GenreType(str, Enum):
         normalized_value = value.lower().strip().replace("-", "_").replace(" ", "_")
         
         # Direct match with enum values
-        for genre in cls:
-            if genre.value == normalized_value:
-                return genre
+        genre = cls._VALUE_INDEX.get(normalized_value)
+        if genre is not None:
+            return genre
         
         # Fuzzy matching for common variations and aliases
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        # Check fuzzy matches
+        if normalized_value in fuzzy_matches:
+            return fuzzy_matches[normalized_value]
+        
+        # Partial matching for compound terms (e.g., "fantasy romance" -> ROMANTASY)
+        if "fantasy" in normalized_value and ("romance" in normalized_value or "romantic" in normalized_value):
+            return cls.ROMANTASY
+        elif "romance" in normalized_value and "fantasy" in normalized_value:
+            return cls.ROMANTASY
+        elif "dark" in normalized_value and "academia" in normalized_value:
+            return cls.DARK_ACADEMIA
+        elif "cozy" in normalized_value and "fantasy" in normalized_value:
+            return cls.COZY_FANTASY
+        elif "coming" in normalized_value and "age" in normalized_value:
+            return cls.COMING_OF_AGE
+        
+        # Check if the normalized value contains any genre as a substring
+        for genre in cls._MEMBERS:
+            if genre.value in normalized_value or normalized_value in genre.value:
+                return genre
+        
+        # If no match found, raise descriptive error
+        available_genres = [genre.value for genre in cls]
+        raise ValueError(
+            f"Unknown genre: '{value}'. "
+            f"Available genres: {', '.join(sorted(available_genres[:10]))}..."
+        )
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'GenreType']:
+        return {
             # Romance variations
             "romantic": cls.ROMANCE,
             "love_story": cls.ROMANCE,
@@ -337,34 +373,6 @@ class GenreType(str, Enum):
             "nonfiction": cls.REFERENCE,
             "non_fiction": cls.REFERENCE,
         }
-        
-        # Check fuzzy matches
-        if normalized_value in fuzzy_matches:
-            return fuzzy_matches[normalized_value]
-        
-        # Partial matching for compound terms (e.g., "fantasy romance" -> ROMANTASY)
-        if "fantasy" in normalized_value and ("romance" in normalized_value or "romantic" in normalized_value):
-            return cls.ROMANTASY
-        elif "romance" in normalized_value and "fantasy" in normalized_value:
-            return cls.ROMANTASY
-        elif "dark" in normalized_value and "academia" in normalized_value:
-            return cls.DARK_ACADEMIA
-        elif "cozy" in normalized_value and "fantasy" in normalized_value:
-            return cls.COZY_FANTASY
-        elif "coming" in normalized_value and "age" in normalized_value:
-            return cls.COMING_OF_AGE
-        
-        # Check if the normalized value contains any genre as a substring
-        for genre in cls:
-            if genre.value in normalized_value or normalized_value in genre.value:
-                return genre
-        
-        # If no match found, raise descriptive error
-        available_genres = [genre.value for genre in cls]
-        raise ValueError(
-            f"Unknown genre: '{value}'. "
-            f"Available genres: {', '.join(sorted(available_genres[:10]))}..."
-        )
     
     @classmethod
     def get_trending_genres(cls) -> List['GenreType']:
@@ -433,6 +441,7 @@ class GenreType(str, Enum):
         return cls(data['value'])
 
 
+@frozen_lookup_tables
 class SubGenreType(str, Enum):
     """All subgenres consolidated with comprehensive from_string support."""
     
@@ -731,12 +740,38 @@ class SubGenreType(str, Enum):
         normalized_value = value.lower().strip().replace("-", "_").replace(" ", "_")
         
         # Direct match
-        for subgenre in cls:
-            if subgenre.value == normalized_value:
-                return subgenre
+        subgenre = cls._VALUE_INDEX.get(normalized_value)
+        if subgenre is not None:
+            return subgenre
         
         # Fuzzy matching dictionary
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        # Check fuzzy matches
+        if normalized_value in fuzzy_matches:
+            return fuzzy_matches[normalized_value]
+        
+        # Partial matching for compound terms
+        for key, subgenre in fuzzy_matches.items():
+            if key in normalized_value or normalized_value in key:
+                return subgenre
+        
+        # Check if the normalized value contains any subgenre as a substring
+        for subgenre in cls._MEMBERS:
+            clean_subgenre_value = subgenre.value.replace("_sub", "")
+            if clean_subgenre_value in normalized_value or normalized_value in clean_subgenre_value:
+                return subgenre
+        
+        # If no match found, raise descriptive error
+        available_subgenres = [sg.value for sg in cls]
+        raise ValueError(
+            f"Unknown subgenre: '{value}'. "
+            f"Available subgenres include: {', '.join(sorted(available_subgenres[:10]))}..."
+        )
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'SubGenreType']:
+        return {
             # Romance subgenres
             "contemporary": cls.CONTEMPORARY_ROMANCE,
             "historical": cls.HISTORICAL_ROMANCE,
@@ -805,28 +840,6 @@ class SubGenreType(str, Enum):
             "celebrity": cls.CELEBRITY_BIOGRAPHY,
             "children_book": cls.CHILDREN_BOOK
         }
-        
-        # Check fuzzy matches
-        if normalized_value in fuzzy_matches:
-            return fuzzy_matches[normalized_value]
-        
-        # Partial matching for compound terms
-        for key, subgenre in fuzzy_matches.items():
-            if key in normalized_value or normalized_value in key:
-                return subgenre
-        
-        # Check if the normalized value contains any subgenre as a substring
-        for subgenre in cls:
-            clean_subgenre_value = subgenre.value.replace("_sub", "")
-            if clean_subgenre_value in normalized_value or normalized_value in clean_subgenre_value:
-                return subgenre
-        
-        # If no match found, raise descriptive error
-        available_subgenres = [sg.value for sg in cls]
-        raise ValueError(
-            f"Unknown subgenre: '{value}'. "
-            f"Available subgenres include: {', '.join(sorted(available_subgenres[:10]))}..."
-        )
     
     def __str__(self) -> str:
         return self.display_name
@@ -1026,6 +1039,99 @@ class GenreMapping:
 
     }
     
+    # Immutable indexes and cached views, built once by _build_indexes() right
+    # after the class is defined (GenreSubGenrePair validates against this class)
+    _SUBGENRE_TO_GENRES: Mapping[SubGenreType, Tuple[GenreType, ...]] = MappingProxyType({})
+    _SORTED_SUBGENRES: Mapping[GenreType, Tuple[SubGenreType, ...]] = MappingProxyType({})
+    _ALL_COMBINATIONS: Tuple[GenreSubGenrePair, ...] = ()
+    _COMBINATIONS_BY_GENRE: Mapping[GenreType, Tuple[GenreSubGenrePair, ...]] = MappingProxyType({})
+    _COMBINATION_ORDER: Mapping[Tuple[GenreType, SubGenreType], int] = MappingProxyType({})
+    _TRENDING_COMBINATIONS: Tuple[GenreSubGenrePair, ...] = ()
+    _AI_FRIENDLY_COMBINATIONS: Tuple[GenreSubGenrePair, ...] = ()
+    _AI_FRIENDLY_KEYS: FrozenSet[Tuple[GenreType, SubGenreType]] = frozenset()
+    
+    TRENDING_PAIRS: Tuple[Tuple[GenreType, SubGenreType], ...] = (
+        # Romance trending
+        (GenreType.ROMANCE, SubGenreType.DARK_ROMANCE),
+        (GenreType.ROMANCE, SubGenreType.ENEMIES_TO_LOVERS),
+        (GenreType.ROMANCE, SubGenreType.BILLIONAIRE_ROMANCE),
+        
+        # Romantasy trending
+        (GenreType.ROMANTASY, SubGenreType.ROMANTASY_SUB),
+        (GenreType.ROMANTASY, SubGenreType.PARANORMAL_ROMANCE),
+        
+        # Fantasy trending
+        (GenreType.COZY_FANTASY, SubGenreType.COZY_FANTASY_SUB),
+        (GenreType.FANTASY, SubGenreType.FAIRY_TALE_RETELLING),
+        
+        # Thriller trending
+        (GenreType.THRILLER, SubGenreType.PSYCHOLOGICAL_THRILLER),
+        (GenreType.THRILLER, SubGenreType.DOMESTIC_THRILLER),
+        
+        # Mystery trending
+        (GenreType.MYSTERY, SubGenreType.COZY_MYSTERY),
+        
+        # Non-fiction trending
+        (GenreType.SELF_HELP, SubGenreType.MOTIVATIONAL),
+        (GenreType.SELF_HELP, SubGenreType.MINDFULNESS),
+        (GenreType.TRUE_CRIME, SubGenreType.TRUE_CRIME_SUB),
+    )
+    
+    AI_FRIENDLY_PAIRS: Tuple[Tuple[GenreType, SubGenreType], ...] = (
+        # Easy romance
+        (GenreType.ROMANCE, SubGenreType.CONTEMPORARY_ROMANCE),
+        (GenreType.ROMANCE, SubGenreType.ROMANTIC_COMEDY),
+        
+        # Easy fantasy
+        (GenreType.COZY_FANTASY, SubGenreType.COZY_FANTASY_SUB),
+        (GenreType.FANTASY, SubGenreType.FAIRY_TALE_RETELLING),
+        
+        # Easy non-fiction
+        (GenreType.SELF_HELP, SubGenreType.MOTIVATIONAL),
+        (GenreType.SELF_HELP, SubGenreType.PRODUCTIVITY),
+        (GenreType.COOKING, SubGenreType.COOKING_SUB),
+        (GenreType.TRAVEL, SubGenreType.TRAVEL_GUIDE),
+        
+        # Easy YA
+        (GenreType.YOUNG_ADULT, SubGenreType.YA_CONTEMPORARY),
+        (GenreType.COMING_OF_AGE, SubGenreType.COMING_OF_AGE_SUB),
+    )
+    
+    @classmethod
+    def _build_indexes(cls) -> None:
+        """
+        Build the forward/reverse indexes and cached combination views.
+        
+        Must be re-run if GENRE_SUBGENRE_MAP is changed at runtime.
+        """
+        subgenre_to_genres: Dict[SubGenreType, List[GenreType]] = {}
+        combinations: List[GenreSubGenrePair] = []
+        by_genre: Dict[GenreType, Tuple[GenreSubGenrePair, ...]] = {}
+        
+        for genre, subgenres in cls.GENRE_SUBGENRE_MAP.items():
+            genre_pairs = []
+            for subgenre in subgenres:
+                subgenre_to_genres.setdefault(subgenre, []).append(genre)
+                genre_pairs.append(GenreSubGenrePair(genre, subgenre))
+            by_genre[genre] = tuple(genre_pairs)
+            combinations.extend(genre_pairs)
+        
+        cls._SUBGENRE_TO_GENRES = MappingProxyType(
+            {subgenre: tuple(genres) for subgenre, genres in subgenre_to_genres.items()}
+        )
+        cls._SORTED_SUBGENRES = MappingProxyType({
+            genre: tuple(sorted(subgenres, key=lambda x: x.display_name))
+            for genre, subgenres in cls.GENRE_SUBGENRE_MAP.items()
+        })
+        cls._ALL_COMBINATIONS = tuple(combinations)
+        cls._COMBINATIONS_BY_GENRE = MappingProxyType(by_genre)
+        cls._COMBINATION_ORDER = MappingProxyType(
+            {(combo.genre, combo.subgenre): index for index, combo in enumerate(combinations)}
+        )
+        cls._TRENDING_COMBINATIONS = tuple(cls.create_pair(g, sg) for g, sg in cls.TRENDING_PAIRS)
+        cls._AI_FRIENDLY_COMBINATIONS = tuple(cls.create_pair(g, sg) for g, sg in cls.AI_FRIENDLY_PAIRS)
+        cls._AI_FRIENDLY_KEYS = frozenset(cls.AI_FRIENDLY_PAIRS)
+    
     @classmethod
     def get_subgenres(cls, genre: GenreType) -> Set[SubGenreType]:
         """Get all valid subgenres for a given genre."""
@@ -1034,25 +1140,18 @@ class GenreMapping:
     @classmethod
     def get_subgenres_list(cls, genre: GenreType) -> List[SubGenreType]:
         """Get all valid subgenres for a given genre as a sorted list."""
-        subgenres = cls.get_subgenres(genre)
-        return sorted(subgenres, key=lambda x: x.display_name)
+        return list(cls._SORTED_SUBGENRES.get(genre, ()))
     
     @classmethod
     def get_genre_for_subgenre(cls, subgenre: SubGenreType) -> Optional[GenreType]:
         """Get the primary parent genre for a given subgenre."""
-        for genre, subgenres in cls.GENRE_SUBGENRE_MAP.items():
-            if subgenre in subgenres:
-                return genre
-        return None
+        genres = cls._SUBGENRE_TO_GENRES.get(subgenre)
+        return genres[0] if genres else None
     
     @classmethod
     def get_all_genres_for_subgenre(cls, subgenre: SubGenreType) -> List[GenreType]:
         """Get all parent genres for a given subgenre (some subgenres belong to multiple genres)."""
-        genres = []
-        for genre, subgenres in cls.GENRE_SUBGENRE_MAP.items():
-            if subgenre in subgenres:
-                genres.append(genre)
-        return genres
+        return list(cls._SUBGENRE_TO_GENRES.get(subgenre, ()))
     
     @classmethod
     def is_valid_combination(cls, genre: GenreType, subgenre: SubGenreType) -> bool:
@@ -1067,68 +1166,17 @@ class GenreMapping:
     @classmethod
     def get_all_combinations(cls) -> List[GenreSubGenrePair]:
         """Get all valid genre-subgenre combinations."""
-        combinations = []
-        for genre, subgenres in cls.GENRE_SUBGENRE_MAP.items():
-            for subgenre in subgenres:
-                combinations.append(GenreSubGenrePair(genre, subgenre))
-        return combinations
+        return list(cls._ALL_COMBINATIONS)
     
     @classmethod
     def get_trending_combinations(cls) -> List[GenreSubGenrePair]:
         """Get trending genre-subgenre combinations based on market research."""
-        trending_pairs = [
-            # Romance trending
-            (GenreType.ROMANCE, SubGenreType.DARK_ROMANCE),
-            (GenreType.ROMANCE, SubGenreType.ENEMIES_TO_LOVERS),
-            (GenreType.ROMANCE, SubGenreType.BILLIONAIRE_ROMANCE),
-            
-            # Romantasy trending
-            (GenreType.ROMANTASY, SubGenreType.ROMANTASY_SUB),
-            (GenreType.ROMANTASY, SubGenreType.PARANORMAL_ROMANCE),
-            
-            # Fantasy trending
-            (GenreType.COZY_FANTASY, SubGenreType.COZY_FANTASY_SUB),
-            (GenreType.FANTASY, SubGenreType.FAIRY_TALE_RETELLING),
-            
-            # Thriller trending
-            (GenreType.THRILLER, SubGenreType.PSYCHOLOGICAL_THRILLER),
-            (GenreType.THRILLER, SubGenreType.DOMESTIC_THRILLER),
-            
-            # Mystery trending
-            (GenreType.MYSTERY, SubGenreType.COZY_MYSTERY),
-            
-            # Non-fiction trending
-            (GenreType.SELF_HELP, SubGenreType.MOTIVATIONAL),
-            (GenreType.SELF_HELP, SubGenreType.MINDFULNESS),
-            (GenreType.TRUE_CRIME, SubGenreType.TRUE_CRIME_SUB),
-        ]
-        
-        return [cls.create_pair(genre, subgenre) for genre, subgenre in trending_pairs]
+        return list(cls._TRENDING_COMBINATIONS)
     
     @classmethod
     def get_ai_friendly_combinations(cls) -> List[GenreSubGenrePair]:
         """Get genre-subgenre combinations that are easier for AI to generate."""
-        ai_friendly_pairs = [
-            # Easy romance
-            (GenreType.ROMANCE, SubGenreType.CONTEMPORARY_ROMANCE),
-            (GenreType.ROMANCE, SubGenreType.ROMANTIC_COMEDY),
-            
-            # Easy fantasy
-            (GenreType.COZY_FANTASY, SubGenreType.COZY_FANTASY_SUB),
-            (GenreType.FANTASY, SubGenreType.FAIRY_TALE_RETELLING),
-            
-            # Easy non-fiction
-            (GenreType.SELF_HELP, SubGenreType.MOTIVATIONAL),
-            (GenreType.SELF_HELP, SubGenreType.PRODUCTIVITY),
-            (GenreType.COOKING, SubGenreType.COOKING_SUB),
-            (GenreType.TRAVEL, SubGenreType.TRAVEL_GUIDE),
-            
-            # Easy YA
-            (GenreType.YOUNG_ADULT, SubGenreType.YA_CONTEMPORARY),
-            (GenreType.COMING_OF_AGE, SubGenreType.COMING_OF_AGE_SUB),
-        ]
-        
-        return [cls.create_pair(genre, subgenre) for genre, subgenre in ai_friendly_pairs]
+        return list(cls._AI_FRIENDLY_COMBINATIONS)
     
     @classmethod
     def search_combinations(cls, 
@@ -1136,18 +1184,19 @@ class GenreMapping:
                           market_popularity: Optional[str] = None,
                           ai_friendly: bool = False) -> List[GenreSubGenrePair]:
         """Search for combinations based on various criteria."""
-        all_combinations = cls.get_all_combinations()
+        if not ai_friendly:
+            if genre_filter:
+                return list(cls._COMBINATIONS_BY_GENRE.get(genre_filter, ()))
+            return list(cls._ALL_COMBINATIONS)
         
+        # Composite filters: intersect the key sets, then restore canonical order
+        keys = cls._AI_FRIENDLY_KEYS
         if genre_filter:
-            all_combinations = [combo for combo in all_combinations if combo.genre == genre_filter]
-        
-        if ai_friendly:
-            ai_friendly_combos = cls.get_ai_friendly_combinations()
-            ai_friendly_set = {(combo.genre, combo.subgenre) for combo in ai_friendly_combos}
-            all_combinations = [combo for combo in all_combinations 
-                              if (combo.genre, combo.subgenre) in ai_friendly_set]
+            genre_keys = {(genre_filter, subgenre) for subgenre in cls.get_subgenres(genre_filter)}
+            keys = keys & genre_keys
         
-        return all_combinations
+        order = cls._COMBINATION_ORDER
+        return [cls._ALL_COMBINATIONS[index] for index in sorted(order[key] for key in keys)]
     
     @classmethod
     def get_statistics(cls) -> Dict[str, int]:
@@ -1179,6 +1228,9 @@ class GenreMapping:
         pass
 
 
+GenreMapping._build_indexes()
+
+
 # Example usage and testing
 if __name__ == "__main__":
     print("=== Genre Mapping System Demo ===\n")
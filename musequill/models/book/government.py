@@ -2,7 +2,10 @@ from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple, Union
 import re
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class GovernmentType(str, Enum):
     """Types of government systems with comprehensive fantasy and real-world options."""
     
@@ -263,17 +266,55 @@ class GovernmentType(str, Enum):
         cleaned_value = gov_string.strip().lower()
         
         # Direct enum value match first
-        for gov_type in cls:
-            if gov_type.value == cleaned_value:
-                return gov_type
+        gov_type = cls._VALUE_INDEX.get(cleaned_value)
+        if gov_type is not None:
+            return gov_type
         
         # Display name match
-        for gov_type in cls:
-            if gov_type.display_name.lower() == cleaned_value:
-                return gov_type
+        gov_type = cls._DISPLAY_NAME_INDEX.get(cleaned_value)
+        if gov_type is not None:
+            return gov_type
         
         # Restrictive fuzzy matching with precise synonyms
-        fuzzy_mappings = {
+        fuzzy_mappings = cls._fuzzy_aliases
+        
+        # Check fuzzy mappings with exact matches only
+        if cleaned_value in fuzzy_mappings:
+            return fuzzy_mappings[cleaned_value]
+        
+        # Partial word matching - very restrictive
+        for gov_type in cls._MEMBERS:
+            gov_words = gov_type.value.split('_')
+            input_words = cleaned_value.replace('_', ' ').replace('-', ' ').split()
+            
+            # Skip if input is too short or has too many words
+            if len(cleaned_value) < 4 or len(input_words) > 3:
+                continue
+            
+            # Check for meaningful word overlap
+            matched_chars = 0
+            total_input_chars = len(cleaned_value.replace(' ', ''))
+            
+            for input_word in input_words:
+                if len(input_word) >= 4:  # Only consider words 4+ characters
+                    for gov_word in gov_words:
+                        if input_word == gov_word:
+                            matched_chars += len(input_word)
+                        elif len(input_word) >= 5 and len(gov_word) >= 5:
+                            # Very restrictive substring matching
+                            if (input_word in gov_word and len(input_word) >= len(gov_word) * 0.8) or \
+                               (gov_word in input_word and len(gov_word) >= len(input_word) * 0.8):
+                                matched_chars += min(len(input_word), len(gov_word))
+            
+            # Require very substantial match (at least 80% of input should match)
+            if matched_chars > 0 and matched_chars / total_input_chars >= 0.8:
+                return gov_type
+        
+        raise ValueError(f"Invalid government type: '{gov_string}'")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'GovernmentType']:
+        return {
             # Historical terms
             "king": cls.MONARCHY,
             "queen": cls.MONARCHY,
@@ -385,40 +426,6 @@ class GovernmentType(str, Enum):
             "collapse": cls.FAILED_STATE,
             "collapsed": cls.FAILED_STATE,
         }
-        
-        # Check fuzzy mappings with exact matches only
-        if cleaned_value in fuzzy_mappings:
-            return fuzzy_mappings[cleaned_value]
-        
-        # Partial word matching - very restrictive
-        for gov_type in cls:
-            gov_words = gov_type.value.split('_')
-            input_words = cleaned_value.replace('_', ' ').replace('-', ' ').split()
-            
-            # Skip if input is too short or has too many words
-            if len(cleaned_value) < 4 or len(input_words) > 3:
-                continue
-            
-            # Check for meaningful word overlap
-            matched_chars = 0
-            total_input_chars = len(cleaned_value.replace(' ', ''))
-            
-            for input_word in input_words:
-                if len(input_word) >= 4:  # Only consider words 4+ characters
-                    for gov_word in gov_words:
-                        if input_word == gov_word:
-                            matched_chars += len(input_word)
-                        elif len(input_word) >= 5 and len(gov_word) >= 5:
-                            # Very restrictive substring matching
-                            if (input_word in gov_word and len(input_word) >= len(gov_word) * 0.8) or \
-                               (gov_word in input_word and len(gov_word) >= len(input_word) * 0.8):
-                                matched_chars += min(len(input_word), len(gov_word))
-            
-            # Require very substantial match (at least 80% of input should match)
-            if matched_chars > 0 and matched_chars / total_input_chars >= 0.8:
-                return gov_type
-        
-        raise ValueError(f"Invalid government type: '{gov_string}'")
     
     def __str__(self) -> str:
         """String representation using display name."""
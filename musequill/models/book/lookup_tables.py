@@ -0,0 +1,118 @@
+from enum import Enum
+from functools import wraps
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Tuple, Type, TypeVar
+
+
+E = TypeVar("E", bound=Enum)
+
+
+class alias_table:
+    """
+    Class-level lookup table for an Enum, built once and frozen.
+
+    Decorate a builder that takes the enum class and returns a dict (or a
+    list/tuple of pairs). The result is exposed as a read-only attribute, so
+    ``from_string`` can consult ``cls._fuzzy_aliases`` instead of rebuilding a
+    dict literal on every call::
+
+        @alias_table
+        def _fuzzy_aliases(cls) -> Dict[str, 'GenreType']:
+            return {"sci_fi": cls.SCIENCE_FICTION}
+
+    Tables are built eagerly by ``frozen_lookup_tables`` at import time, or
+    lazily on first access for undecorated classes.
+    """
+
+    def __init__(self, builder: Callable[[Type[Enum]], Any]):
+        self.builder = builder
+        self.name = builder.__name__
+        self.__doc__ = builder.__doc__
+        self._tables: Dict[type, Any] = {}
+
+    def build(self, owner: Type[Enum]) -> Any:
+        table = _freeze(self.builder(owner))
+        self._tables[owner] = table
+        return table
+
+    def __get__(self, instance: Any, owner: Type[Enum]) -> Any:
+        table = self._tables.get(owner)
+        if table is None:
+            table = self.build(owner)
+        return table
+
+
+def frozen_lookup_tables(enum_cls: Type[E]) -> Type[E]:
+    """
+    Class decorator that precomputes an Enum's read-only properties.
+
+    Every property defined on the class is evaluated once per member and the
+    results are stored in a tuple indexed by member ordinal; the property is
+    replaced by a lookup into that tuple. Lists are stored as tuples and handed
+    out as fresh lists so callers can still mutate what they receive without
+    corrupting the table.
+
+    The decorator also adds:
+        _MEMBERS: tuple of members in definition order
+        _VALUE_INDEX: frozen mapping of value -> member
+        _DISPLAY_NAME_INDEX: frozen mapping of lower-cased display name -> member
+                             (only when the class defines ``display_name``)
+
+    and builds every ``alias_table`` on the class.
+    """
+    members: Tuple[E, ...] = tuple(enum_cls)
+    for ordinal, member in enumerate(members):
+        member._ordinal_ = ordinal
+
+    for name, attr in list(vars(enum_cls).items()):
+        if type(attr) is property and attr.fset is None:
+            try:
+                values = [attr.fget(member) for member in members]
+            except Exception:
+                # Leave properties that cannot be evaluated for every member alone
+                continue
+            setattr(enum_cls, name, _table_property(attr.fget, values))
+
+    enum_cls._MEMBERS = members
+    enum_cls._VALUE_INDEX = MappingProxyType({member.value: member for member in members})
+
+    if isinstance(vars(enum_cls).get("display_name"), property):
+        display_index: Dict[str, E] = {}
+        for member in members:
+            display_index.setdefault(member.display_name.lower(), member)
+        enum_cls._DISPLAY_NAME_INDEX = MappingProxyType(display_index)
+
+    for attr in list(vars(enum_cls).values()):
+        if isinstance(attr, alias_table):
+            attr.build(enum_cls)
+
+    return enum_cls
+
+
+def _table_property(fget: Callable[[Any], Any], values: list) -> property:
+    """Build a property that reads a precomputed per-member value."""
+    if any(isinstance(value, list) for value in values):
+        table = tuple(tuple(value) if isinstance(value, list) else value for value in values)
+        is_list = tuple(isinstance(value, list) for value in values)
+
+        @wraps(fget)
+        def lookup(self):
+            ordinal = self._ordinal_
+            value = table[ordinal]
+            return list(value) if is_list[ordinal] else value
+    else:
+        table = tuple(values)
+
+        @wraps(fget)
+        def lookup(self):
+            return table[self._ordinal_]
+
+    return property(lookup)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType(dict(value))
+    if isinstance(value, list):
+        return tuple(value)
+    return value
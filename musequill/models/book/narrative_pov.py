@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import List, Dict
 
+from .lookup_tables import frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class NarrativePOV(str, Enum):
     """
     Comprehensive point of view options for narrative writing.
@@ -2,7 +2,10 @@ from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple, Union
 import re
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class PacingStyle(str, Enum):
     """Comprehensive story pacing preferences for different narrative approaches."""
     
@@ -295,17 +298,33 @@ class PacingStyle(str, Enum):
         cleaned_value = pacing_string.strip().lower()
         
         # Direct enum value match first
-        for style in cls:
-            if style.value == cleaned_value:
-                return style
+        style = cls._VALUE_INDEX.get(cleaned_value)
+        if style is not None:
+            return style
         
         # Display name match
-        for style in cls:
-            if style.display_name.lower() == cleaned_value:
-                return style
+        style = cls._DISPLAY_NAME_INDEX.get(cleaned_value)
+        if style is not None:
+            return style
         
         # Fuzzy matching with synonyms
-        fuzzy_mappings = {
+        fuzzy_mappings = cls._fuzzy_aliases
+        
+        # Check fuzzy mappings
+        if cleaned_value in fuzzy_mappings:
+            return fuzzy_mappings[cleaned_value]
+        
+        # Check if any part of the input matches a mapping
+        for key, style in fuzzy_mappings.items():
+            if key in cleaned_value or cleaned_value in key:
+                return style
+        
+        # No match found
+        raise ValueError(f"No matching pacing style found for: {pacing_string}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'PacingStyle']:
+        return {
             # Speed terms
             "fast": cls.FAST_PACED,
             "quick": cls.FAST_PACED,
@@ -361,18 +380,6 @@ class PacingStyle(str, Enum):
             "thoughtful": cls.THOUGHTFUL,
             "reflective": cls.CONTEMPLATIVE,
         }
-        
-        # Check fuzzy mappings
-        if cleaned_value in fuzzy_mappings:
-            return fuzzy_mappings[cleaned_value]
-        
-        # Check if any part of the input matches a mapping
-        for key, style in fuzzy_mappings.items():
-            if key in cleaned_value or cleaned_value in key:
-                return style
-        
-        # No match found
-        raise ValueError(f"No matching pacing style found for: {pacing_string}")
 
     @classmethod
     def get_high_intensity_styles(cls) -> List["PacingStyle"]:
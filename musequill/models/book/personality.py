@@ -2,7 +2,10 @@ from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple, Union
 import re
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class PersonalityTrait(str, Enum):
     """Common personality traits for character development."""
     # Positive Traits
@@ -164,13 +167,23 @@ class PersonalityTrait(str, Enum):
         value_lower = value.lower().strip()
         
         # Direct value matching
-        try:
-            return cls(value_lower)
-        except ValueError:
-            pass
+        member = cls._VALUE_INDEX.get(value_lower)
+        if member is not None:
+            return member
         
         # Fuzzy matching with synonyms
-        mappings = {
+        # Pre-sorted by length for better matching
+        sorted_mappings = cls._aliases_by_length
+        
+        for keyword, trait in sorted_mappings:
+            if keyword in value_lower:
+                return trait
+        
+        raise ValueError(f"Unknown personality trait: {value}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'PersonalityTrait']:
+        return {
             # Positive trait synonyms
             "courageous": cls.BRAVE,
             "fearless": cls.BRAVE,
@@ -258,15 +271,10 @@ class PersonalityTrait(str, Enum):
             "outgoing": cls.EXTROVERTED,
             "social": cls.EXTROVERTED,
         }
-        
-        # Sort by length for better matching
-        sorted_mappings = sorted(mappings.items(), key=lambda x: len(x[0]), reverse=True)
-        
-        for keyword, trait in sorted_mappings:
-            if keyword in value_lower:
-                return trait
-        
-        raise ValueError(f"Unknown personality trait: {value}")
+
+    @alias_table
+    def _aliases_by_length(cls) -> Tuple[Tuple[str, 'PersonalityTrait'], ...]:
+        return sorted(cls._fuzzy_aliases.items(), key=lambda x: len(x[0]), reverse=True)
 
     @classmethod
     def get_positive_traits(cls) -> List['PersonalityTrait']:
@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple, Union
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class PlotType(str, Enum):
     """Comprehensive plot archetypes and story structures for book generation."""
     
@@ -590,12 +593,35 @@ class PlotType(str, Enum):
         normalized_value = value.lower().strip().replace("-", "_").replace(" ", "_")
         
         # Direct match
-        for plot in cls:
-            if plot.value == normalized_value:
-                return plot
+        plot = cls._VALUE_INDEX.get(normalized_value)
+        if plot is not None:
+            return plot
         
         # Fuzzy matching
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        if normalized_value in fuzzy_matches:
+            return fuzzy_matches[normalized_value]
+        
+        # Partial matching
+        for key, plot in fuzzy_matches.items():
+            if key in normalized_value or normalized_value in key:
+                return plot
+        
+        # Check if the normalized value contains any plot as a substring
+        for plot in cls._MEMBERS:
+            if plot.value in normalized_value or normalized_value in plot.value:
+                return plot
+        
+        available_plots = [plot.value for plot in cls]
+        raise ValueError(
+            f"Unknown plot type: '{value}'. "
+            f"Available plots include: {', '.join(sorted(available_plots[:10]))}..."
+        )
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'PlotType']:
+        return {
             # Classic plots
             "monster": cls.OVERCOMING_THE_MONSTER,
             "rags": cls.RAGS_TO_RICHES,
@@ -732,25 +758,6 @@ class PlotType(str, Enum):
             "racial": cls.RACIAL_JUSTICE,
             "economic": cls.ECONOMIC_INEQUALITY,
         }
-        
-        if normalized_value in fuzzy_matches:
-            return fuzzy_matches[normalized_value]
-        
-        # Partial matching
-        for key, plot in fuzzy_matches.items():
-            if key in normalized_value or normalized_value in key:
-                return plot
-        
-        # Check if the normalized value contains any plot as a substring
-        for plot in cls:
-            if plot.value in normalized_value or normalized_value in plot.value:
-                return plot
-        
-        available_plots = [plot.value for plot in cls]
-        raise ValueError(
-            f"Unknown plot type: '{value}'. "
-            f"Available plots include: {', '.join(sorted(available_plots[:10]))}..."
-        )
     
     @classmethod
     def get_plots_for_genre(cls, genre: str) -> List['PlotType']:
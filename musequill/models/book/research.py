@@ -4,7 +4,10 @@ from dataclasses import dataclass, field
 import json
 from datetime import datetime
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class ResearchType(str, Enum):
     """Types of research needed for book generation."""
     
@@ -234,12 +237,35 @@ class ResearchType(str, Enum):
         normalized_value = value.lower().strip().replace("-", "_").replace(" ", "_")
         
         # Direct match
-        for research_type in cls:
-            if research_type.value == normalized_value:
-                return research_type
+        research_type = cls._VALUE_INDEX.get(normalized_value)
+        if research_type is not None:
+            return research_type
         
         # Fuzzy matching
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        if normalized_value in fuzzy_matches:
+            return fuzzy_matches[normalized_value]
+        
+        # Partial matching
+        for key, research_type in fuzzy_matches.items():
+            if key in normalized_value or normalized_value in key:
+                return research_type
+        
+        # Check if the normalized value contains any research type as a substring
+        for research_type in cls._MEMBERS:
+            if research_type.value in normalized_value or normalized_value in research_type.value:
+                return research_type
+        
+        available_types = [rt.value for rt in cls]
+        raise ValueError(
+            f"Unknown research type: '{value}'. "
+            f"Available types include: {', '.join(sorted(available_types[:10]))}..."
+        )
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'ResearchType']:
+        return {
             "history": cls.HISTORICAL,
             "science": cls.SCIENTIFIC,
             "tech": cls.TECHNICAL,
@@ -279,25 +305,6 @@ class ResearchType(str, Enum):
             "entertainment": cls.ENTERTAINMENT,
             "journalism": cls.MEDIA,
         }
-        
-        if normalized_value in fuzzy_matches:
-            return fuzzy_matches[normalized_value]
-        
-        # Partial matching
-        for key, research_type in fuzzy_matches.items():
-            if key in normalized_value or normalized_value in key:
-                return research_type
-        
-        # Check if the normalized value contains any research type as a substring
-        for research_type in cls:
-            if research_type.value in normalized_value or normalized_value in research_type.value:
-                return research_type
-        
-        available_types = [rt.value for rt in cls]
-        raise ValueError(
-            f"Unknown research type: '{value}'. "
-            f"Available types include: {', '.join(sorted(available_types[:10]))}..."
-        )
     
     @classmethod
     def get_types_for_genre(cls, genre: str) -> List['ResearchType']:
@@ -2,7 +2,10 @@ from enum import Enum
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class StoryStructure(str, Enum):
     """Enhanced story structure types for AI book generation."""
     
@@ -226,12 +229,35 @@ class StoryStructure(str, Enum):
         normalized_value = value.lower().strip().replace("-", "_").replace(" ", "_")
         
         # Direct match
-        for structure in cls:
-            if structure.value == normalized_value:
-                return structure
+        structure = cls._VALUE_INDEX.get(normalized_value)
+        if structure is not None:
+            return structure
         
         # Fuzzy matching
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        if normalized_value in fuzzy_matches:
+            return fuzzy_matches[normalized_value]
+        
+        # Partial matching
+        for key, structure in fuzzy_matches.items():
+            if key in normalized_value or normalized_value in key:
+                return structure
+        
+        # Check if the normalized value contains any structure as a substring
+        for structure in cls._MEMBERS:
+            if structure.value in normalized_value or normalized_value in structure.value:
+                return structure
+        
+        available_structures = [s.value for s in cls]
+        raise ValueError(
+            f"Unknown story structure: '{value}'. "
+            f"Available structures: {', '.join(sorted(available_structures[:10]))}..."
+        )
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'StoryStructure']:
+        return {
             # Common variations
             "three_act": cls.THREE_ACT,
             "3_act": cls.THREE_ACT,
@@ -264,25 +290,6 @@ class StoryStructure(str, Enum):
             "experimental": cls.EXPERIMENTAL,
             "custom": cls.CUSTOM,
         }
-        
-        if normalized_value in fuzzy_matches:
-            return fuzzy_matches[normalized_value]
-        
-        # Partial matching
-        for key, structure in fuzzy_matches.items():
-            if key in normalized_value or normalized_value in key:
-                return structure
-        
-        # Check if the normalized value contains any structure as a substring
-        for structure in cls:
-            if structure.value in normalized_value or normalized_value in structure.value:
-                return structure
-        
-        available_structures = [s.value for s in cls]
-        raise ValueError(
-            f"Unknown story structure: '{value}'. "
-            f"Available structures: {', '.join(sorted(available_structures[:10]))}..."
-        )
     
     @classmethod
     def get_structures_for_genre(cls, genre: str) -> List['StoryStructure']:
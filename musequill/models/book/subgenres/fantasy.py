@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import Dict, List
 
+from ..lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class FantasySubGenre(str, Enum):
     """Fantasy subgenres optimized for AI book generation and market demand."""
     
@@ -86,12 +89,21 @@ class FantasySubGenre(str, Enum):
         value_lower = value.lower().strip().replace(" ", "_").replace("-", "_")
         
         # Direct match
-        for subgenre in cls:
-            if subgenre.value == value_lower:
-                return subgenre
+        subgenre = cls._VALUE_INDEX.get(value_lower)
+        if subgenre is not None:
+            return subgenre
         
         # Fuzzy matching
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        if value_lower in fuzzy_matches:
+            return fuzzy_matches[value_lower]
+        
+        raise ValueError(f"Unknown fantasy subgenre: {value}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'FantasySubGenre']:
+        return {
             "high": cls.HIGH_FANTASY,
             "urban": cls.URBAN_FANTASY,
             "dark": cls.DARK_FANTASY,
@@ -105,11 +117,6 @@ class FantasySubGenre(str, Enum):
             "retelling": cls.FAIRY_TALE_RETELLING,
             "sword": cls.SWORD_AND_SORCERY
         }
-        
-        if value_lower in fuzzy_matches:
-            return fuzzy_matches[value_lower]
-        
-        raise ValueError(f"Unknown fantasy subgenre: {value}")
     
     @classmethod
     def get_trending_subgenres(cls) -> List['FantasySubGenre']:
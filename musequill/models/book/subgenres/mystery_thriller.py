@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import Dict, List
 
+from ..lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class MysteryThrillerSubGenre(str, Enum):
     """Mystery and Thriller subgenres optimized for AI book generation."""
     
@@ -111,12 +114,21 @@ class MysteryThrillerSubGenre(str, Enum):
         value_lower = value.lower().strip().replace(" ", "_").replace("-", "_")
         
         # Direct match
-        for subgenre in cls:
-            if subgenre.value == value_lower:
-                return subgenre
+        subgenre = cls._VALUE_INDEX.get(value_lower)
+        if subgenre is not None:
+            return subgenre
         
         # Fuzzy matching
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        if value_lower in fuzzy_matches:
+            return fuzzy_matches[value_lower]
+        
+        raise ValueError(f"Unknown mystery/thriller subgenre: {value}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'MysteryThrillerSubGenre']:
+        return {
             "cozy": cls.COZY_MYSTERY,
             "police": cls.POLICE_PROCEDURAL,
             "detective": cls.DETECTIVE_FICTION,
@@ -128,11 +140,6 @@ class MysteryThrillerSubGenre(str, Enum):
             "spy": cls.SPY_THRILLER,
             "medical": cls.MEDICAL_THRILLER
         }
-        
-        if value_lower in fuzzy_matches:
-            return fuzzy_matches[value_lower]
-        
-        raise ValueError(f"Unknown mystery/thriller subgenre: {value}")
     
     @classmethod
     def get_trending_subgenres(cls) -> List['MysteryThrillerSubGenre']:
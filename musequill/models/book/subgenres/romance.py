@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import Dict, List
 
+from ..lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class RomanceSubGenre(str, Enum):
     """Romance subgenres optimized for AI book generation and market demand."""
     
@@ -69,12 +72,21 @@ class RomanceSubGenre(str, Enum):
         value_lower = value.lower().strip().replace(" ", "_").replace("-", "_")
         
         # Direct match
-        for subgenre in cls:
-            if subgenre.value == value_lower:
-                return subgenre
+        subgenre = cls._VALUE_INDEX.get(value_lower)
+        if subgenre is not None:
+            return subgenre
         
         # Fuzzy matching
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        if value_lower in fuzzy_matches:
+            return fuzzy_matches[value_lower]
+        
+        raise ValueError(f"Unknown romance subgenre: {value}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'RomanceSubGenre']:
+        return {
             "contemporary": cls.CONTEMPORARY_ROMANCE,
             "historical": cls.HISTORICAL_ROMANCE,
             "paranormal": cls.PARANORMAL_ROMANCE,
@@ -86,11 +98,6 @@ class RomanceSubGenre(str, Enum):
             "enemies": cls.ENEMIES_TO_LOVERS,
             "second_chance": cls.SECOND_CHANCE_ROMANCE
         }
-        
-        if value_lower in fuzzy_matches:
-            return fuzzy_matches[value_lower]
-        
-        raise ValueError(f"Unknown romance subgenre: {value}")
     
     @classmethod
     def get_trending_subgenres(cls) -> List['RomanceSubGenre']:
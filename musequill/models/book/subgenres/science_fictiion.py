@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import Dict, List
 
+from ..lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class ScienceFictionSubGenre(str, Enum):
     """Science Fiction subgenres optimized for AI book generation."""
     
@@ -106,12 +109,21 @@ class ScienceFictionSubGenre(str, Enum):
         value_lower = value.lower().strip().replace(" ", "_").replace("-", "_")
         
         # Direct match
-        for subgenre in cls:
-            if subgenre.value == value_lower:
-                return subgenre
+        subgenre = cls._VALUE_INDEX.get(value_lower)
+        if subgenre is not None:
+            return subgenre
         
         # Fuzzy matching
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        if value_lower in fuzzy_matches:
+            return fuzzy_matches[value_lower]
+        
+        raise ValueError(f"Unknown science fiction subgenre: {value}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'ScienceFictionSubGenre']:
+        return {
             "space": cls.SPACE_OPERA,
             "opera": cls.SPACE_OPERA,
             "cyber": cls.CYBERPUNK,
@@ -128,11 +140,6 @@ class ScienceFictionSubGenre(str, Enum):
             "climate": cls.CLI_FI,
             "climate_fiction": cls.CLI_FI
         }
-        
-        if value_lower in fuzzy_matches:
-            return fuzzy_matches[value_lower]
-        
-        raise ValueError(f"Unknown science fiction subgenre: {value}")
     
     @classmethod
     def get_trending_subgenres(cls) -> List['ScienceFictionSubGenre']:
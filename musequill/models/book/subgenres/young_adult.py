@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import Dict, List
 
+from ..lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class YoungAdultSubGenre(str, Enum):
     """Young Adult subgenres optimized for AI book generation."""
     
@@ -104,12 +107,21 @@ class YoungAdultSubGenre(str, Enum):
             value_lower = "ya_" + value_lower[12:]
         
         # Direct match
-        for subgenre in cls:
-            if subgenre.value == value_lower:
-                return subgenre
+        subgenre = cls._VALUE_INDEX.get(value_lower)
+        if subgenre is not None:
+            return subgenre
         
         # Fuzzy matching
-        fuzzy_matches = {
+        fuzzy_matches = cls._fuzzy_aliases
+        
+        if value_lower in fuzzy_matches:
+            return fuzzy_matches[value_lower]
+        
+        raise ValueError(f"Unknown young adult subgenre: {value}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'YoungAdultSubGenre']:
+        return {
             "fantasy": cls.YA_FANTASY,
             "romance": cls.YA_ROMANCE,
             "dystopian": cls.YA_DYSTOPIAN,
@@ -121,11 +133,6 @@ class YoungAdultSubGenre(str, Enum):
             "paranormal": cls.YA_PARANORMAL,
             "historical": cls.YA_HISTORICAL
         }
-        
-        if value_lower in fuzzy_matches:
-            return fuzzy_matches[value_lower]
-        
-        raise ValueError(f"Unknown young adult subgenre: {value}")
     
     @classmethod
     def get_trending_subgenres(cls) -> List['YoungAdultSubGenre']:
@@ -2,7 +2,10 @@ from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple
 import re
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class TechnologyLevel(str, Enum):
     """Technology advancement levels for storytelling contexts."""
     
@@ -299,17 +302,59 @@ class TechnologyLevel(str, Enum):
         cleaned_value = value.strip().lower()
         
         # Direct match first
-        for tech_level in cls:
-            if tech_level.value == cleaned_value:
-                return tech_level
+        tech_level = cls._VALUE_INDEX.get(cleaned_value)
+        if tech_level is not None:
+            return tech_level
         
         # Display name match
-        for tech_level in cls:
-            if tech_level.display_name.lower() == cleaned_value:
-                return tech_level
+        tech_level = cls._DISPLAY_NAME_INDEX.get(cleaned_value)
+        if tech_level is not None:
+            return tech_level
         
         # Fuzzy matching with synonyms and common terms
-        fuzzy_mappings = {
+        fuzzy_mappings = cls._fuzzy_aliases
+        
+        # Check fuzzy mappings - require more precise matches
+        for key, tech_level in fuzzy_mappings.items():
+            # Exact match or cleaned_value is a word within the key (for multi-word keys)
+            if (key == cleaned_value or 
+                (len(key.split()) > 1 and cleaned_value in key.split()) or
+                # Allow key to be found in cleaned_value only if it's a substantial part
+                (len(key) >= 4 and key in cleaned_value and len(key) >= len(cleaned_value) * 0.6)):
+                return tech_level
+        
+        # Partial word matching - balanced approach  
+        for tech_level in cls._MEMBERS:
+            tech_words = tech_level.value.split('_')
+            input_words = cleaned_value.replace('_', ' ').replace('-', ' ').split()
+            
+            # Check for meaningful word overlap
+            matched_chars = 0
+            total_input_chars = len(cleaned_value.replace(' ', ''))
+            
+            # Skip if input is too short or too long compared to tech level value
+            if total_input_chars < 3 or total_input_chars > len(tech_level.value) * 2:
+                continue
+                
+            for input_word in input_words:
+                if len(input_word) > 2:  # Consider words longer than 2 characters
+                    for tech_word in tech_words:
+                        if input_word == tech_word:
+                            matched_chars += len(input_word)
+                        elif len(input_word) >= 4 and input_word in tech_word:
+                            matched_chars += len(input_word)
+                        elif len(tech_word) >= 4 and tech_word in input_word and len(tech_word) >= 4:
+                            matched_chars += len(tech_word)
+            
+            # Require substantial match (at least 60% of input should match)
+            if matched_chars > 0 and matched_chars / total_input_chars >= 0.6:
+                return tech_level
+        
+        raise ValueError(f"Invalid technology level: '{value}'")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'TechnologyLevel']:
+        return {
             # Historical periods
             "stone": cls.STONE_AGE,
             "caveman": cls.STONE_AGE,
@@ -392,44 +437,6 @@ class TechnologyLevel(str, Enum):
             "post-scarcity": cls.POST_SCARCITY,
             "postscarcity": cls.POST_SCARCITY,
         }
-        
-        # Check fuzzy mappings - require more precise matches
-        for key, tech_level in fuzzy_mappings.items():
-            # Exact match or cleaned_value is a word within the key (for multi-word keys)
-            if (key == cleaned_value or 
-                (len(key.split()) > 1 and cleaned_value in key.split()) or
-                # Allow key to be found in cleaned_value only if it's a substantial part
-                (len(key) >= 4 and key in cleaned_value and len(key) >= len(cleaned_value) * 0.6)):
-                return tech_level
-        
-        # Partial word matching - balanced approach  
-        for tech_level in cls:
-            tech_words = tech_level.value.split('_')
-            input_words = cleaned_value.replace('_', ' ').replace('-', ' ').split()
-            
-            # Check for meaningful word overlap
-            matched_chars = 0
-            total_input_chars = len(cleaned_value.replace(' ', ''))
-            
-            # Skip if input is too short or too long compared to tech level value
-            if total_input_chars < 3 or total_input_chars > len(tech_level.value) * 2:
-                continue
-                
-            for input_word in input_words:
-                if len(input_word) > 2:  # Consider words longer than 2 characters
-                    for tech_word in tech_words:
-                        if input_word == tech_word:
-                            matched_chars += len(input_word)
-                        elif len(input_word) >= 4 and input_word in tech_word:
-                            matched_chars += len(input_word)
-                        elif len(tech_word) >= 4 and tech_word in input_word and len(tech_word) >= 4:
-                            matched_chars += len(tech_word)
-            
-            # Require substantial match (at least 60% of input should match)
-            if matched_chars > 0 and matched_chars / total_input_chars >= 0.6:
-                return tech_level
-        
-        raise ValueError(f"Invalid technology level: '{value}'")
 
     @classmethod
     def get_historical_levels(cls) -> List['TechnologyLevel']:
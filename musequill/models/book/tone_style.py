@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple, Union
 
+from .lookup_tables import frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class ToneStyle(str, Enum):
     """Comprehensive emotional and stylistic tones for book writing."""
     
@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import List, Dict, Any, Optional
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class WorldType(str, Enum):
     """Types of fictional worlds with comprehensive world-building characteristics."""
     
@@ -620,14 +623,28 @@ class WorldType(str, Enum):
         value_lower = value.lower().strip()
         
         # Direct value matching
-        try:
-            return cls(value_lower)
-        except ValueError:
-            pass
+        member = cls._VALUE_INDEX.get(value_lower)
+        if member is not None:
+            return member
         
         # Fuzzy matching with common synonyms and variations
         # Order matters - more specific matches should come first
-        mappings = {
+        mappings = cls._fuzzy_aliases
+        
+        # Check for partial matches, starting with most specific
+        # Special handling for "magic realism" vs "realism" conflict
+        if "magic" in value_lower and "realism" in value_lower:
+            return cls.MAGICAL_REALISM
+            
+        for keyword, world_type in mappings.items():
+            if keyword in value_lower:
+                return world_type
+        
+        raise ValueError(f"Unknown world type: {value}")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'WorldType']:
+        return {
             # Multi-word specific matches first
             "magic realism": cls.MAGICAL_REALISM,
             "magical realism": cls.MAGICAL_REALISM,
@@ -751,17 +768,6 @@ class WorldType(str, Enum):
             "environmental": cls.CLIMATE_FICTION,
             "space": cls.SPACE_OPERA,
         }
-        
-        # Check for partial matches, starting with most specific
-        # Special handling for "magic realism" vs "realism" conflict
-        if "magic" in value_lower and "realism" in value_lower:
-            return cls.MAGICAL_REALISM
-            
-        for keyword, world_type in mappings.items():
-            if keyword in value_lower:
-                return world_type
-        
-        raise ValueError(f"Unknown world type: {value}")
 
     @classmethod
     def get_fantasy_types(cls) -> List['WorldType']:
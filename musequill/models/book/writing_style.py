@@ -2,7 +2,10 @@ from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple, Union
 import re
 
+from .lookup_tables import alias_table, frozen_lookup_tables
 
+
+@frozen_lookup_tables
 class WritingStyle(str, Enum):
     """Comprehensive writing styles for different types of book content and audiences."""
     
@@ -439,17 +442,55 @@ class WritingStyle(str, Enum):
         cleaned_value = style_string.strip().lower()
         
         # Direct enum value match first
-        for style in cls:
-            if style.value == cleaned_value:
-                return style
+        style = cls._VALUE_INDEX.get(cleaned_value)
+        if style is not None:
+            return style
         
         # Display name match
-        for style in cls:
-            if style.display_name.lower() == cleaned_value:
-                return style
+        style = cls._DISPLAY_NAME_INDEX.get(cleaned_value)
+        if style is not None:
+            return style
         
         # Restrictive fuzzy matching with precise synonyms
-        fuzzy_mappings = {
+        fuzzy_mappings = cls._fuzzy_aliases
+        
+        # Check fuzzy mappings with exact matches only
+        if cleaned_value in fuzzy_mappings:
+            return fuzzy_mappings[cleaned_value]
+        
+        # Partial word matching - very restrictive
+        for style in cls._MEMBERS:
+            style_words = style.value.split('_')
+            input_words = cleaned_value.replace('_', ' ').replace('-', ' ').split()
+            
+            # Skip if input is too short or has too many words
+            if len(cleaned_value) < 4 or len(input_words) > 3:
+                continue
+            
+            # Check for meaningful word overlap
+            matched_chars = 0
+            total_input_chars = len(cleaned_value.replace(' ', ''))
+            
+            for input_word in input_words:
+                if len(input_word) >= 4:  # Only consider words 4+ characters
+                    for style_word in style_words:
+                        if input_word == style_word:
+                            matched_chars += len(input_word)
+                        elif len(input_word) >= 5 and len(style_word) >= 5:
+                            # Very restrictive substring matching
+                            if (input_word in style_word and len(input_word) >= len(style_word) * 0.8) or \
+                               (style_word in input_word and len(style_word) >= len(input_word) * 0.8):
+                                matched_chars += min(len(input_word), len(style_word))
+            
+            # Require very substantial match (at least 80% of input should match)
+            if matched_chars > 0 and matched_chars / total_input_chars >= 0.8:
+                return style
+        
+        raise ValueError(f"Invalid writing style: '{style_string}'")
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'WritingStyle']:
+        return {
             # Academic terms
             "academic": cls.ACADEMIC,
             "scholarly": cls.SCHOLARLY,
@@ -603,40 +644,6 @@ class WritingStyle(str, Enum):
             "spiritual": cls.SPIRITUAL,
             "religious": cls.SPIRITUAL,
         }
-        
-        # Check fuzzy mappings with exact matches only
-        if cleaned_value in fuzzy_mappings:
-            return fuzzy_mappings[cleaned_value]
-        
-        # Partial word matching - very restrictive
-        for style in cls:
-            style_words = style.value.split('_')
-            input_words = cleaned_value.replace('_', ' ').replace('-', ' ').split()
-            
-            # Skip if input is too short or has too many words
-            if len(cleaned_value) < 4 or len(input_words) > 3:
-                continue
-            
-            # Check for meaningful word overlap
-            matched_chars = 0
-            total_input_chars = len(cleaned_value.replace(' ', ''))
-            
-            for input_word in input_words:
-                if len(input_word) >= 4:  # Only consider words 4+ characters
-                    for style_word in style_words:
-                        if input_word == style_word:
-                            matched_chars += len(input_word)
-                        elif len(input_word) >= 5 and len(style_word) >= 5:
-                            # Very restrictive substring matching
-                            if (input_word in style_word and len(input_word) >= len(style_word) * 0.8) or \
-                               (style_word in input_word and len(style_word) >= len(input_word) * 0.8):
-                                matched_chars += min(len(input_word), len(style_word))
-            
-            # Require very substantial match (at least 80% of input should match)
-            if matched_chars > 0 and matched_chars / total_input_chars >= 0.8:
-                return style
-        
-        raise ValueError(f"Invalid writing style: '{style_string}'")
 
     @classmethod
     def get_academic_styles(cls) -> List['WritingStyle']:
@@ -0,0 +1,512 @@
+"""
+Multi-book batch runner.
+
+Runs the planning pipeline of ``main.py main`` (summary, book plan, research,
+book DNA, chapter plan) for every template in a manifest, sharing one set of
+warmed-up LLM services, one context manager and one researcher across books.
+
+Books move through the stages independently, so while one book waits on web
+search another can be using the GPU. Each stage has its own concurrency limit
+(backpressure), a cap on books in flight keeps memory bounded, and a per-book
+progress report is rewritten after every stage transition.
+
+Usage:
+    python main.py batch --manifest manifest.json [--pool-size 2] [--max-books 4]
+
+Manifest:
+    {"templates": ["bunny", {"template": "romance", "copies": 2}]}
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, TYPE_CHECKING
+from uuid import uuid4
+
+from musequill.services.backend.llm.scheduler import Priority, request_scope
+from musequill.services.backend.utils.payloads import extract_json_from_response
+
+if TYPE_CHECKING:
+    from musequill.services.backend.llm import LLMService
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+DEFAULT_OUTPUT_ROOT = Path("musequill/services/backend/outputs/batch")
+WARMUP_PROMPT = "Reply with OK."
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+# ----------------------------
+# Jobs and manifest
+# ----------------------------
+
+@dataclass
+class BookJob:
+    """One book in the batch and everything produced for it so far."""
+    template: str
+    template_data: Dict[str, Any]
+    book_id: str = field(default_factory=lambda: str(uuid4()))
+    output_path: Optional[Path] = None
+    artifacts: Dict[str, Any] = field(default_factory=dict)
+    status: str = QUEUED
+    stage: Optional[str] = None
+    completed: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_report(self) -> Dict[str, Any]:
+        return {
+            "template": self.template,
+            "book_id": self.book_id,
+            "status": self.status,
+            "stage": self.stage,
+            "completed": list(self.completed),
+            "timings": {k: round(v, 2) for k, v in self.timings.items()},
+            "output_path": str(self.output_path) if self.output_path else None,
+            "error": self.error,
+        }
+
+
+def load_manifest(manifest_path: Path, templates_dir: Path = TEMPLATES_DIR) -> List[BookJob]:
+    """
+    Read a manifest and load each template it names.
+
+    The manifest is a JSON list, or an object with a "templates" list; each
+    entry is a template name or {"template": name, "copies": n}.
+
+    Raises:
+        FileNotFoundError: If a named template does not exist
+        ValueError: If the manifest has no usable entries
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    entries = manifest.get("templates", []) if isinstance(manifest, dict) else manifest
+
+    jobs: List[BookJob] = []
+    for entry in entries or []:
+        name = entry if isinstance(entry, str) else entry.get("template")
+        copies = 1 if isinstance(entry, str) else int(entry.get("copies", 1))
+        if not name:
+            continue
+        template_path = templates_dir / f"{name}.json"
+        if not template_path.exists():
+            raise FileNotFoundError(f"Template file '{template_path}' not found")
+        with open(template_path, "r", encoding="utf-8") as f:
+            template_data = json.load(f)
+        jobs.extend(BookJob(template=name, template_data=template_data) for _ in range(copies))
+
+    if not jobs:
+        raise ValueError(f"Manifest '{manifest_path}' lists no templates")
+    return jobs
+
+
+# ----------------------------
+# Shared resources
+# ----------------------------
+
+class LLMPool:
+    """
+    Fixed set of initialised LLM services shared by every book.
+
+    LLMService keeps its sampling parameters on the instance, so concurrent
+    stages each lease their own service instead of sharing one. All services
+    talk to the same Ollama model, which is loaded once by ``start``.
+
+    Args:
+        factory: Creates an uninitialised LLMService
+        size: Number of services, i.e. the most LLM calls in flight at once
+    """
+
+    def __init__(self, factory: Callable[[], "LLMService"], size: int = 2):
+        if size < 1:
+            raise ValueError("LLM pool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self._idle: Optional[asyncio.Queue] = None
+
+    async def start(self, warm_up: bool = True) -> None:
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            service = self.factory()
+            await service.initialize()
+            self._idle.put_nowait(service)
+        if warm_up:
+            async with self.lease() as service:
+                # Loads the model weights before the first book needs them
+                await service.generate(WARMUP_PROMPT, max_tokens=1)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator["LLMService"]:
+        if self._idle is None:
+            raise RuntimeError("LLM pool is not started")
+        service = await self._idle.get()
+        try:
+            yield service
+        finally:
+            self._idle.put_nowait(service)
+
+
+class BatchResources:
+    """
+    Connections shared across the batch: the LLM pool, the context manager and the researcher.
+
+    The researcher is created on first use (creating it resets its Chroma
+    collection, which used to happen once per book) and is used by one book
+    at a time because it keeps per-run dedup state.
+    """
+
+    def __init__(
+        self,
+        llm_pool: LLMPool,
+        output_root: Path = DEFAULT_OUTPUT_ROOT,
+        ctx_mgr: Any = None,
+        researcher_factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.llm_pool = llm_pool
+        self.output_root = Path(output_root)
+        self.ctx_mgr = ctx_mgr
+        self.researcher_factory = researcher_factory
+        self._researcher: Any = None
+        self._research_lock = asyncio.Lock()
+
+    @classmethod
+    async def create(
+        cls,
+        pool_size: int = 2,
+        output_root: Path = DEFAULT_OUTPUT_ROOT,
+        with_context: bool = True,
+    ) -> "BatchResources":
+        from musequill.services.backend.llm import create_llm_service
+
+        pool = LLMPool(create_llm_service, pool_size)
+        await pool.start()
+        ctx_mgr = None
+        if with_context:
+            from musequill.services.backend.integration import create_llm_context_manager
+            ctx_mgr = await create_llm_context_manager()
+
+        def researcher_factory():
+            from musequill.services.backend.researcher import ResearcherAgent, ResearcherConfig
+            return ResearcherAgent(ResearcherConfig())
+
+        return cls(pool, output_root, ctx_mgr, researcher_factory)
+
+    def llm(self):
+        return self.llm_pool.lease()
+
+    async def research(self, book_id: str, queries: Sequence[Any]) -> Dict[str, Any]:
+        async with self._research_lock:
+            if self._researcher is None:
+                self._researcher = self.researcher_factory()
+            # Sources seen for another book must not be filtered out of this one
+            self._researcher.content_hashes.clear()
+            self._researcher.processed_urls.clear()
+            return await self._researcher.execute_research(book_id, list(queries))
+
+    async def store(self, job: BookJob, content_id: str, content: str) -> None:
+        if self.ctx_mgr is None:
+            return
+        flag = await self.ctx_mgr.store(
+            book_id=job.book_id,
+            metadata=job.artifacts["book_model"],
+            as_vector=False,
+            content_id=content_id,
+            content=content,
+        )
+        if not flag:
+            raise RuntimeError(f"Failed to store {content_id}")
+
+
+# ----------------------------
+# Stages
+# ----------------------------
+
+StageFn = Callable[[BookJob, BatchResources], Awaitable[None]]
+
+
+@dataclass
+class Stage:
+    """A pipeline step and how many books may run it at once."""
+    name: str
+    run: StageFn
+    limit: int = 1
+
+
+def _write(job: BookJob, filename: str, content: Any) -> None:
+    path = job.output_path / filename
+    with open(path, "w", encoding="utf-8") as f:
+        if isinstance(content, str):
+            f.write(content)
+        else:
+            json.dump(content, f, indent=2, ensure_ascii=False)
+
+
+def _response_text(response: Dict[str, Any], what: str) -> str:
+    if "error" in response:
+        raise RuntimeError(f"{what} generation failed: {response['error']}")
+    return response["response"]
+
+
+async def model_stage(job: BookJob, resources: BatchResources) -> None:
+    from musequill.services.backend.model.book import BookModelType
+
+    book_model = BookModelType(**job.template_data)
+    job.artifacts["book_model"] = book_model
+    job.output_path = resources.output_root / f"{job.template}-{job.book_id}"
+    job.output_path.mkdir(parents=True, exist_ok=True)
+    _write(job, "book_model.json", book_model.model_dump())
+
+
+async def summary_stage(job: BookJob, resources: BatchResources) -> None:
+    from musequill.services.backend.prompts import BookSummaryPromptGenerator
+
+    book_model = job.artifacts["book_model"]
+    bspg = BookSummaryPromptGenerator()
+    book_data = book_model.model_dump()
+    prompt = bspg.generate_prompt(book_data)
+    settings = bspg.get_prompt_statistics(prompt, book_data).get("recommended_model_settings") or {}
+
+    async with resources.llm() as llm:
+        await llm.update_default_parameters(
+            temperature=settings.get("temperature", 0.7),
+            max_tokens=settings.get("max_tokens", 5000),
+            top_p=settings.get("top_p", 0.5),
+            top_k=settings.get("top_k", 40),
+            repeat_penalty=settings.get("repeat_penalty", 1.1),
+            stop=settings.get("stop"),
+        )
+        summary = _response_text(await llm.generate(prompt), "Book summary")
+
+    job.artifacts["book_summary"] = summary
+    _write(job, "book_summary.md", summary)
+    await resources.store(job, "book_summary", summary)
+
+
+async def book_plan_stage(job: BookJob, resources: BatchResources) -> None:
+    from musequill.services.backend.prompts import BookPlanConfig, BookPlanPromptGenerator
+
+    book_model = job.artifacts["book_model"]
+    generator = BookPlanPromptGenerator(BookPlanConfig(include_examples=True, detail_level="comprehensive"))
+    prompt = generator.generate_BookPlan_prompt(book_model, job.artifacts["book_summary"])
+    settings = generator.get_prompt_stats(prompt).get("recommended_model_settings")
+
+    async with resources.llm() as llm:
+        if settings:
+            await llm.update_default_parameters(**settings)
+        text = _response_text(await llm.generate(prompt), "Book plan")
+
+    book_plan = extract_json_from_response(text)
+    if book_plan is None:
+        raise ValueError("Book plan response is not JSON")
+    job.artifacts["book_plan"] = book_plan
+    _write(job, "book_plan.json", book_plan)
+    await resources.store(job, "book_plan", json.dumps(book_plan))
+
+
+async def research_stage(job: BookJob, resources: BatchResources) -> None:
+    from musequill.services.backend.prompts import ResearchPromptGenerator
+    from musequill.services.backend.researcher import ResearchQuery
+
+    prompt = ResearchPromptGenerator.generate_prompt(
+        job.artifacts["book_model"], job.artifacts["book_summary"], job.artifacts["book_plan"]
+    )
+    async with resources.llm() as llm:
+        await llm.update_default_parameters(temperature=0.1, max_tokens=5000, top_p=0.5)
+        text = _response_text(await llm.generate(prompt), "Research query")
+    queries = extract_json_from_response(text)
+    if queries is None:
+        raise ValueError("Research query response is not JSON")
+    _write(job, "research-query.json", queries)
+
+    # Web search and embedding run without holding an LLM lease
+    results = await resources.research(job.book_id, ResearchQuery.load_research_queries(json.dumps(queries)))
+    research: Dict[str, List[str]] = {}
+    for query_type, result_list in results.get("detailed_results", {}).items():
+        research[query_type] = [
+            f"{sr.title}: {sr.content}" for result in result_list for sr in result.search_results
+        ]
+    job.artifacts["research"] = research
+    _write(job, "research-results.json", research)
+    await resources.store(job, "research_results", json.dumps(research))
+
+
+async def dna_stage(job: BookJob, resources: BatchResources) -> None:
+    from musequill.services.backend.prompts import BookDNAInputs, BookDNAPromptGenerator
+
+    research = job.artifacts["research"]
+    dna_input = BookDNAInputs(
+        book_model=job.artifacts["book_model"],
+        book_blueprint=job.artifacts["book_plan"],
+        research_topics=[(k, v[0]) for k, v in research.items() if v],
+        book_summary=job.artifacts["book_summary"],
+        book_id=job.book_id,
+    )
+    prompt = BookDNAPromptGenerator.generate_dna_prompt(dna_input)
+    async with resources.llm() as llm:
+        await llm.update_default_parameters(
+            temperature=1.3, max_tokens=800, top_k=10, top_p=0.9, repeat_penalty=1.1
+        )
+        book_dna = _response_text(await llm.generate(prompt), "Book DNA")
+
+    job.artifacts["book_dna"] = book_dna
+    _write(job, "book-dna.md", book_dna)
+    await resources.store(job, "book_dna", book_dna)
+
+
+async def chapter_plan_stage(job: BookJob, resources: BatchResources) -> None:
+    from musequill.services.backend.writers import generate_chapter_plan
+
+    async with resources.llm() as llm:
+        chapter_plan = await generate_chapter_plan(
+            ctx_mgr=resources.ctx_mgr,
+            llm_service=llm,
+            book_model=job.artifacts["book_model"],
+            book_id=job.book_id,
+            output_path=job.output_path,
+            book_dna=job.artifacts["book_dna"],
+            blueprint=job.artifacts["book_plan"],
+            book_summary=job.artifacts["book_summary"],
+            research_data=job.artifacts["research"],
+        )
+    if chapter_plan is None:
+        raise RuntimeError("Chapter planning failed")
+    job.artifacts["chapter_plan"] = chapter_plan
+    _write(job, "chapter-plan.json", chapter_plan.model_dump_json(indent=2, exclude_none=True))
+
+
+def default_stages(llm_slots: int = 2) -> List[Stage]:
+    """The ``main`` pipeline; LLM-bound stages may together use every pool slot."""
+    return [
+        Stage("model", model_stage, limit=8),
+        Stage("summary", summary_stage, limit=llm_slots),
+        Stage("book_plan", book_plan_stage, limit=llm_slots),
+        Stage("research", research_stage, limit=2),
+        Stage("dna", dna_stage, limit=llm_slots),
+        Stage("chapter_plan", chapter_plan_stage, limit=1),
+    ]
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+
+class BatchRunner:
+    """
+    Drive many books through the stages concurrently.
+
+    Each book runs its stages in order; different books overlap freely, subject
+    to each stage's limit. ``max_active_books`` bounds how many books have
+    started but not finished. A failing book is reported and the rest go on.
+
+    Args:
+        jobs: Books to produce
+        stages: Pipeline steps, in order
+        resources: Shared services passed to every stage
+        max_active_books: Books in flight at once
+        report_path: Where the progress report is rewritten (optional)
+    """
+
+    def __init__(
+        self,
+        jobs: Sequence[BookJob],
+        stages: Sequence[Stage],
+        resources: BatchResources,
+        max_active_books: int = 4,
+        report_path: Optional[Path] = None,
+    ):
+        self.jobs = list(jobs)
+        self.stages = list(stages)
+        self.resources = resources
+        self.max_active_books = max(1, max_active_books)
+        self.report_path = Path(report_path) if report_path else None
+        self.started_at: Optional[float] = None
+
+    async def run(self) -> List[BookJob]:
+        self.started_at = time.perf_counter()
+        admission = asyncio.Semaphore(self.max_active_books)
+        limits = {stage.name: asyncio.Semaphore(max(1, stage.limit)) for stage in self.stages}
+        self._write_report()
+        await asyncio.gather(*(self._run_book(job, admission, limits) for job in self.jobs))
+        self._write_report()
+        return self.jobs
+
+    async def _run_book(self, job: BookJob, admission: asyncio.Semaphore,
+                        limits: Dict[str, asyncio.Semaphore]) -> None:
+        # LLM calls for this book queue as batch work, taking turns with the other books
+        with request_scope(Priority.BATCH, book_id=job.book_id):
+            await self._run_stages(job, admission, limits)
+
+    async def _run_stages(self, job: BookJob, admission: asyncio.Semaphore,
+                          limits: Dict[str, asyncio.Semaphore]) -> None:
+        async with admission:
+            job.status = RUNNING
+            for stage in self.stages:
+                async with limits[stage.name]:
+                    job.stage = stage.name
+                    self._write_report()
+                    start = time.perf_counter()
+                    try:
+                        await stage.run(job, self.resources)
+                    except Exception as e:
+                        job.timings[stage.name] = time.perf_counter() - start
+                        job.status = FAILED
+                        job.error = f"{stage.name}: {e}"
+                        logger.error(f"🔴  {job.template} ({job.book_id}) failed at {stage.name}: {e}")
+                        self._write_report()
+                        return
+                    job.timings[stage.name] = time.perf_counter() - start
+                    job.completed.append(stage.name)
+                    logger.info(f"✅  {job.template} ({job.book_id}) {stage.name} "
+                                f"in {job.timings[stage.name]:.1f}s")
+            job.status = DONE
+            job.stage = None
+            self._write_report()
+
+    def report(self) -> Dict[str, Any]:
+        counts = {s: sum(1 for j in self.jobs if j.status == s) for s in (QUEUED, RUNNING, DONE, FAILED)}
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        return {
+            "elapsed": round(elapsed, 2),
+            "stages": [stage.name for stage in self.stages],
+            "counts": counts,
+            "books": [job.to_report() for job in self.jobs],
+        }
+
+    def _write_report(self) -> None:
+        if self.report_path is None:
+            return
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.report_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        tmp.replace(self.report_path)
+
+
+async def run_batch(
+    manifest_path: Path,
+    pool_size: int = 2,
+    max_active_books: int = 4,
+    output_root: Path = DEFAULT_OUTPUT_ROOT,
+    report_path: Optional[Path] = None,
+) -> List[BookJob]:
+    """Load the manifest, warm the shared services once and run every book."""
+    jobs = load_manifest(manifest_path)
+    resources = await BatchResources.create(pool_size, output_root)
+    runner = BatchRunner(
+        jobs,
+        default_stages(pool_size),
+        resources,
+        max_active_books=max_active_books,
+        report_path=report_path or Path(output_root) / "batch-report.json",
+    )
+    return await runner.run()
@@ -1,31 +1,19 @@
-from .content_parser import (
-    ParsedContent,
-    create_content_parser,
-    ContentParser,
-    BookContentParser,
-    SimpleContentParser
-)
+from musequill.services.backend.lazy_exports import lazy_exports
 
-from .llm_context_manager import (
-    LLMContextManager
-)
+# Exported name -> submodule that defines it; submodules load on first access
+_EXPORTS = {
+    "ParsedContent":             ".content_parser",
+    "create_content_parser":     ".content_parser",
+    "ContentParser":             ".content_parser",
+    "BookContentParser":         ".content_parser",
+    "SimpleContentParser":       ".content_parser",
+    "LLMContextManager":         ".llm_context_manager",
+    "MetadataGenerator":         ".metadata_generator",
+    "create_metadata_generator": ".metadata_generator",
+    "SimpleMetadataGenerator":   ".metadata_generator",
+    "MetadataPromptConfig":      ".metadata_generator",
+}
 
-from .metadata_generator import (
-    MetadataGenerator,
-    create_metadata_generator,
-    SimpleMetadataGenerator,
-    MetadataPromptConfig
-)
+__all__ = list(_EXPORTS)
 
-__all__ = [
-    "ParsedContent",
-    "create_content_parser",
-    "ContentParser",
-    "BookContentParser",
-    "SimpleContentParser",
-    "LLMContextManager",
-    "MetadataGenerator",
-    "create_metadata_generator",
-    "SimpleMetadataGenerator",
-    "MetadataPromptConfig"
-]
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -32,6 +32,7 @@ from musequill.models.book.conflict import ConflictType
 from musequill.models.book.narrative_pov import NarrativePOV
 from musequill.models.book.pacing_style import PacingStyle
 from musequill.models.book.tone_style import ToneStyle
+from musequill.services.backend.llm.scheduler import Priority, request_scope
 
 
 logger = logging.getLogger(__name__)
@@ -249,7 +250,9 @@ class LLMMetadataGenerator(MetadataGenerator):
         # Execute LLM call with retries
         for attempt in range(self.config.retry_attempts):
             try:
-                response = await self._call_llm(prompt)
+                # Background work: queues behind interactive and pipeline calls
+                with request_scope(Priority.BATCH, book_id=book_id):
+                    response = await self._call_llm(prompt)
                 parsed_metadata = self._extract_json_from_response(response)
                 
                 if parsed_metadata:
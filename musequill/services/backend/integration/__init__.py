@@ -1,6 +1,13 @@
-from .context_manager import (
-    LLMContextManager,
-    create_local_manager,
-    create_production_manager,
-    create_llm_context_manager
-)
\ No newline at end of file
+from musequill.services.backend.lazy_exports import lazy_exports
+
+# Exported name -> submodule that defines it; submodules load on first access
+_EXPORTS = {
+    "LLMContextManager":          ".context_manager",
+    "create_local_manager":       ".context_manager",
+    "create_production_manager":  ".context_manager",
+    "create_llm_context_manager": ".context_manager",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
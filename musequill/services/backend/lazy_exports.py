@@ -0,0 +1,55 @@
+"""
+Lazy package exports.
+
+Backend packages re-export their public names from ``__init__.py``. Importing
+those submodules eagerly pulls in LangChain, Tavily, ChromaDB and friends even
+when a caller only needs a config class or a pydantic model. ``lazy_exports``
+builds a module-level ``__getattr__``/``__dir__`` pair so that each submodule
+is imported the first time one of its names is accessed:
+
+    _EXPORTS = {
+        "ResearcherAgent": ".researcher_agent",
+        "ResearcherConfig": ".researcher_agent_config",
+    }
+
+    __all__ = list(_EXPORTS)
+    __getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+``from package import Name`` keeps working and only loads the module that
+defines ``Name``.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str,
+    exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build ``__getattr__`` and ``__dir__`` for a package with lazy exports.
+
+    Args:
+        package: The package's ``__name__``
+        exports: Mapping of exported name -> relative module that defines it
+
+    Returns:
+        Tuple of (``__getattr__``, ``__dir__``) to assign at module level
+    """
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module_name, package), name)
+        # Cache on the package so __getattr__ is not hit again for this name
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
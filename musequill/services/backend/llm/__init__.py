@@ -1,12 +1,16 @@
-from .ollama_config import OllamaConfig
+from musequill.services.backend.lazy_exports import lazy_exports
 
-from .ollama_client import (
-    create_llm_service,
-    LLMService
-)
+# Exported name -> submodule that defines it; submodules load on first access
+_EXPORTS = {
+    "OllamaConfig":       ".ollama_config",
+    "LLMService":         ".ollama_client",
+    "create_llm_service": ".ollama_client",
+    "EndpointPool":       ".endpoint_pool",
+    "LLMScheduler":       ".scheduler",
+    "Priority":           ".scheduler",
+    "request_scope":      ".scheduler",
+}
 
-__all__ = [
-    "OllamaConfig",
-    "LLMService",
-    "create_llm_service"
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,135 @@
+"""
+Per-request num_ctx / num_predict sizing for Ollama from the measured prompt
+"""
+
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Context windows are rounded up to these, so consecutive calls of similar
+# size ask for the same num_ctx and Ollama keeps the loaded runner
+CTX_BUCKETS = (2048, 4096, 8192, 16384, 32768)
+MAX_NUM_CTX = 32768
+# Room left for the response when the caller sets no num_predict
+DEFAULT_RESPONSE_RESERVE = 4096
+# A loaded context this many times larger than needed is given up for a smaller one
+SHRINK_FACTOR = 4
+
+# Characters per token before any calibration; prose under llama-family
+# tokenizers runs around 4, so this errs towards a larger window
+DEFAULT_CHARS_PER_TOKEN = 3.5
+# Estimated counts get this margin; exact counts need none
+ESTIMATE_MARGIN = 1.05
+# prompt_eval_count drops when Ollama reuses a cached prefix; ratios outside
+# this band are not a clean measurement and are ignored
+_PLAUSIBLE_CHARS_PER_TOKEN = (2.0, 6.0)
+
+
+class PromptTokenCounter:
+    """
+    Counts prompt tokens for sizing.
+
+    With ``tokenizer_name`` set (a Hugging Face tokenizer id matching the
+    served model) and the optional ``tokenizers`` package installed, counts
+    are exact. Otherwise the count is an estimate from characters per token,
+    calibrated after every call against the prompt_eval_count Ollama reports
+    from the model's own tokenizer.
+    """
+
+    def __init__(self, tokenizer_name: str = "", chars_per_token: float = DEFAULT_CHARS_PER_TOKEN):
+        self.chars_per_token = chars_per_token
+        self.samples = 0
+        self._tokenizer = None
+        if tokenizer_name:
+            try:
+                from tokenizers import Tokenizer
+                self._tokenizer = Tokenizer.from_pretrained(tokenizer_name)
+            except ImportError:
+                logger.warning("tokenizers package not installed - estimating prompt tokens")
+            except Exception as e:
+                logger.warning(f"🟡  Could not load tokenizer {tokenizer_name!r} ({e}) - estimating prompt tokens")
+
+    @property
+    def exact(self) -> bool:
+        return self._tokenizer is not None
+
+    def count(self, text: str) -> int:
+        if self._tokenizer is not None:
+            return len(self._tokenizer.encode(text or "").ids)
+        return math.ceil(len(text or "") / self.chars_per_token * ESTIMATE_MARGIN)
+
+    def calibrate(self, text: str, measured_tokens: Optional[int]) -> None:
+        """Fold in the prompt_eval_count Ollama reported for ``text``."""
+        if self._tokenizer is not None or not measured_tokens or measured_tokens <= 0:
+            return
+        ratio = len(text or "") / measured_tokens
+        lo, hi = _PLAUSIBLE_CHARS_PER_TOKEN
+        if not lo <= ratio <= hi:
+            return
+        # Running mean for the first few calls, then an exponential average
+        self.samples += 1
+        weight = max(1 / self.samples, 0.2)
+        self.chars_per_token += weight * (ratio - self.chars_per_token)
+
+
+@dataclass
+class ContextSize:
+    """Sizes chosen for one request."""
+    num_ctx: int
+    num_predict: Optional[int]
+    prompt_tokens: int
+    exact: bool
+    warnings: List[str] = field(default_factory=list)
+
+
+class ContextSizer:
+    """
+    Picks num_ctx for each request: the smallest bucket holding the prompt
+    plus the response budget, never below the caller's own num_ctx and never
+    above ``max_ctx``.
+
+    The window in use is kept while it still fits and is less than
+    SHRINK_FACTOR times too large, so a run of calls with slightly different
+    prompts does not reload the model. When even ``max_ctx`` cannot hold the
+    prompt and the requested num_predict, the response budget is cut to fit
+    and the cut is reported. Ollama would otherwise truncate silently.
+    """
+
+    def __init__(
+        self,
+        counter: Optional[PromptTokenCounter] = None,
+        max_ctx: int = MAX_NUM_CTX,
+        buckets: Sequence[int] = CTX_BUCKETS,
+        response_reserve: int = DEFAULT_RESPONSE_RESERVE,
+    ):
+        self.counter = counter or PromptTokenCounter()
+        self.max_ctx = max_ctx
+        self.buckets = tuple(b for b in sorted(buckets) if b <= max_ctx) or (max_ctx,)
+        self.response_reserve = response_reserve
+        self.current: Optional[int] = None
+
+    def size(self, prompt: str, num_predict: Optional[int] = None, min_ctx: Optional[int] = None) -> ContextSize:
+        tokens = self.counter.count(prompt)
+        predict = num_predict if num_predict and num_predict > 0 else None
+        needed = max(tokens + (predict or self.response_reserve), min(min_ctx or 0, self.max_ctx))
+
+        num_ctx = next((b for b in self.buckets if b >= needed), self.buckets[-1])
+        current = self.current
+        if current is not None and needed <= current <= self.max_ctx and current < num_ctx * SHRINK_FACTOR:
+            num_ctx = max(num_ctx, current)
+
+        warnings: List[str] = []
+        if tokens >= num_ctx:
+            warnings.append(f"prompt of ~{tokens} tokens exceeds num_ctx {num_ctx}; Ollama will truncate it")
+        elif predict is not None and tokens + predict > num_ctx:
+            warnings.append(f"num_predict {predict} cut to {num_ctx - tokens} to fit the ~{tokens}-token "
+                            f"prompt in num_ctx {num_ctx}; the response may be truncated")
+            predict = num_ctx - tokens
+        for warning in warnings:
+            logger.warning(f"🟡  {warning}")
+
+        self.current = num_ctx
+        return ContextSize(num_ctx, predict, tokens, self.counter.exact, warnings)
@@ -0,0 +1,257 @@
+"""
+Pool of Ollama endpoints: least-outstanding routing with model affinity,
+health probing, circuit breaking and retry on another node
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_URL = "http://localhost:11434"
+# Consecutive transport failures that open a node's circuit, and for how long
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 30.0
+PROBE_TIMEOUT = 2.0
+# Seconds between /api/ps probes of every node, for pools of more than one
+HEALTH_CHECK_INTERVAL = 15.0
+# A node that already holds the model keeps its requests until it has this
+# many more in flight than the least busy node; loading a 70B model elsewhere
+# costs far more than queueing behind a couple of requests
+AFFINITY_SLACK = 2
+
+_CONNECT_ERRORS = {"ConnectError", "ConnectTimeout"}  # httpx, used by the ollama client
+
+
+class NoEndpointAvailable(RuntimeError):
+    """Every endpoint in the pool was tried for this request."""
+
+
+def endpoint_urls(default: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Endpoints from OLLAMA_BASE_URLS (comma-separated), else ``default``,
+    else OLLAMA_BASE_URL, else the local Ollama.
+    """
+    listed = [u.strip().rstrip("/") for u in os.getenv("OLLAMA_BASE_URLS", "").split(",") if u.strip()]
+    if listed:
+        return tuple(dict.fromkeys(listed))
+    return ((default or os.getenv("OLLAMA_BASE_URL") or DEFAULT_URL).rstrip("/"),)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Whether ``exc`` means the node failed (so another node may succeed), not the request.
+
+    Only errors from before a node took the request count: an error status,
+    or failing to connect. A read timeout means the node accepted the request
+    and is still generating, so resending it would start the whole generation
+    again elsewhere.
+    """
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status >= 500 or status == 429
+    # requests' ConnectionError covers ConnectTimeout but not ReadTimeout;
+    # the builtin covers refused/reset sockets but not TimeoutError
+    if isinstance(exc, (requests.ConnectionError, ConnectionError)):
+        return True
+    return any(cls.__name__ in _CONNECT_ERRORS for cls in type(exc).__mro__)
+
+
+@dataclass
+class Endpoint:
+    url: str
+    outstanding: int = 0
+    models: Set[str] = field(default_factory=set)  # loaded, as far as the pool knows
+    failures: int = 0                               # consecutive
+    open_until: float = 0.0                         # circuit open (skipped) until then
+    served: int = 0
+
+    def available(self, now: float) -> bool:
+        return self.open_until <= now
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"url": self.url, "outstanding": self.outstanding, "models": sorted(self.models),
+                "failures": self.failures, "open": self.open_until > time.monotonic(), "served": self.served}
+
+
+class EndpointPool:
+    """
+    Routes requests for a model across Ollama endpoints.
+
+    Each request goes to the node with the fewest requests in flight,
+    preferring nodes that already have the model loaded (within
+    ``affinity_slack``). A node's loaded models are learned from the requests
+    it serves and from ``probe`` (``/api/ps``). After ``failure_threshold``
+    consecutive transport failures a node's circuit opens for ``cooldown``
+    seconds. Once the cooldown passes it takes traffic again, and one more
+    failure re-opens it. ``call``/``acall`` retry a failed request on
+    another node. With a single endpoint the pool only does bookkeeping.
+
+    One pool per set of URLs is shared by every caller (``shared_pool``),
+    so in-flight counts cover the whole process. A shared pool of several
+    nodes probes them every ``HEALTH_CHECK_INTERVAL`` seconds.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown: float = COOLDOWN_SECONDS,
+        affinity_slack: int = AFFINITY_SLACK,
+        probe_timeout: float = PROBE_TIMEOUT,
+    ):
+        self.endpoints: List[Endpoint] = [Endpoint(u.rstrip("/")) for u in dict.fromkeys(urls)]
+        if not self.endpoints:
+            raise ValueError("EndpointPool needs at least one URL")
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.affinity_slack = affinity_slack
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    # ---- routing ----
+
+    def choose(self, model: str, exclude: Iterable[str] = ()) -> Endpoint:
+        """
+        Raises:
+            NoEndpointAvailable: If every endpoint is in ``exclude``
+        """
+        excluded = set(exclude)
+        candidates = [e for e in self.endpoints if e.url not in excluded]
+        if not candidates:
+            raise NoEndpointAvailable(f"all {len(self.endpoints)} Ollama endpoints failed")
+        now = time.monotonic()
+        # With every circuit open, try the node that has been resting longest rather than fail outright
+        live = [e for e in candidates if e.available(now)] or [min(candidates, key=lambda e: e.open_until)]
+        least = min(e.outstanding for e in live)
+        warm = [e for e in live if model in e.models and e.outstanding <= least + self.affinity_slack]
+        return min(warm or live, key=lambda e: (e.outstanding, e.served))
+
+    @contextmanager
+    def lease(self, model: str, exclude: Iterable[str] = ()) -> Iterator[Endpoint]:
+        """Pick an endpoint and count the request against it until the block exits."""
+        with self._lock:
+            endpoint = self.choose(model, exclude)
+            endpoint.outstanding += 1
+        try:
+            yield endpoint
+        except BaseException as e:
+            with self._lock:
+                if is_retryable(e):
+                    self._record_failure(endpoint, e)
+                else:
+                    endpoint.failures = 0
+            raise
+        else:
+            with self._lock:
+                endpoint.failures = 0
+                endpoint.served += 1
+                endpoint.models.add(model)
+        finally:
+            with self._lock:
+                endpoint.outstanding -= 1
+
+    def call(self, model: str, fn: Callable[[str], T], retries: Optional[int] = None) -> T:
+        """``fn(base_url)`` on a chosen endpoint, retried on other nodes after node failures."""
+        tried: List[str] = []
+        while True:
+            try:
+                with self.lease(model, tried) as endpoint:
+                    return fn(endpoint.url)
+            except NoEndpointAvailable:
+                raise
+            except Exception as e:
+                if not self._retry(e, endpoint, tried, retries):
+                    raise
+
+    async def acall(self, model: str, fn: Callable[[str], Awaitable[T]], retries: Optional[int] = None) -> T:
+        """Async ``call``."""
+        tried: List[str] = []
+        while True:
+            try:
+                with self.lease(model, tried) as endpoint:
+                    return await fn(endpoint.url)
+            except NoEndpointAvailable:
+                raise
+            except Exception as e:
+                if not self._retry(e, endpoint, tried, retries):
+                    raise
+
+    def _retry(self, error: Exception, endpoint: Endpoint, tried: List[str], retries: Optional[int]) -> bool:
+        """Whether to try another node after ``endpoint`` failed; records it as tried."""
+        attempts = len(self.endpoints) if retries is None else min(len(self.endpoints), retries + 1)
+        if not is_retryable(error) or len(tried) + 1 >= attempts:
+            return False
+        tried.append(endpoint.url)
+        logger.warning(f"🟡  Ollama at {endpoint.url} failed ({error}); retrying on another node")
+        return True
+
+    def _record_failure(self, endpoint: Endpoint, error: BaseException) -> None:
+        endpoint.failures += 1
+        if endpoint.failures >= self.failure_threshold:
+            endpoint.open_until = time.monotonic() + self.cooldown
+            endpoint.models.clear()
+            logger.warning(f"🔴  Ollama at {endpoint.url} failed {endpoint.failures} times ({error}); "
+                           f"skipping it for {self.cooldown:.0f}s")
+
+    # ---- health ----
+
+    def probe(self, endpoint: Endpoint) -> bool:
+        """Ask ``endpoint`` which models it has loaded; a failed probe counts as a failure."""
+        try:
+            r = requests.get(f"{endpoint.url}/api/ps", timeout=self.probe_timeout)
+            r.raise_for_status()
+            models = {m.get("name") or m.get("model") for m in r.json().get("models", [])}
+        except Exception as e:
+            with self._lock:
+                self._record_failure(endpoint, e)
+            return False
+        with self._lock:
+            endpoint.models = {m for m in models if m}
+            endpoint.failures = 0
+            endpoint.open_until = 0.0
+        return True
+
+    def probe_all(self) -> Dict[str, bool]:
+        return {e.url: self.probe(e) for e in self.endpoints}
+
+    def start_health_checks(self, interval: float = HEALTH_CHECK_INTERVAL) -> threading.Thread:
+        """Probe every endpoint every ``interval`` seconds on a daemon thread (once per pool)."""
+        if self._health_thread is None:
+            def run():
+                while True:
+                    self.probe_all()
+                    time.sleep(interval)
+
+            self._health_thread = threading.Thread(target=run, name="ollama-health", daemon=True)
+            self._health_thread.start()
+        return self._health_thread
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [e.to_dict() for e in self.endpoints]
+
+
+@lru_cache(maxsize=None)
+def shared_pool(urls: Tuple[str, ...]) -> EndpointPool:
+    """The process-wide pool for ``urls``; with several nodes it probes them in the background."""
+    pool = EndpointPool(urls)
+    if len(pool) > 1:
+        pool.start_health_checks()
+    return pool
@@ -1,16 +1,33 @@
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
 import json
 import time
 # Import langchain and ollama
 from langchain_ollama import OllamaLLM
 from langchain.schema import BaseMessage, HumanMessage, SystemMessage
 
+from musequill.services.backend.utils.payloads import JsonStreamScanner
+
+from .context_sizing import ContextSize, ContextSizer, PromptTokenCounter
+from .endpoint_pool import shared_pool
 from .ollama_config import OllamaConfig
+from .scheduler import Priority, scheduled, shared_scheduler
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Configured OllamaLLM instances kept per service (parameter sets x endpoints)
+_MAX_CACHED_LLMS = 8
+
+
+def _prompt_text(prompt: Union[str, Sequence[str]]) -> str:
+    """One prompt string; callers also pass ``[prompt]`` (list items are joined by newlines)."""
+    if isinstance(prompt, str):
+        return prompt
+    return "\n".join(str(part) for part in prompt)
+
 # ============================================================================
 # LLM Service Integration
 # ============================================================================
@@ -34,6 +51,21 @@ class LLMService:
         self.seed: int = 42
         self.stop: Optional[str] = None
         self.llm: Optional[OllamaLLM] = None
+        self._init_params: Dict[str, Any] = {}
+        # Per-request num_ctx/num_predict from the measured prompt (see context_sizing)
+        self.auto_context_sizing: bool = ollama_config.auto_context_sizing
+        self.sizer = ContextSizer(
+            PromptTokenCounter(ollama_config.tokenizer_name),
+            max_ctx=ollama_config.max_num_ctx,
+        )
+        # Configured LLM instances by parameters, most recent last
+        self._sized_llms: Dict[tuple, OllamaLLM] = {}
+        # Requests are routed across OLLAMA_BASE_URLS; a single URL behaves as before
+        self.pool = shared_pool(ollama_config.endpoint_urls)
+        # Calls queue by priority class and book (see scheduler); None sends them straight through
+        slots = ollama_config.scheduler_slots
+        self.scheduler = shared_scheduler(slots) if slots > 0 else None
+        self.priority: Priority = Priority.PIPELINE
 
     # ----------------------------
     # String / Debug Representations
@@ -91,6 +123,8 @@ class LLMService:
             init_params.update(kwargs)
 
             self.llm = OllamaLLM(**init_params)
+            self._init_params = init_params
+            self._sized_llms.clear()
             logger.info(
                 f"✅  LLM service initialized with params: {init_params}"
             )
@@ -101,7 +135,7 @@ class LLMService:
 
     async def generate(
         self, 
-        prompt: str, 
+        prompt: Union[str, Sequence[str]], 
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         top_p: Optional[float] = None
@@ -110,7 +144,7 @@ class LLMService:
         Generate response from LLM with optional parameter overrides.
         
         Args:
-            prompt: The input prompt
+            prompt: The input prompt (a list of strings is joined into one)
             temperature: Override temperature for this request
             max_tokens: Override max_tokens for this request  
             top_p: Override top_p for this request
@@ -122,63 +156,65 @@ class LLMService:
             if not self.llm:
                 logger.error("🔴 LLM is not initialized")
                 raise RuntimeError("LLM is not initialized")
+            prompt = _prompt_text(prompt)
             
             # Use per-request parameters if provided, otherwise use instance defaults
             request_temperature = temperature if temperature is not None else self.temperature
             request_max_tokens = max_tokens if max_tokens is not None else self.max_tokens
             request_top_p = top_p if top_p is not None else self.top_p
             
-            # For per-request parameter changes, we need to update the LLM instance
-            # Note: langchain-ollama might not support dynamic parameter changes
-            # In that case, you might need to create a new instance or use the Ollama API directly
             if (request_temperature != self.temperature or 
                 request_max_tokens != self.max_tokens or 
                 request_top_p != self.top_p):
-                
                 logger.info(f"🟢  Using custom parameters for this request: "
                            f"temperature={request_temperature}, "
                            f"max_tokens={request_max_tokens}, "
                            f"top_p={request_top_p}")
-                
-                # Create temporary LLM instance with custom parameters
-                temp_params = {
-                    "model": self.model_name,
-                    "base_url": self.base_url,
-                    "temperature": request_temperature,
-                    "top_p": request_top_p
-                }
-                
-                if request_max_tokens is not None:
-                    temp_params["num_predict"] = request_max_tokens
-                
-                temp_llm = OllamaLLM(**temp_params)
-                llm_to_use = temp_llm
-            else:
-                llm_to_use = self.llm
-            
-            # Start timing
-            start_time = time.perf_counter()
-            response = await asyncio.to_thread(llm_to_use.invoke, prompt)
-            end_time = time.perf_counter()
-            
-            # Calculate elapsed time in seconds
-            elapsed_time = end_time - start_time
+
+            sizing = self._size_request(prompt, request_max_tokens)
+
+            async def run(base_url: str):
+                llm = self._llm_for(
+                    base_url=base_url,
+                    temperature=request_temperature,
+                    top_p=request_top_p,
+                    num_predict=sizing.num_predict if sizing else request_max_tokens,
+                    num_ctx=sizing.num_ctx if sizing else None,
+                )
+                return llm, await asyncio.to_thread(llm.generate, [prompt])
+
+            # Elapsed time excludes the wait for a scheduler slot
+            (llm_to_use, result), queue_wait, elapsed_time = await self._dispatch(run)
+
+            generation = result.generations[0][0]
+            # Ollama's final stream message: token counts and why generation stopped
+            info = generation.generation_info or {}
+            self.sizer.counter.calibrate(prompt, info.get("prompt_eval_count"))
+            truncated = info.get("done_reason") == "length"
+            if truncated:
+                logger.warning(f"🟡  Response stopped at num_predict={llm_to_use.num_predict} "
+                               f"({info.get('eval_count')} tokens); it is probably truncated")
             
             return {
-                "response": response,
+                "response": generation.text,
                 "timelapse": elapsed_time,
                 "parameters_used": {
-                    "base_url": self.base_url,
+                    "base_url": llm_to_use.base_url,
                     "model": self.model_name,
                     "temperature": request_temperature,
                     "max_tokens": request_max_tokens,
                     "top_p": request_top_p,
                     "top_k": self.top_k,
-                    "num_ctx": self.num_ctx,
-                    "num_predict": self.num_predict,
+                    "num_ctx": llm_to_use.num_ctx,
+                    "num_predict": llm_to_use.num_predict,
                     "seed": self.seed,
                     "repeat_penalty": self.repeat_penalty,
-                    "stop": self.stop
+                    "stop": self.stop,
+                    **self._sizing_report(sizing),
+                    "prompt_eval_count": info.get("prompt_eval_count"),
+                    "eval_count": info.get("eval_count"),
+                    "truncated": truncated,
+                    "queue_wait": queue_wait
                 }
             }
             
@@ -193,6 +229,65 @@ class LLMService:
                 "error": str(e)
             }
     
+    async def generate_json(self, prompt: Union[str, Sequence[str]], opening: str = "{") -> Dict[str, Any]:
+        """
+        Stream a response and stop as soon as the first top-level JSON value closes.
+
+        Args:
+            prompt: The input prompt (a list of strings is joined into one)
+            opening: Characters that may start the JSON value ("{", "[" or "{[")
+
+        Returns:
+            Dict containing the raw response, the parsed value under "json"
+            (None if no complete value was produced) and timing metadata
+        """
+        try:
+            if not self.llm:
+                logger.error("🔴 LLM is not initialized")
+                raise RuntimeError("LLM is not initialized")
+            prompt = _prompt_text(prompt)
+
+            sizing = self._size_request(prompt, self.max_tokens)
+
+            async def run(base_url: str):
+                llm = self._llm_for(
+                    base_url=base_url,
+                    num_predict=sizing.num_predict if sizing else None,
+                    num_ctx=sizing.num_ctx if sizing else None,
+                )
+                scanner = JsonStreamScanner(opening)
+                chunks: List[str] = []
+                async for chunk in llm.astream(prompt):
+                    chunks.append(chunk)
+                    scanner.feed(chunk)
+                    if scanner.complete:
+                        # Leaving the stream closes it, which stops generation
+                        break
+                scanner.finish()
+                return llm, scanner, chunks
+
+            (llm_to_use, scanner, chunks), queue_wait, elapsed_time = await self._dispatch(run)
+
+            return {
+                "response": "".join(chunks),
+                "json": scanner.value if scanner.complete else None,
+                "stopped_early": scanner.complete,
+                "timelapse": elapsed_time,
+                "parameters_used": {
+                    "base_url": llm_to_use.base_url,
+                    "num_ctx": llm_to_use.num_ctx,
+                    "num_predict": llm_to_use.num_predict,
+                    **self._sizing_report(sizing),
+                    "queue_wait": queue_wait
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"🔴  Error in JSON generation: {e}")
+            return {
+                "error": str(e)
+            }
+
     async def update_default_parameters(
         self, 
         *args,
@@ -228,9 +323,11 @@ class LLMService:
         if repeat_penalty is not None:
             self.repeat_penalty = repeat_penalty
         if num_ctx is not None:
-            self.num_ctx = min(32768, num_ctx)
+            # With automatic sizing this is a floor; each request still gets a window that fits
+            self.num_ctx = min(self.sizer.max_ctx, num_ctx)
         if num_predict is not None:
-            self.num_predict = min(4096, num_predict)
+            # Automatic sizing fits num_predict to the window per request instead of a fixed cap
+            self.num_predict = num_predict if self.auto_context_sizing else min(4096, num_predict)
         if stop is not None:
             self.stop = stop
         if seed is not None:
@@ -249,6 +346,56 @@ class LLMService:
                    f"max_tokens={self.max_tokens}, top_p={self.top_p}, num_prodict={self.num_predict}, seed={self.seed},"
                    f"top_k={self.top_k}, num_ctx={self.num_ctx} repeat_penalty={self.repeat_penalty}, stop={self.stop}")
     
+    async def _dispatch(self, run: Callable[[str], Awaitable[T]]) -> Tuple[T, float, float]:
+        """
+        ``run(base_url)`` through the scheduler and the endpoint pool.
+
+        Returns:
+            The result, seconds queued for a slot and seconds in service
+        """
+        queued_at = started = time.perf_counter()
+
+        async def call() -> T:
+            nonlocal started
+            started = time.perf_counter()
+            return await self.pool.acall(self.model_name, run)
+
+        result = await scheduled(self.scheduler, call, self.priority)
+        return result, started - queued_at, time.perf_counter() - started
+
+    def _size_request(self, prompt: str, num_predict: Optional[int]) -> Optional[ContextSize]:
+        """num_ctx/num_predict for ``prompt``, or None when automatic sizing is off."""
+        if not self.auto_context_sizing:
+            return None
+        return self.sizer.size(prompt, num_predict or self.num_predict, min_ctx=self.num_ctx)
+
+    @staticmethod
+    def _sizing_report(sizing: Optional[ContextSize]) -> Dict[str, Any]:
+        if sizing is None:
+            return {}
+        return {
+            "prompt_tokens": sizing.prompt_tokens,
+            "prompt_tokens_exact": sizing.exact,
+            "sizing_warnings": sizing.warnings
+        }
+
+    def _llm_for(self, **overrides: Any) -> OllamaLLM:
+        """
+        The initialized LLM, or one configured with ``overrides`` (None values
+        keep the defaults). Recent instances are reused while the overrides
+        stay the same, which with bucketed num_ctx and a few endpoints is
+        most calls.
+        """
+        params = {**self._init_params, **{k: v for k, v in overrides.items() if v is not None}}
+        if params == self._init_params:
+            return self.llm
+        key = tuple(sorted((k, repr(v)) for k, v in params.items()))
+        llm = self._sized_llms.pop(key, None) or OllamaLLM(**params)
+        self._sized_llms[key] = llm
+        if len(self._sized_llms) > _MAX_CACHED_LLMS:
+            del self._sized_llms[next(iter(self._sized_llms))]
+        return llm
+
     def get_current_parameters(self) -> Dict[str, Any]:
         """Get the current parameter configuration."""
         return {
@@ -263,6 +410,8 @@ class LLMService:
             "repeat_penalty": self.repeat_penalty,
             "seed": self.seed,
             "stop": self.stop,
+            "endpoints": self.pool.stats(),
+            "scheduler": self.scheduler.stats() if self.scheduler else None,
             "is_initialized": self.llm is not None
         }
     
@@ -3,7 +3,7 @@ Configuration management for the ollama client
 """
 
 from pydantic import Field
-from typing import List
+from typing import List, Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -21,18 +21,61 @@ class OllamaConfig(BaseSettings):
         description="Ollama server base URL"
     )
 
+    base_urls: str = Field(
+        default="",
+        validation_alias="OLLAMA_BASE_URLS",
+        description="Comma-separated Ollama endpoints to balance requests across; empty uses base_url"
+    )
+
     model_name: str = Field(
         default="llama3.3:70b",
         validation_alias="OLLAMA_MODEL_NAME",
         description="Ollama model"
     )
 
+    screening_model_name: str = Field(
+        default="",
+        validation_alias="OLLAMA_SCREENING_MODEL_NAME",
+        description="Small, fast model for first-pass chapter critique; empty disables that tier"
+    )
+
+    auto_context_sizing: bool = Field(
+        default=True,
+        validation_alias="OLLAMA_AUTO_CONTEXT_SIZING",
+        description="Size num_ctx/num_predict per request from the measured prompt"
+    )
+
+    max_num_ctx: int = Field(
+        default=32768,
+        validation_alias="OLLAMA_MAX_NUM_CTX",
+        description="Largest context window requested from Ollama"
+    )
+
+    tokenizer_name: str = Field(
+        default="",
+        validation_alias="OLLAMA_TOKENIZER",
+        description="Hugging Face tokenizer id for exact prompt counts (needs `tokenizers`); empty estimates"
+    )
+
+    scheduler_slots: int = Field(
+        default=0,
+        validation_alias="OLLAMA_SCHEDULER_SLOTS",
+        description="LLM calls sent to Ollama at once, by priority (this process only); "
+                    "0 sends every call straight through. Set to OLLAMA_NUM_PARALLEL x endpoints"
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         extra="ignore"
     )
 
+    @property
+    def endpoint_urls(self) -> Tuple[str, ...]:
+        """Endpoints requests are routed across, in configured order."""
+        urls = [u.strip().rstrip("/") for u in self.base_urls.split(",") if u.strip()]
+        return tuple(dict.fromkeys(urls)) or (self.base_url.rstrip("/"),)
+
     def __str__(self) -> str:
         """User-friendly string (for print)."""
         return f"OllamaConfig(base_url={self.base_url}, model_name={self.model_name})"
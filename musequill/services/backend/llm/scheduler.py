@@ -0,0 +1,350 @@
+"""
+Priority scheduler for LLM calls: priority classes with concurrency caps,
+round-robin between books within a class, deadlines, cancellation and
+queue-wait / service-time metrics
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# LLM calls sent to Ollama at once, across every endpoint; match OLLAMA_NUM_PARALLEL x endpoints
+DEFAULT_SLOTS = 2
+# Scheduling is opt-in: OLLAMA_SCHEDULER_SLOTS unset or 0 sends every call straight through
+ENV_DEFAULT_SLOTS = 0
+# Queue-wait and service-time samples kept per class for the percentiles
+METRIC_WINDOW = 1000
+
+
+class Priority(IntEnum):
+    """Request classes, most urgent first."""
+    INTERACTIVE = 0   # a user is waiting: wizard suggestions
+    PIPELINE = 1      # book generation: plans, chapters, critiques
+    BATCH = 2         # background: multi-book batches, content metadata
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed before it finished."""
+
+
+@dataclass(frozen=True)
+class RequestScope:
+    """Scheduling attributes for the LLM calls made inside ``request_scope``."""
+    priority: Optional[Priority] = None
+    book_id: Optional[str] = None
+    deadline: Optional[float] = None   # time.monotonic() value
+
+
+_scope: ContextVar[RequestScope] = ContextVar("llm_request_scope", default=RequestScope())
+
+
+def current_scope() -> RequestScope:
+    return _scope.get()
+
+
+@contextmanager
+def request_scope(
+    priority: Optional[Priority] = None,
+    book_id: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[RequestScope]:
+    """
+    Tag LLM calls made in this block (and tasks started from it) with a
+    priority, the book they serve and a deadline ``timeout`` seconds from now.
+    Unset fields are inherited from the enclosing scope; a nested deadline can
+    only be earlier.
+    """
+    outer = _scope.get()
+    deadline = outer.deadline
+    if timeout is not None:
+        deadline = min(d for d in (deadline, time.monotonic() + timeout) if d is not None)
+    scope = RequestScope(
+        priority if priority is not None else outer.priority,
+        book_id if book_id is not None else outer.book_id,
+        deadline,
+    )
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def scheduler_slots() -> int:
+    """Slots from OLLAMA_SCHEDULER_SLOTS; 0 (the default) turns scheduling off."""
+    return int(os.getenv("OLLAMA_SCHEDULER_SLOTS", str(ENV_DEFAULT_SLOTS)))
+
+
+@dataclass
+class _Ticket:
+    priority: Priority
+    book_id: str
+    deadline: Optional[float]
+    future: "asyncio.Future[None]"
+    enqueued_at: float = field(default_factory=time.monotonic)
+    task: Optional["asyncio.Task[Any]"] = None
+
+
+class _ClassMetrics:
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.expired = 0
+        self.queue_wait: Deque[float] = deque(maxlen=METRIC_WINDOW)
+        self.service_time: Deque[float] = deque(maxlen=METRIC_WINDOW)
+
+    @staticmethod
+    def _summary(samples: Deque[float]) -> Dict[str, float]:
+        if not samples:
+            return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return {"mean": round(sum(ordered) / len(ordered), 4), "p50": round(pick(0.5), 4),
+                "p95": round(pick(0.95), 4), "max": round(ordered[-1], 4)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"submitted": self.submitted, "completed": self.completed, "failed": self.failed,
+                "cancelled": self.cancelled, "expired": self.expired,
+                "queue_wait": self._summary(self.queue_wait), "service_time": self._summary(self.service_time)}
+
+
+class LLMScheduler:
+    """
+    Admits LLM calls to the backend a limited number at a time.
+
+    At most ``slots`` calls run at once. A freed slot goes to the most urgent
+    class that is under its cap (``caps``). ``reserved`` slots are kept for
+    INTERACTIVE, so a call a user is waiting on does not queue behind
+    multi-minute chapter drafts made by the same process. By default one is
+    reserved when there are three or more slots; with fewer, a reserve would
+    halve (or stop) pipeline concurrency.
+
+    Priorities only order calls made in the same process. The frontend and the
+    generation pipeline run separately, each with its own scheduler, so a
+    wizard click still competes with another process's drafts at Ollama.
+    Within a class, books take turns, so one book's burst of critique calls
+    does not hold up every other book in a batch.
+
+    A request whose deadline passes while queued, or while running under
+    ``run``, raises DeadlineExceeded. Cancelling the waiting task takes it out
+    of the queue, and ``cancel_book`` cancels everything queued or running for
+    a book. A call cancelled while running in a worker thread
+    (``asyncio.to_thread``) still finishes in that thread after its slot
+    is released.
+
+    State is only touched from the event loop, so no lock is needed. Futures
+    are created per request on the running loop, so one scheduler works
+    across ``asyncio.run`` calls.
+    """
+
+    def __init__(
+        self,
+        slots: int = DEFAULT_SLOTS,
+        caps: Optional[Dict[Priority, int]] = None,
+        reserved: Optional[int] = None,
+    ):
+        if slots < 1:
+            raise ValueError("LLMScheduler needs at least one slot")
+        self.slots = slots
+        # Slots only INTERACTIVE may take; the other classes share the rest
+        if reserved is None:
+            reserved = 1 if slots > 2 else 0
+        self.reserved = max(0, min(slots - 1, reserved))
+        self.caps: Dict[Priority, int] = {p: slots for p in Priority}
+        self.caps.update(caps or {})
+        self._queues: Dict[Priority, "OrderedDict[str, Deque[_Ticket]]"] = {p: OrderedDict() for p in Priority}
+        self._running: Dict[Priority, List[_Ticket]] = {p: [] for p in Priority}
+        self.metrics: Dict[Priority, _ClassMetrics] = {p: _ClassMetrics() for p in Priority}
+
+    # ---- admission ----
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Priority = Priority.PIPELINE,
+        book_id: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[None]:
+        """
+        Hold a slot for the block. ``deadline`` (a time.monotonic() value)
+        bounds the wait for the slot.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before a slot is free
+        """
+        ticket = await self._acquire(Priority(priority), book_id, deadline)
+        started = time.monotonic()
+        metrics = self.metrics[ticket.priority]
+        try:
+            yield
+        except asyncio.CancelledError:
+            metrics.cancelled += 1
+            raise
+        except DeadlineExceeded:
+            metrics.expired += 1
+            raise
+        except BaseException:
+            metrics.failed += 1
+            raise
+        else:
+            metrics.completed += 1
+        finally:
+            metrics.service_time.append(time.monotonic() - started)
+            self._release(ticket)
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        priority: Priority = Priority.PIPELINE,
+        book_id: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> T:
+        """
+        ``await fn()`` in a slot, cancelled if ``deadline`` passes first.
+
+        Raises:
+            DeadlineExceeded: If the deadline passes while queued or running
+        """
+        async with self.slot(priority, book_id, deadline):
+            if deadline is None:
+                return await fn()
+            try:
+                return await asyncio.wait_for(fn(), max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded("LLM request ran past its deadline") from None
+
+    async def _acquire(self, priority: Priority, book_id: Optional[str], deadline: Optional[float]) -> _Ticket:
+        loop = asyncio.get_running_loop()
+        ticket = _Ticket(priority, book_id or "", deadline, loop.create_future(), task=asyncio.current_task())
+        metrics = self.metrics[priority]
+        metrics.submitted += 1
+        self._queues[priority].setdefault(ticket.book_id, deque()).append(ticket)
+        self._dispatch()
+        try:
+            if deadline is None:
+                await ticket.future
+            else:
+                await asyncio.wait_for(asyncio.shield(ticket.future), max(0.0, deadline - time.monotonic()))
+        except BaseException as e:
+            if ticket.future.done() and not ticket.future.cancelled():
+                self._release(ticket)          # granted just as the wait gave up
+            else:
+                self._dequeue(ticket)
+                ticket.future.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                metrics.expired += 1
+                raise DeadlineExceeded("LLM request deadline passed while queued") from None
+            if isinstance(e, asyncio.CancelledError):
+                metrics.cancelled += 1
+            raise
+        metrics.queue_wait.append(time.monotonic() - ticket.enqueued_at)
+        return ticket
+
+    def _admissible(self, priority: Priority) -> bool:
+        if not self._queues[priority] or len(self._running[priority]) >= self.caps[priority]:
+            return False
+        if priority == Priority.INTERACTIVE:
+            return True
+        return self.running - len(self._running[Priority.INTERACTIVE]) < self.slots - self.reserved
+
+    def _dispatch(self) -> None:
+        while self.running < self.slots:
+            ticket = next((self._pop(p) for p in Priority if self._admissible(p)), None)
+            if ticket is None:
+                return
+            self._running[ticket.priority].append(ticket)
+            ticket.future.set_result(None)
+
+    def _pop(self, priority: Priority) -> _Ticket:
+        """Next ticket of ``priority``, from the book whose turn it is."""
+        books = self._queues[priority]
+        book_id, queue = next(iter(books.items()))
+        ticket = queue.popleft()
+        del books[book_id]
+        if queue:
+            books[book_id] = queue     # back of the line
+        return ticket
+
+    def _dequeue(self, ticket: _Ticket) -> None:
+        queue = self._queues[ticket.priority].get(ticket.book_id)
+        if queue and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del self._queues[ticket.priority][ticket.book_id]
+
+    def _release(self, ticket: _Ticket) -> None:
+        running = self._running[ticket.priority]
+        if ticket in running:
+            running.remove(ticket)
+            self._dispatch()
+
+    # ---- control and reporting ----
+
+    def cancel_book(self, book_id: str) -> int:
+        """Cancel every queued and running request for ``book_id``; returns how many."""
+        tickets = [t for p in Priority for t in self._queues[p].get(book_id, ())]
+        tickets += [t for p in Priority for t in self._running[p] if t.book_id == book_id]
+        for ticket in tickets:
+            if ticket.task is not None:
+                ticket.task.cancel()
+        return len(tickets)
+
+    @property
+    def running(self) -> int:
+        return sum(len(r) for r in self._running.values())
+
+    def queued(self, priority: Optional[Priority] = None) -> int:
+        classes = [priority] if priority is not None else list(Priority)
+        return sum(len(q) for p in classes for q in self._queues[p].values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "slots": self.slots,
+            "running": self.running,
+            "classes": {
+                p.name.lower(): {"cap": self.caps[p], "running": len(self._running[p]),
+                                 "queued": self.queued(p), **self.metrics[p].to_dict()}
+                for p in Priority
+            },
+        }
+
+
+@lru_cache(maxsize=None)
+def shared_scheduler(slots: int = DEFAULT_SLOTS) -> LLMScheduler:
+    """The process-wide scheduler with ``slots`` slots."""
+    return LLMScheduler(slots)
+
+
+async def scheduled(
+    scheduler: Optional[LLMScheduler],
+    fn: Callable[[], Awaitable[T]],
+    priority: Priority = Priority.PIPELINE,
+) -> T:
+    """
+    ``await fn()`` through ``scheduler`` (directly when None), with the
+    priority, book and deadline of the current ``request_scope``. ``priority``
+    applies when the scope sets none.
+    """
+    if scheduler is None:
+        return await fn()
+    scope = current_scope()
+    return await scheduler.run(
+        fn,
+        priority=scope.priority if scope.priority is not None else priority,
+        book_id=scope.book_id,
+        deadline=scope.deadline,
+    )
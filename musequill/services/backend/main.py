@@ -3,11 +3,17 @@
 Main script to load and convert JSON templates to BookModelType.
 
 Usage:
-    python main.py --template <template_name>
-    python main.py -t <template_name>
+    python main.py [command] [args...]
+
+    Commands: main, batch, book-research, process-results, book-dna, chapter-plan,
+    chapter-briefs, writer, enhanced-writer (default)
+
+    python main.py main --template <template_name>
+    python main.py main -t <template_name>
 
 Example:
-    python main.py --template children_fantasy
+    python main.py main --template children_fantasy
+    python main.py batch --manifest overnight.json --pool-size 2
 """
 import asyncio
 import argparse
@@ -30,19 +36,6 @@ from musequill.config import (
 
 # Import our book model
 from musequill.services.backend.model.book import BookModelType
-from musequill.services.backend.prompts import (
-    BookSummaryPromptGenerator,
-    BookSummaryConfig,
-    BlueprintPromptGenerator,
-    PlanningPromptGenerator,
-    PlanningConfig,
-    ResearchPromptGenerator,
-    generate_validation_prompt,
-    BookDNAInputs,
-    BookDNAPromptGenerator,
-    BookPlanConfig,
-    BookPlanPromptGenerator
-)
 from musequill.services.backend.llm.ollama_client import (
     create_llm_service,
     LLMService
@@ -56,32 +49,9 @@ from musequill.services.backend.utils import (
     load_chapter_briefs
 )
 
-from musequill.services.backend.researcher import (
-    ResearcherAgent,
-    ResearcherConfig,
-    ResearchQuery,
-    ResearchResults,
-    SearchResult
-)
-
-from musequill.services.backend.context import (
-    LLMContextManager,
-)
-
-from musequill.services.backend.integration import (
-    create_llm_context_manager
-)
-
-from musequill.services.backend.writers import (
-    generate_chapter_plan,
-    ValidationPolicy,
-    validate_output_generic,
-    ValidationError
-)
-
-from musequill.services.backend.process_results import (
-    extract_research_results_by_category
-)
+# Prompt generators, the researcher (Tavily/Chroma/LangChain), the context
+# manager and the writers are imported inside the command that uses them so
+# each command only pays for its own dependencies.
 
 # Configure logging
 logging.basicConfig(
@@ -213,6 +183,28 @@ def save_research_data(data: Dict[str, Any], filename: str):
         json.dump(data, f, indent=2, ensure_ascii=False, cls=ResearchEncoder)
 
 async def main():
+    from musequill.services.backend.prompts import (
+        BookSummaryPromptGenerator,
+        BlueprintPromptGenerator,
+        PlanningPromptGenerator,
+        PlanningConfig,
+        ResearchPromptGenerator,
+        BookDNAInputs,
+        BookDNAPromptGenerator,
+        BookPlanConfig,
+        BookPlanPromptGenerator
+    )
+    from musequill.services.backend.researcher import (
+        ResearcherAgent,
+        ResearcherConfig,
+        ResearchQuery,
+        ResearchResults,
+        SearchResult
+    )
+    from musequill.services.backend.context import LLMContextManager
+    from musequill.services.backend.integration import create_llm_context_manager
+    from musequill.services.backend.writers import generate_chapter_plan
+
     logger.info("🚀  Starting backend service...")
     logger.info("🏗️  Loading configuration...")
     config = get_settings()
@@ -223,9 +215,9 @@ async def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  python main.py --template children_fantasy
-  python main.py -t adventure_story
-  python main.py --template mystery_novel
+  python main.py main --template children_fantasy
+  python main.py main -t adventure_story
+  python main.py main --template mystery_novel
         """
     )
     
@@ -724,6 +716,12 @@ Examples:
         logger.error(f"Error: {e}")
 
 async def book_research():
+    from musequill.services.backend.prompts import ResearchPromptGenerator
+    from musequill.services.backend.researcher import (
+        ResearcherAgent,
+        ResearcherConfig,
+        ResearchQuery
+    )
     try:
         llm_service:LLMService = create_llm_service()
         output_path = Path('musequill/services/backend/samples')
@@ -775,6 +773,7 @@ async def book_research():
         logger.error(f"Error: {e}")
 
 async def process_results():
+    from musequill.services.backend.process_results import extract_research_results_by_category
     try:
         output_path = Path('musequill/services/backend/samples')
         output_path.mkdir(parents=True, exist_ok=True)
@@ -792,6 +791,7 @@ async def process_results():
         logger.error(f"Error: {e}")
 
 async def generate_book_dna():
+    from musequill.services.backend.prompts import BookDNAInputs, BookDNAPromptGenerator
 
     try:
         llm_service:LLMService = create_llm_service()
@@ -853,6 +853,7 @@ async def generate_book_dna():
         logger.error(f"Error: {e}")
 
 async def chapter_plan():
+    from musequill.services.backend.writers import generate_chapter_plan
     try:
 
         llm_service:LLMService = create_llm_service()
@@ -984,33 +985,14 @@ async def writer():
     except Exception as e:
         logger.error(f"Error: {e}")
 
-# enhanced_main.py - Replace your existing writer() function
-
-import asyncio
-import json
-from pathlib import Path
-from uuid import uuid4
-from typing import List, Dict, Any
-
-# Import your existing modules
-from musequill.services.backend.writers.chapter_planning_model import GenericPlan
-from musequill.services.backend.writers.book_planning_model import GenericBookPlan
-from musequill.services.backend.writers.chapter_brief_model import GenericChapterBrief
-from musequill.services.backend.utils import coerce_to_model
-from musequill.services.backend.writers.research_model import RefinedResearch
-from musequill.services.backend.model import BookModelType
-from musequill.services.backend.llm.ollama_client import LLMService, create_llm_service
-from musequill.services.backend.utils.loader import load_chapter_briefs
-
-# Import the enhanced chapter writer
-from musequill.services.backend.writers.enhanced_chapter_writer import enhanced_write_all_chapters_with_qc
-
-import logging
-logger = logging.getLogger(__name__)
-
-
 async def enhanced_writer():
     """Enhanced writer function with improved context management for coherent chapters."""
+    from musequill.services.backend.writers.chapter_planning_model import GenericPlan
+    from musequill.services.backend.writers.book_planning_model import GenericBookPlan
+    from musequill.services.backend.writers.chapter_brief_model import GenericChapterBrief
+    from musequill.services.backend.utils import coerce_to_model
+    from musequill.services.backend.writers.research_model import RefinedResearch
+    from musequill.services.backend.writers.enhanced_chapter_writer import enhanced_write_all_chapters_with_qc
     
     try:
         print("🚀 Starting Enhanced Book Writer with Context Memory")
@@ -1159,9 +1141,51 @@ async def enhanced_writer():
         raise
 
 
+async def batch():
+    """Run the planning pipeline for every template in a manifest with shared services."""
+    from musequill.services.backend.batch import DEFAULT_OUTPUT_ROOT, run_batch
+
+    parser = argparse.ArgumentParser(description="Produce many books from a manifest of templates")
+    parser.add_argument('--manifest', '-m', type=Path, required=True,
+                        help='JSON list of template names (or {"template", "copies"} entries)')
+    parser.add_argument('--pool-size', type=int, default=2,
+                        help='LLM services shared by all books, i.e. concurrent LLM calls')
+    parser.add_argument('--max-books', type=int, default=4,
+                        help='Books in flight at once')
+    parser.add_argument('--output', '-o', type=Path, default=DEFAULT_OUTPUT_ROOT,
+                        help='Root directory for per-book outputs and the progress report')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    jobs = await run_batch(
+        args.manifest,
+        pool_size=args.pool_size,
+        max_active_books=args.max_books,
+        output_root=args.output,
+    )
+    for job in jobs:
+        status = "✅" if job.status == "done" else "❌"
+        logger.info(f"{status}  {job.template} ({job.book_id}): {job.status}"
+                    f"{' - ' + job.error if job.error else ''}")
+    print(f'DONE in {tick(start, time.perf_counter())}')
+
+
+COMMANDS = {
+    "main": main,
+    "batch": batch,
+    "book-research": book_research,
+    "process-results": process_results,
+    "book-dna": generate_book_dna,
+    "chapter-plan": chapter_plan,
+    "chapter-briefs": chapter_briefs,
+    "writer": writer,
+    "enhanced-writer": enhanced_writer,
+}
+
+
 if __name__ == "__main__":
-    # Run the enhanced writer
-    asyncio.run(enhanced_writer())
-    
-    # Uncomment to run single chapter test instead:
-    # asyncio.run(test_enhanced_writer_single_chapter())
\ No newline at end of file
+    # python main.py [command] [args...]; runs the enhanced writer by default
+    command = "enhanced-writer"
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        command = sys.argv.pop(1)
+    asyncio.run(COMMANDS[command]())
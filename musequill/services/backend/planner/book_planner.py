@@ -2,15 +2,25 @@ from __future__ import annotations
 import json, os, time, logging, requests
 from typing import Any, Dict, Tuple, Optional
 from pydantic import ValidationError
-from jsonschema import validate as js_validate, Draft202012Validator
 
-from .book_plan import BookPlan, book_plan_json_schema
-from .schema_util import _json_skeleton
+from musequill.services.backend.llm.endpoint_pool import endpoint_urls, shared_pool
+from musequill.services.backend.utils.payloads import scan_json
+from musequill.services.backend.validators.plan_repair import (
+    PlanFragmentRepairer,
+    pydantic_issues,
+    schema_issues,
+)
+
+from .book_plan import BookPlan
+from .constrained import PLANNER_STATS, RepairStats
+from .schema_registry import SCHEMA_REGISTRY
 
 log = logging.getLogger(__name__)
 
 # ---- Runtime knobs ----
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+# OLLAMA_BASE_URLS (comma-separated) spreads planner calls over several nodes
+OLLAMA_POOL = shared_pool(endpoint_urls(OLLAMA_URL))
 OLLAMA_MODEL = os.getenv("BOOK_PLANNER_MODEL", "llama3.3:70b")
 STRUCTURED_OK = os.getenv("OLLAMA_STRUCTURED", "1") == "1"
 TIMEOUT_S = int(os.getenv("OLLAMA_TIMEOUT", "240"))
@@ -26,6 +36,7 @@ SYS = (
 # --- at top of book_planner.py ---
 JSON_STOP_TOKENS = ["\n\n#", "\n\n##", "\n\n###", "\n\nCritical", "\n\nAnalysis", "\n\nRecommendation"]
 
+
 # def _json_skeleton(schema: dict) -> str:
 #     """
 #     Emit a minimal skeleton object with correct keys but empty values.
@@ -62,12 +73,15 @@ def _to_json_or_raise(text: str) -> dict:
     try:
         return json.loads(text.strip())
     except Exception:
-        return json.loads(_extract_json(text))
+        return scan_json(text, "{[")
+
+def _post(path: str, payload: dict, timeout: int) -> str:
+    def send(base_url: str) -> dict:
+        r = requests.post(f"{base_url}{path}", json=payload, timeout=timeout)
+        r.raise_for_status()
+        return r.json()
 
-def _post(url: str, payload: dict, timeout: int) -> str:
-    r = requests.post(url, json=payload, timeout=timeout)
-    r.raise_for_status()
-    data = r.json()
+    data = OLLAMA_POOL.call(payload["model"], send)
     # /api/chat: {"message":{"content": "..."}}
     if "message" in data:
         return data.get("message", {}).get("content", "")
@@ -102,21 +116,28 @@ def _fewshot_assistant_example(schema: dict) -> list:
     }
     return [{"role": "assistant", "content": json.dumps(tiny, ensure_ascii=False)}]
 
-def ollama_chat_strict(messages: list, schema: dict, timeout: int) -> str:
+def ollama_chat_strict(messages: list, schema: dict, timeout: int, stats: Optional[RepairStats] = None) -> str:
     """
-    Try: (1) structured chat, (2) json-mode chat with few-shot + skeleton, (3) /api/generate.
+    Try: (1) constrained decoding, (2) json-mode chat with few-shot + skeleton, (3) /api/generate.
     Enforce stops and temperature=0. Returns raw text (ideally JSON).
+
+    Step (1) sends the derived ``format`` schema, which Ollama compiles into a
+    sampling grammar; its output normally validates without any fallback.
     """
+    stats = stats if stats is not None else PLANNER_STATS
+    compiled = SCHEMA_REGISTRY.get(schema)
     options = {"temperature": 0, "top_p": 0.9, "stop": JSON_STOP_TOKENS}
-    # 1) Structured (if available)
+    # 1) Constrained decoding (if available)
     if STRUCTURED_OK:
-        payload = {"model": OLLAMA_MODEL, "messages": messages, "stream": False, "options": options, "format": schema}
-        txt = _post(f"{OLLAMA_URL}/api/chat", payload, timeout)
+        payload = {"model": OLLAMA_MODEL, "messages": messages, "stream": False, "options": options,
+                   "format": compiled.format_schema}
+        txt = _post("/api/chat", payload, timeout)
+        stats.record_generation(txt)
         if txt.strip().startswith("{") or txt.strip().startswith("["):
             return txt
 
     # 2) JSON mode with few-shot + skeleton coercion
-    skeleton = _json_skeleton(schema)
+    skeleton = compiled.skeleton
     coercion = (
         "Return ONLY valid JSON matching the schema. No prose, no markdown. "
         "Fill this skeleton's keys and keep the same shape. Do not add keys.\n"
@@ -126,7 +147,8 @@ def ollama_chat_strict(messages: list, schema: dict, timeout: int) -> str:
         {"role": "user", "content": coercion}
     ]
     payload2 = {"model": OLLAMA_MODEL, "messages": msgs2, "stream": False, "options": options, "format": "json"}
-    txt2 = _post(f"{OLLAMA_URL}/api/chat", payload2, timeout)
+    txt2 = _post("/api/chat", payload2, timeout)
+    stats.record_generation(txt2)
     if txt2.strip().startswith("{") or txt2.strip().startswith("["):
         return txt2
 
@@ -143,28 +165,10 @@ def ollama_chat_strict(messages: list, schema: dict, timeout: int) -> str:
         "format": "json",
         "options": options,
     }
-    return _post(f"{OLLAMA_URL}/api/generate", payload3, timeout)
-
+    txt3 = _post("/api/generate", payload3, timeout)
+    stats.record_generation(txt3)
+    return txt3
 
-def _extract_json(text: str) -> str:
-    start = text.find("{")
-    if start == -1:
-        start = text.find("[")
-    if start == -1:
-        raise ValueError("No JSON found")
-    stack = []
-    for i, c in enumerate(text[start:], start):
-        if c in "{[":
-            stack.append(c)
-        elif c in "}]":
-            if not stack:
-                raise ValueError("Unbalanced JSON")
-            opening = stack.pop()
-            if (opening, c) not in (("{", "}"), ("[", "]")):
-                raise ValueError("Mismatched braces")
-            if not stack:
-                return text[start:i+1]
-    raise ValueError("Incomplete JSON")
 
 def _ollama_chat(messages: list, format_payload: Any) -> str:
     payload = {
@@ -177,21 +181,17 @@ def _ollama_chat(messages: list, format_payload: Any) -> str:
         },
         "format": format_payload  # JSON Schema (preferred) or "json"
     }
-    r = requests.post(f"{OLLAMA_URL}/api/chat", json=payload, timeout=TIMEOUT_S)
-    r.raise_for_status()
-    data = r.json()
-    return data.get("message", {}).get("content", "")
+    return _post("/api/chat", payload, TIMEOUT_S)
 
 def _validate(obj: dict, schema: dict) -> Tuple[bool, Optional[str]]:
     try:
-        Draft202012Validator.check_schema(schema)
-        js_validate(instance=obj, schema=schema)
-        BookPlan.model_validate(obj)  # stricter Pydantic pass
+        # Compiled once per schema: meta-schema check, validator and TypeAdapter
+        SCHEMA_REGISTRY.get(schema, BookPlan).validate(obj)  # JSON Schema, then stricter Pydantic pass
         return True, None
     except Exception as e:
         return False, str(e)
 
-def _repair(bad_json: str, schema: dict, error: str) -> str:
+def _repair(bad_json: str, schema: dict, error: str, stats: Optional[RepairStats] = None) -> str:
     messages = [
         {"role": "system", "content": SYS},
         {"role": "user", "content":
@@ -201,7 +201,40 @@ def _repair(bad_json: str, schema: dict, error: str) -> str:
             "### JSON Schema:\n" + json.dumps(schema, ensure_ascii=False) + "\n\n"
             "Return ONLY corrected JSON. No comments."}
     ]
-    return _ollama_chat(messages, schema if STRUCTURED_OK else "json")
+    format_payload = SCHEMA_REGISTRY.get(schema).format_schema if STRUCTURED_OK else "json"
+    fixed = _ollama_chat(messages, format_payload)
+    (stats if stats is not None else PLANNER_STATS).record_generation(fixed, repair=True)
+    return fixed
+
+def _repair_fragments(obj: dict, schema: dict, stats: Optional[RepairStats] = None) -> Optional[dict]:
+    """
+    Regenerate only the sub-objects named by validation errors (one chapter
+    entry, the characters map, ...) and splice them back into ``obj``.
+    Returns None when the errors are not fragment-local.
+    """
+    stats = stats if stats is not None else PLANNER_STATS
+    compiled = SCHEMA_REGISTRY.get(schema, BookPlan)
+    issues = schema_issues(compiled.validator.iter_errors(obj))
+    if not issues:
+        try:
+            compiled.adapter.validate_python(obj)
+        except ValidationError as ve:
+            issues = pydantic_issues(ve)
+
+    def generate(prompt: str, fragment) -> str:
+        format_payload = ({"type": "object", "properties": {"fragment": fragment.schema}, "required": ["fragment"]}
+                          if STRUCTURED_OK else "json")
+        text = _ollama_chat([{"role": "system", "content": SYS}, {"role": "user", "content": prompt}],
+                            format_payload)
+        stats.record_generation(text, repair=True)
+        return text
+
+    repairer = PlanFragmentRepairer(schema=compiled.format_schema, pinned_keys=("ch",))
+    outcome = repairer.repair_sync(obj, issues, generate)
+    if not outcome.applicable or not outcome.changed:
+        return None
+    log.info("fragment repair: %d fragment(s), ~%d tokens", len(outcome.repaired), outcome.approx_tokens)
+    return outcome.plan
 
 def _build_prompt(
     book_model: Dict[str, Any],
@@ -231,8 +264,11 @@ def _build_prompt(
         "- No extra keys beyond the schema."
     )
 
-def plan_book(book_model, blueprint, research, planning_text, summary_text) -> BookPlan:
-    schema = book_plan_json_schema()
+def plan_book(book_model, blueprint, research, planning_text, summary_text,
+              stats: Optional[RepairStats] = None) -> BookPlan:
+    stats = stats if stats is not None else PLANNER_STATS
+    stats.start_plan()
+    schema = SCHEMA_REGISTRY.for_model(BookPlan).schema
     messages = [
         {"role": "system", "content": SYS},
         {"role": "user", "content": _build_prompt(book_model, blueprint, research, planning_text, summary_text)}
@@ -241,25 +277,40 @@ def plan_book(book_model, blueprint, research, planning_text, summary_text) -> B
     while attempts < MAX_RETRIES:
         attempts += 1
         try:
-            raw = ollama_chat_strict(messages, schema, TIMEOUT_S)
+            raw = ollama_chat_strict(messages, schema, TIMEOUT_S, stats)
 
             try:
                 obj = _to_json_or_raise(raw)
             except Exception:
                 # Force a coercion retry once with a super-terse command
+                stats.record_validation_failure()
                 coercion_msg = {"role": "user", "content": "Your last output was invalid. Respond with ONLY valid JSON for the schema. No text."}
-                raw2 = ollama_chat_strict(messages + [coercion_msg], schema, TIMEOUT_S)
+                raw2 = ollama_chat_strict(messages + [coercion_msg], schema, TIMEOUT_S, stats)
                 obj = _to_json_or_raise(raw2)
 
             ok, err = _validate(obj, schema)
             if ok:
+                stats.record_accepted()
                 return BookPlan.model_validate(obj)
 
-            fixed_raw = _repair(json.dumps(obj, ensure_ascii=False), schema, err or "validation error")
+            stats.record_validation_failure()
+            # Cheap path first: regenerate only the failing fragments
+            patched = _repair_fragments(obj, schema, stats)
+            if patched is not None:
+                ok, err_patched = _validate(patched, schema)
+                if ok:
+                    stats.record_accepted()
+                    return BookPlan.model_validate(patched)
+                stats.record_validation_failure()
+                obj, err = patched, err_patched
+
+            fixed_raw = _repair(json.dumps(obj, ensure_ascii=False), schema, err or "validation error", stats)
             obj2 = _to_json_or_raise(fixed_raw)
             ok2, err2 = _validate(obj2, schema)
             if ok2:
+                stats.record_accepted()
                 return BookPlan.model_validate(obj2)
+            stats.record_validation_failure()
             last_err = err2
         except Exception as e:
             last_err = str(e)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+# Keywords that only annotate a schema; the grammar compiler ignores them, so
+# they just add bytes to every request
+_ANNOTATION_KEYS = {"title", "description", "examples", "default", "$schema", "$id", "$comment"}
+# Keywords whose value is a subschema, a list of subschemas, or a name -> subschema map.
+# Every other keyword's value (enum, const, required, pattern, ...) is data and is copied as is.
+_SUBSCHEMA_KEYS = {"items", "additionalItems", "additionalProperties", "unevaluatedItems",
+                   "unevaluatedProperties", "contains", "propertyNames", "not", "if", "then", "else"}
+_SUBSCHEMA_LISTS = {"allOf", "anyOf", "oneOf", "prefixItems", "items"}
+_NAME_MAPS = {"properties", "patternProperties", "dependentSchemas"}
+
+
+def ollama_format_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Derive an Ollama ``format`` schema for constrained decoding.
+
+    Ollama compiles ``format`` into a sampling grammar, so the model can only emit
+    JSON of this shape. The derived schema:
+      - inlines ``$ref`` pointers into ``$defs``/``definitions`` (the grammar
+        compiler resolves refs poorly); recursive refs collapse to their type
+      - drops annotation keywords (title/description/examples/default) where
+        they are schema keywords; property names and ``enum``/``const`` values
+        are data and are kept verbatim
+      - keeps ``required`` as declared, so optional fields stay optional
+    """
+    def resolve(ref: str) -> Dict[str, Any]:
+        if not ref.startswith("#/"):
+            return {}
+        node: Any = schema
+        for part in ref[2:].split("/"):
+            if not isinstance(node, dict) or part not in node:
+                return {}
+            node = node[part]
+        return node
+
+    def convert(node: Any, stack: tuple) -> Any:
+        if not isinstance(node, dict):
+            return node     # boolean schema
+
+        if "$ref" in node:
+            ref = node["$ref"]
+            if ref in stack:
+                target_type = resolve(ref).get("type", "object")
+                return {"type": target_type}
+            return convert(resolve(ref), stack + (ref,))
+
+        out: Dict[str, Any] = {}
+        for key, value in node.items():
+            if key in _ANNOTATION_KEYS or key in ("$defs", "definitions"):
+                continue
+            if key in _NAME_MAPS and isinstance(value, dict):
+                out[key] = {name: convert(sub, stack) for name, sub in value.items()}
+            elif key in _SUBSCHEMA_LISTS and isinstance(value, list):
+                out[key] = [convert(sub, stack) for sub in value]
+            elif key in _SUBSCHEMA_KEYS:
+                out[key] = convert(value, stack)
+            else:
+                out[key] = deepcopy(value)
+        return out
+
+    return convert(schema, ())
+
+
+@dataclass
+class RepairStats:
+    """
+    Counts LLM generations and repairs across plans.
+
+    ``bytes_regenerated`` is every byte produced after a plan's first generation,
+    i.e. the cost of retries and repair cycles that constrained decoding removes.
+    """
+    plans: int = 0
+    accepted: int = 0
+    generations: int = 0
+    repairs: int = 0
+    validation_failures: int = 0
+    bytes_generated: int = 0
+    bytes_regenerated: int = 0
+    attempts_per_plan: List[int] = field(default_factory=list)
+
+    def start_plan(self) -> None:
+        self.plans += 1
+        self.attempts_per_plan.append(0)
+
+    def record_generation(self, text: str, repair: bool = False) -> None:
+        if not self.attempts_per_plan:
+            self.start_plan()
+        size = len(text.encode("utf-8"))
+        self.generations += 1
+        self.bytes_generated += size
+        if self.attempts_per_plan[-1] > 0:
+            self.bytes_regenerated += size
+        self.attempts_per_plan[-1] += 1
+        if repair:
+            self.repairs += 1
+
+    def record_validation_failure(self) -> None:
+        self.validation_failures += 1
+
+    def record_accepted(self) -> None:
+        self.accepted += 1
+
+    @property
+    def mean_attempts(self) -> float:
+        if not self.attempts_per_plan:
+            return 0.0
+        return sum(self.attempts_per_plan) / len(self.attempts_per_plan)
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "plans": self.plans,
+            "accepted": self.accepted,
+            "generations": self.generations,
+            "repairs": self.repairs,
+            "validation_failures": self.validation_failures,
+            "bytes_generated": self.bytes_generated,
+            "bytes_regenerated": self.bytes_regenerated,
+            "mean_attempts": round(self.mean_attempts, 2),
+        }
+
+
+# Generation/repair counters across plan_book calls, shared by both planners
+# (pass stats= to track separately)
+PLANNER_STATS = RepairStats()
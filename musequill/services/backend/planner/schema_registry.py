@@ -0,0 +1,121 @@
+from __future__ import annotations
+import json
+from copy import deepcopy
+from dataclasses import dataclass, replace
+from hashlib import sha256
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
+from pydantic import BaseModel, TypeAdapter
+
+from .constrained import ollama_format_schema
+from .schema_util import _json_skeleton
+
+# Schema dicts remembered by identity (oldest dropped first)
+_ID_CACHE_SIZE = 256
+
+
+def schema_key(schema: Dict[str, Any]) -> str:
+    """Content hash of a JSON Schema (key order does not matter)."""
+    canonical = json.dumps(schema, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    """Everything derived from one schema, built once and reused across attempts."""
+    key: str
+    schema: Dict[str, Any]
+    validator: Draft202012Validator
+    skeleton: str
+    format_schema: Dict[str, Any]
+    adapter: Optional[TypeAdapter] = None
+
+    def validate(self, instance: Any) -> Any:
+        """
+        Validate against the JSON Schema, then the Pydantic model if there is one.
+
+        Raises the same errors as ``jsonschema.validate`` / ``TypeAdapter.validate_python``.
+        Returns the validated model instance (or ``instance`` when no model is attached).
+        """
+        error = best_match(self.validator.iter_errors(instance))
+        if error is not None:
+            raise error
+        if self.adapter is not None:
+            return self.adapter.validate_python(instance)
+        return instance
+
+
+class SchemaRegistry:
+    """
+    Compiles each JSON Schema once, keyed by content hash.
+
+    The meta-schema check, validator construction, skeleton generation, Ollama
+    ``format`` derivation and TypeAdapter build all happen on first use. Later
+    lookups with the same dict object are an identity hit that skips hashing;
+    a registered schema dict must therefore not be mutated afterwards. An
+    equal schema in a new dict costs one hash.
+
+    Entries are per (schema, model): the same schema looked up with another
+    Pydantic model gets its own TypeAdapter, sharing the compiled validator.
+
+    Args:
+        skeleton_builder: Schema -> skeleton JSON string (defaults to schema_util._json_skeleton)
+    """
+
+    def __init__(self, skeleton_builder: Callable[[Dict[str, Any]], str] = _json_skeleton):
+        self.skeleton_builder = skeleton_builder
+        self._by_key: Dict[Tuple[str, Optional[type]], CompiledSchema] = {}
+        # (id(schema), model) -> (schema, compiled); holding the dict keeps its id from being reused
+        self._by_id: Dict[Tuple[int, Optional[type]], Tuple[Dict[str, Any], CompiledSchema]] = {}
+        self._by_model: Dict[type, CompiledSchema] = {}
+
+    def get(self, schema: Dict[str, Any], model: Optional[Type[BaseModel]] = None) -> CompiledSchema:
+        hit = self._by_id.get((id(schema), model))
+        if hit is not None and hit[0] is schema:
+            return hit[1]
+        key = schema_key(schema)
+        compiled = self._by_key.get((key, model))
+        if compiled is None:
+            base = self._by_key.get((key, None))
+            if base is None:
+                base = self._by_key[(key, None)] = self._compile(key, schema)
+            compiled = base if model is None else replace(base, adapter=TypeAdapter(model))
+            self._by_key[(key, model)] = compiled
+        self._by_id[(id(schema), model)] = (schema, compiled)
+        if len(self._by_id) > _ID_CACHE_SIZE:
+            # Callers building a fresh dict per call would otherwise grow this forever
+            del self._by_id[next(iter(self._by_id))]
+        return compiled
+
+    def for_model(self, model: Type[BaseModel]) -> CompiledSchema:
+        """Compiled schema for a Pydantic model, without re-hashing its schema."""
+        compiled = self._by_model.get(model)
+        if compiled is None:
+            compiled = self.get(model.model_json_schema(), model)
+            self._by_model[model] = compiled
+        return compiled
+
+    def clear(self) -> None:
+        self._by_key.clear()
+        self._by_id.clear()
+        self._by_model.clear()
+
+    def __len__(self) -> int:
+        """Number of distinct schemas compiled."""
+        return sum(1 for _, model in self._by_key if model is None)
+
+    def _compile(self, key: str, schema: Dict[str, Any]) -> CompiledSchema:
+        schema = deepcopy(schema)
+        Draft202012Validator.check_schema(schema)
+        return CompiledSchema(
+            key=key,
+            schema=schema,
+            validator=Draft202012Validator(schema),
+            skeleton=self.skeleton_builder(schema),
+            format_schema=ollama_format_schema(schema),
+        )
+
+
+SCHEMA_REGISTRY = SchemaRegistry()
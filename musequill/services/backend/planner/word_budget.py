@@ -0,0 +1,100 @@
+from __future__ import annotations
+import math
+from typing import List, Optional, Sequence
+
+
+def allocate_words(
+    total: int,
+    weights: Sequence[float],
+    *,
+    minimum: int = 0,
+    maximum: Optional[int] = None,
+) -> List[int]:
+    """
+    Split ``total`` words into integers proportional to ``weights``, each within [minimum, maximum].
+
+    The proportional shares are found exactly: the scale factor where the
+    clamped shares sum to ``total`` is located by sweeping the sorted points at
+    which a chapter hits a bound, so the whole allocation is O(n log n). Shares
+    are then floored and the remaining words go to the largest fractional parts
+    (largest-remainder method, ties to the earlier chapter), so the result sums
+    to ``total`` exactly.
+
+    If the bounds make ``total`` unreachable (``total < n * minimum`` or
+    ``total > n * maximum``) every chapter gets the violated bound. Zero or
+    negative weights get ``minimum`` unless the weighted chapters are all at
+    ``maximum``; if no weight is positive the split is even.
+    """
+    n = len(weights)
+    if n == 0:
+        return []
+    if maximum is not None and maximum < minimum:
+        raise ValueError(f"maximum ({maximum}) is below minimum ({minimum})")
+    if total <= n * minimum:
+        return [minimum] * n
+    if maximum is not None and total >= n * maximum:
+        return [maximum] * n
+
+    w = [float(x) if x and x > 0 else 0.0 for x in weights]
+    if not any(w):
+        w = [1.0] * n
+
+    # f(scale) = sum(clamp(scale * w_i, minimum, maximum)) is continuous and
+    # piecewise linear: chapter i joins the slope at minimum / w_i and leaves it
+    # at maximum / w_i.
+    events = []
+    for x in w:
+        if x > 0:
+            events.append((minimum / x, 0, x))
+            if maximum is not None:
+                events.append((maximum / x, 1, x))
+    events.sort()
+
+    const = float(n * minimum)
+    slope = 0.0
+    scale = None
+    for at, kind, x in events:
+        if slope > 0 and const + slope * at >= total:
+            scale = (total - const) / slope
+            break
+        if kind == 0:
+            slope += x
+            const -= minimum
+        else:
+            slope -= x
+            const += maximum
+    if scale is None and maximum is not None:
+        # Every weighted chapter is at maximum; the zero-weight ones share what is left
+        idle = [i for i, x in enumerate(w) if x == 0]
+        spill = allocate_words(total - maximum * (n - len(idle)), [1] * len(idle),
+                               minimum=minimum, maximum=maximum)
+        out = [maximum] * n
+        for i, words in zip(idle, spill):
+            out[i] = words
+        return out
+    if scale is None:
+        scale = (total - const) / slope
+
+    upper = math.inf if maximum is None else maximum
+    shares = [min(max(scale * x, minimum), upper) for x in w]
+    out = [int(math.floor(s)) for s in shares]
+    remainder = total - sum(out)
+
+    if remainder > 0:
+        order = sorted(range(n), key=lambda i: (-(shares[i] - out[i]), i))
+        for i in order:
+            if remainder == 0:
+                break
+            if out[i] < upper:
+                out[i] += 1
+                remainder -= 1
+    elif remainder < 0:
+        # Only reachable through float error; take back from the smallest fractions
+        order = sorted(range(n), key=lambda i: (shares[i] - out[i], i))
+        for i in order:
+            if remainder == 0:
+                break
+            if out[i] > minimum:
+                out[i] -= 1
+                remainder += 1
+    return out
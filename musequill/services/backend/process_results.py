@@ -1,4 +1,18 @@
+import random
 from difflib import SequenceMatcher
+from typing import Dict, List, Tuple
+
+# MinHash/LSH parameters for near-duplicate candidates: 3-char shingles of the
+# 100-char sample, 20 bands of 2 rows. Near-duplicates share most shingles and
+# collide in some band with high probability; every candidate is confirmed with
+# the exact SequenceMatcher ratio, so LSH only prunes comparisons.
+_SAMPLE_CHARS = 100
+_SHINGLE = 3
+_BANDS = 20
+_ROWS = 2
+_rng = random.Random(20240601)
+# XOR masks act as the hash permutations; 30-bit values keep min(map(...)) on small ints
+_MASKS = [_rng.getrandbits(30) for _ in range(_BANDS * _ROWS)]
 
 def is_similar_content(text1: str, text2: str, threshold: float = 0.8) -> bool:
     """
@@ -23,6 +37,55 @@ def is_similar_content(text1: str, text2: str, threshold: float = 0.8) -> bool:
     similarity = SequenceMatcher(None, sample1, sample2).ratio()
     return similarity >= threshold
 
+def _sample(text: str) -> str:
+    return text[:_SAMPLE_CHARS].strip().lower()
+
+def _minhash(sample: str) -> List[int]:
+    shingles = {hash(sample[i:i + _SHINGLE]) & 0x3FFFFFFF
+                for i in range(max(1, len(sample) - _SHINGLE + 1))}
+    return [min(map(mask.__xor__, shingles)) for mask in _MASKS]
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index that keeps the first of any group of similar texts.
+
+    Approximates checking ``is_similar_content`` against every kept text, but
+    compares each new text only with kept texts that share an LSH bucket
+    (identical samples short-circuit). Texts are grouped by ``scope``
+    so one index can serve every category in a single pass.
+    """
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self._buckets: Dict[Tuple, List[str]] = {}
+        self._exact: set = set()
+
+    def _similar(self, sample: str, other: str) -> bool:
+        matcher = SequenceMatcher(None, sample, other)
+        # Cheap upper bounds first; ratio() is the expensive part
+        return (matcher.real_quick_ratio() >= self.threshold
+                and matcher.quick_ratio() >= self.threshold
+                and matcher.ratio() >= self.threshold)
+
+    def add(self, text: str, scope: str = "") -> bool:
+        """Keep ``text`` unless it is similar to a kept text in the same scope. Returns True if kept."""
+        sample = _sample(text)
+        if (scope, sample) in self._exact:
+            return False
+        signature = _minhash(sample)
+        keys = [(scope, band, tuple(signature[band * _ROWS:(band + 1) * _ROWS])) for band in range(_BANDS)]
+        seen = set()
+        for key in keys:
+            for other in self._buckets.get(key, ()):
+                if other not in seen:
+                    seen.add(other)
+                    if self._similar(sample, other):
+                        return False
+        self._exact.add((scope, sample))
+        for key in keys:
+            self._buckets.setdefault(key, []).append(sample)
+        return True
+
 def extract_research_results_by_category(research_results):
     """
     Extract tavily_answer values from research results organized by category.
@@ -47,6 +110,8 @@ def extract_research_results_by_category(research_results):
         return {}
     
     category_answers = {}
+    # One index for all categories; answers are only compared within their category
+    index = NearDuplicateIndex()
     
     for category, category_data in detailed_results.items():
         answers = []
@@ -60,12 +125,8 @@ def extract_research_results_by_category(research_results):
                             if isinstance(result, dict) and 'tavily_answer' in result:
                                 tavily_answer = result['tavily_answer']
                                 if tavily_answer and isinstance(tavily_answer, str):
-                                    # Check if this answer is similar to any existing answer
-                                    is_duplicate = any(
-                                        is_similar_content(tavily_answer, existing_answer)
-                                        for existing_answer in answers
-                                    )
-                                    if not is_duplicate:
+                                    # Keep it unless it is similar to an answer already kept
+                                    if index.add(tavily_answer, scope=category):
                                         answers.append(tavily_answer)
         
         category_answers[category] = answers
@@ -1,59 +1,24 @@
-from .blueprint_prompt_generator import (
-    BlueprintPromptGenerator
-)
-
-from .target_json_schema import (
-    TARGET_JSON_SCHEMA,
-    EXPECTED_OUTPUT
-)
-
-from .blueprint_validation_prompt_generation import (
-    generate_validation_prompt
-)
-
-from .planning_prompt_generator import (
-    PlanningPromptGenerator,
-    PlanningConfig
-)
-
-from .reseach_prompt_generator import (
-    ResearchPromptGenerator
-)
-
-from .book_summary_prompt_generator import (
-    BookSummaryPromptGenerator,
-    BookSummaryConfig
-)
-
-from .book_dna_prompt_generator import (
-    BookDNAInputs,
-    BookDNAPromptGenerator
-)  
-
-from .chaptet_planning_prompt_generator import (
-    ChapterPlanningPromptGenerator,
-    ChapterPlanningInputs
-)
-
-from .book_plan_prompt_generator import (
-    BookPlanPromptGenerator,
-    BookPlanConfig
-)
-
-__all__ = [
-    "BlueprintPromptGenerator",
-    "PlanningPromptGenerator",
-    "PlanningConfig",
-    "ResearchPromptGenerator",
-    "BookSummaryPromptGenerator",
-    "BookSummaryConfig",
-    "generate_validation_prompt",
-    "TARGET_JSON_SCHEMA",
-    "EXPECTED_OUTPUT",
-    "BookDNAInputs",
-    "BookDNAPromptGenerator",
-    "ChapterPlanningPromptGenerator",
-    "ChapterPlanningInputs",
-    "BookPlanPromptGenerator",
-    "BookPlanConfig"
-]
\ No newline at end of file
+from musequill.services.backend.lazy_exports import lazy_exports
+
+# Exported name -> submodule that defines it; submodules load on first access
+_EXPORTS = {
+    "BlueprintPromptGenerator":       ".blueprint_prompt_generator",
+    "PlanningPromptGenerator":        ".planning_prompt_generator",
+    "PlanningConfig":                 ".planning_prompt_generator",
+    "ResearchPromptGenerator":        ".reseach_prompt_generator",
+    "BookSummaryPromptGenerator":     ".book_summary_prompt_generator",
+    "BookSummaryConfig":              ".book_summary_prompt_generator",
+    "generate_validation_prompt":     ".blueprint_validation_prompt_generation",
+    "TARGET_JSON_SCHEMA":             ".target_json_schema",
+    "EXPECTED_OUTPUT":                ".target_json_schema",
+    "BookDNAInputs":                  ".book_dna_prompt_generator",
+    "BookDNAPromptGenerator":         ".book_dna_prompt_generator",
+    "ChapterPlanningPromptGenerator": ".chaptet_planning_prompt_generator",
+    "ChapterPlanningInputs":          ".chaptet_planning_prompt_generator",
+    "BookPlanPromptGenerator":        ".book_plan_prompt_generator",
+    "BookPlanConfig":                 ".book_plan_prompt_generator",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,22 +1,16 @@
-from .researcher_agent_model import (
-    ResearchQuery,
-    QueryStatus,
-    ResearchResults,
-    SearchResult,
-    ProcessedChunk
-)
+from musequill.services.backend.lazy_exports import lazy_exports
 
-from .researcher_agent_config import ResearcherConfig
+# Exported name -> submodule that defines it; submodules load on first access
+_EXPORTS = {
+    "ResearchQuery":    ".researcher_agent_model",
+    "QueryStatus":      ".researcher_agent_model",
+    "ResearcherConfig": ".researcher_agent_config",
+    "ResearcherAgent":  ".researcher_agent",
+    "ResearchResults":  ".researcher_agent_model",
+    "SearchResult":     ".researcher_agent_model",
+    "ProcessedChunk":   ".researcher_agent_model",
+}
 
-from .researcher_agent import ResearcherAgent, ResearcherConfig
+__all__ = list(_EXPORTS)
 
-__all__ = [
-    "ResearchQuery",
-    "QueryStatus",
-    "ResearcherConfig",
-    "ResearcherAgent",
-    "ResearcherConfig",
-    "ResearchResults",
-    "SearchResult",
-    "ProcessedChunk"
-]
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,6 +1,12 @@
-from .redis_config import RedisClientConfig
+from musequill.services.backend.lazy_exports import lazy_exports
 
-from .redis_client import (
-    RedisClient,
-    create_redis_client
-)
\ No newline at end of file
+# Exported name -> submodule that defines it; submodules load on first access
+_EXPORTS = {
+    "RedisClientConfig":   ".redis_config",
+    "RedisClient":         ".redis_client",
+    "create_redis_client": ".redis_client",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
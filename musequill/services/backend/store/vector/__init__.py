@@ -1,14 +1,12 @@
-from .chromadb_config import (
-    ChromaDbConfig
-)
+from musequill.services.backend.lazy_exports import lazy_exports
 
-from .chromadb_client import (
-    ChromaDBClient,
-    create_chromadb_client
-)
+# Exported name -> submodule that defines it; submodules load on first access
+_EXPORTS = {
+    "ChromaDbConfig":         ".chromadb_config",
+    "ChromaDBClient":         ".chromadb_client",
+    "create_chromadb_client": ".chromadb_client",
+}
 
-__all__ = [
-    "ChromaDbConfig",
-    "ChromaDBClient",
-    "create_chromadb_client"
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,45 +1,23 @@
-from .generate_filename import (
-    generate_filename,
-)
+from musequill.services.backend.lazy_exports import lazy_exports
 
-from .time_utils import (
-    seconds_to_time_string
-)
+# Exported name -> submodule that defines it; submodules load on first access
+_EXPORTS = {
+    "generate_filename":                ".generate_filename",
+    "seconds_to_time_string":           ".time_utils",
+    "JsonStreamScanner":                ".payloads",
+    "scan_json":                        ".payloads",
+    "extract_json_array_from_response": ".payloads",
+    "extract_json_from_response":       ".payloads",
+    "is_valid_json":                    ".payloads",
+    "clean_json_string":                ".payloads",
+    "TermMatcher":                      ".term_matcher",
+    "tick":                             ".tick",
+    "dict_to_markdown":                 ".markdown",
+    "coerce_each":                      ".coercion",
+    "coerce_to_model":                  ".coercion",
+    "load_chapter_briefs":              ".loader",
+}
 
-from .payloads import (
-    extract_json_array_from_response,
-    extract_json_from_response,
-    is_valid_json,
-    clean_json_string
-)
+__all__ = list(_EXPORTS)
 
-from .tick import (
-    tick
-)
-
-from .markdown import (
-    dict_to_markdown
-)
-
-from .coercion import (
-    coerce_each,
-    coerce_to_model
-)
-
-from .loader import (
-    load_chapter_briefs
-)
-
-__all__ = [
-    'generate_filename',
-    'seconds_to_time_string',
-    'extract_json_array_from_response',
-    'extract_json_from_response',
-    'is_valid_json',
-    'clean_json_string',
-    'tick',
-    'dict_to_markdown',
-    'coerce_each',
-    'coerce_to_model',
-    'load_chapter_briefs'
-]
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
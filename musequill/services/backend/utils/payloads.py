@@ -1,6 +1,203 @@
 import json
 import re
-from typing import Optional, Dict, Any, Union
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional
+
+
+class JsonStreamScanner:
+    """
+    Incremental, string-aware scanner for the first complete top-level JSON value.
+    
+    Feed it text as it arrives (whole responses or streamed tokens). Each character
+    is examined once: brackets inside strings and escaped quotes are ignored, and
+    the scanner stops as soon as the first top-level value closes, so a caller
+    reading a token stream can stop generation right there.
+    
+    A balanced value that does not parse (e.g. ``{placeholder}`` in prose before
+    the real payload) is skipped and scanning resumes after its opening bracket.
+    An opening bracket that is never closed (``Note {oops`` before the payload)
+    can only be told apart at the end of the input: call ``finish`` then, and
+    scanning restarts just after it.
+    
+    Chunks are kept as fed and addressed by absolute offsets, so slicing out a
+    captured or final value costs its own length, not the whole stream's.
+    
+    Args:
+        opening: Characters that may start the top-level value ("{" for objects,
+                 "[" for arrays, "{[" for either)
+        capture_depth: If set (2 or more), ``feed`` also returns the text of every
+                       nested value that closes at this depth (top level is depth 1)
+    
+    Examples:
+        >>> scanner = JsonStreamScanner()
+        >>> for token in ['Sure: {"a": "}', '", "b": [1]} trailing']:
+        ...     scanner.feed(token)
+        ...     if scanner.complete:
+        ...         break
+        >>> scanner.value
+        {'a': '}', 'b': [1]}
+    """
+    
+    _STRUCTURAL = re.compile(r'["{}\[\]]')
+    _STRING_SPECIAL = re.compile(r'["\\]')
+    _CLOSERS = {'}': '{', ']': '['}
+    
+    def __init__(self, opening: str = '{', capture_depth: Optional[int] = None):
+        self.opening = opening
+        self.capture_depth = capture_depth
+        self._opening_pattern = re.compile('[' + re.escape(opening) + ']')
+        self._chunks: List[str] = []
+        self._chunk_starts: List[int] = []   # absolute offset of each kept chunk
+        self._length = 0
+        self._offset = 0            # absolute offset of the text being scanned
+        self._start: Optional[int] = None
+        self._stack: List[str] = []
+        self._capture_starts: List[int] = []
+        self._in_string = False
+        self._escape = False
+        self.complete = False
+        self.value: Any = None
+        self.text: Optional[str] = None
+    
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Scan the next piece of text.
+        
+        Returns:
+            Text of nested values closed at ``capture_depth`` within this chunk
+            (always empty when no capture depth is set)
+        """
+        captured: List[str] = []
+        if self.complete or not chunk:
+            return captured
+        
+        self._chunks.append(chunk)
+        self._chunk_starts.append(self._length)
+        self._offset = self._length
+        self._length += len(chunk)
+        self._run(chunk, captured)
+        return captured
+    
+    def finish(self) -> List[str]:
+        """
+        Mark the end of the input. If a candidate is still open, its opening
+        bracket was unbalanced: drop it and rescan from just after it.
+        
+        Returns:
+            Nested values captured by the rescan, as for ``feed``
+        """
+        captured: List[str] = []
+        while not self.complete and self._start is not None:
+            self._resume(self._reject(), captured)
+        return captured
+    
+    def _run(self, text: str, captured: List[str]) -> None:
+        resume = self._scan(text, 0, captured)
+        while resume is not None:
+            # Rejected candidate: rescan the kept text from just after its opening bracket
+            self._offset = resume
+            resume = self._scan(self._slice(resume, self._length), 0, captured)
+        if self._start is None:
+            # No open candidate: nothing fed so far can be part of a value
+            self._chunks, self._chunk_starts = [], []
+    
+    def _resume(self, resume: int, captured: List[str]) -> None:
+        """Rescan the kept text from absolute offset ``resume``."""
+        self._offset = resume
+        self._run(self._slice(resume, self._length), captured)
+    
+    def _scan(self, chunk: str, pos: int, captured: List[str]) -> Optional[int]:
+        """Advance over ``chunk``; return an absolute resume offset if the candidate was rejected."""
+        length = len(chunk)
+        
+        while pos < length and not self.complete:
+            if self._start is None:
+                match = self._opening_pattern.search(chunk, pos)
+                if match is None:
+                    return None
+                pos = match.start()
+                self._start = self._offset + pos
+                self._stack = [chunk[pos]]
+                pos += 1
+                continue
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = self._STRING_SPECIAL.search(chunk, pos)
+                if match is None:
+                    return None
+                pos = match.end()
+                if match.group() == '\\':
+                    self._escape = True
+                else:
+                    self._in_string = False
+                continue
+            
+            match = self._STRUCTURAL.search(chunk, pos)
+            if match is None:
+                return None
+            char = match.group()
+            pos = match.end()
+            
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._stack.append(char)
+                if len(self._stack) == self.capture_depth:
+                    self._capture_starts.append(self._offset + pos - 1)
+            elif self._stack.pop() != self._CLOSERS[char]:
+                # Mismatched bracket: this candidate cannot be JSON
+                return self._reject()
+            else:
+                end = self._offset + pos
+                if self._capture_starts and len(self._stack) + 1 == self.capture_depth:
+                    captured.append(self._slice(self._capture_starts.pop(), end))
+                if not self._stack:
+                    text = self._slice(self._start, end)
+                    try:
+                        self.value = json.loads(text)
+                    except json.JSONDecodeError:
+                        return self._reject()
+                    self.text = text
+                    self.complete = True
+        return None
+    
+    def _slice(self, start: int, end: int) -> str:
+        """Text between absolute offsets ``start`` and ``end``."""
+        first = bisect_right(self._chunk_starts, start) - 1
+        last = bisect_left(self._chunk_starts, end, first) - 1
+        base = self._chunk_starts[first]
+        if first == last:
+            return self._chunks[first][start - base:end - base]
+        return "".join(self._chunks[first:last + 1])[start - base:end - base]
+    
+    def _reject(self) -> int:
+        """Reset the scan state and return where to resume."""
+        resume = self._start + 1
+        self._start = None
+        self._stack = []
+        self._capture_starts = []
+        self._in_string = False
+        self._escape = False
+        return resume
+
+
+def scan_json(text: str, opening: str = '{') -> Any:
+    """
+    Return the first complete JSON value in ``text`` that starts with one of ``opening``.
+    
+    Raises:
+        json.JSONDecodeError: If no complete, parseable value is found
+    """
+    scanner = JsonStreamScanner(opening)
+    scanner.feed(text)
+    scanner.finish()
+    if not scanner.complete:
+        raise json.JSONDecodeError("No complete JSON value found", text, len(text))
+    return scanner.value
 
 
 def extract_json_from_response(input_str: str) -> Optional[Dict[str, Any]]:
@@ -11,7 +208,7 @@ def extract_json_from_response(input_str: str) -> Optional[Dict[str, Any]]:
     - JSON wrapped in markdown code blocks
     - JSON with leading/trailing text
     - Multiple JSON objects (returns the first valid one)
-    - Malformed JSON with common issues
+    - Braces and escaped quotes inside JSON strings
     
     Args:
         input_str: The input string that may contain JSON
@@ -29,135 +226,12 @@ def extract_json_from_response(input_str: str) -> Optional[Dict[str, Any]]:
     if not input_str or not isinstance(input_str, str):
         return None
     
-    # Trim whitespace
-    input_str = input_str.strip()
-    
-    if not input_str:
-        return None
-
-    # Try multiple extraction strategies
-    strategies = [
-        _extract_from_code_blocks,
-        _extract_from_braces,
-        _extract_with_regex,
-        _extract_multiline_json
-    ]
-    
-    for strategy in strategies:
-        try:
-            result = strategy(input_str)
-            if result is not None:
-                return result
-        except Exception:
-            continue
-    
-    return None
-
-
-def _extract_from_code_blocks(text: str) -> Optional[Dict[str, Any]]:
-    """Extract JSON from markdown code blocks."""
-    # Look for ```json or ``` code blocks
-    patterns = [
-        r'```json\s*(\{[\s\S]*?\})\s*```',
-        r'```\s*\n(.*?)\n```',
-        r'`(.*?)`'
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-        for match in matches:
-            try:
-                cleaned = match.strip()
-                if cleaned.startswith('{') and cleaned.endswith('}'):
-                    return json.loads(cleaned)
-            except (json.JSONDecodeError, AttributeError):
-                continue
-    
-    return None
-
-
-def _extract_from_braces(text: str) -> Optional[Dict[str, Any]]:
-    """Extract JSON by finding the first complete JSON object with braces."""
-    # Find the first opening brace
-    start = text.find('{')
-    if start == -1:
-        return None
-    
-    # Find the matching closing brace
-    brace_count = 0
-    end = start
-    
-    for i in range(start, len(text)):
-        if text[i] == '{':
-            brace_count += 1
-        elif text[i] == '}':
-            brace_count -= 1
-            if brace_count == 0:
-                end = i + 1
-                break
-    
-    if brace_count != 0:
-        # Try to find the last closing brace
-        end = text.rfind('}') + 1
-        if end <= start:
-            return None
-    
     try:
-        json_str = text[start:end]
-        return json.loads(json_str)
+        return scan_json(input_str, '{')
     except json.JSONDecodeError:
         return None
 
 
-def _extract_with_regex(text: str) -> Optional[Dict[str, Any]]:
-    """Extract JSON using regex patterns."""
-    # Pattern to match JSON objects (basic)
-    json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-    
-    matches = re.findall(json_pattern, text, re.DOTALL)
-    
-    for match in matches:
-        try:
-            return json.loads(match.strip())
-        except json.JSONDecodeError:
-            continue
-    
-    return None
-
-
-def _extract_multiline_json(text: str) -> Optional[Dict[str, Any]]:
-    """Handle multiline JSON with proper brace matching."""
-    lines = text.split('\n')
-    json_lines = []
-    in_json = False
-    brace_count = 0
-    
-    for line in lines:
-        line = line.strip()
-        
-        # Start collecting when we see an opening brace
-        if '{' in line and not in_json:
-            in_json = True
-            json_lines.append(line)
-            brace_count += line.count('{') - line.count('}')
-        elif in_json:
-            json_lines.append(line)
-            brace_count += line.count('{') - line.count('}')
-            
-            # Stop when braces are balanced
-            if brace_count == 0:
-                break
-    
-    if json_lines and brace_count == 0:
-        try:
-            json_str = '\n'.join(json_lines)
-            return json.loads(json_str)
-        except json.JSONDecodeError:
-            pass
-    
-    return None
-
-
 # Additional utility functions
 def extract_json_array_from_response(input_str: str) -> Optional[list]:
     """
@@ -172,22 +246,10 @@ def extract_json_array_from_response(input_str: str) -> Optional[list]:
     if not input_str or not isinstance(input_str, str):
         return None
     
-    input_str = input_str.strip()
-    
-    # Find array brackets
-    start = input_str.find('[')
-    end = input_str.rfind(']') + 1
-    
-    if start >= 0 and end > start:
-        try:
-            json_str = input_str[start:end]
-            result = json.loads(json_str)
-            if isinstance(result, list):
-                return result
-        except json.JSONDecodeError:
-            pass
-    
-    return None
+    try:
+        return scan_json(input_str, '[')
+    except json.JSONDecodeError:
+        return None
 
 
 def is_valid_json(text: str) -> bool:
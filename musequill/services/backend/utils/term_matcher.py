@@ -0,0 +1,100 @@
+from __future__ import annotations
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class TermMatcher:
+    """
+    Case-insensitive multi-term substring matcher (Aho-Corasick).
+
+    The automaton is built once from a fixed set of terms; each search is a
+    single linear pass over the text no matter how many terms there are,
+    instead of one ``term in text`` scan per term. Failure links are folded
+    into a full transition table at build time, so the scan does one dict
+    lookup per character.
+
+    Args:
+        terms: Terms to find; empty strings are ignored, duplicates collapse
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: Tuple[str, ...] = tuple(dict.fromkeys(t for t in terms if t))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, term in enumerate(self.terms):
+            state = 0
+            for char in term.lower():
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (index,)
+
+        # Breadth-first failure links; outputs of the fallback state are inherited
+        order: List[int] = []
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+        # Deterministic transitions: a state's moves are its failure state's, plus its own edges
+        self._delta: List[Dict[str, int]] = [{}] * len(self._goto)
+        self._delta[0] = dict(self._goto[0])
+        for state in order:
+            moves = dict(self._delta[self._fail[state]])
+            moves.update(self._goto[state])
+            self._delta[state] = moves
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __bool__(self) -> bool:
+        return bool(self.terms)
+
+    def finditer(self, text: str, lowered: bool = False) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield ``(start, end, term)`` for every occurrence, overlapping ones included.
+
+        Pass ``lowered=True`` when ``text`` is already lower-cased to skip the copy.
+        """
+        if not self.terms:
+            return
+        haystack = text if lowered else text.lower()
+        delta, out, terms = self._delta, self._out, self.terms
+        state = 0
+        for pos, char in enumerate(haystack):
+            state = delta[state].get(char, 0)
+            for index in out[state]:
+                term = terms[index]
+                yield pos + 1 - len(term), pos + 1, term
+
+    def find_all(self, text: str, lowered: bool = False) -> List[Tuple[int, int, str]]:
+        return list(self.finditer(text, lowered))
+
+    def present(self, text: str, lowered: bool = False) -> Set[str]:
+        """Distinct terms that occur in ``text``."""
+        if not self.terms:
+            return set()
+        haystack = text if lowered else text.lower()
+        delta, out = self._delta, self._out
+        found: Set[int] = set()
+        state = 0
+        for char in haystack:
+            state = delta[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return {self.terms[index] for index in found}
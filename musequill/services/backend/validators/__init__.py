@@ -1,19 +1,16 @@
-from .plan_baseline import (
-    PlanBaselines
-)
+from musequill.services.backend.lazy_exports import lazy_exports
 
-from .plan_validation_results import (
-    ValidationIssue,
-    ValidationResult
-)
+# Exported name -> submodule that defines it; submodules load on first access
+_EXPORTS = {
+    "validate_plan_against_baselines": ".plan_validator",
+    "ValidationIssue":                 ".plan_validation_results",
+    "ValidationResult":                ".plan_validation_results",
+    "PlanBaselines":                   ".plan_baseline",
+    "PlanTextIndex":                   ".plan_index",
+    "PlanFragmentRepairer":            ".plan_repair",
+    "RepairOutcome":                   ".plan_repair",
+}
 
-from .plan_validator import (
-    validate_plan_against_baselines
-)
+__all__ = list(_EXPORTS)
 
-__all__ = [
-    "validate_plan_against_baselines",
-    "ValidationIssue",
-    "ValidationResult",
-    "PlanBaselines"
-]
\ No newline at end of file
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from musequill.services.backend.utils.term_matcher import TermMatcher
+from musequill.services.backend.writers.chapter_planning_model import GenericPlan
+
+from .plan_validation_results import PlanPath
+
+
+@lru_cache(maxsize=32)
+def _matcher(terms: FrozenSet[str]) -> TermMatcher:
+    # Baselines rarely change between attempts, so the automaton is reused
+    return TermMatcher(sorted(terms))
+
+
+def _plan_sections(plan: GenericPlan) -> Dict[PlanPath, str]:
+    """Searchable text per plan fragment, in the order the validator has always read it."""
+    sections: Dict[PlanPath, str] = {("logline",): plan.logline or ""}
+    sections[("themes",)] = " ".join(plan.themes or [])
+    sections[("project",)] = "\n".join(filter(None, (plan.project.genre, plan.project.sub_genre)))
+    wb = plan.world_bible
+    sections[("world_bible",)] = "\n".join(filter(None, (wb.setting, wb.time_period, wb.technology)))
+    for name, c in (plan.characters or {}).items():
+        sections[("characters", name)] = "\n".join([name, c.description or "", *(c.goals or [])])
+    for i, b in enumerate(plan.hero_journey_beats or []):
+        sections[("hero_journey_beats", i)] = f"{b.beat}\n{b.description}"
+    for i, ch in enumerate(plan.chapter_outline or []):
+        sections[("chapter_outline", i)] = f"{ch.title}\n{ch.description}"
+    return sections
+
+
+class PlanTextIndex:
+    """
+    Lower-cased plan text and baseline-term hits, built in one pass.
+
+    Every section (logline, one character, one chapter, ...) is lower-cased once
+    and scanned once by an Aho-Corasick automaton over all terms, so presence
+    checks are set lookups and each hit knows which section it came from.
+
+    Args:
+        plan: Validated plan
+        terms: Every term any check will ask about (entities, forbidden, keywords)
+    """
+
+    def __init__(self, plan: GenericPlan, terms: Iterable[str]):
+        self.sections: Dict[PlanPath, str] = {
+            path: text.lower() for path, text in _plan_sections(plan).items()
+        }
+        self.matcher = _matcher(frozenset(t for t in terms if t))
+        self.hits: Dict[PlanPath, Set[str]] = {}
+        for path, text in self.sections.items():
+            found = self.matcher.present(text, lowered=True)
+            if found:
+                self.hits[path] = found
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.sections.values())
+
+    def present(self, terms: Iterable[str], section: Optional[PlanPath] = None) -> Set[str]:
+        """Subset of ``terms`` found in the plan (or in one section)."""
+        wanted = set(terms)
+        sources = [self.hits.get(section, set())] if section is not None else self.hits.values()
+        found: Set[str] = set()
+        for hits in sources:
+            found |= hits & wanted
+        return found
+
+    def contains_any(self, terms: Iterable[str], section: Optional[PlanPath] = None) -> bool:
+        return bool(self.present(terms, section))
+
+    def where(self, terms: Iterable[str]) -> List[PlanPath]:
+        """Sections mentioning any of ``terms``, in plan order."""
+        wanted = set(terms)
+        return [path for path, hits in self.hits.items() if hits & wanted]
@@ -0,0 +1,369 @@
+from __future__ import annotations
+import asyncio
+import inspect
+import json
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from musequill.services.backend.planner.constrained import ollama_format_schema
+from musequill.services.backend.utils.payloads import scan_json
+from musequill.services.backend.writers.chapter_planning_model import GenericPlan
+
+from .plan_baseline import PlanBaselines
+from .plan_validation_results import PlanPath, ValidationIssue
+
+# Issues fixed by assignment, without asking the model
+_IDENTITY_CODES = {"consistency.title", "consistency.author", "consistency.required_empty"}
+
+FragmentGenerator = Callable[[str, "Fragment"], Union[str, Awaitable[str]]]
+
+
+@dataclass
+class Fragment:
+    """One sub-object of a plan to regenerate, with the problems found in it."""
+    path: PlanPath
+    current: Any
+    problems: List[str]
+    schema: Dict[str, Any]
+
+    @property
+    def label(self) -> str:
+        return "".join(f"[{p}]" if isinstance(p, int) else (f".{p}" if i else p)
+                       for i, p in enumerate(self.path))
+
+
+@dataclass
+class RepairOutcome:
+    """Result of one fragment-repair pass over a plan."""
+    plan: Dict[str, Any]
+    applicable: bool = True
+    fixed: List[PlanPath] = field(default_factory=list)      # set directly from baselines
+    repaired: List[PlanPath] = field(default_factory=list)   # regenerated and spliced back in
+    failed: List[PlanPath] = field(default_factory=list)     # model output could not be used
+    unresolved: List[ValidationIssue] = field(default_factory=list)
+    prompt_chars: int = 0
+    response_chars: int = 0
+
+    @property
+    def approx_tokens(self) -> int:
+        return (self.prompt_chars + self.response_chars) // 4
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.fixed or self.repaired)
+
+
+def fragment_path(plan: Dict[str, Any], path: Iterable[Union[str, int]]) -> Optional[PlanPath]:
+    """
+    Smallest self-contained sub-object that owns ``path``.
+
+    List entries and map values that are themselves objects (one chapter, one
+    character) are fragments of their own; anything else is owned by its
+    top-level field. Returns None for whole-plan errors.
+    """
+    path = tuple(path)
+    if not path or not isinstance(path[0], str):
+        return None
+    head = path[0]
+    value = plan.get(head) if isinstance(plan, dict) else None
+    if len(path) > 1:
+        key = path[1]
+        if isinstance(value, list) and isinstance(key, int) and 0 <= key < len(value):
+            return (head, key)
+        if isinstance(value, dict) and isinstance(value.get(key), (dict, list)):
+            return (head, key)
+    return (head,)
+
+
+def schema_issues(errors: Iterable[Any]) -> List[ValidationIssue]:
+    """``jsonschema`` errors -> issues whose paths point at the offending value."""
+    issues = []
+    for error in errors:
+        path = tuple(error.absolute_path)
+        if error.validator == "required" and isinstance(error.instance, dict):
+            missing = [name for name in error.validator_value if name not in error.instance]
+            paths = [path + (name,) for name in missing] or [path]
+        else:
+            paths = [path]
+        issues.append(ValidationIssue("error", "schema.invalid", error.message, paths))
+    return issues
+
+
+def pydantic_issues(error: Any) -> List[ValidationIssue]:
+    """Pydantic ``ValidationError`` -> issues keyed by each error's ``loc``."""
+    return [
+        ValidationIssue("error", "schema.invalid", f"{e.get('loc')} -> {e.get('msg')}",
+                        [tuple(e.get("loc") or ())])
+        for e in error.errors()
+    ]
+
+
+def _get(node: Any, path: PlanPath) -> Any:
+    for part in path:
+        if isinstance(node, dict):
+            node = node.get(part)
+        elif isinstance(node, list) and isinstance(part, int) and 0 <= part < len(node):
+            node = node[part]
+        else:
+            return None
+    return node
+
+
+def _set(node: Any, path: PlanPath, value: Any) -> None:
+    for part in path[:-1]:
+        if isinstance(node, dict):
+            node = node.setdefault(part, {})
+        else:
+            node = node[part]
+    node[path[-1]] = value
+
+
+class PlanFragmentRepairer:
+    """
+    Regenerates only the parts of a plan that failed validation.
+
+    Each issue's paths are mapped to fragments (one chapter outline entry, one
+    character, the logline, ...). Every fragment gets a short prompt with its
+    current value, the problems, nearby context and its slice of the schema;
+    the answer is spliced back into the plan. A repair costs a few hundred
+    tokens per fragment instead of a full plan regeneration.
+
+    Issues without a usable path (whole-plan errors) make the pass
+    inapplicable, so callers can fall back to regenerating the full plan.
+
+    Args:
+        schema: Root JSON Schema of the plan (defaults to GenericPlan)
+        baselines: Hard constraints to restate in fragment prompts and to fix identity fields
+        pinned_keys: Keys of list entries kept from the original (e.g. chapter numbers)
+        max_fragments: Above this many fragments a full regeneration is cheaper
+    """
+
+    def __init__(
+        self,
+        schema: Optional[Dict[str, Any]] = None,
+        baselines: Optional[PlanBaselines] = None,
+        pinned_keys: Tuple[str, ...] = ("chapter",),
+        max_fragments: int = 8,
+    ):
+        self.schema = ollama_format_schema(schema or GenericPlan.model_json_schema())
+        self.baselines = baselines
+        self.pinned_keys = pinned_keys
+        self.max_fragments = max_fragments
+
+    # ---------- Planning ----------
+
+    def fragments(self, plan: Dict[str, Any], issues: Iterable[ValidationIssue]
+                  ) -> Tuple[List[Fragment], List[ValidationIssue]]:
+        """Group issues by fragment; returns (fragments, issues that map to none)."""
+        problems: Dict[PlanPath, List[str]] = {}
+        unresolved: List[ValidationIssue] = []
+        for issue in issues:
+            if issue.code in _IDENTITY_CODES and self.baselines is not None:
+                continue
+            paths = [fragment_path(plan, p) for p in issue.paths]
+            if not paths or None in paths:
+                unresolved.append(issue)
+                continue
+            for path in paths:
+                problems.setdefault(path, []).append(issue.message)
+
+        # A fragment inside another one is regenerated with its parent
+        selected: Dict[PlanPath, List[str]] = {}
+        for path in sorted(problems, key=len):
+            parent = next((p for p in selected if path[:len(p)] == p), None)
+            if parent is None:
+                selected[path] = list(dict.fromkeys(problems[path]))
+            else:
+                selected[parent].extend(m for m in problems[path] if m not in selected[parent])
+
+        return [
+            Fragment(path, deepcopy(_get(plan, path)), messages, self._subschema(path))
+            for path, messages in selected.items()
+        ], unresolved
+
+    def _subschema(self, path: PlanPath) -> Dict[str, Any]:
+        node = self.schema
+        for part in path:
+            for option in node.get("anyOf", ()):
+                if option.get("type") != "null":
+                    node = option
+                    break
+            if isinstance(part, int):
+                node = node.get("items", {})
+            else:
+                extra = node.get("additionalProperties")
+                node = node.get("properties", {}).get(part, extra if isinstance(extra, dict) else {})
+        return node
+
+    # ---------- Deterministic fixes ----------
+
+    def _fix_identity(self, plan: Dict[str, Any], issues: Iterable[ValidationIssue]) -> List[PlanPath]:
+        b = self.baselines
+        if b is None:
+            return []
+        fixed = []
+        for issue in issues:
+            if issue.code not in _IDENTITY_CODES:
+                continue
+            for path in issue.paths:
+                if not path:
+                    continue
+                if issue.code == "consistency.title":
+                    value = b.title
+                elif issue.code == "consistency.author":
+                    value = b.author
+                else:
+                    value = deepcopy(b.require_empty_fields.get(tuple(path)))
+                _set(plan, path, value)
+                fixed.append(path)
+        return fixed
+
+    # ---------- Prompting ----------
+
+    def build_prompt(self, plan: Dict[str, Any], fragment: Fragment) -> str:
+        """Focused prompt for one fragment: context, current value, problems, schema."""
+        project = plan.get("project") if isinstance(plan.get("project"), dict) else {}
+        lines = [
+            "You are repairing ONE fragment of a JSON book plan. The rest of the plan is fixed.",
+            f'Book: "{project.get("title", "")}" by {project.get("author", "")} '
+            f'({project.get("genre", "")}). Logline: {plan.get("logline", "")}',
+        ]
+        lines.extend(self._neighbours(plan, fragment.path))
+        lines.extend([
+            f"Fragment: {fragment.label}",
+            "Current value: " + json.dumps(fragment.current, ensure_ascii=False),
+            "Problems to fix:",
+            *(f"- {message}" for message in fragment.problems),
+        ])
+        lines.extend(self._constraints(fragment.path))
+        lines.extend([
+            "Fragment JSON Schema: " + json.dumps(fragment.schema, ensure_ascii=False, separators=(",", ":")),
+            'Return ONLY {"fragment": <corrected value>} as JSON. No prose, no markdown.',
+        ])
+        return "\n".join(lines)
+
+    def _neighbours(self, plan: Dict[str, Any], path: PlanPath) -> List[str]:
+        if len(path) != 2:
+            return []
+        siblings = plan.get(path[0])
+        if isinstance(siblings, list) and isinstance(path[1], int):
+            around = [
+                (i, siblings[i]) for i in (path[1] - 1, path[1] + 1)
+                if 0 <= i < len(siblings) and isinstance(siblings[i], dict)
+            ]
+            return [f"Neighbour {path[0]}[{i}]: {entry.get('title') or entry.get('beat') or ''}"
+                    for i, entry in around]
+        if isinstance(siblings, dict):
+            others = [name for name in siblings if name != path[1]]
+            return [f"Other {path[0]}: {', '.join(map(str, others))}"] if others else []
+        return []
+
+    def _constraints(self, path: PlanPath) -> List[str]:
+        b = self.baselines
+        if b is None:
+            return []
+        rules = []
+        head = path[0]
+        if b.forbidden_terms:
+            rules.append(f"Never mention: {sorted(b.forbidden_terms)}.")
+        if head == "project" and b.allowed_genres:
+            rules.append(f"project.genre must be one of {sorted(b.allowed_genres)}.")
+        if head == "characters" and b.required_entities:
+            rules.append(f"characters must include {sorted(b.required_entities)}.")
+        if head == "characters" and len(path) == 1:
+            rules.append(f"Provide at least {b.min_characters} characters.")
+        if head == "chapter_outline" and len(path) == 1:
+            rules.append(f"Provide {b.min_chapters}-{b.max_chapters} chapters numbered from 1.")
+        if head == "chapter_outline" and len(path) > 1:
+            rules.append("Description: 2-3 specific sentences; title distinct from other chapters.")
+        if head == "hero_journey_beats" and len(path) == 1:
+            rules.append(f"Provide at least {b.min_beats} beats.")
+        if head == "themes" and b.preferred_theme_keywords:
+            rules.append(f"Prefer themes touching {sorted(b.preferred_theme_keywords)}.")
+        if head == "world_bible" and b.preferred_setting_keywords:
+            rules.append(f"Setting should reference {sorted(b.preferred_setting_keywords)}.")
+        if head == "logline":
+            rules.append(f"At most {b.max_logline_chars} characters.")
+        return ["Hard rules:", *(f"- {rule}" for rule in rules)] if rules else []
+
+    # ---------- Splicing ----------
+
+    def splice(self, plan: Dict[str, Any], fragment: Fragment, response: str) -> bool:
+        """Parse a fragment answer and write it into ``plan``. Returns False if unusable."""
+        try:
+            parsed = scan_json(response, "{")
+        except json.JSONDecodeError:
+            return False
+        if isinstance(parsed, dict) and "fragment" in parsed:
+            value = parsed["fragment"]
+        elif fragment.schema.get("type") == "object":
+            value = parsed  # the model answered with the bare object
+        else:
+            return False
+        if isinstance(value, dict) and isinstance(fragment.current, dict):
+            for key in self.pinned_keys:
+                if key in fragment.current:
+                    value[key] = fragment.current[key]
+        _set(plan, fragment.path, value)
+        return True
+
+    # ---------- Driving ----------
+
+    def _prepare(self, plan: Dict[str, Any], issues: List[ValidationIssue]
+                 ) -> Tuple[RepairOutcome, List[Fragment]]:
+        plan = deepcopy(plan)
+        fragments, unresolved = self.fragments(plan, issues)
+        outcome = RepairOutcome(plan=plan, unresolved=unresolved)
+        if unresolved or len(fragments) > self.max_fragments:
+            outcome.applicable = False
+            return outcome, []
+        outcome.fixed = self._fix_identity(plan, issues)
+        if outcome.fixed:
+            # Rebuild so fragment values and prompts carry the fixed identity fields
+            fragments, _ = self.fragments(plan, issues)
+        return outcome, fragments
+
+    def _apply(self, outcome: RepairOutcome, fragment: Fragment, prompt: str, response: Any) -> None:
+        outcome.prompt_chars += len(prompt)
+        if isinstance(response, BaseException) or not isinstance(response, str):
+            outcome.failed.append(fragment.path)
+            return
+        outcome.response_chars += len(response)
+        if self.splice(outcome.plan, fragment, response):
+            outcome.repaired.append(fragment.path)
+        else:
+            outcome.failed.append(fragment.path)
+
+    async def repair(self, plan: Dict[str, Any], issues: List[ValidationIssue],
+                     generate: FragmentGenerator) -> RepairOutcome:
+        """
+        Repair ``plan`` (not modified) fragment by fragment; fragments are generated concurrently.
+
+        ``generate(prompt, fragment)`` returns the model's text, or an awaitable of it.
+        """
+        outcome, fragments = self._prepare(plan, issues)
+        prompts = [self.build_prompt(outcome.plan, f) for f in fragments]
+
+        async def run(prompt: str, fragment: Fragment) -> str:
+            result = generate(prompt, fragment)
+            return await result if inspect.isawaitable(result) else result
+
+        responses = await asyncio.gather(*(run(p, f) for p, f in zip(prompts, fragments)),
+                                         return_exceptions=True)
+        for fragment, prompt, response in zip(fragments, prompts, responses):
+            self._apply(outcome, fragment, prompt, response)
+        return outcome
+
+    def repair_sync(self, plan: Dict[str, Any], issues: List[ValidationIssue],
+                    generate: Callable[[str, Fragment], str]) -> RepairOutcome:
+        """Blocking variant of :meth:`repair` for synchronous callers."""
+        outcome, fragments = self._prepare(plan, issues)
+        for fragment in fragments:
+            prompt = self.build_prompt(outcome.plan, fragment)
+            try:
+                response: Any = generate(prompt, fragment)
+            except Exception as e:
+                response = e
+            self._apply(outcome, fragment, prompt, response)
+        return outcome
@@ -1,11 +1,14 @@
-from dataclasses import dataclass
-from typing import List, Literal, Optional
+from dataclasses import dataclass, field
+from typing import List, Literal, Optional, Tuple, Union
+
+PlanPath = Tuple[Union[str, int], ...]
 
 @dataclass
 class ValidationIssue:
     severity: Literal["error","warn"]   # "error" reduces validity; "warn" reduces score
     code: str                           # machine-friendly
     message: str                        # human-friendly, concise
+    paths: List[PlanPath] = field(default_factory=list)  # offending locations in the plan JSON, if known
 
 @dataclass
 class ValidationResult:
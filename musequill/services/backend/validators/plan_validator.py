@@ -1,5 +1,5 @@
 import re
-from typing import Iterable, List, Optional
+from typing import List, Optional
 from pydantic import ValidationError
 
 from musequill.services.backend.writers.chapter_planning_model import GenericPlan
@@ -7,7 +7,8 @@ from .plan_validation_results import (
     ValidationIssue,
     ValidationResult
 )
-from .plan_baseline import PlanBaselines   
+from .plan_baseline import PlanBaselines
+from .plan_index import PlanTextIndex   
 
 # Reuse your GenericPlan model
 # from yourmodule import GenericPlan
@@ -80,29 +81,8 @@ def _make_refined_prompt(
     )
 
 
-def _contains_any(text: str, needles: Iterable[str]) -> bool:
-    t = text.lower()
-    return any(n.lower() in t for n in needles if n)
-
-def _collect_text(plan: GenericPlan) -> str:
-    parts = [plan.logline or ""]
-    parts.extend(plan.themes or [])
-    parts.append(plan.project.genre or "")
-    parts.append(plan.project.sub_genre or "" if plan.project.sub_genre else "")
-    parts.append(plan.world_bible.setting or "")
-    parts.append(plan.world_bible.time_period or "" if plan.world_bible.time_period else "")
-    parts.append(plan.world_bible.technology or "" if plan.world_bible.technology else "")
-    for c_name, c in (plan.characters or {}).items():
-        parts.append(c_name)
-        parts.append(c.description or "")
-        parts.extend(c.goals or [])
-    for b in (plan.hero_journey_beats or []):
-        parts.append(b.beat)
-        parts.append(b.description)
-    for ch in (plan.chapter_outline or []):
-        parts.append(ch.title)
-        parts.append(ch.description)
-    return "\n".join(parts)
+def _label(path: tuple) -> str:
+    return "".join(f"[{p}]" if isinstance(p, int) else (f".{p}" if i else p) for i, p in enumerate(path))
 
 def validate_plan_against_baselines(
     plan_json: dict,
@@ -118,7 +98,8 @@ def validate_plan_against_baselines(
             issues.append(ValidationIssue(
                 severity="error",
                 code="schema.invalid",
-                message=f"{e.get('loc')} -> {e.get('msg')}"
+                message=f"{e.get('loc')} -> {e.get('msg')}",
+                paths=[tuple(e.get('loc') or ())]
             ))
         return ValidationResult(
             is_valid=False, score=0.0, issues=issues, regenerate=True,
@@ -138,46 +119,62 @@ def validate_plan_against_baselines(
     # chapters unique handled by your model; we add some basic thresholds
     if len(plan.characters) < baselines.min_characters:
         issues.append(ValidationIssue("error","structure.characters.min",
-            f"characters has {len(plan.characters)} but requires at least {baselines.min_characters}."))
+            f"characters has {len(plan.characters)} but requires at least {baselines.min_characters}.",
+            [("characters",)]))
     if len(plan.chapter_outline) < baselines.min_chapters:
         issues.append(ValidationIssue("error","structure.chapters.min",
-            f"chapter_outline has {len(plan.chapter_outline)} but requires at least {baselines.min_chapters}."))
+            f"chapter_outline has {len(plan.chapter_outline)} but requires at least {baselines.min_chapters}.",
+            [("chapter_outline",)]))
     if baselines.max_chapters and len(plan.chapter_outline) > baselines.max_chapters:
         issues.append(ValidationIssue("warn","structure.chapters.max",
-            f"chapter_outline has {len(plan.chapter_outline)} which exceeds preferred maximum {baselines.max_chapters}."))
+            f"chapter_outline has {len(plan.chapter_outline)} which exceeds preferred maximum {baselines.max_chapters}.",
+            [("chapter_outline",)]))
     if len(plan.hero_journey_beats) < baselines.min_beats:
         issues.append(ValidationIssue("warn","structure.beats.min",
-            f"hero_journey_beats has {len(plan.hero_journey_beats)} but {baselines.min_beats}+ is preferred."))
+            f"hero_journey_beats has {len(plan.hero_journey_beats)} but {baselines.min_beats}+ is preferred.",
+            [("hero_journey_beats",)]))
 
     # 3) Consistency checks vs baselines (identity, genre, entities, forbidden)
     if baselines.title and plan.project.title.strip() != baselines.title.strip():
         issues.append(ValidationIssue("error","consistency.title",
-            f'project.title "{plan.project.title}" must equal "{baselines.title}".'))
+            f'project.title "{plan.project.title}" must equal "{baselines.title}".',
+            [("project", "title")]))
     if baselines.author and plan.project.author.strip() != baselines.author.strip():
         issues.append(ValidationIssue("error","consistency.author",
-            f'project.author "{plan.project.author}" must equal "{baselines.author}".'))
+            f'project.author "{plan.project.author}" must equal "{baselines.author}".',
+            [("project", "author")]))
 
     if baselines.allowed_genres and plan.project.genre not in baselines.allowed_genres:
         issues.append(ValidationIssue("error","consistency.genre.allowed",
-            f'project.genre "{plan.project.genre}" not in allowed_genres {sorted(baselines.allowed_genres)}.'))
+            f'project.genre "{plan.project.genre}" not in allowed_genres {sorted(baselines.allowed_genres)}.',
+            [("project", "genre")]))
     if baselines.disallowed_genres and plan.project.genre in baselines.disallowed_genres:
         issues.append(ValidationIssue("error","consistency.genre.disallowed",
-            f'project.genre "{plan.project.genre}" is disallowed.'))
-
-    all_text = _collect_text(plan)
+            f'project.genre "{plan.project.genre}" is disallowed.',
+            [("project", "genre")]))
+
+    # One lower-cased pass over the plan answers every term check below
+    index = PlanTextIndex(plan, (
+        *baselines.required_entities, *baselines.forbidden_terms,
+        *baselines.preferred_theme_keywords, *baselines.preferred_setting_keywords,
+    ))
     # Required entities: must appear either as a character key or in text
+    found_entities = index.present(baselines.required_entities)
     for ent in baselines.required_entities:
         in_chars = ent in plan.characters
-        in_text = ent.lower() in all_text.lower()
+        in_text = ent in found_entities
         if not (in_chars or in_text):
             issues.append(ValidationIssue("error","consistency.entity.missing",
-                f'Required entity "{ent}" not found in characters or text.'))
+                f'Required entity "{ent}" not found in characters or text.',
+                [("characters",)]))
 
     # Forbidden terms
-    if baselines.forbidden_terms and _contains_any(all_text, baselines.forbidden_terms):
-        bad = [t for t in baselines.forbidden_terms if t.lower() in all_text.lower()]
+    bad = index.present(baselines.forbidden_terms)
+    if bad:
+        where = index.where(bad)
         issues.append(ValidationIssue("error","consistency.forbidden.terms",
-            f"Forbidden terms present: {sorted(set(bad))}."))
+            f"Forbidden terms present: {sorted(bad)} in {', '.join(_label(p) for p in where)}.",
+            where))
 
     # Required empty fields (path -> []), if you later add such fields
     for path, required_value in baselines.require_empty_fields.items():
@@ -190,38 +187,52 @@ def validate_plan_against_baselines(
                 break
         if val != required_value:
             issues.append(ValidationIssue("error","consistency.required_empty",
-                f'Field {".".join(path)} must equal {required_value}, got {val}.'))
+                f'Field {".".join(path)} must equal {required_value}, got {val}.',
+                [tuple(path)]))
 
     # 4) Completeness & specificity
     if len(plan.themes) == 0:
-        issues.append(ValidationIssue("warn","completeness.themes.empty","themes is empty."))
+        issues.append(ValidationIssue("warn","completeness.themes.empty","themes is empty.",
+            [("themes",)]))
 
     # Mild heuristic: chapter titles should be unique and >= 60% unique
     titles = [c.title.strip().lower() for c in plan.chapter_outline]
     unique_ratio = len(set(titles)) / max(1, len(titles))
     if unique_ratio < 0.6:
+        seen_titles = set()
+        repeated = []
+        for i, title in enumerate(titles):
+            if title in seen_titles:
+                repeated.append(("chapter_outline", i))
+            seen_titles.add(title)
         issues.append(ValidationIssue("warn","completeness.ch_titles.low_var",
-            f"Only {unique_ratio:.0%} of chapter titles are unique; increase variety."))
+            f"Only {unique_ratio:.0%} of chapter titles are unique; increase variety.",
+            repeated))
 
     # Preferred signals
-    if baselines.preferred_theme_keywords and not _contains_any(" ".join(plan.themes), baselines.preferred_theme_keywords):
+    if baselines.preferred_theme_keywords and not index.contains_any(baselines.preferred_theme_keywords, ("themes",)):
         issues.append(ValidationIssue("warn","completeness.themes.bias",
-            f"themes lacks preferred keywords {sorted(baselines.preferred_theme_keywords)}."))
+            f"themes lacks preferred keywords {sorted(baselines.preferred_theme_keywords)}.",
+            [("themes",)]))
 
-    if baselines.preferred_setting_keywords and not _contains_any(all_text, baselines.preferred_setting_keywords):
+    if baselines.preferred_setting_keywords and not index.contains_any(baselines.preferred_setting_keywords):
         issues.append(ValidationIssue("warn","completeness.setting.bias",
-            f"text lacks preferred setting keywords {sorted(baselines.preferred_setting_keywords)}."))
+            f"text lacks preferred setting keywords {sorted(baselines.preferred_setting_keywords)}.",
+            [("world_bible",)]))
 
     # 5) Style/Hygiene
     if plan.logline and len(plan.logline) > baselines.max_logline_chars:
         issues.append(ValidationIssue("warn","style.logline.too_long",
-            f"logline exceeds {baselines.max_logline_chars} chars; tighten."))
+            f"logline exceeds {baselines.max_logline_chars} chars; tighten.",
+            [("logline",)]))
 
     # Penalize very short descriptions (weak specificity)
-    short_desc_ch = sum(1 for c in plan.chapter_outline if len(c.description) < 40)
+    short_desc_paths = [("chapter_outline", i) for i, c in enumerate(plan.chapter_outline) if len(c.description) < 40]
+    short_desc_ch = len(short_desc_paths)
     if short_desc_ch > 0:
         issues.append(ValidationIssue("warn","style.chapter.desc.short",
-            f"{short_desc_ch} chapter descriptions are very short; add specificity."))
+            f"{short_desc_ch} chapter descriptions are very short; add specificity.",
+            short_desc_paths))
 
     # ---------- Compute score and decision ----------
     def subtract(weight_key: str, fraction: float):
@@ -1,48 +1,21 @@
-from .chapter_planning import generate_chapter_plan
-
-from .chapter_planning_validation import (
-    ValidationPolicy,
-    validate_output_generic,
-    ValidationError
-)
-
-from .chapter_planning_model import (
-    GenericPlan,
-    Chapter
-)
-
-from .book_planning_model import (
-    GenericBookPlan
-)
-
-from .chapter_brief_model import (
-    GenericChapterBrief
-)
-
-from .research_model import (
-    RefinedResearch
-)
-
-from .chapter_critic import (
-    ChapterCritic
-)
-
-from .context_manager import (
-    EnhancedContextManager,
-    create_enhanced_context_manager
-)
-
-__all__ = [
-    "generate_chapter_plan",
-    "ValidationPolicy",
-    "validate_output_generic",
-    "ValidationError",
-    "GenericPlan",
-    "Chapter",
-    "GenericBookPlan",
-    "GenericChapterBrief",
-    "RefinedResearch",
-    "ChapterCritic",
-    "EnhancedContextManager",
-    "create_enhanced_context_manager"
-]
+from musequill.services.backend.lazy_exports import lazy_exports
+
+# Exported name -> submodule that defines it; submodules load on first access
+_EXPORTS = {
+    "generate_chapter_plan":           ".chapter_planning",
+    "ValidationPolicy":                ".chapter_planning_validation",
+    "validate_output_generic":         ".chapter_planning_validation",
+    "ValidationError":                 ".chapter_planning_validation",
+    "GenericPlan":                     ".chapter_planning_model",
+    "Chapter":                         ".chapter_planning_model",
+    "GenericBookPlan":                 ".book_planning_model",
+    "GenericChapterBrief":             ".chapter_brief_model",
+    "RefinedResearch":                 ".research_model",
+    "ChapterCritic":                   ".chapter_critic",
+    "EnhancedContextManager":          ".context_manager",
+    "create_enhanced_context_manager": ".context_manager",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+import hashlib
+import json
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+def fingerprint(obj: Any) -> str:
+    """Content hash of a model, dict/list tree or string (pydantic models hash their JSON dump)."""
+    if isinstance(obj, str):
+        data = obj
+    elif hasattr(obj, "model_dump_json"):
+        data = obj.model_dump_json()
+    else:
+        data = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=_jsonable)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _jsonable(obj: Any) -> Any:
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+class ArtifactCache:
+    """
+    Rendered summaries and prompt fragments of a run's immutable artifacts.
+
+    ``get(name, obj, render)`` renders ``obj`` once per fragment name. An
+    object seen before is found by identity without re-hashing it; a new
+    object is fingerprinted, so an equal copy (a context dict rebuilt for
+    each chapter, say) reuses the earlier rendering. The cache holds a
+    reference to every object it has seen so identities stay valid; keep one
+    per run (ChapterCritic and EnhancedContextManager each own one) and call
+    ``clear`` if an artifact is edited in place.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[Tuple[str, int], Tuple[Any, Any]] = {}
+        self._by_content: Dict[Tuple[str, str], Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._by_content)
+
+    def get(self, name: str, obj: Any, render: Callable[[Any], T]) -> T:
+        entry = self._by_id.get((name, id(obj)))
+        if entry is not None and entry[0] is obj:
+            self.hits += 1
+            return entry[1]
+
+        key = (name, fingerprint(obj))
+        value = self._by_content.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            value = self._by_content[key] = render(obj)
+        else:
+            self.hits += 1
+        self._by_id[(name, id(obj))] = (obj, value)
+        return value
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._by_content.clear()
+
+
+def cached_fragment(ctx: Dict[str, Any], name: str, obj: Any, render: Callable[[Any], T]) -> T:
+    """``render(obj)`` through the context's ``artifact_cache``, or directly if it has none."""
+    cache = ctx.get("artifact_cache")
+    return cache.get(name, obj, render) if cache is not None else render(obj)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from musequill.services.backend.utils.term_matcher import TermMatcher
+
+BANNED = "banned"
+CHARACTER = "character"
+THREAD = "thread"
+
+# Up to this many terms, one C-level str.find sweep per term beats the
+# pure-Python automaton walk; above it the automaton's single pass wins
+DIRECT_SEARCH_MAX_TERMS = 256
+
+# Thread descriptions are long; the feedback check has always matched their first 20 characters
+THREAD_KEY_CHARS = 20
+
+
+def thread_key(thread: str) -> str:
+    return (thread or "")[:THREAD_KEY_CHARS]
+
+
+@dataclass(frozen=True, order=True)
+class TermHit:
+    start: int
+    end: int
+    term: str
+    kind: str
+
+
+class TermHits:
+    """All hits of a BookTermMatcher in one text, in text order."""
+
+    def __init__(self, hits: List[TermHit]):
+        self.hits = hits
+
+    def __len__(self) -> int:
+        return len(self.hits)
+
+    def of(self, kind: str) -> List[TermHit]:
+        return [h for h in self.hits if h.kind == kind]
+
+    def terms(self, kind: str) -> List[str]:
+        """Distinct terms of ``kind`` in order of first occurrence."""
+        return list(dict.fromkeys(h.term for h in self.hits if h.kind == kind))
+
+
+class BookTermMatcher:
+    """
+    One compiled matcher for a book's banned n-grams, character names and thread keys.
+
+    Built once per book (see ``EnhancedContextManager.term_matcher``), so the
+    quality checks share one lower-cased copy of the chapter and one set of
+    hits instead of each lower-casing the text and testing phrases on its
+    own. Every hit keeps its offsets so revision prompts can point at the
+    passage. Large term sets are scanned with the Aho-Corasick automaton;
+    small ones with ``str.find``, which is faster below
+    ``DIRECT_SEARCH_MAX_TERMS``.
+
+    Args:
+        banned: Banned n-grams
+        characters: Character names
+        threads: Plot thread descriptions (matched by ``thread_key``)
+    """
+
+    def __init__(self, banned: Iterable[str] = (), characters: Iterable[str] = (),
+                 threads: Iterable[str] = ()):
+        self.kinds: Dict[str, Tuple[str, ...]] = {}
+        for kind, terms in ((BANNED, banned), (CHARACTER, characters),
+                            (THREAD, (thread_key(t) for t in threads))):
+            for term in terms:
+                if term and term.strip() and kind not in self.kinds.get(term, ()):
+                    self.kinds[term] = self.kinds.get(term, ()) + (kind,)
+        self.matcher = TermMatcher(self.kinds)
+
+    def __len__(self) -> int:
+        return len(self.matcher)
+
+    def scan(self, text: str, lowered: bool = False) -> TermHits:
+        haystack = text if lowered else text.lower()
+        if len(self.matcher) > DIRECT_SEARCH_MAX_TERMS:
+            found = self.matcher.finditer(haystack, lowered=True)
+        else:
+            found = self._find(haystack)
+        hits = sorted(
+            TermHit(start, end, term, kind)
+            for start, end, term in found
+            for kind in self.kinds[term]
+        )
+        return TermHits(hits)
+
+    def _find(self, haystack: str):
+        for term in self.matcher.terms:
+            needle = term.lower()
+            start = haystack.find(needle)
+            while start != -1:
+                yield start, start + len(needle), term
+                start = haystack.find(needle, start + 1)
+
+
+@lru_cache(maxsize=32)
+def phrase_matcher(phrases: Tuple[str, ...]) -> BookTermMatcher:
+    """Matcher for a fixed phrase list (e.g. a module's banned n-grams), built once."""
+    return BookTermMatcher(banned=phrases)
+
+
+def describe_hits(text: str, hits: Sequence[TermHit], limit: int = 8, context: int = 40) -> List[str]:
+    """
+    Prompt lines locating each hit: the phrase, its line and character offset, and the surrounding text.
+    """
+    lines: List[str] = []
+    for hit in list(hits)[:limit]:
+        line_no = text.count("\n", 0, hit.start) + 1
+        before = text[max(0, hit.start - context):hit.start].replace("\n", " ")
+        after = text[hit.end:hit.end + context].replace("\n", " ")
+        lines.append(
+            f'"{text[hit.start:hit.end]}" at line {line_no}, chars {hit.start}-{hit.end}: '
+            f'"…{before}[{text[hit.start:hit.end]}]{after}…"'
+        )
+    if len(hits) > limit:
+        lines.append(f"... and {len(hits) - limit} more")
+    return lines
@@ -1,6 +1,7 @@
 # chapter_briefs.py
 
 from typing import Any, Dict, List, Optional, Tuple
+import math
 import re
 from poc.qa_session import QASession
 from poc.llm_ollama import llm
@@ -14,6 +15,8 @@ from musequill.services.backend.writers import (
 from musequill.services.backend.model import (
     BookModelType
 )
+from musequill.models.book.book_length import BookLength
+from musequill.services.backend.planner.word_budget import allocate_words
 
 # ----------------------------
 # Public API
@@ -21,12 +24,18 @@ from musequill.services.backend.model import (
 
 cached_characters: Dict[str, str] = {}
 
+DEFAULT_CHAPTER_WORDS = 2500
+# Per-chapter bounds around the mean when splitting the book budget by beat count
+CHAPTER_WORDS_MIN_RATIO = 0.6
+CHAPTER_WORDS_MAX_RATIO = 1.5
+
 def make_chapter_brief(
     *,
     book_model: BookModelType,
     book_plan: GenericBookPlan,
     book_summary: str,
-    chapter: Chapter
+    chapter: Chapter,
+    target_words: int = DEFAULT_CHAPTER_WORDS
 ) -> Dict[str, Any]:
 
     # --- Canon from book_plan metadata ---
@@ -62,7 +71,7 @@ def make_chapter_brief(
         "ch": chapter.chapter,
         "title": chapter.title,
         "description": chapter.description,
-        "word_count": 2500,  # Default word count
+        "word_count": target_words,
         "act": chapter_act,
         "act_description": act_info.get("description", ""),
         "act_turning_points": act_info.get("turning_points", []),
@@ -76,7 +85,6 @@ def make_chapter_brief(
     beats = _beats_for_structure_enhanced(structure_type, chapter_act, act_info, chapter_beats)
 
     # --- Scene planning with enhanced context ---
-    target_words = int(chapter_item.get("word_count", 2500))
     n_scenes = _scene_count(target_words, pace)
     scenes = _scenes_from_item_enhanced(
         chapter_item=chapter_item,
@@ -148,19 +156,60 @@ def make_all_chapter_briefs_from_plan(
     richer fields like role/tags/snippets.
     """
 
+    budget = chapter_word_budget(book_model, book_plan, chapter_plan)
     briefs: List[Dict[str, Any]] = []
-    for ch in chapter_plan.chapter_outline:
+    for ch, words in zip(chapter_plan.chapter_outline, budget):
         briefs.append(
             make_chapter_brief(
                 book_model=book_model,
                 book_plan=book_plan,
                 book_summary=book_summary,
                 chapter=ch,
+                target_words=words,
             )
         )
     return briefs
 
 
+def chapter_word_budget(
+    book_model: BookModelType,
+    book_plan: GenericBookPlan,
+    chapter_plan: GenericPlan
+) -> List[int]:
+    """
+    Target words per chapter_outline entry, summing exactly to the book's budget.
+
+    The total comes from the plan's pacing_targets.word_count, then the book
+    model's length category, then DEFAULT_CHAPTER_WORDS per chapter. Chapters
+    are weighted by their beat count in book_plan, within 0.6x-1.5x the mean.
+    """
+    chapters = chapter_plan.chapter_outline
+    if not chapters:
+        return []
+    total = _book_word_total(book_model, chapter_plan) or DEFAULT_CHAPTER_WORDS * len(chapters)
+    mean = total / len(chapters)
+    weights = [max(len(_get_chapter_beats(ch.chapter, book_plan)), 1) for ch in chapters]
+    return allocate_words(
+        total,
+        weights,
+        minimum=int(mean * CHAPTER_WORDS_MIN_RATIO),
+        maximum=int(math.ceil(mean * CHAPTER_WORDS_MAX_RATIO)),
+    )
+
+
+def _book_word_total(book_model: BookModelType, chapter_plan: GenericPlan) -> Optional[int]:
+    # "60,000-80,000 words" -> midpoint; a single figure is taken as-is
+    spec = chapter_plan.pacing_targets.word_count or ""
+    numbers = [int(n.replace(",", "")) for n in re.findall(r"\d[\d,]*", spec)]
+    numbers = [n for n in numbers if n >= 1000]
+    if numbers:
+        return (min(numbers) + max(numbers)) // 2
+    try:
+        return BookLength.from_string(book_model.book.length).target_words
+    except Exception:
+        return None
+
+
 # ----------------------------
 # Book Plan Extraction Helpers
 # ----------------------------
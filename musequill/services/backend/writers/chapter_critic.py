@@ -1,6 +1,6 @@
 # chapter_critic.py
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Any, Dict, List, Optional, Tuple, Union
 import re
 import math
@@ -12,8 +12,27 @@ import math
 
 from musequill.services.backend.model import BookModelType
 from . import GenericPlan, GenericChapterBrief
-from musequill.services.backend.llm import LLMService
+from musequill.services.backend.llm import LLMService, OllamaConfig
 from musequill.services.backend.utils import extract_json_from_response
+from .chapter_patch import (
+    PATCH_MAX_TOKENS,
+    REWRITE_MAX_TOKENS,
+    PatchError,
+    RevisionStats,
+    apply_patch_response,
+    patch_instructions,
+    render_with_ids,
+)
+from .artifact_cache import ArtifactCache
+from .critique_screening import (
+    FAST,
+    FULL,
+    LOCAL,
+    CritiqueTierStats,
+    LocalScreen,
+    ScreeningPolicy,
+    screen_chapter,
+)
 # ---- Public dataclasses for consumers ----
 
 @dataclass
@@ -63,48 +82,17 @@ class CritiqueResult:
     findings: CritiqueFindings
     revised_text: str
     revision_prompt_used: Optional[str] = None
+    tier: str = FULL  # which critique tier settled the pass
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "pass_index": self.pass_index,
             "findings": self.findings.to_dict(),
             "revised_text": self.revised_text,
-            "revision_prompt_used": self.revision_prompt_used
+            "revision_prompt_used": self.revision_prompt_used,
+            "tier": self.tier
         }
 
-# ---- Utility: small local QC checks (fast & deterministic) ----
-
-def _word_count(text: str) -> int:
-    return len(re.findall(r"\b\w+\b", text or ""))
-
-def _line_dupes(text: str, min_len: int = 25) -> List[str]:
-    lines = [ln.strip() for ln in (text or "").splitlines() if ln.strip()]
-    seen, dups = {}, []
-    for ln in lines:
-        if len(ln) < min_len: 
-            continue
-        seen[ln] = seen.get(ln, 0) + 1
-        if seen[ln] == 2:
-            dups.append(ln)
-    return dups
-
-def _contains_banned(text: str, banned: List[str]) -> List[str]:
-    hits = []
-    lower = text.lower()
-    for n in banned or []:
-        if n and n.strip() and n.lower() in lower:
-            hits.append(n)
-    return hits
-
-def _length_delta_ok(text: str, target: Optional[int], tolerance: float = 0.25) -> Tuple[bool, str]:
-    if not target or target <= 0:
-        return True, "No target length provided."
-    wc = _word_count(text)
-    lo, hi = int(target * (1 - tolerance)), int(target * (1 + tolerance))
-    if lo <= wc <= hi:
-        return True, f"Word count {wc} within [{lo}, {hi}]."
-    return False, f"Word count {wc} outside [{lo}, {hi}] for target {target}."
-
 # ---- Prompt builders ----
 
 def _build_critic_prompt(
@@ -226,6 +214,40 @@ Format strictly as:
 <CHANGES_MADE_END>
 """
 
+def _build_patch_prompt(
+    current_chapter: str,
+    findings: CritiqueFindings,
+    artifacts: CritiqueArtifacts,
+    banned_ngrams: List[str],
+) -> str:
+    # Same findings as the full revision, but the model returns edits, not the chapter
+    return f"""You are a novel line-editor. Fix the chapter below by editing only the passages the critique findings point to.
+
+Findings (JSON):
+overall_score={findings.overall_score}
+axes={[{"axis": a.axis, "score": a.score} for a in findings.axes]}
+red_flags={findings.red_flags}
+suggestions={findings.suggestions}
+inline_change_notes={findings.inline_change_notes}
+
+Non-negotiables:
+- Obey canon and constraints.
+- Avoid banned n-grams: {banned_ngrams or []}.
+- Preserve continuity with story-so-far and previous chapter.
+- Keep POV guardrails and the chapter's voice intact.
+
+Context (do not repeat back, just use):
+[Chapter brief]:
+{artifacts.chapter_brief_summary}
+
+[Story so far]:
+{artifacts.story_so_far_summary}
+
+[Chapter to revise]:
+{render_with_ids(current_chapter)}
+
+{patch_instructions()}"""
+
 # ---- JSON extraction helpers (robust-ish without external deps) ----
 
 
@@ -309,11 +331,38 @@ class AcceptancePolicy:
 class ChapterCritic:
     """
     Runs up to N critique→revision passes with an LLM.
+
+    Each critique is tiered (see ``ScreeningPolicy``): deterministic local
+    metrics first, then the optional ``fast_llm`` on a compact prompt, and
+    the full critic model only for borderline chapters. ``stats`` counts how
+    each pass was settled.
+
+    With ``revision_mode="patch"`` a revision asks for targeted edits
+    anchored to paragraph ids (see ``chapter_patch``), applied and validated
+    locally; chapters far off their target length, and patches that fail to
+    apply, are rewritten in full. ``revision_stats`` tracks both.
+
+    The book model, book plan and chapter brief summaries are rendered once
+    per run through ``artifact_cache``, not on every pass.
     """
 
-    def __init__(self, llm: LLMService, acceptance: Optional[AcceptancePolicy] = None):
+    def __init__(
+        self,
+        llm: LLMService,
+        acceptance: Optional[AcceptancePolicy] = None,
+        screening: Optional[ScreeningPolicy] = None,
+        fast_llm: Optional[LLMService] = None,
+        revision_mode: str = "patch",
+        artifact_cache: Optional[ArtifactCache] = None,
+    ):
         self.llm = llm
         self.acceptance = acceptance or AcceptancePolicy()
+        self.screening = screening or ScreeningPolicy()
+        self.fast_llm = fast_llm
+        self.revision_mode = revision_mode
+        self.stats = CritiqueTierStats()
+        self.revision_stats = RevisionStats()
+        self.artifact_cache = artifact_cache or ArtifactCache()
 
     async def critique_once(
         self,
@@ -331,89 +380,101 @@ class ChapterCritic:
         """Single critique pass + optional rewrite (depending on acceptance)."""
 
         # Prepare artifacts
+        cache = self.artifact_cache
         artifacts = CritiqueArtifacts(
             previous_chapter=previous_chapter,
             story_so_far_summary=story_so_far_summary,
-            book_model_md=getattr(book_model, "to_markdown", lambda: str(book_model))(),
-            chapter_brief_summary=_summarize_chapter_brief(chapter_plan),
-            book_plan_summary=_summarize_book_plan(book_plan),
+            book_model_md=cache.get("book_model_md", book_model, _book_model_markdown),
+            chapter_brief_summary=cache.get("chapter_brief_summary", chapter_plan, _summarize_chapter_brief),
+            book_plan_summary=cache.get("book_plan_summary", book_plan, _summarize_book_plan),
         )
-
-        # Quick local checks (non-blocking; turned into red flags if necessary)
-        local_red_flags = []
-        ok_len, msg_len = _length_delta_ok(current_chapter, getattr(chapter_plan.meta, "target_words", target_words))
-        if not ok_len:
-            local_red_flags.append(msg_len)
-
-        dupes = _line_dupes(current_chapter)
-        if dupes:
-            local_red_flags.append(f"Detected repeated lines: {min(len(dupes),5)} samples (e.g., “{dupes[0][:80]}…”)")
-
-        banned_hits = _contains_banned(current_chapter, banned_ngrams or [])
-        if banned_hits:
-            local_red_flags.append(f"Banned n-grams present: {banned_hits[:5]}")
-
-        # Ask LLM to critique
-        critic_prompt = _build_critic_prompt(
-            current_chapter=current_chapter,
-            artifacts=artifacts,
-            banned_ngrams=banned_ngrams or [],
-            target_words=getattr(chapter_plan.meta, "target_words", target_words),
-        )
-
-        decode_opts = {
-            "temperature": 0.3,     # analysis is best at low temperature
-            "top_p": 0.9,
-            "max_tokens": 3000,
-            **(decode_overrides or {})
-        }
-        await self.llm.update_default_parameters(**decode_opts)
-        resp = await self.llm.generate(critic_prompt)
-        data = extract_json_from_response(resp["response"])
-
-        # Build findings
-        axes = [
-            CritiqueAxisScore(
-                axis=ax.get("axis", "unknown"),
-                score=float(ax.get("score", 0)),
-                rationale=ax.get("rationale", "").strip() or "No rationale provided."
+        target = getattr(chapter_plan.meta, "target_words", target_words)
+        policy = self.screening
+
+        # Tier 1: local metrics (their red flags also carry into the model tiers)
+        screen = screen_chapter(current_chapter, target, banned_ngrams or [], policy.length_tolerance)
+        findings: Optional[CritiqueFindings] = None
+        tier = LOCAL
+        verdict = policy.settle_local(screen, self.acceptance.allow_red_flags)
+        if verdict is not None:
+            findings = _local_findings(screen, keep_as_is=verdict)
+
+        # Tier 2: small model on a compact prompt; clear passes and fails stop here
+        if findings is None and self.fast_llm is not None:
+            compact = replace(artifacts, previous_chapter=None,
+                              book_model_md="(omitted for screening)",
+                              book_plan_summary="(omitted for screening)")
+            fast = await self._llm_findings(
+                self.fast_llm,
+                _build_critic_prompt(current_chapter, compact, banned_ngrams or [], target),
+                {"temperature": 0.2, "top_p": 0.9, "max_tokens": 1200},
+                screen.red_flags,
             )
-            for ax in data.get("axes", [])
-        ]
-        findings = CritiqueFindings(
-            overall_score=float(data.get("overall_score", 0)),
-            axes=axes,
-            red_flags=(data.get("red_flags") or []) + local_red_flags,
-            suggestions=data.get("suggestions") or [],
-            inline_change_notes=data.get("inline_change_notes") or [],
-            keep_as_is=bool(data.get("keep_as_is", False))
-        )
+            tier = FAST
+            # A failed call or a reply without JSON is left to the full critic
+            if fast is not None and policy.settle_fast(fast.overall_score, self.acceptance.accept(fast)[0]) is not None:
+                findings = fast
+            else:
+                self.stats.fast_escalate += 1
+
+        # Tier 3: the full critic, for borderline chapters
+        if findings is None:
+            tier = FULL
+            findings = await self._llm_findings(
+                self.llm,
+                _build_critic_prompt(current_chapter, artifacts, banned_ngrams or [], target),
+                {
+                    "temperature": 0.3,     # analysis is best at low temperature
+                    "top_p": 0.9,
+                    "max_tokens": 3000,
+                    **(decode_overrides or {})
+                },
+                screen.red_flags,
+            )
+            if findings is None:
+                raise ValueError("The critic returned no usable critique")
 
         # Accept or revise?
         accepted, _ = self.acceptance.accept(findings)
         if findings.keep_as_is and not findings.red_flags:
             accepted = True
+        self.stats.record(tier, accepted)
 
         revised_text = current_chapter
         revision_prompt_used = None
 
-        if not accepted:
+        if not accepted and self.revision_mode == "patch" and screen.length_ok:
+            patch_prompt = _build_patch_prompt(current_chapter, findings, artifacts, banned_ngrams or [])
+            await self.llm.update_default_parameters(
+                temperature=0.7, top_p=0.9, max_tokens=PATCH_MAX_TOKENS
+            )
+            rev = await self.llm.generate_json(patch_prompt)
+            try:
+                revised_text = apply_patch_response(current_chapter, rev.get("json"))
+                revision_prompt_used = patch_prompt
+                self.revision_stats.record_patch(rev.get("response", ""), current_chapter)
+            except PatchError as e:
+                print(f"Patch revision rejected ({e}); rewriting the chapter in full")
+                self.revision_stats.fallbacks += 1
+
+        if not accepted and revision_prompt_used is None:
             revision_prompt = _build_revision_prompt(
                 current_chapter=current_chapter,
                 findings=findings,
                 artifacts=artifacts,
                 banned_ngrams=banned_ngrams or [],
-                target_words=getattr(chapter_plan.meta, "target_words", target_words),
+                target_words=target,
             )
             revision_decode = {
                 "temperature": 0.85,  # creative but controlled line-edit
                 "top_p": 0.9,
-                "max_tokens": 8000
+                "max_tokens": REWRITE_MAX_TOKENS
             }
             await self.llm.update_default_parameters(**revision_decode)
             rev = await self.llm.generate(revision_prompt)
             revised_text, _ = _extract_revised(rev["response"])
             revision_prompt_used = revision_prompt
+            self.revision_stats.full_rewrites += 1
 
             # If the model somehow failed to return revised content, fall back
             if not revised_text.strip():
@@ -423,7 +484,39 @@ class ChapterCritic:
             pass_index=0,
             findings=findings,
             revised_text=revised_text,
-            revision_prompt_used=revision_prompt_used
+            revision_prompt_used=revision_prompt_used,
+            tier=tier
+        )
+
+    async def _llm_findings(
+        self,
+        llm: LLMService,
+        prompt: str,
+        decode_opts: Dict[str, Any],
+        local_red_flags: List[str],
+    ) -> Optional[CritiqueFindings]:
+        """The model's critique of ``prompt``; None if the call failed or the reply has no JSON object."""
+        await llm.update_default_parameters(**decode_opts)
+        resp = await llm.generate(prompt)
+        data = extract_json_from_response(resp.get("response", ""))
+        if "error" in resp or not isinstance(data, dict):
+            return None
+
+        axes = [
+            CritiqueAxisScore(
+                axis=ax.get("axis", "unknown"),
+                score=float(ax.get("score", 0)),
+                rationale=ax.get("rationale", "").strip() or "No rationale provided."
+            )
+            for ax in data.get("axes", [])
+        ]
+        return CritiqueFindings(
+            overall_score=float(data.get("overall_score", 0)),
+            axes=axes,
+            red_flags=(data.get("red_flags") or []) + local_red_flags,
+            suggestions=data.get("suggestions") or [],
+            inline_change_notes=data.get("inline_change_notes") or [],
+            keep_as_is=bool(data.get("keep_as_is", False))
         )
 
     async def improve_up_to(
@@ -470,8 +563,33 @@ class ChapterCritic:
         # If we exit the loop, return the best (last) version with full trace
         return text, results
 
+async def create_screening_llm(ollama_config: Optional[OllamaConfig] = None) -> Optional[LLMService]:
+    """The fast critique tier's model (``OLLAMA_SCREENING_MODEL_NAME``), or None if unset."""
+    config = ollama_config or OllamaConfig()
+    if not config.screening_model_name:
+        return None
+    llm = LLMService(config.model_copy(update={"model_name": config.screening_model_name}))
+    await llm.initialize()
+    return llm
+
+def _local_findings(screen: LocalScreen, keep_as_is: bool) -> CritiqueFindings:
+    return CritiqueFindings(
+        overall_score=screen.overall_score,
+        axes=[
+            CritiqueAxisScore(axis=axis, score=score, rationale="Local metric.")
+            for axis, score in screen.axis_scores.items()
+        ],
+        red_flags=list(screen.red_flags),
+        suggestions=list(screen.suggestions),
+        inline_change_notes=[],
+        keep_as_is=keep_as_is
+    )
+
 # ---- Summarizers for artifacts (compact strings for prompts) ----
 
+def _book_model_markdown(book_model: BookModelType) -> str:
+    return getattr(book_model, "to_markdown", lambda: str(book_model))()
+
 def _summarize_chapter_brief(chb: GenericChapterBrief) -> str:
     """
     Build a compact one-pager string from GenericChapterBrief.
@@ -1,11 +1,17 @@
 # enhanced_feedback_system.py
 import re
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # Import the proper types
 from musequill.services.backend.writers.chapter_brief_model import GenericChapterBrief
 from musequill.services.backend.model.book import BookModelType
+from musequill.services.backend.writers.book_terms import (
+    BANNED, CHARACTER, THREAD, BookTermMatcher, describe_hits, thread_key
+)
+from musequill.services.backend.writers.chapter_patch import patch_instructions, render_with_ids
+from musequill.services.backend.writers.repetition_index import RepetitionReport
+from musequill.services.backend.writers.text_profile import text_profile
 
 @dataclass
 class ChapterFeedback:
@@ -19,6 +25,7 @@ class ChapterFeedback:
     specific_suggestions: List[str]
     strengths: List[str]
     improvement_priority: str  # "high", "medium", "low"
+    flagged_passages: List[str] = field(default_factory=list)  # banned or recycled phrases to rewrite
 
 def evaluate_chapter_quality_with_feedback(
     text: str, 
@@ -27,11 +34,19 @@ def evaluate_chapter_quality_with_feedback(
     context: Dict[str, Any],
     word_count: int,
     target_words: int,
-    narrative_continuity: Dict[str, Any] = None
+    narrative_continuity: Dict[str, Any] = None,
+    term_matcher: Optional[BookTermMatcher] = None,
+    repetition: Optional[RepetitionReport] = None
 ) -> Tuple[float, ChapterFeedback]:
     """
     Evaluate chapter quality and provide detailed feedback for improvement.
     Returns (score, feedback_object).
+
+    With a ``term_matcher`` (see ``EnhancedContextManager.term_matcher``) the
+    character, plot-thread and banned-phrase checks read one shared scan, and
+    banned-phrase hits are located in ``feedback.flagged_passages``. A
+    ``repetition`` report (see ``EnhancedContextManager.check_repetition``)
+    adds phrasing recycled from earlier chapters to the flagged passages.
     """
     
     feedback = ChapterFeedback(
@@ -47,6 +62,8 @@ def evaluate_chapter_quality_with_feedback(
     )
     
     score = 0.0
+    profile = text_profile(text)
+    hits = profile.term_hits(term_matcher) if term_matcher is not None else None
     
     # Word count analysis with feedback (30% of total)
     word_ratio = word_count / target_words
@@ -75,8 +92,8 @@ def evaluate_chapter_quality_with_feedback(
     structure_issues = []
     structure_strengths = []
     
-    title_count = text.count("# ")
-    scene_count = text.count("### ")
+    title_count = profile.h1_count
+    scene_count = profile.h3_count
     
     if title_count >= 1:
         score += 0.10
@@ -105,7 +122,7 @@ def evaluate_chapter_quality_with_feedback(
     content_issues = []
     content_strengths = []
     
-    if len(text.strip()) > 500:
+    if profile.content_chars > 500:
         score += 0.15
         content_strengths.append("Substantial content length")
     else:
@@ -120,8 +137,8 @@ def evaluate_chapter_quality_with_feedback(
         feedback.specific_suggestions.append("Include a ```qa block analyzing story progress, character development, and continuity")
 
     # Dialogue analysis
-    dialogue_count = text.count('"')
-    paragraphs = len([p for p in text.split('\n\n') if p.strip()])
+    dialogue_count = profile.quote_count
+    paragraphs = profile.paragraph_count
     
     if dialogue_count > 4:  # At least some dialogue
         content_strengths.append("Contains dialogue")
@@ -137,7 +154,7 @@ def evaluate_chapter_quality_with_feedback(
     quality_issues = []
     quality_strengths = []
     
-    sentences = text.count('.') + text.count('!') + text.count('?')
+    sentences = profile.sentence_marks
     if sentences > 20:
         score += 0.10
         quality_strengths.append(f"Good sentence variety ({sentences} sentences)")
@@ -153,7 +170,7 @@ def evaluate_chapter_quality_with_feedback(
         quality_issues.append("No dialogue present")
     
     # Check for sentence complexity
-    comma_count = text.count(',')
+    comma_count = profile.comma_count
     if comma_count > sentences * 0.3:  # Good complexity
         score += 0.05
         quality_strengths.append("Good sentence complexity")
@@ -176,10 +193,10 @@ def evaluate_chapter_quality_with_feedback(
         active_threads = narrative_continuity.get("active_plot_threads", [])
         
         # Look for character name references
-        character_mentions = 0
-        for char_name in character_states.keys():
-            if char_name.lower() in text.lower():
-                character_mentions += 1
+        if hits is not None:
+            character_mentions = len(set(hits.terms(CHARACTER)) & set(character_states))
+        else:
+            character_mentions = len(profile.contains(character_states.keys()))
         
         if character_mentions > 0:
             continuity_strengths.append(f"References {character_mentions} established characters")
@@ -189,10 +206,11 @@ def evaluate_chapter_quality_with_feedback(
             feedback.specific_suggestions.append("Include references to characters established in previous chapters")
         
         # Check for plot thread advancement keywords
-        thread_advancement = any(
-            thread['thread'].lower()[:20] in text.lower() 
-            for thread in active_threads[:3]
-        )
+        thread_keys = [thread_key(thread['thread']) for thread in active_threads[:3]]
+        if hits is not None:
+            thread_advancement = bool(set(hits.terms(THREAD)) & set(thread_keys))
+        else:
+            thread_advancement = bool(profile.contains(thread_keys))
         
         if thread_advancement:
             continuity_strengths.append("Appears to advance existing plot threads")
@@ -205,6 +223,29 @@ def evaluate_chapter_quality_with_feedback(
         if continuity_strengths:
             feedback.strengths.extend(continuity_strengths)
 
+    # Banned phrases, located so the revision can target them
+    if hits is not None and hits.of(BANNED):
+        feedback.flagged_passages = describe_hits(text, hits.of(BANNED))
+        feedback.specific_suggestions.append(
+            f"Rewrite the passages using banned phrases: {', '.join(hits.terms(BANNED)[:5])}"
+        )
+
+    # Repetition within the chapter and across the manuscript
+    if repetition is not None:
+        if repetition.repeated:
+            feedback.specific_suggestions.append(
+                f"Vary phrasing repeated within the chapter: {', '.join(repetition.repeated[:3])}"
+            )
+        if repetition.recycled:
+            feedback.flagged_passages.extend(
+                f'"{r.phrase}" (already used in chapter {r.chapter})' for r in repetition.recycled[:8]
+            )
+        if repetition.excessive_recycling:
+            score -= 0.05
+            feedback.specific_suggestions.append(
+                f"Rephrase {len(repetition.recycled)} passages recycled from earlier chapters"
+            )
+
     # Overall assessment
     feedback.overall_score = min(score, 1.0)
     
@@ -224,23 +265,8 @@ def evaluate_chapter_quality_with_feedback(
     
     return feedback.overall_score, feedback
 
-def create_improvement_prompt(
-    original_text: str,
-    feedback: ChapterFeedback,
-    enhanced_context: Dict[str, Any],
-    attempt_number: int
-) -> str:
-    """Create a focused improvement prompt based on feedback."""
-    
-    chapter_brief: GenericChapterBrief = enhanced_context["chapter_brief"]
-    narrative_continuity = enhanced_context.get("narrative_continuity", {})
-    
-    chapter_num = chapter_brief.meta.chapter_number
-    chapter_title = chapter_brief.meta.chapter_title
-    target_words = chapter_brief.meta.target_words
-    
-    # Build feedback summary
-    feedback_summary = f"""
+def _feedback_summary(feedback: ChapterFeedback, attempt_number: int) -> str:
+    return f"""
 ## Quality Assessment (Attempt {attempt_number})
 **Overall Score**: {feedback.overall_score:.2f}/1.0 ({feedback.improvement_priority.upper()} priority)
 
@@ -258,6 +284,31 @@ def create_improvement_prompt(
 - {feedback.continuity_feedback}
 """
 
+def _flagged_context(feedback: ChapterFeedback) -> str:
+    if not feedback.flagged_passages:
+        return ""
+    return (
+        "\n**Flagged Passages (banned or recycled phrasing to rewrite)**:\n"
+        + "\n".join(f"- {line}" for line in feedback.flagged_passages) + "\n"
+    )
+
+def create_improvement_prompt(
+    original_text: str,
+    feedback: ChapterFeedback,
+    enhanced_context: Dict[str, Any],
+    attempt_number: int
+) -> str:
+    """Create a focused improvement prompt based on feedback."""
+    
+    chapter_brief: GenericChapterBrief = enhanced_context["chapter_brief"]
+    narrative_continuity = enhanced_context.get("narrative_continuity", {})
+    
+    chapter_num = chapter_brief.meta.chapter_number
+    chapter_title = chapter_brief.meta.chapter_title
+    target_words = chapter_brief.meta.target_words
+    
+    feedback_summary = _feedback_summary(feedback, attempt_number)
+
     # Build continuity context
     continuity_context = ""
     if narrative_continuity:
@@ -278,6 +329,8 @@ def create_improvement_prompt(
             for thread in active_threads[:3]:
                 continuity_context += f"- {thread['thread']}\n"
 
+    flagged_context = _flagged_context(feedback)
+
     improvement_prompt = f"""You are revising Chapter {chapter_num} based on specific feedback. Your goal is to address the identified issues while maintaining the chapter's strengths.
 
 {feedback_summary}
@@ -293,7 +346,7 @@ def create_improvement_prompt(
 - Beats: {', '.join(chapter_brief.narrative_beats)}
 
 {continuity_context}
-
+{flagged_context}
 ## Revision Instructions:
 
 ### Primary Focus (Based on Feedback Priority: {feedback.improvement_priority.upper()}):
@@ -342,4 +395,41 @@ def create_improvement_prompt(
 
 Begin the revision now, focusing especially on the {feedback.improvement_priority} priority issues identified:"""
 
-    return improvement_prompt
\ No newline at end of file
+    return improvement_prompt
+
+def create_patch_prompt(
+    original_text: str,
+    feedback: ChapterFeedback,
+    enhanced_context: Dict[str, Any],
+    attempt_number: int
+) -> str:
+    """
+    Like ``create_improvement_prompt``, but asks for targeted edits anchored
+    to paragraph ids instead of the whole chapter (see ``chapter_patch``).
+    """
+    chapter_brief: GenericChapterBrief = enhanced_context["chapter_brief"]
+    narrative_continuity = enhanced_context.get("narrative_continuity", {})
+
+    continuity_context = ""
+    if narrative_continuity:
+        character_states = narrative_continuity.get("character_states", {})
+        active_threads = narrative_continuity.get("active_plot_threads", [])
+        if character_states:
+            continuity_context += f"\n**Established Characters**: {', '.join(list(character_states)[:5])}\n"
+        if active_threads:
+            continuity_context += "\n**Plot Threads to Advance**:\n"
+            continuity_context += "\n".join(f"- {thread['thread']}" for thread in active_threads[:3]) + "\n"
+
+    return f"""You are revising Chapter {chapter_brief.meta.chapter_number} ("{chapter_brief.meta.chapter_title}") based on specific feedback. Fix the issues by editing only the passages that need it; keep everything else as written.
+
+{_feedback_summary(feedback, attempt_number)}
+{_flagged_context(feedback)}
+## Chapter Requirements:
+- Target: {chapter_brief.meta.target_words} words
+- Beats: {', '.join(chapter_brief.narrative_beats)}
+{continuity_context}
+## Chapter to Revise:
+{render_with_ids(original_text)}
+
+## Output Requirements:
+{patch_instructions()}"""
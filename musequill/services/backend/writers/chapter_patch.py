@@ -0,0 +1,178 @@
+from __future__ import annotations
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from musequill.services.backend.writers.text_profile import text_profile
+
+REPLACE = "replace"
+DELETE = "delete"
+INSERT_AFTER = "insert_after"
+OPS = (REPLACE, DELETE, INSERT_AFTER)
+
+# A patch for a handful of paragraphs fits well inside this; a full chapter needs the rewrite budget
+PATCH_MAX_TOKENS = 1500
+REWRITE_MAX_TOKENS = 8000
+# Editing more than this share of paragraphs is a rewrite; let the model do it whole
+MAX_EDITED_SHARE = 0.5
+# Patched chapters must keep their length within this factor of the original
+MAX_LENGTH_CHANGE = 0.5
+
+_BLOCK_SPLIT = re.compile(r"\n\s*\n")
+_ID_PATTERN = re.compile(r"^P(\d+)$")
+
+
+class PatchError(ValueError):
+    """A patch that cannot be applied or whose result fails validation."""
+
+
+@dataclass
+class PatchEdit:
+    op: str
+    id: str
+    text: str = ""
+
+
+def split_blocks(text: str) -> List[str]:
+    """Paragraphs and headings, separated by blank lines; block ``i`` has id ``P{i+1}``."""
+    return [b.strip() for b in _BLOCK_SPLIT.split((text or "").strip()) if b.strip()]
+
+
+def render_with_ids(text: str) -> str:
+    """The chapter with each block prefixed by its id, for patch prompts."""
+    return "\n\n".join(f"[P{i}] {block}" for i, block in enumerate(split_blocks(text), 1))
+
+
+def patchable(word_count: int, target_words: Optional[int], tolerance: float = 0.25) -> bool:
+    """Whether a draft is close enough to length for local edits; far off target needs a rewrite."""
+    if not target_words or target_words <= 0:
+        return True
+    return abs(word_count / target_words - 1) <= tolerance
+
+
+def patch_instructions() -> str:
+    """Output-format section shared by the patch prompts."""
+    return f"""Each paragraph and heading of the chapter is prefixed with an id like [P7].
+Do NOT rewrite the whole chapter. Return only the edits needed, as one JSON object:
+
+{{"edits": [
+  {{"op": "replace", "id": "P7", "text": "new paragraph text"}},
+  {{"op": "insert_after", "id": "P12", "text": "new paragraph to add after P12"}},
+  {{"op": "delete", "id": "P15"}}
+]}}
+
+Rules:
+- "op" is one of {", ".join(OPS)}; "id" must be an id shown in the chapter ("P0" inserts at the start).
+- "text" is plain chapter prose (or a heading), without the [P#] prefix.
+- Edit each id at most once with replace/delete; keep the H1 title and `###` scene headings.
+- Touch only the passages the findings call for. Return only the JSON object.
+"""
+
+
+def parse_patch(data: Any) -> List[PatchEdit]:
+    """
+    Edits from a model's JSON (``{"edits": [...]}`` or a bare list).
+
+    Raises:
+        PatchError: If the payload is missing or malformed
+    """
+    if isinstance(data, dict):
+        data = data.get("edits")
+    if not isinstance(data, list):
+        raise PatchError("patch has no edits list")
+    edits = []
+    for raw in data:
+        if not isinstance(raw, dict):
+            raise PatchError(f"edit is not an object: {raw!r}")
+        op = str(raw.get("op", "")).strip().lower()
+        block_id = str(raw.get("id", "")).strip().strip("[]").upper()
+        text = str(raw.get("text") or "").strip()
+        if op not in OPS:
+            raise PatchError(f"unknown op {op!r}")
+        if op != DELETE and not text:
+            raise PatchError(f"{op} on {block_id} has no text")
+        edits.append(PatchEdit(op, block_id, text))
+    return edits
+
+
+def apply_patch(text: str, edits: List[PatchEdit], max_edited_share: float = MAX_EDITED_SHARE) -> str:
+    """
+    Apply ``edits`` to ``text`` and validate the result.
+
+    Raises:
+        PatchError: On unknown ids, conflicting edits, too many edited
+            paragraphs, or a result that loses the chapter's structure or length
+    """
+    blocks = split_blocks(text)
+    if not edits:
+        raise PatchError("patch is empty")
+
+    replaced: Dict[int, Optional[str]] = {}
+    inserted: Dict[int, List[str]] = {}
+    for edit in edits:
+        m = _ID_PATTERN.match(edit.id)
+        index = int(m.group(1)) if m else -1
+        if not 0 <= index <= len(blocks) or (index == 0 and edit.op != INSERT_AFTER):
+            raise PatchError(f"unknown block id {edit.id!r}")
+        if edit.op == INSERT_AFTER:
+            inserted.setdefault(index, []).append(edit.text)
+        elif index in replaced:
+            raise PatchError(f"conflicting edits for {edit.id}")
+        else:
+            replaced[index] = edit.text if edit.op == REPLACE else None
+
+    if len(replaced) + len(inserted) > max(1, int(len(blocks) * max_edited_share)):
+        raise PatchError(f"patch edits {len(replaced) + len(inserted)} of {len(blocks)} blocks")
+
+    out: List[str] = list(inserted.get(0, []))
+    for index, block in enumerate(blocks, 1):
+        new = replaced.get(index, block)
+        if new is not None:
+            out.append(new)
+        out.extend(inserted.get(index, []))
+    patched = "\n\n".join(out)
+    validate_patched(text, patched)
+    return patched
+
+
+def validate_patched(original: str, patched: str) -> None:
+    """
+    Raises:
+        PatchError: If the patch changed the number of H1 titles, removed every
+            scene heading, or moved the length by more than MAX_LENGTH_CHANGE
+    """
+    before, after = text_profile(original), text_profile(patched)
+    if after.h1_count != before.h1_count:
+        raise PatchError(f"patch changed H1 titles ({before.h1_count} -> {after.h1_count})")
+    if before.h3_count and not after.h3_count:
+        raise PatchError("patch removed every scene heading")
+    if before.word_count and abs(after.word_count / before.word_count - 1) > MAX_LENGTH_CHANGE:
+        raise PatchError(f"patch changed length {before.word_count} -> {after.word_count} words")
+
+
+def apply_patch_response(text: str, data: Any) -> str:
+    """``parse_patch`` then ``apply_patch``; raises PatchError on either failure."""
+    return apply_patch(text, parse_patch(data))
+
+
+@dataclass
+class RevisionStats:
+    """Patch revisions versus full rewrites, and how much output the patches saved."""
+    patched: int = 0
+    fallbacks: int = 0       # patch attempted but rejected, so rewritten in full
+    full_rewrites: int = 0   # including fallbacks
+    patch_chars: int = 0     # model output spent on patches
+    chapter_chars: int = 0   # size of the chapters those patches revised
+
+    def record_patch(self, response: str, chapter: str) -> None:
+        self.patched += 1
+        self.patch_chars += len(response or "")
+        self.chapter_chars += len(chapter or "")
+
+    @property
+    def output_reduction(self) -> float:
+        """How many times smaller a patch was than re-emitting the chapter (0 if none yet)."""
+        return self.chapter_chars / self.patch_chars if self.patch_chars else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "output_reduction": round(self.output_reduction, 1)}
@@ -21,6 +21,7 @@ from musequill.services.backend.utils.payloads import extract_json_from_response
 
 from musequill.services.backend.validators import (
     PlanBaselines,
+    PlanFragmentRepairer,
     validate_plan_against_baselines,
     ValidationResult,
     ValidationIssue
@@ -28,6 +29,11 @@ from musequill.services.backend.validators import (
 
 logger = logging.getLogger(__name__)
 
+# Fragment repair passes per generated plan before falling back to full regeneration
+MAX_FRAGMENT_REPAIR_ROUNDS = 2
+# Output cap for one fragment (a chapter entry, the characters map, ...)
+FRAGMENT_MAX_TOKENS = 800
+
 async def generate_chapter_plan(
     ctx_mgr: LLMContextManager,
     llm_service: LLMService,
@@ -91,6 +97,27 @@ async def generate_chapter_plan(
             logger.error(f"🔴 Failed to update LLM parameters: {e}")
             logger.info("🔄 Using default parameters...")
 
+    baselines = PlanBaselines(
+        title=book_model.book.title,
+        author=book_model.book.author,
+        allowed_genres={book_model.genre.primary.type,book_model.genre.sub.type},
+        disallowed_genres={"Thriller","Sci-Fi","Fantasy","Journalism"},
+        required_entities={"Noah Bennett","Dr. Ava Kline"},
+        forbidden_terms={"spaceship","dragon","time portal"},
+        min_characters=2,
+        min_chapters=12,
+        min_beats=6,
+        preferred_theme_keywords={"self-honesty","obligation"},
+        preferred_setting_keywords={"New York","NYC","Manhattan"},
+        max_logline_chars=280,
+        require_empty_fields={}  # add paths -> [] if you extend the model with such fields
+    )
+    repairer = PlanFragmentRepairer(baselines=baselines)
+
+    async def generate_fragment(fragment_prompt: str, fragment) -> str:
+        response = await llm_service.generate(fragment_prompt, max_tokens=FRAGMENT_MAX_TOKENS)
+        return response.get('response', '')
+
     chapter_plan: Optional[GenericPlan] = None
     # Generate chapter plan
     while True:
@@ -112,24 +139,24 @@ async def generate_chapter_plan(
             json.dump(raw_response, f, indent=2, ensure_ascii=False)
 
         try:
-            chapter_plan = GenericPlan(**raw_response)
-            baselines = PlanBaselines(
-                title=book_model.book.title,
-                author=book_model.book.author,
-                allowed_genres={book_model.genre.primary.type,book_model.genre.sub.type},
-                disallowed_genres={"Thriller","Sci-Fi","Fantasy","Journalism"},
-                required_entities={"Noah Bennett","Dr. Ava Kline"},
-                forbidden_terms={"spaceship","dragon","time portal"},
-                min_characters=2,
-                min_chapters=12,
-                min_beats=6,
-                preferred_theme_keywords={"self-honesty","obligation"},
-                preferred_setting_keywords={"New York","NYC","Manhattan"},
-                max_logline_chars=280,
-                require_empty_fields={}  # add paths -> [] if you extend the model with such fields
-            )
+            if not isinstance(raw_response, dict):
+                raise ValueError("response contains no JSON object")
+
+            result = validate_plan_against_baselines(raw_response, baselines)
 
-            result = validate_plan_against_baselines(chapter_plan.model_dump(), baselines)
+            # Regenerate only the failing fragments (a chapter entry, the characters map, ...)
+            rounds = 0
+            while (not result.is_valid or result.regenerate) and rounds < MAX_FRAGMENT_REPAIR_ROUNDS:
+                outcome = await repairer.repair(raw_response, result.issues, generate_fragment)
+                if not outcome.applicable or not outcome.changed:
+                    break
+                rounds += 1
+                logger.info(
+                    f"🩹 Repaired {len(outcome.repaired)} fragment(s), fixed {len(outcome.fixed)} field(s) "
+                    f"for ~{outcome.approx_tokens} tokens"
+                )
+                raw_response = outcome.plan
+                result = validate_plan_against_baselines(raw_response, baselines)
 
             if not result.is_valid or result.regenerate:
                 # Feed result.refined_prompt back to your LLM along with the original artifacts
@@ -137,6 +164,7 @@ async def generate_chapter_plan(
                 prompt = result.refined_prompt
                 continue
             else:
+                chapter_plan = GenericPlan.model_validate(raw_response)
                 print("Plan accepted. Score:", result.score)
                 break
 
@@ -9,6 +9,10 @@ import os, re, math, textwrap, unicodedata
 from datetime import datetime
 
 from continuity import make_story_to_date_summary, get_prev_chapter_text
+from musequill.services.backend.writers.artifact_cache import ArtifactCache, cached_fragment
+from musequill.services.backend.writers.book_terms import describe_hits
+from musequill.services.backend.writers.repetition_index import RepetitionIndex
+from musequill.services.backend.writers.text_profile import text_profile
 from musequill.services.backend.llm.ollama_client import (
     create_llm_service,
     LLMService
@@ -37,16 +41,10 @@ banned_ngrams = [
 # chapter_writer.py
 
 def count_ngrams(text: str, n: int = 3) -> Dict[str, int]:
-    words = re.findall(r"[A-Za-z']+", text.lower())
-    grams = [" ".join(words[i:i+n]) for i in range(len(words)-n+1)]
-    freq = {}
-    for g in grams:
-        freq[g] = freq.get(g, 0) + 1
-    return freq
+    return dict(text_profile(text).ngrams(n))
 
 def find_banned(text: str, banned: List[str]) -> List[str]:
-    low = text.lower()
-    return [p for p in banned if p.lower() in low]
+    return text_profile(text).contains(banned)
 
 def extract_qa(text: str) -> Tuple[str, str]:
     m = re.search(r"```qa(.*?)```", text, flags=re.S)
@@ -54,26 +52,40 @@ def extract_qa(text: str) -> Tuple[str, str]:
     clean = text.replace(qa, "").strip()
     return clean, (m.group(1).strip() if m else "")
 
-def needs_revision(chapter_text: str, banned_phrases: List[str], target_words: int) -> List[str]:
+def needs_revision(
+    chapter_text: str,
+    banned_phrases: List[str],
+    target_words: int,
+    repetition_index: RepetitionIndex | None = None,
+    chapter_number: int | None = None,
+) -> List[str]:
     issues = []
-    word_count = len(re.findall(r"\b\w+\b", chapter_text))
+    profile = text_profile(chapter_text)
+    word_count = profile.word_count
     if not (0.75*target_words <= word_count <= 1.25*target_words):
         issues.append(f"length off target ({word_count} vs {target_words}).")
-    dupes = [g for g,c in count_ngrams(chapter_text, 4).items() if c>=3]
+    dupes = profile.repeated_ngrams(4, 3)
     if dupes:
         issues.append(f"repetitive 4-grams ({len(dupes)}) found.")
-    banned_hit = find_banned(chapter_text, banned_phrases)
+    if repetition_index is not None:
+        report = repetition_index.check(chapter_text, chapter_number)
+        if report.excessive_recycling:
+            samples = "; ".join(f'"{r.phrase}" (ch. {r.chapter})' for r in report.recycled[:3])
+            issues.append(f"repetitive phrasing recycled from earlier chapters ({len(report.recycled)}): {samples}.")
+    banned_hit = profile.contains(banned_phrases)
     if banned_hit:
         issues.append(f"banned phrases used: {', '.join(banned_hit)}.")
-    if chapter_text.count("# ") != 1:
+    if profile.h1_count != 1:
         issues.append("missing or multiple H1 titles.")
-    if "###" not in chapter_text:
+    if not profile.h3_count:
         issues.append("no scene headings (###).")
     return issues
 
 def revision_prompt(original: str, issues: List[str], brief: GenericChapterBrief, banned: List[str]) -> str:
     bullets = "\n".join([f"- {i}" for i in issues])
     banned_bullets = "\n".join([f"- {p}" for p in banned])
+    located = describe_hits(original, text_profile(original).phrase_hits(banned))
+    located_bullets = "\n".join([f"- {line}" for line in located]) or "- none"
     return f"""Revise the chapter below to fix the listed issues without changing canon or POV constraints.
 Fixes required:
 {bullets}
@@ -81,6 +93,9 @@ Fixes required:
 Avoid these phrases entirely:
 {banned_bullets}
 
+Banned phrases found in the draft (rewrite these passages):
+{located_bullets}
+
 Keep structure (H1 title; `###` scene headings). Keep length within ±10% of target {brief.meta.target_words} words.
 
 === BEGIN CHAPTER ===
@@ -147,6 +162,7 @@ async def write_chapter_with_qc(
     banned_ngrams: List[str],
     decode_overrides: Dict[str, Any] | None = None,
     max_retries: int = 3,
+    repetition_index: RepetitionIndex | None = None,
 ) -> Dict[str, str]:
     from prompting import build_chapter_prompt
 
@@ -193,7 +209,10 @@ async def write_chapter_with_qc(
             text, qa = extract_qa(fix['response'])
         
         # Check for issues
-        issues = needs_revision(text, banned_ngrams, brief.meta.target_words)
+        issues = needs_revision(
+            text, banned_ngrams, brief.meta.target_words,
+            repetition_index, int(brief.meta.chapter_number)
+        )
         all_attempts_issues.append(issues)
         
         if not issues:
@@ -215,7 +234,8 @@ async def write_chapter_with_qc(
 from .chapter_critic import (
     ChapterCritic,
     AcceptancePolicy,
-    CritiqueResult
+    CritiqueResult,
+    create_screening_llm
 )
 from .chapter_brief_model import GenericChapterBrief
 
@@ -229,8 +249,9 @@ async def adaptive_chapter_critique(
     chapter_text: str,
     prev_chapter_text: str | None,
     banned_ngrams: List[str],
+    critic: ChapterCritic | None = None,
 ) -> Dict[str, Any]:
-    critic = ChapterCritic(
+    critic = critic or ChapterCritic(
         llm, 
         acceptance=AcceptancePolicy(
             min_overall_score=0.80,   # tighten/loosen as you wish
@@ -281,6 +302,13 @@ async def write_all_chapters_with_qc(
     prev_chapter:str|None = None
 
     manuscript_dir = os.path.join(out_dir, "manuscript")
+    repetition_index = RepetitionIndex()
+    # One critic per book so its tier counters cover the whole manuscript
+    critic = ChapterCritic(
+        llm,
+        acceptance=AcceptancePolicy(min_overall_score=0.80, min_axis_score=0.72, allow_red_flags=False),
+        fast_llm=await create_screening_llm(),
+    )
 
     for brief in sorted(chapter_briefs, key=lambda b: b.meta.chapter_number):
         chapter_num = int(brief.meta.chapter_number)
@@ -294,6 +322,7 @@ async def write_all_chapters_with_qc(
             prev_chapter_text=prev_chapter,
             banned_ngrams= banned_ngrams,
             max_retries=3,
+            repetition_index=repetition_index,
         )
 
         res = await adaptive_chapter_critique(
@@ -304,7 +333,8 @@ async def write_all_chapters_with_qc(
             story_so_far_summary=story_so_far,
             chapter_text=res['chapter_md'],
             prev_chapter_text=prev_chapter,
-            banned_ngrams=banned_ngrams
+            banned_ngrams=banned_ngrams,
+            critic=critic
         )
 
 
@@ -320,8 +350,16 @@ async def write_all_chapters_with_qc(
         )
 
         prev_chapter = res['chapter_md']
+        repetition_index.add(prev_chapter, chapter_num)
         save_markdown_chapter(res['chapter_md'], brief, out_dir)
 
+    tiers = critic.stats
+    print(f"Critique passes: {tiers.passes} ({tiers.local_accept + tiers.local_revise} local, "
+          f"{tiers.fast_accept + tiers.fast_revise} fast, {tiers.full} full); "
+          f"full-critic calls avoided: {tiers.full_calls_avoided}")
+    revisions = critic.revision_stats
+    print(f"Critic revisions: {revisions.patched} patched, {revisions.full_rewrites} full rewrites "
+          f"({revisions.fallbacks} after a rejected patch); patch output {revisions.output_reduction:.1f}x smaller")
     return results
 
 
@@ -338,31 +376,22 @@ def build_context_pack(
     prior_chapter_text: Optional[str],
     prior_chapter_summary: Optional[str],
     cumulative_summary: Optional[str],
+    artifact_cache: Optional[ArtifactCache] = None,
 ) -> Dict[str, Any]:
-
-    # trim noisy fields from book_model for prompt economy
-    model_compact = {
-        "book": {
-            "title": dget(book_model, "book.title", "Untitled"),
-            "author": dget(book_model, "book.author", "Unknown Author"),
-            "type": dget(book_model, "book.type"),
-            "length": dget(book_model, "book.length"),
-            "language": dget(book_model, "book.language"),
-        },
-        "structure": book_model.get("structure"),
-        "audience": book_model.get("audience"),
-        "genre": book_model.get("genre"),
-        "tone": book_model.get("tone") or constraints.get("tone"),
-        "pov": book_model.get("pov") or constraints.get("pov"),
-        "plot": book_model.get("plot"),
-        "style": book_model.get("style"),
-        "world": book_model.get("world"),
-    }
+    """
+    Context for ``make_prompt``. With an ``artifact_cache`` the compact book
+    model is built once per run and the prompt's canon section renders once.
+    """
+    if artifact_cache is not None:
+        model_compact = artifact_cache.get("compact_book_model", (book_model, constraints), _compact_book_model)
+    else:
+        model_compact = _compact_book_model((book_model, constraints))
 
     # research_pack = select_research_for_prompt(research_corpus, chapter_brief, max_items=6)
 
     return {
         "timestamp": datetime.utcnow().isoformat() + "Z",
+        "artifact_cache": artifact_cache,
         "book_model": model_compact,
         "book_summary": book_summary.strip(),
         "constraints": {
@@ -381,6 +410,28 @@ def build_context_pack(
     }
 
 
+def _compact_book_model(artifacts: Tuple[BookModelType, Dict[str, Any]]) -> Dict[str, Any]:
+    """Trim noisy fields from book_model for prompt economy."""
+    book_model, constraints = artifacts
+    return {
+        "book": {
+            "title": dget(book_model, "book.title", "Untitled"),
+            "author": dget(book_model, "book.author", "Unknown Author"),
+            "type": dget(book_model, "book.type"),
+            "length": dget(book_model, "book.length"),
+            "language": dget(book_model, "book.language"),
+        },
+        "structure": book_model.get("structure"),
+        "audience": book_model.get("audience"),
+        "genre": book_model.get("genre"),
+        "tone": book_model.get("tone") or constraints.get("tone"),
+        "pov": book_model.get("pov") or constraints.get("pov"),
+        "plot": book_model.get("plot"),
+        "style": book_model.get("style"),
+        "world": book_model.get("world"),
+    }
+
+
 def select_research_for_prompt(research: Dict[str, Any], brief: GenericChapterBrief, max_items: int = 6) -> Dict[str, Any]:
     """
     Down-select research to the most relevant items for this chapter.
@@ -411,6 +462,16 @@ def select_research_for_prompt(research: Dict[str, Any], brief: GenericChapterBr
 
 # ---------- Prompting ----------
 
+def _canon_book_lines(b: Dict[str, Any]) -> str:
+    # Continuation lines carry the dedent margin of make_prompt's template
+    return "\n    ".join([
+        f"- Book: {b['book']['title']} by {b['book']['author']}",
+        f"- Structure: {fmt(b.get('structure'))}",
+        f"- Audience: {fmt(b.get('audience'))}",
+        f"- Genre: {fmt(b.get('genre'))}",
+    ])
+
+
 def make_prompt(ctx: Dict[str, Any]) -> str:
     b = ctx["book_model"]
     cons = ctx["constraints"]
@@ -429,10 +490,7 @@ def make_prompt(ctx: Dict[str, Any]) -> str:
     You are a professional novelist. Write the next chapter as publishable prose in **Markdown**.
 
     ## Canon (LOCKED)
-    - Book: {b['book']['title']} by {b['book']['author']}
-    - Structure: {fmt(b.get('structure'))}
-    - Audience: {fmt(b.get('audience'))}
-    - Genre: {fmt(b.get('genre'))}
+    {cached_fragment(ctx, "canon_book", b, _canon_book_lines)}
     - Tone: {cons.get('tone')}
     - Pace: {cons.get('pace')}
     - POV: {fmt(cons.get('pov'))}
@@ -544,8 +602,7 @@ def strip_dialogue(text: str) -> str:
 
 
 def count_words(text: str) -> int:
-    # Simple word count
-    return len(re.findall(r"\b\w+\b", text))
+    return text_profile(text).word_count
 
 
 # ---------- Summaries / Continuity ----------
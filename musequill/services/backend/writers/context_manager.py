@@ -1,5 +1,5 @@
 # enhanced_context_manager.py
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 import json
 import os
 from pathlib import Path
@@ -9,6 +9,9 @@ from datetime import datetime
 from musequill.services.backend.writers.chapter_brief_model import GenericChapterBrief
 from musequill.services.backend.model import BookModelType
 from musequill.services.backend.writers.research_model import RefinedResearch
+from musequill.services.backend.writers.artifact_cache import ArtifactCache
+from musequill.services.backend.writers.book_terms import BookTermMatcher, thread_key
+from musequill.services.backend.writers.repetition_index import RepetitionIndex, RepetitionReport
 
 class NarrativeState:
     """Tracks the evolving state of the narrative across chapters."""
@@ -187,10 +190,18 @@ class EnhancedContextManager:
         self.base_dir = base_dir
         self.narrative_state = NarrativeState()
         self.state_file = os.path.join(base_dir, f"narrative_state_{book_id}.json")
+        self._term_matcher: Optional[BookTermMatcher] = None
+        self._term_matcher_key: Optional[Tuple] = None
+        # Prompt fragments of the book's fixed artifacts, rendered once per run
+        self.artifact_cache = ArtifactCache()
         
         # Load existing state if available
         if os.path.exists(self.state_file):
             self.narrative_state = NarrativeState.load_from_file(self.state_file)
+
+        # Hashed n-grams of the chapters written so far, for recycled phrasing
+        self.repetition_file = os.path.join(base_dir, f"repetition_index_{book_id}.bin")
+        self.repetition_index = RepetitionIndex.load(self.repetition_file)
     
     def build_enhanced_context_pack(
         self,
@@ -240,6 +251,30 @@ class EnhancedContextManager:
         
         return enhanced_context
     
+    def term_matcher(
+        self,
+        banned_ngrams: Iterable[str],
+        narrative_continuity: Dict[str, Any]
+    ) -> BookTermMatcher:
+        """
+        Compiled matcher for the banned n-grams, character names and plot threads in play.
+
+        Kept on the context manager and rebuilt only when one of the term sets
+        changes, which in practice is after a chapter introduces a character or
+        thread, so every draft and revision of a chapter reuses one matcher.
+        """
+        characters = tuple(narrative_continuity.get("character_states", {}))
+        threads = tuple(t["thread"] for t in narrative_continuity.get("active_plot_threads", []))
+        key = (tuple(banned_ngrams or ()), characters, tuple(thread_key(t) for t in threads))
+        if self._term_matcher is None or key != self._term_matcher_key:
+            self._term_matcher = BookTermMatcher(key[0], characters, threads)
+            self._term_matcher_key = key
+        return self._term_matcher
+
+    def check_repetition(self, chapter_text: str, target_chapter: int) -> RepetitionReport:
+        """Phrasing repeated within the draft or recycled from other chapters of the book."""
+        return self.repetition_index.check(chapter_text, target_chapter)
+
     def update_after_chapter_completion(
         self, 
         chapter_content: str, 
@@ -249,6 +284,8 @@ class EnhancedContextManager:
         """Update narrative state after chapter completion."""
         self.narrative_state.update_from_chapter(chapter_content, chapter_meta, continuity_data)
         self.narrative_state.save_to_file(self.state_file)
+        self.repetition_index.add(chapter_content, int(chapter_meta["chapter_number"]))
+        self.repetition_index.save(self.repetition_file)
     
     def _build_traditional_context(
         self,
@@ -258,8 +295,14 @@ class EnhancedContextManager:
         research_corpus: RefinedResearch,
         chapter_brief: GenericChapterBrief
     ) -> Dict[str, Any]:
-        """Build the traditional context structure using proper typed objects."""
+        """
+        Build the traditional context structure using proper typed objects.
+
+        The artifacts are passed by reference along with ``artifact_cache``,
+        through which prompt builders render their fixed sections once per run.
+        """
         return {
+            "artifact_cache": self.artifact_cache,
             "timestamp": datetime.utcnow().isoformat() + "Z",
             "book_model": book_model,
             "book_summary": book_summary.strip(),
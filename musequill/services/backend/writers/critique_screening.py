@@ -0,0 +1,139 @@
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from musequill.services.backend.writers.book_terms import describe_hits
+from musequill.services.backend.writers.text_profile import text_profile
+
+# Tier names, as recorded on each CritiqueResult
+LOCAL = "local"
+FAST = "fast"
+FULL = "full"
+
+
+@dataclass
+class ScreeningPolicy:
+    """
+    When ChapterCritic may settle a pass without the full critic model.
+
+    Local metrics run first. A chapter with deterministic red flags (length
+    out of band, banned n-grams, repeated lines) must be revised anyway when
+    the acceptance policy forbids red flags, so it goes straight to revision.
+    A clean chapter is accepted locally only if ``local_accept_score`` is
+    set and reached; prose quality is not measurable locally, so this is off
+    by default. Otherwise the fast model (if any) critiques a compact prompt:
+    a clear pass or clear fail settles it, and only the band between
+    ``fast_revise_score`` and ``fast_accept_score`` goes to the full critic.
+    """
+    screen_local_red_flags: bool = True
+    local_accept_score: Optional[float] = None
+    fast_accept_score: float = 0.85
+    fast_revise_score: float = 0.60
+    length_tolerance: float = 0.25
+
+    def settle_local(self, screen: "LocalScreen", allow_red_flags: bool) -> Optional[bool]:
+        """True to accept, False to revise on local findings alone, None to ask a model."""
+        if screen.red_flags and self.screen_local_red_flags and not allow_red_flags:
+            return False
+        if (not screen.red_flags and self.local_accept_score is not None
+                and screen.overall_score >= self.local_accept_score):
+            return True
+        return None
+
+    def settle_fast(self, overall_score: float, accepted: bool) -> Optional[bool]:
+        """True/False when the fast model's verdict is clear, None to escalate to the full critic."""
+        if accepted and overall_score >= self.fast_accept_score:
+            return True
+        if overall_score < self.fast_revise_score:
+            return False
+        return None
+
+
+@dataclass
+class LocalScreen:
+    """Deterministic metrics for one chapter draft."""
+    overall_score: float
+    axis_scores: Dict[str, float]
+    red_flags: List[str]
+    suggestions: List[str]
+    length_ok: bool = True
+
+
+@dataclass
+class CritiqueTierStats:
+    """How each critique pass was settled, and how many full-critic calls that saved."""
+    local_accept: int = 0
+    local_revise: int = 0
+    fast_accept: int = 0
+    fast_revise: int = 0
+    fast_escalate: int = 0
+    full: int = 0
+
+    @property
+    def passes(self) -> int:
+        return self.local_accept + self.local_revise + self.fast_accept + self.fast_revise + self.full
+
+    @property
+    def full_calls_avoided(self) -> int:
+        return self.passes - self.full
+
+    def record(self, tier: str, accepted: bool) -> None:
+        if tier == FULL:
+            self.full += 1
+        else:
+            name = f"{tier}_{'accept' if accepted else 'revise'}"
+            setattr(self, name, getattr(self, name) + 1)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {**asdict(self), "passes": self.passes, "full_calls_avoided": self.full_calls_avoided}
+
+
+def screen_chapter(
+    text: str,
+    target_words: Optional[int],
+    banned_ngrams: List[str],
+    length_tolerance: float = 0.25,
+) -> LocalScreen:
+    """
+    Score a draft on what can be measured without a model: length against
+    target, repetition, banned n-grams and heading structure. The red flags
+    are the critic's long-standing local checks.
+    """
+    text = text or ""
+    profile = text_profile(text)
+    red_flags: List[str] = []
+    suggestions: List[str] = []
+    axes: Dict[str, float] = {}
+    length_ok = True
+
+    # Length: full marks within ±10%, nothing beyond ±50%
+    if target_words and target_words > 0:
+        wc = profile.word_count
+        lo, hi = int(target_words * (1 - length_tolerance)), int(target_words * (1 + length_tolerance))
+        if not lo <= wc <= hi:
+            length_ok = False
+            red_flags.append(f"Word count {wc} outside [{lo}, {hi}] for target {target_words}.")
+            suggestions.append(f"{'Expand' if wc < lo else 'Tighten'} the chapter toward {target_words} words.")
+        off = abs(wc / target_words - 1)
+        axes["Length"] = max(0.0, min(1.0, 1 - (off - 0.10) / 0.40))
+
+    dupes = profile.repeated_lines(25)
+    if dupes:
+        red_flags.append(f"Detected repeated lines: {min(len(dupes),5)} samples (e.g., “{dupes[0][:80]}…”)")
+    repeated = profile.repeated_ngrams(4, 3)
+    if repeated:
+        suggestions.append(f"Vary repeated phrasing: {', '.join(repeated[:3])}")
+    axes["Repetition"] = max(0.0, 1 - 0.1 * (len(dupes) + len(repeated)))
+
+    hits = profile.phrase_hits(banned_ngrams or [])
+    if hits:
+        red_flags.append(f"Banned n-grams present: {list(dict.fromkeys(h.term for h in hits))[:5]}")
+        red_flags.extend(f"Banned n-gram {where}" for where in describe_hits(text, hits, limit=5))
+    axes["Banned phrases"] = 0.0 if hits else 1.0
+
+    axes["Structure"] = 1.0 if profile.h1_count == 1 and profile.h3_count else 0.5
+    if axes["Structure"] < 1.0:
+        suggestions.append("Use one H1 chapter title and `###` scene headings.")
+
+    overall = sum(axes.values()) / len(axes)
+    return LocalScreen(overall, axes, red_flags, suggestions, length_ok)
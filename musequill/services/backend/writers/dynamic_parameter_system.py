@@ -1,6 +1,13 @@
 # dynamic_parameter_system.py
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import json
+import math
+import os
+import random
+import time
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from dataclasses import asdict, dataclass, field, fields
+
+from musequill.services.backend.writers.chapter_patch import REWRITE_MAX_TOKENS
 
 @dataclass
 class DynamicParams:
@@ -218,6 +225,292 @@ class ParameterAdaptationManager:
         return min(adaptive_length, 2500)  # Cap at reasonable limit
 
 
+# Recorded performance and the learned controller
+
+# A chapter is acceptable once its feedback score reaches this (the enhanced writer's threshold)
+ACCEPTABLE_SCORE = 0.85
+# Shared by every book written into the same output directory
+PERFORMANCE_FILE = "performance_history.jsonl"
+# Context windows Ollama is asked for; the prompt plus num_predict must fit
+CONTEXT_SIZES = (4096, 8192, 16384, 32768)
+# Longest response the controller asks for: the same budget a full rewrite gets
+MAX_PREDICT = REWRITE_MAX_TOKENS
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimation (1 token ≈ 0.75 words)."""
+    return int(len((text or "").split()) * 1.33)
+
+
+@dataclass
+class ChapterRun:
+    """One chapter's generation: the parameters used and what they cost."""
+    book_id: str
+    chapter: int
+    complexity: str
+    target_words: int
+    temperature: float
+    num_ctx: int
+    num_predict: int
+    max_retries: int
+    attempts: int
+    final_score: float
+    accepted: bool
+    prompt_tokens: int   # first-draft prompt, estimated
+    tokens: int          # prompt + completion over all attempts, estimated
+    wall_time: float     # seconds for the whole attempt loop
+    recorded_at: float = field(default_factory=time.time)
+
+    @property
+    def predict_ratio(self) -> float:
+        """num_predict relative to the chapter's target length in tokens."""
+        return round(self.num_predict / max(1, self.target_words * 1.33), 1)
+
+
+class PerformanceStore:
+    """
+    Append-only JSONL log of ChapterRuns, shared across books.
+
+    Every run is kept (the controller needs history, not just the last few
+    chapters); unreadable lines are skipped so a torn write loses one record.
+    With ``path=None`` the store is in memory only.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._runs: List[ChapterRun] = self._load()
+
+    def _load(self) -> List[ChapterRun]:
+        if not self.path or not os.path.exists(self.path):
+            return []
+        names = {f.name for f in fields(ChapterRun)}
+        runs = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                    runs.append(ChapterRun(**{k: v for k, v in data.items() if k in names}))
+                except (ValueError, TypeError):
+                    continue
+        return runs
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    @property
+    def runs(self) -> List[ChapterRun]:
+        return list(self._runs)
+
+    def record(self, run: ChapterRun) -> None:
+        if self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(run)) + "\n")
+        self._runs.append(run)
+
+
+@dataclass
+class GenerationPlan:
+    """Parameters the controller picked for one chapter, and why."""
+    complexity: str
+    temperature: float
+    revision_temperature: float
+    num_ctx: int
+    num_predict: int
+    max_retries: int
+    accept_rate: float          # estimated per-attempt acceptance
+    attempt_seconds: float      # estimated wall time per attempt
+    expected_seconds: float     # within the retry budget
+    samples: int                # recorded runs behind the estimate
+    explored: bool = False
+
+    def generation_params(self) -> Dict[str, Any]:
+        """First-draft settings for ``LLMService.update_default_parameters`` (max_tokens is Ollama's num_predict)."""
+        return {"temperature": self.temperature, "top_p": 0.95, "top_k": 50,
+                "num_ctx": self.num_ctx, "max_tokens": self.num_predict}
+
+
+_Arm = Tuple[float, int, float]  # temperature, num_ctx, predict ratio
+
+
+def _num_predict(ratio: float, target_words: int) -> int:
+    return min(MAX_PREDICT, int(ratio * target_words * 1.33))
+
+
+class ParameterController:
+    """
+    Picks temperature, num_ctx, num_predict and the retry budget for a chapter
+    to minimise expected time to an acceptable chapter, from recorded runs.
+
+    For each candidate setting, a per-attempt acceptance rate and wall time
+    are estimated from runs of the same chapter complexity with that setting.
+    Both are shrunk towards the pooled runs of that complexity (``prior_strength``
+    pseudo-attempts), and time is scaled by num_predict, so untried settings
+    get a sensible latency estimate. The setting with the lowest
+    ``seconds / accept_rate`` wins. The retry budget is the fewest attempts
+    that reach ``target_success`` at that rate. With no history the
+    heuristic tiers of ``ParameterAdaptationManager`` decide, with the
+    writer's long-standing 3 attempts. ``exploration`` is the chance of
+    trying another candidate so the history covers more than one setting.
+    """
+
+    def __init__(
+        self,
+        store: PerformanceStore,
+        temperatures: Sequence[float] = (0.7, 0.8, 0.9),
+        predict_ratios: Sequence[float] = (1.3, 1.6, 2.0),
+        max_retry_budget: int = 5,
+        target_success: float = 0.9,
+        prior_strength: float = 2.0,
+        exploration: float = 0.1,
+        seed: Optional[int] = None,
+    ):
+        self.store = store
+        self.temperatures = tuple(temperatures)
+        self.predict_ratios = tuple(predict_ratios)
+        self.max_retry_budget = max_retry_budget
+        self.target_success = target_success
+        self.prior_strength = prior_strength
+        self.exploration = exploration
+        self.adaptation = ParameterAdaptationManager()
+        self._rng = random.Random(seed)
+
+    def candidates(self, prompt_tokens: int, target_words: int) -> List[_Arm]:
+        """Settings whose context window fits the prompt and the chapter; the two smallest windows that do."""
+        arms = []
+        for ratio in self.predict_ratios:
+            predict = _num_predict(ratio, target_words)
+            ratio = round(predict / (target_words * 1.33), 1)  # as recorded, after the MAX_PREDICT cap
+            fitting = [c for c in CONTEXT_SIZES if c >= prompt_tokens + predict][:2] or [CONTEXT_SIZES[-1]]
+            arms.extend((t, ctx, ratio) for t in self.temperatures for ctx in fitting)
+        return list(dict.fromkeys(arms))
+
+    def plan(
+        self,
+        chapter_brief,
+        prompt_tokens: int,
+        target_words: Optional[int] = None,
+        complexity: Optional[str] = None,
+    ) -> GenerationPlan:
+        """Parameters for a chapter whose first-draft prompt is ``prompt_tokens`` long."""
+        target_words = target_words or getattr(getattr(chapter_brief, "meta", None), "target_words", 0) or 2000
+        complexity = complexity or self.adaptation._assess_chapter_complexity(chapter_brief)
+        arms = self.candidates(prompt_tokens, target_words)
+        runs = [r for r in self.store.runs if r.complexity == complexity] or self.store.runs
+
+        if not runs:
+            heuristic = self.adaptation.calculate_dynamic_params(chapter_brief, 0)
+            # Without history, the longest response is the safe choice: a short one truncates the draft
+            default = min(arms, key=lambda a: (abs(a[0] - heuristic.temperature_base), -a[2], a[1]))
+            return self._make_plan(complexity, default, target_words, 0.5, 0.0, 0, retries=3)
+
+        scored = [(self.estimate(arm, runs, _num_predict(arm[2], target_words)), arm) for arm in arms]
+        explored = self.exploration > 0 and self._rng.random() < self.exploration
+        (rate, seconds, samples), arm = self._rng.choice(scored) if explored else min(
+            scored, key=lambda e: (e[0][1] / e[0][0], -e[0][2]))
+        return self._make_plan(complexity, arm, target_words, rate, seconds, samples, explored=explored)
+
+    def estimate(self, arm: _Arm, runs: List[ChapterRun], num_predict: int) -> Tuple[float, float, int]:
+        """(per-attempt acceptance, seconds per attempt, matching runs) for ``arm`` over ``runs``."""
+        k = self.prior_strength
+        attempts = sum(r.attempts for r in runs)
+        prior_rate = (sum(r.accepted for r in runs) + 0.5) / (attempts + 1)
+        # Generation time grows with the tokens asked for, so time is estimated per
+        # requested token and scaled to this chapter's num_predict
+        prior_per_token = sum(r.wall_time for r in runs) / max(1, sum(r.num_predict * r.attempts for r in runs))
+
+        matching = [r for r in runs if (r.temperature, r.num_ctx, r.predict_ratio) == arm]
+        attempts = sum(r.attempts for r in matching)
+        rate = (sum(r.accepted for r in matching) + k * prior_rate) / (attempts + k)
+        per_token = ((sum(r.wall_time for r in matching) + k * prior_per_token * num_predict)
+                     / (sum(r.num_predict * r.attempts for r in matching) + k * num_predict))
+        return max(rate, 1e-3), per_token * num_predict, len(matching)
+
+    def retry_budget(self, rate: float) -> int:
+        """Fewest attempts whose chance of one acceptance reaches ``target_success``."""
+        if rate >= 1:
+            return 1
+        needed = math.ceil(math.log(1 - self.target_success) / math.log(1 - rate))
+        return max(1, min(self.max_retry_budget, needed))
+
+    def _make_plan(self, complexity, arm, target_words, rate, seconds, samples, retries=None, explored=False):
+        temperature, num_ctx, ratio = arm
+        retries = retries or self.retry_budget(rate)
+        expected = seconds * (1 - (1 - rate) ** retries) / rate if rate else 0.0
+        return GenerationPlan(
+            complexity=complexity,
+            temperature=temperature,
+            revision_temperature=round(temperature - 0.1, 2),
+            num_ctx=num_ctx,
+            num_predict=_num_predict(ratio, target_words),
+            max_retries=retries,
+            accept_rate=rate,
+            attempt_seconds=seconds,
+            expected_seconds=expected,
+            samples=samples,
+            explored=explored,
+        )
+
+
+def replay_benchmark(runs: List[ChapterRun], controller_factory, baseline: Optional[_Arm] = None) -> Dict[str, Any]:
+    """
+    Offline replay over recorded runs.
+
+    Runs are replayed in the order they were recorded. Before each chapter a
+    controller that has seen only the earlier runs picks a setting. The
+    cost of that choice is the recorded time-to-acceptable of the setting
+    for that complexity: total wall time over accepted chapters, across the
+    whole log. ``baseline`` is the fixed setting to compare against (default:
+    the most common one in the log, i.e. what the writer used before).
+    ``controller_factory(store)`` builds the controller, usually with
+    ``exploration=0``.
+    """
+    runs = sorted(runs, key=lambda r: r.recorded_at)
+    arm_of = lambda r: (r.temperature, r.num_ctx, r.predict_ratio)
+
+    cost: Dict[Tuple[str, _Arm], List[float]] = {}
+    for r in runs:
+        total = cost.setdefault((r.complexity, arm_of(r)), [0.0, 0.0])
+        total[0] += r.wall_time
+        total[1] += r.accepted
+
+    def time_to_accept(complexity: str, arm: _Arm) -> Optional[float]:
+        wall, accepted = cost.get((complexity, arm), (0.0, 0.0))
+        return wall / accepted if accepted else None
+
+    if baseline is None:
+        counts: Dict[_Arm, int] = {}
+        for r in runs:
+            counts[arm_of(r)] = counts.get(arm_of(r), 0) + 1
+        baseline = max(counts, key=counts.get)
+
+    history = PerformanceStore(None)
+    controller = controller_factory(history)
+    chosen = baseline_total = 0.0
+    evaluated = unscored = 0
+    for r in runs:
+        plan = controller.plan(None, r.prompt_tokens, target_words=r.target_words, complexity=r.complexity)
+        arm = (plan.temperature, plan.num_ctx, round(plan.num_predict / (r.target_words * 1.33), 1))
+        picked, base = time_to_accept(r.complexity, arm), time_to_accept(r.complexity, baseline)
+        if picked is None or base is None:
+            unscored += 1   # the log cannot say what the choice would have cost
+        else:
+            chosen += picked
+            baseline_total += base
+            evaluated += 1
+        history.record(r)
+
+    return {
+        "chapters": len(runs),
+        "evaluated": evaluated,
+        "unscored": unscored,
+        "baseline": baseline,
+        "baseline_seconds": baseline_total,
+        "controller_seconds": chosen,
+        "speedup": baseline_total / chosen if chosen else 0.0,
+    }
+
+
 # Integration functions for the enhanced chapter writer
 
 def integrate_dynamic_params_with_enhanced_writer():
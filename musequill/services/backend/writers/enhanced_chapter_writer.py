@@ -1,6 +1,7 @@
 # enhanced_chapter_writer.py
 import os
 import re
+import time
 import unicodedata
 from typing import Dict, List, Any, Optional
 from uuid import uuid4
@@ -11,6 +12,25 @@ from musequill.services.backend.model.book import BookModelType
 from musequill.services.backend.writers.research_model import RefinedResearch
 from musequill.services.backend.llm.ollama_client import LLMService
 from .context_manager import EnhancedContextManager, create_enhanced_context_manager
+from .chapter_patch import (
+    PATCH_MAX_TOKENS,
+    REWRITE_MAX_TOKENS,
+    PatchError,
+    RevisionStats,
+    apply_patch_response,
+    patchable,
+)
+from .artifact_cache import cached_fragment
+from .dynamic_parameter_system import (
+    ACCEPTABLE_SCORE,
+    PERFORMANCE_FILE,
+    ChapterRun,
+    GenerationPlan,
+    ParameterController,
+    PerformanceStore,
+    estimate_tokens,
+)
+from .text_profile import text_profile
 from musequill.services.backend.utils import (
     seconds_to_time_string,
     extract_json_from_response
@@ -18,11 +38,40 @@ from musequill.services.backend.utils import (
 # Import the feedback system
 from .chapter_feedback import (
     evaluate_chapter_quality_with_feedback,
-    create_improvement_prompt
+    create_improvement_prompt,
+    create_patch_prompt
 )
 
+def _book_overview(book_model: BookModelType) -> str:
+    return f"""## Book Overview
+- **Title**: {book_model.book.title}
+- **Genre**: {book_model.genre.primary.type}
+- **Audience**: {book_model.audience.type} ({book_model.audience.age})
+- **POV**: {book_model.pov.type}
+- **Tone**: {book_model.tone.type}"""
+
+
+def _scene_structure(chapter_brief: GenericChapterBrief) -> str:
+    """Scene details using proper typed access."""
+    out = ""
+    for i, scene in enumerate(chapter_brief.scenes, 1):
+        out += f"""
+**Scene {i}**: {scene.location or 'Unknown location'} ({scene.time or 'Unknown time'})
+- Characters: {', '.join(scene.characters_on_stage)}
+- Objective: {scene.objective or 'Advance the story'}
+- Conflict: {scene.conflict or 'Create tension'}
+- Exit: {scene.exit_on or 'Natural transition'}
+"""
+    return out
+
+
 def make_enhanced_chapter_prompt(ctx: Dict[str, Any]) -> str:
-    """Create an enhanced chapter prompt with rich contextual information."""
+    """
+    Create an enhanced chapter prompt with rich contextual information.
+
+    The book overview and scene structure come from ``ctx["artifact_cache"]``
+    when the context manager supplies one, so they render once per run.
+    """
     
     book_model: BookModelType = ctx["book_model"]
     chapter_brief: GenericChapterBrief = ctx["chapter_brief"]
@@ -79,12 +128,7 @@ def make_enhanced_chapter_prompt(ctx: Dict[str, Any]) -> str:
 # MASTER CONTEXT & CONTINUITY
 You are writing a continuous story. Each chapter must build naturally on what came before, maintaining character consistency, advancing plot threads, and preserving the narrative voice established in previous chapters.
 
-## Book Overview
-- **Title**: {book_model.book.title}
-- **Genre**: {book_model.genre.primary.type}
-- **Audience**: {book_model.audience.type} ({book_model.audience.age})
-- **POV**: {book_model.pov.type}
-- **Tone**: {book_model.tone.type}
+{cached_fragment(ctx, "book_overview", book_model, _book_overview)}
 
 ## Story Continuity Context
 {contextual_summary}
@@ -107,17 +151,7 @@ You are writing a continuous story. Each chapter must build naturally on what ca
 
 ### Scene Structure:
 """
-
-    # Add scene details using proper typed access
-    scenes = chapter_brief.scenes
-    for i, scene in enumerate(scenes, 1):
-        prompt += f"""
-**Scene {i}**: {scene.location or 'Unknown location'} ({scene.time or 'Unknown time'})
-- Characters: {', '.join(scene.characters_on_stage)}
-- Objective: {scene.objective or 'Advance the story'}
-- Conflict: {scene.conflict or 'Create tension'}
-- Exit: {scene.exit_on or 'Natural transition'}
-"""
+    prompt += cached_fragment(ctx, "scene_structure", chapter_brief, _scene_structure)
 
     prompt += f"""
 
@@ -175,9 +209,15 @@ async def enhanced_write_chapter_with_qc(
     banned_ngrams: List[str] = None,
     max_retries: int = 3,
     prior_chapter_text: Optional[str] = None,
-    prior_chapter_summary: Optional[str] = None
+    prior_chapter_summary: Optional[str] = None,
+    controller: Optional[ParameterController] = None
 ) -> Dict[str, Any]:
-    """Enhanced chapter writing with feedback-driven improvement loop."""
+    """
+    Enhanced chapter writing with feedback-driven improvement loop.
+
+    With a ``controller``, temperature, num_ctx, num_predict and the retry
+    budget come from its plan, and the run is recorded to its store.
+    """
     
     # Build enhanced context
     enhanced_context = context_manager.build_enhanced_context_pack(
@@ -191,37 +231,56 @@ async def enhanced_write_chapter_with_qc(
         prior_chapter_summary=prior_chapter_summary
     )
     
+    term_matcher = context_manager.term_matcher(
+        banned_ngrams or [], enhanced_context["narrative_continuity"]
+    )
+    
+    revision_stats = RevisionStats()
     attempts = 0
     best_text = ""
     best_score = 0
     best_feedback = None
     feedback_history = []
+    plan: Optional[GenerationPlan] = None
+    started = time.perf_counter()
     
     # Initial generation
     attempts += 1
     try:
         initial_prompt = make_enhanced_chapter_prompt(enhanced_context)
+        prompt_tokens = estimate_tokens(initial_prompt)
         
-        # Generate with moderate creativity
-        temp = 0.8
-        await llm.update_default_parameters(**{
-            "temperature": temp,
-            "top_p": 0.95,
-            "top_k": 50
-        })
+        if controller is not None:
+            plan = controller.plan(chapter_brief, prompt_tokens)
+            max_retries = plan.max_retries
+            print(f"  Parameters: temperature {plan.temperature}, num_ctx {plan.num_ctx}, "
+                  f"num_predict {plan.num_predict}, up to {max_retries} attempts "
+                  f"(expected {seconds_to_time_string(plan.expected_seconds)})")
+            await llm.update_default_parameters(**plan.generation_params())
+        else:
+            # Generate with moderate creativity
+            await llm.update_default_parameters(**{
+                "temperature": 0.8,
+                "top_p": 0.95,
+                "top_k": 50,
+                "max_tokens": REWRITE_MAX_TOKENS
+            })
         
         res = await llm.generate(initial_prompt)
         if res.get('timelapse', 0):
             print(f"⏱️  LLM Response Time: {seconds_to_time_string(res['timelapse'])}")
         
         text, qa_block = extract_qa_block(res['response'])
+        tokens = prompt_tokens + estimate_tokens(res['response'])
         word_count = count_words(text)
         target_words = chapter_brief.meta.target_words
         
         # Get detailed feedback
         score, feedback = evaluate_chapter_quality_with_feedback(
             text, qa_block, chapter_brief, enhanced_context, 
-            word_count, target_words, enhanced_context.get("narrative_continuity")
+            word_count, target_words, enhanced_context.get("narrative_continuity"),
+            term_matcher=term_matcher,
+            repetition=context_manager.check_repetition(text, target_chapter)
         )
         
         best_text = text
@@ -232,40 +291,71 @@ async def enhanced_write_chapter_with_qc(
         print(f"  Initial attempt: Score {score:.2f}, Priority: {feedback.improvement_priority}")
         
         # If initial attempt is good enough, we're done
-        if score >= 0.85:
+        if score >= ACCEPTABLE_SCORE:
             print(f"  ✓ Chapter meets quality threshold on first attempt")
         else:
             print(f"  → Needs improvement, beginning feedback loop...")
             
             # Improvement loop with feedback
-            while attempts < max_retries and best_score < 0.85:
+            while attempts < max_retries and best_score < ACCEPTABLE_SCORE:
                 attempts += 1
                 
                 try:
-                    # Create improvement prompt based on feedback
-                    improvement_prompt = create_improvement_prompt(
-                        best_text, best_feedback, enhanced_context, attempts
-                    )
-                    
-                    # Adjust generation parameters for revision
-                    revision_temp = 0.7 + (attempts - 1) * 0.05  # Slightly less creative for revisions
-                    await llm.update_default_parameters(**{
-                        "temperature": revision_temp,
-                        "top_p": 0.9,
-                        "top_k": 40
-                    })
+                    # Slightly less creative for revisions
+                    revision_temp = (plan.revision_temperature if plan else 0.7) + (attempts - 1) * 0.05
+                    revised_text = None
                     
-                    res = await llm.generate(improvement_prompt)
-                    if res.get('timelapse', 0):
-                        print(f"⏱️  Revision Time: {seconds_to_time_string(res['timelapse'])}")
+                    # Near target length: ask for targeted edits instead of the whole chapter
+                    if patchable(count_words(best_text), target_words, tolerance=0.2):
+                        await llm.update_default_parameters(**{
+                            "temperature": revision_temp,
+                            "top_p": 0.9,
+                            "top_k": 40,
+                            "max_tokens": PATCH_MAX_TOKENS
+                        })
+                        patch_prompt = create_patch_prompt(
+                            best_text, best_feedback, enhanced_context, attempts
+                        )
+                        res = await llm.generate_json(patch_prompt)
+                        tokens += estimate_tokens(patch_prompt) + estimate_tokens(res.get("response", ""))
+                        try:
+                            revised_text = apply_patch_response(best_text, res.get("json"))
+                            revised_qa = qa_block
+                            revision_stats.record_patch(res.get("response", ""), best_text)
+                            print(f"    Patched {len(res.get('response', ''))} chars instead of rewriting {len(best_text)}")
+                        except PatchError as e:
+                            revision_stats.fallbacks += 1
+                            print(f"    Patch rejected ({e}), rewriting in full")
                     
-                    revised_text, revised_qa = extract_qa_block(res['response'])
+                    if revised_text is None:
+                        # Create improvement prompt based on feedback
+                        improvement_prompt = create_improvement_prompt(
+                            best_text, best_feedback, enhanced_context, attempts
+                        )
+                        
+                        # Adjust generation parameters for revision
+                        await llm.update_default_parameters(**{
+                            "temperature": revision_temp,
+                            "top_p": 0.9,
+                            "top_k": 40,
+                            "max_tokens": REWRITE_MAX_TOKENS
+                        })
+                        
+                        res = await llm.generate(improvement_prompt)
+                        tokens += estimate_tokens(improvement_prompt) + estimate_tokens(res.get("response", ""))
+                        if res.get('timelapse', 0):
+                            print(f"⏱️  Revision Time: {seconds_to_time_string(res['timelapse'])}")
+                        
+                        revised_text, revised_qa = extract_qa_block(res['response'])
+                        revision_stats.full_rewrites += 1
                     revised_word_count = count_words(revised_text)
                     
                     # Evaluate revision
                     revised_score, revised_feedback = evaluate_chapter_quality_with_feedback(
                         revised_text, revised_qa, chapter_brief, enhanced_context,
-                        revised_word_count, target_words, enhanced_context.get("narrative_continuity")
+                        revised_word_count, target_words, enhanced_context.get("narrative_continuity"),
+                        term_matcher=term_matcher,
+                        repetition=context_manager.check_repetition(revised_text, target_chapter)
                     )
                     
                     print(f"  Revision {attempts-1}: Score {revised_score:.2f} (was {best_score:.2f})")
@@ -282,7 +372,7 @@ async def enhanced_write_chapter_with_qc(
                     feedback_history.append(revised_feedback)
                     
                     # Break if we reach quality threshold
-                    if best_score >= 0.85:
+                    if best_score >= ACCEPTABLE_SCORE:
                         print(f"  ✓ Chapter meets quality threshold after {attempts-1} revisions")
                         break
                         
@@ -297,6 +387,24 @@ async def enhanced_write_chapter_with_qc(
     if not best_text:
         raise RuntimeError(f"Failed to generate chapter after {max_retries} attempts")
     
+    if controller is not None:
+        controller.store.record(ChapterRun(
+            book_id=context_manager.book_id,
+            chapter=int(target_chapter),
+            complexity=plan.complexity,
+            target_words=target_words,
+            temperature=plan.temperature,
+            num_ctx=plan.num_ctx,
+            num_predict=plan.num_predict,
+            max_retries=max_retries,
+            attempts=attempts,
+            final_score=best_score,
+            accepted=best_score >= ACCEPTABLE_SCORE,
+            prompt_tokens=prompt_tokens,
+            tokens=tokens,
+            wall_time=time.perf_counter() - started
+        ))
+    
     # Extract continuity information for state updates
     continuity_data = await extract_continuity_advanced(best_text, chapter_brief, llm)
     
@@ -309,7 +417,8 @@ async def enhanced_write_chapter_with_qc(
         "quality_score": best_score,
         "attempts": attempts,
         "final_feedback": best_feedback.__dict__ if best_feedback else {},
-        "improvement_history": [f.__dict__ for f in feedback_history]
+        "improvement_history": [f.__dict__ for f in feedback_history],
+        "revisions": revision_stats.to_dict()
     }
     
     # Update narrative state
@@ -344,6 +453,8 @@ async def enhanced_write_all_chapters_with_qc(
     
     # Initialize enhanced context manager
     context_manager = create_enhanced_context_manager(book_id, out_dir)
+    # Learns generation parameters from every book written into out_dir
+    controller = ParameterController(PerformanceStore(os.path.join(out_dir, PERFORMANCE_FILE)))
     
     os.makedirs(out_dir, exist_ok=True)
     results: List[Dict[str, Any]] = []
@@ -372,7 +483,8 @@ async def enhanced_write_all_chapters_with_qc(
             target_chapter=chapter_num,
             banned_ngrams=banned_ngrams,
             max_retries=3,
-            prior_chapter_text=prev_chapter_text
+            prior_chapter_text=prev_chapter_text,
+            controller=controller
         )
         
         results.append(chapter_result)
@@ -408,7 +520,7 @@ def extract_qa_block(text: str) -> tuple[str, str]:
 
 def count_words(text: str) -> int:
     """Count words in text."""
-    return len(text.split())
+    return text_profile(text).word_count
 
 
 def evaluate_chapter_quality(
@@ -422,6 +534,7 @@ def evaluate_chapter_quality(
     """Evaluate chapter quality (0.0 to 1.0)."""
     
     score = 0.0
+    profile = text_profile(text)
     
     # Word count scoring (30% of total)
     word_ratio = word_count / target_words
@@ -433,28 +546,28 @@ def evaluate_chapter_quality(
         score += 0.10
     
     # Structure scoring (20% of total)
-    if text.count("# ") >= 1:  # Has title
+    if profile.h1_count >= 1:  # Has title
         score += 0.10
-    if text.count("### ") >= 1:  # Has scene breaks
+    if profile.h3_count >= 1:  # Has scene breaks
         score += 0.10
     
     # Content scoring (30% of total)
-    if len(text.strip()) > 500:  # Substantial content
+    if profile.content_chars > 500:  # Substantial content
         score += 0.15
     if qa_block:  # Has QA block
         score += 0.15
     
     # Basic quality indicators (20% of total)
-    sentences = text.count('.') + text.count('!') + text.count('?')
+    sentences = profile.sentence_marks
     if sentences > 20:  # Reasonable sentence count
         score += 0.10
     
     # Check for dialogue
-    if '"' in text:
+    if profile.quote_count:
         score += 0.05
     
     # Check for variety in sentence structure
-    if text.count(',') > sentences * 0.5:  # Complex sentences
+    if profile.comma_count > sentences * 0.5:  # Complex sentences
         score += 0.05
     
     return min(score, 1.0)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+import logging
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from musequill.services.backend.writers.text_profile import text_profile
+
+logger = logging.getLogger(__name__)
+
+# Six words: long enough that stock phrases ("at the end of the") rarely
+# collide across chapters, short enough to catch a recycled image or line
+DEFAULT_NGRAM = 6
+# A 100k-word novel has roughly 100k distinct 6-grams, so this holds a long book
+DEFAULT_MAX_GRAMS = 250_000
+# Within a chapter, the 4-gram rule the writer's revision check has always used
+INTRA_NGRAM = 4
+INTRA_MIN_COUNT = 3
+# A couple of shared phrases between chapters is normal prose; more is recycling
+RECYCLED_PHRASE_LIMIT = 2
+
+_MAGIC = b"MQRI"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHqqI")
+_SEGMENT = struct.Struct("<iI")
+# n-gram hashes come from the tuple hash; a snapshot written under another scheme is discarded
+_HASH_PROBE = hash((1, 2, 3))
+
+
+@dataclass
+class RecycledPhrase:
+    phrase: str
+    chapter: int  # earlier chapter that used it
+    start: int    # token offset in the checked chapter
+
+
+@dataclass
+class RepetitionReport:
+    repeated: List[str] = field(default_factory=list)               # within the chapter
+    recycled: List[RecycledPhrase] = field(default_factory=list)    # from earlier chapters
+
+    @property
+    def excessive_recycling(self) -> bool:
+        return len(self.recycled) > RECYCLED_PHRASE_LIMIT
+
+
+class RepetitionIndex:
+    """
+    Hashed n-gram index of the manuscript so far, for catching recycled phrasing.
+
+    Each indexed chapter keeps its distinct n-gram hashes in a compact
+    ``array('q')`` segment (8 bytes per n-gram, no phrase strings), and a
+    hash -> chapter table answers "was this used before?" in O(1), so checking
+    a chapter is a single pass over its tokens. Once more than ``max_grams``
+    hashes are held, the oldest chapters are dropped. ``save``/``load`` keep a
+    binary snapshot next to the narrative state file.
+
+    Re-indexing a chapter (after a rewrite) replaces its segment. The table
+    records the latest chapter for each n-gram.
+
+    Args:
+        n: Words per n-gram for cross-chapter matching
+        max_grams: Memory bound, in stored n-gram hashes
+    """
+
+    def __init__(self, n: int = DEFAULT_NGRAM, max_grams: int = DEFAULT_MAX_GRAMS):
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        self.n = n
+        self.max_grams = max_grams
+        self._seen: Dict[int, int] = {}
+        self._segments: "OrderedDict[int, array]" = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def chapters(self) -> List[int]:
+        return list(self._segments)
+
+    def check(self, text: str, chapter: Optional[int] = None) -> RepetitionReport:
+        """
+        Repetition in ``text``: 4-grams repeated within it, and runs of words
+        already used by an indexed chapter other than ``chapter``.
+        """
+        profile = text_profile(text)
+        report = RepetitionReport(repeated=profile.repeated_ngrams(INTRA_NGRAM, INTRA_MIN_COUNT))
+        if not self._seen:
+            return report
+
+        # Overlapping hits merge into one recycled run of words
+        seen = self._seen
+        start = end = 0
+        source = None
+        for i, earlier in enumerate(map(seen.get, profile.ngram_hashes(self.n))):
+            if earlier is None or earlier == chapter:
+                continue
+            if source is not None and i < end + self.n:
+                end = i
+                continue
+            if source is not None:
+                report.recycled.append(RecycledPhrase(profile.phrase_at(start, end - start + self.n), source, start))
+            start = end = i
+            source = earlier
+        if source is not None:
+            report.recycled.append(RecycledPhrase(profile.phrase_at(start, end - start + self.n), source, start))
+        return report
+
+    def add(self, text: str, chapter: int) -> None:
+        """Index ``chapter`` (replacing any earlier version of it), then enforce the memory bound."""
+        if chapter in self._segments:
+            self.remove(chapter)
+        segment = array("q", set(text_profile(text).ngram_hashes(self.n)))
+        self._add_segment(chapter, segment)
+        while self._size > self.max_grams and len(self._segments) > 1:
+            self.remove(next(iter(self._segments)))
+
+    def remove(self, chapter: int) -> None:
+        segment = self._segments.pop(chapter, None)
+        if segment is None:
+            return
+        seen = self._seen
+        for h in segment:
+            if seen.get(h) == chapter:
+                del seen[h]
+        self._size -= len(segment)
+
+    def _add_segment(self, chapter: int, segment: array) -> None:
+        self._segments[chapter] = segment
+        self._seen.update(dict.fromkeys(segment, chapter))
+        self._size += len(segment)
+
+    # ---- snapshot ----
+
+    def save(self, path: str) -> None:
+        """Write the segments to ``path`` atomically (little-endian, 8 bytes per hash)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.n, _HASH_PROBE, self.max_grams, len(self._segments)))
+            for chapter, segment in self._segments.items():
+                f.write(_SEGMENT.pack(chapter, len(segment)))
+                if sys.byteorder == "big":
+                    segment = array("q", segment)
+                    segment.byteswap()
+                segment.tofile(f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, n: int = DEFAULT_NGRAM, max_grams: int = DEFAULT_MAX_GRAMS) -> "RepetitionIndex":
+        """
+        Index from a snapshot, or an empty one if there is none, it is
+        truncated, or it was written with a different n-gram size or hash scheme.
+        """
+        index = cls(n, max_grams)
+        if not os.path.exists(path):
+            return index
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return index
+            magic, version, saved_n, probe, _, count = _HEADER.unpack(header)
+            if (magic, version, saved_n, probe) != (_MAGIC, _VERSION, n, _HASH_PROBE):
+                logger.warning(f"Ignoring incompatible repetition index snapshot {path}")
+                return index
+            try:
+                for _ in range(count):
+                    chapter, size = _SEGMENT.unpack(f.read(_SEGMENT.size))
+                    segment = array("q")
+                    segment.fromfile(f, size)
+                    if sys.byteorder == "big":
+                        segment.byteswap()
+                    index._add_segment(chapter, segment)
+            except (struct.error, EOFError, ValueError):
+                # A write cut short; start empty rather than from part of a chapter
+                logger.warning(f"Ignoring truncated repetition index snapshot {path}")
+                return cls(n, max_grams)
+        while index._size > index.max_grams and len(index._segments) > 1:
+            index.remove(next(iter(index._segments)))
+        return index
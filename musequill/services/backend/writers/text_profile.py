@@ -0,0 +1,158 @@
+from __future__ import annotations
+import hashlib
+import re
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from musequill.services.backend.writers.book_terms import BookTermMatcher, TermHit, TermHits, phrase_matcher
+
+# A word is a run of word characters, keeping internal apostrophes ("don't")
+WORD_PATTERN = r"\w+(?:['’]\w+)*"
+SENTENCE_END_PATTERN = r"[.!?]+"
+
+
+@lru_cache(maxsize=65536)
+def token_hash(token: str) -> int:
+    """Stable 64-bit hash of a token (unlike ``hash``, the same in every process)."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class ChapterTextProfile:
+    """
+    Everything the quality gates read from a chapter, computed once.
+
+    The writer's revision check, the critic's local checks and the feedback
+    scorer used to lower-case, tokenise and ``count`` the same text on their
+    own, several times per attempt. The profile lower-cases once, tokenises
+    once, walks the lines once and finds sentence ends once; the gates then
+    read counts and look-ups from it.
+
+    Use ``text_profile(text)`` to get a shared, cached profile.
+
+    Args:
+        text: Chapter Markdown (without the qa block)
+    """
+
+    def __init__(self, text: str):
+        self.text: str = text or ""
+        self.lower: str = self.text.lower()
+        self.tokens: List[str] = re.findall(WORD_PATTERN, self.lower)
+
+        # Sentence spans end at each run of terminal punctuation
+        self.sentence_spans: List[Tuple[int, int]] = []
+        self.sentence_marks = 0
+        start = 0
+        for m in re.finditer(SENTENCE_END_PATTERN, self.text):
+            self.sentence_marks += m.end() - m.start()
+            self.sentence_spans.append((start, m.end()))
+            start = m.end()
+        if self.text[start:].strip():
+            self.sentence_spans.append((start, len(self.text)))
+
+        self.h1_count = 0
+        self.h3_count = 0
+        self.paragraph_count = 0
+        self.line_counts: Counter = Counter()
+        in_paragraph = False
+        for raw in self.text.splitlines():
+            line = raw.strip()
+            if not line:
+                in_paragraph = False
+                continue
+            if not in_paragraph:
+                self.paragraph_count += 1
+                in_paragraph = True
+            if line.startswith("# "):
+                self.h1_count += 1
+            elif line.startswith("### "):
+                self.h3_count += 1
+            self.line_counts[line] += 1
+
+        self.quote_count = self.text.count('"')
+        self.comma_count = self.text.count(",")
+        self.content_chars = len(self.text.strip())
+        self._ngrams: Dict[int, Counter] = {}
+        self._hits: Dict[BookTermMatcher, TermHits] = {}
+        self._hashes: Dict[int, array] = {}
+        self._token_hashes: Optional[List[int]] = None
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_spans)
+
+    def ngrams(self, n: int = 3) -> Counter:
+        """Counts of space-joined lower-case word n-grams."""
+        grams = self._ngrams.get(n)
+        if grams is None:
+            tokens = self.tokens
+            grams = Counter(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+            self._ngrams[n] = grams
+        return grams
+
+    def ngram_hashes(self, n: int = 4) -> array:
+        """
+        64-bit hash of every word n-gram, in order, with no joined strings.
+
+        Each window of stable token hashes is combined by the (C-level) tuple
+        hash, which for int tuples is the same in every process.
+        """
+        hashes = self._hashes.get(n)
+        if hashes is None:
+            if self._token_hashes is None:
+                self._token_hashes = list(map(token_hash, self.tokens))
+            values = self._token_hashes
+            hashes = array("q", map(hash, zip(*(values[j:] for j in range(n)))))
+            self._hashes[n] = hashes
+        return hashes
+
+    def phrase_at(self, index: int, n: int) -> str:
+        return " ".join(self.tokens[index:index + n])
+
+    def repeated_ngrams(self, n: int = 4, min_count: int = 3) -> List[str]:
+        """N-grams occurring at least ``min_count`` times, in order of first occurrence."""
+        hashes = self.ngram_hashes(n)
+        repeated = {h for h, c in Counter(hashes).items() if c >= min_count}
+        if not repeated:
+            return []
+        first: Dict[int, int] = {}
+        for i, h in enumerate(hashes):
+            if h in repeated and h not in first:
+                first[h] = i
+        return [self.phrase_at(i, n) for i in first.values()]
+
+    def repeated_lines(self, min_len: int = 25) -> List[str]:
+        """Non-blank lines of at least ``min_len`` characters that occur more than once."""
+        return [ln for ln, c in self.line_counts.items() if c >= 2 and len(ln) >= min_len]
+
+    def term_hits(self, matcher: BookTermMatcher) -> TermHits:
+        """Every hit of ``matcher`` with its offsets, from one pass over the lower-cased text."""
+        hits = self._hits.get(matcher)
+        if hits is None:
+            hits = matcher.scan(self.lower, lowered=True)
+            self._hits[matcher] = hits
+        return hits
+
+    def phrase_hits(self, phrases: Iterable[str]) -> List[TermHit]:
+        """Every occurrence (case-insensitive) of ``phrases``, with offsets, in text order."""
+        phrases = tuple(p for p in phrases if p and p.strip())
+        if not phrases:
+            return []
+        return self.term_hits(phrase_matcher(phrases)).hits
+
+    def contains(self, phrases: Iterable[str]) -> List[str]:
+        """Phrases (case-insensitive) that occur in the text, in the order given."""
+        phrases = list(phrases)
+        found = {h.term for h in self.phrase_hits(phrases)}
+        return [p for p in phrases if p in found]
+
+
+@lru_cache(maxsize=16)
+def text_profile(text: str) -> ChapterTextProfile:
+    """Profile for ``text``, shared by every gate that checks the same draft."""
+    return ChapterTextProfile(text)
@@ -14,12 +14,16 @@ Usage:
     app = FastAPI()
     middleware = IPBlacklistMiddleware(app, max_violations=3, blacklist_duration_hours=24)
     app.add_middleware(type(middleware), **middleware.__dict__)
+
+    # Share bans across all workers through a Redis sorted set
+    app.add_middleware(IPBlacklistMiddleware, redis_url="redis://localhost:6379/0")
 """
 
+import heapq
 import logging
 import time
 from collections import defaultdict, deque
-from typing import Dict, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 
 from fastapi import Request, Response, HTTPException
@@ -28,6 +32,121 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger(__name__)
 
+# With a shared blacklist, a worker's local copy of a ban is trusted for this
+# long before Redis is asked again, so an unban on any worker applies to all
+# of them within a few seconds
+SHARED_RECHECK_SECONDS = 5.0
+
+
+class ExpiryWheel:
+    """
+    Hashed timing wheel that tracks keys with an expiration deadline.
+
+    Deadlines are bucketed into slots of ``resolution`` seconds. ``expire()``
+    only visits the slots between the previous call and now, so every
+    scheduled entry is touched at most once when it fires: cleanup is
+    amortised O(1) per insert instead of a walk over every tracked key.
+    Rescheduling a key leaves a stale entry in the old slot which is ignored
+    when that slot fires.
+    """
+
+    def __init__(self, resolution: float = 1.0):
+        self.resolution = resolution
+        self._slots: Dict[int, Set[str]] = defaultdict(set)
+        # Min-heap of occupied slot ids so idle gaps are skipped in O(log n)
+        self._slot_heap: List[int] = []
+        self._deadlines: Dict[str, float] = {}
+
+    def _slot(self, deadline: float) -> int:
+        return int(deadline // self.resolution)
+
+    def schedule(self, key: str, deadline: float) -> None:
+        """Schedule (or reschedule) a key to expire at ``deadline``."""
+        self._deadlines[key] = deadline
+        slot = self._slot(deadline)
+        bucket = self._slots.get(slot)
+        if bucket is None:
+            heapq.heappush(self._slot_heap, slot)
+            bucket = self._slots[slot]
+        bucket.add(key)
+
+    def cancel(self, key: str) -> bool:
+        """Forget a key. Its slot entry is dropped lazily when the slot fires."""
+        return self._deadlines.pop(key, None) is not None
+
+    def deadline(self, key: str) -> Optional[float]:
+        return self._deadlines.get(key)
+
+    def expire(self, now: float) -> List[str]:
+        """Pop and return every key whose deadline is at or before ``now``."""
+        expired: List[str] = []
+        current = self._slot(now)
+        while self._slot_heap and self._slot_heap[0] <= current:
+            slot = self._slot_heap[0]
+            bucket = self._slots[slot]
+            keep: Set[str] = set()
+            for key in bucket:
+                deadline = self._deadlines.get(key)
+                if deadline is None or self._slot(deadline) != slot:
+                    continue  # cancelled or rescheduled elsewhere
+                if deadline <= now:
+                    del self._deadlines[key]
+                    expired.append(key)
+                else:
+                    keep.add(key)  # same slot, not yet due
+            if keep:
+                self._slots[slot] = keep
+                break
+            heapq.heappop(self._slot_heap)
+            del self._slots[slot]
+        return expired
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._deadlines
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._deadlines)
+
+
+class RedisSharedBlacklist:
+    """
+    Blacklist shared by all workers, stored in a Redis sorted set.
+
+    Each member is an IP and its score is the ban expiration as a unix
+    timestamp, so lookups are a single ``ZSCORE`` and expired bans are
+    purged with one ``ZREMRANGEBYSCORE``.
+    """
+
+    def __init__(self, redis_url: str, key: str = "musequill:ip_blacklist"):
+        # Optional dependency: only required when a shared blacklist is configured
+        import redis.asyncio as aioredis
+
+        self.key = key
+        self._client = aioredis.from_url(redis_url, decode_responses=True)
+
+    async def add(self, ip: str, expires_at: float) -> None:
+        # GT keeps the longest ban when several workers blacklist the same IP
+        await self._client.zadd(self.key, {ip: expires_at}, gt=True)
+
+    async def remove(self, ip: str) -> bool:
+        return bool(await self._client.zrem(self.key, ip))
+
+    async def get_expiration(self, ip: str, now: float) -> Optional[float]:
+        score = await self._client.zscore(self.key, ip)
+        if score is None or score <= now:
+            return None
+        return float(score)
+
+    async def purge_expired(self, now: float) -> int:
+        return int(await self._client.zremrangebyscore(self.key, "-inf", now))
+
+    async def active(self, now: float) -> Dict[str, float]:
+        entries = await self._client.zrangebyscore(self.key, now, "+inf", withscores=True)
+        return {ip: float(score) for ip, score in entries}
+
 
 class IPBlacklistMiddleware(BaseHTTPMiddleware):
     """
@@ -36,16 +155,20 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
     Features:
     - Tracks invalid requests per IP address
     - Blacklists IPs after configurable number of violations
-    - Time-based cleanup of old violations
+    - Time-based cleanup of old violations (amortised O(1) via ExpiryWheel)
     - Configurable blacklist duration
+    - Optional Redis-backed blacklist shared by all workers
     - Comprehensive logging of blacklist events
     - Support for proxy headers (X-Forwarded-For, X-Real-IP)
     """
     
-    def __init__(self, app, max_violations: int = 3, blacklist_duration_hours: int = 24):
+    def __init__(self, app, max_violations: int = 3, blacklist_duration_hours: int = 24,
+                 violation_window_minutes: int = 60, redis_url: Optional[str] = None,
+                 shared_recheck_seconds: float = SHARED_RECHECK_SECONDS):
         super().__init__(app)
         self.max_violations = max_violations
         self.blacklist_duration = timedelta(hours=blacklist_duration_hours)
+        self.violation_window = timedelta(minutes=violation_window_minutes)
         
         # Track violations per IP: {ip: [timestamp1, timestamp2, ...]}
         self.ip_violations: Dict[str, deque] = defaultdict(lambda: deque(maxlen=10))
@@ -53,12 +176,32 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
         # Blacklisted IPs with expiration time: {ip: expiration_datetime}
         self.blacklisted_ips: Dict[str, datetime] = {}
         
+        # Expiry schedules; an IP's violation history is dropped one window
+        # after its latest violation, a ban when it expires
+        self._violation_expiry = ExpiryWheel(resolution=60.0)
+        self._blacklist_expiry = ExpiryWheel(resolution=60.0)
+        
+        self.shared_blacklist: Optional[RedisSharedBlacklist] = None
+        self.shared_recheck_seconds = shared_recheck_seconds
+        # When each local ban was last confirmed against the shared blacklist (monotonic)
+        self._shared_verified_at: Dict[str, float] = {}
+        # Local bans whose publish to the shared blacklist failed; retried on lookup
+        self._unpublished_bans: Dict[str, datetime] = {}
+        if redis_url:
+            try:
+                self.shared_blacklist = RedisSharedBlacklist(redis_url)
+            except ImportError:
+                logger.warning("redis package not installed - using per-process blacklist only")
+        
         # Track when we last cleaned up old data
         self.last_cleanup = datetime.now()
-        self.cleanup_interval = timedelta(hours=1)
+        self.cleanup_interval = timedelta(minutes=1)
+        # Next purge of expired shared bans (monotonic); the first request purges
+        self.next_shared_purge = 0.0
         
         logger.info(f"IP Blacklist middleware initialized: max_violations={max_violations}, "
-                   f"blacklist_duration={blacklist_duration_hours}h")
+                   f"blacklist_duration={blacklist_duration_hours}h, "
+                   f"shared={'redis' if self.shared_blacklist else 'none'}")
     
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP address from request, considering proxy headers."""
@@ -77,28 +220,85 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
         return request.client.host if request.client else "unknown"
     
     def _is_blacklisted(self, ip: str) -> bool:
-        """Check if an IP is currently blacklisted."""
+        """Check if an IP is currently blacklisted in this process."""
         if ip not in self.blacklisted_ips:
             return False
         
         # Check if blacklist has expired
         if datetime.now() > self.blacklisted_ips[ip]:
-            del self.blacklisted_ips[ip]
+            self._drop_local_blacklist(ip)
             logger.info(f"IP {ip} blacklist expired and removed")
             return False
         
         return True
     
-    def _record_violation(self, ip: str, status_code: int, path: str):
-        """Record a violation for an IP address."""
+    async def _check_blacklist(self, ip: str) -> bool:
+        """
+        Whether ``ip`` is banned. With a shared blacklist, Redis decides; a
+        local ban is only trusted for ``shared_recheck_seconds`` after it was
+        last confirmed there.
+        """
+        if self.shared_blacklist is None:
+            return self._is_blacklisted(ip)
+        verified_at = self._shared_verified_at.get(ip)
+        if (self._is_blacklisted(ip) and verified_at is not None
+                and time.monotonic() - verified_at < self.shared_recheck_seconds):
+            return True
+        return await self._is_blacklisted_shared(ip)
+    
+    async def _is_blacklisted_shared(self, ip: str) -> bool:
+        """Check the shared blacklist and mirror its answer locally."""
+        try:
+            expires_at = await self.shared_blacklist.get_expiration(ip, time.time())
+        except Exception as e:
+            logger.error(f"Shared blacklist lookup failed for {ip}: {e}")
+            return self._is_blacklisted(ip)
+        if expires_at is None:
+            if ip in self._unpublished_bans and self._is_blacklisted(ip):
+                # Redis never heard of this ban; publish it rather than lose it
+                await self._publish_ban(ip, self.blacklisted_ips[ip])
+                return True
+            # Unbanned (possibly by another worker) or expired
+            self._drop_local_blacklist(ip)
+            return False
+        self._set_local_blacklist(ip, datetime.fromtimestamp(expires_at))
+        self._shared_verified_at[ip] = time.monotonic()
+        return True
+    
+    def _set_local_blacklist(self, ip: str, expiration: datetime) -> None:
+        self.blacklisted_ips[ip] = expiration
+        self._blacklist_expiry.schedule(ip, expiration.timestamp())
+    
+    def _drop_local_blacklist(self, ip: str) -> bool:
+        self._shared_verified_at.pop(ip, None)
+        self._unpublished_bans.pop(ip, None)
+        self._blacklist_expiry.cancel(ip)
+        return self.blacklisted_ips.pop(ip, None) is not None
+    
+    def _count_recent_violations(self, ip: str, now: datetime) -> int:
+        """Drop violations older than the window and return how many remain."""
+        violations = self.ip_violations.get(ip)
+        if not violations:
+            return 0
+        cutoff = now - self.violation_window
+        while violations and violations[0] < cutoff:
+            violations.popleft()
+        return len(violations)
+    
+    def _record_violation(self, ip: str, status_code: int, path: str) -> Optional[datetime]:
+        """
+        Record a violation for an IP address.
+        
+        Returns the blacklist expiration if this violation triggered a ban.
+        """
         now = datetime.now()
         
         # Add violation timestamp
         self.ip_violations[ip].append(now)
+        self._violation_expiry.schedule(ip, (now + self.violation_window).timestamp())
         
-        # Count recent violations (within the last hour)
-        recent_violations = sum(1 for timestamp in self.ip_violations[ip] 
-                              if now - timestamp < timedelta(hours=1))
+        # Count recent violations (within the violation window)
+        recent_violations = self._count_recent_violations(ip, now)
         
         logger.warning(f"IP {ip} violation recorded: status={status_code}, path={path}, "
                       f"recent_violations={recent_violations}")
@@ -106,7 +306,7 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
         # Check if we should blacklist this IP
         if recent_violations >= self.max_violations:
             expiration = now + self.blacklist_duration
-            self.blacklisted_ips[ip] = expiration
+            self._set_local_blacklist(ip, expiration)
             
             logger.error(f"IP {ip} BLACKLISTED until {expiration} "
                         f"(exceeded {self.max_violations} violations)")
@@ -115,9 +315,39 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
             # - Sending alerts to monitoring systems
             # - Updating external firewall rules
             # - Logging to security systems
+            return expiration
+        return None
+    
+    async def _record_violation_shared(self, ip: str, status_code: int, path: str) -> None:
+        """Record a violation and publish any resulting ban to the shared blacklist."""
+        expiration = self._record_violation(ip, status_code, path)
+        if expiration is not None and self.shared_blacklist is not None:
+            await self._publish_ban(ip, expiration)
+    
+    async def _publish_ban(self, ip: str, expiration: datetime) -> bool:
+        """
+        Write a local ban to the shared blacklist. The ban counts as verified
+        either way; if publishing fails it is kept and published again on the
+        next lookup instead of being dropped because Redis does not have it.
+        """
+        self._shared_verified_at[ip] = time.monotonic()
+        try:
+            await self.shared_blacklist.add(ip, expiration.timestamp())
+        except Exception as e:
+            logger.error(f"Failed to publish ban for {ip} to shared blacklist: {e}")
+            self._unpublished_bans[ip] = expiration
+            return False
+        self._unpublished_bans.pop(ip, None)
+        return True
     
     def _cleanup_old_data(self):
-        """Remove old violation records to prevent memory bloat."""
+        """
+        Remove old violation records and expired bans to prevent memory bloat.
+        
+        Only the wheel slots that elapsed since the previous cleanup are
+        visited, so the cost is proportional to what actually expired rather
+        than to the number of tracked IPs.
+        """
         now = datetime.now()
         
         # Only cleanup periodically
@@ -125,28 +355,33 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
             return
         
         self.last_cleanup = now
-        cutoff_time = now - timedelta(hours=24)  # Keep 24 hours of history
-        
-        # Clean up old violations
-        for ip in list(self.ip_violations.keys()):
-            # Remove old timestamps
-            violations = self.ip_violations[ip]
-            while violations and violations[0] < cutoff_time:
-                violations.popleft()
-            
-            # Remove empty entries
-            if not violations:
-                del self.ip_violations[ip]
+        now_ts = now.timestamp()
+        
+        # Clean up IPs whose latest violation fell out of the window
+        for ip in self._violation_expiry.expire(now_ts):
+            self.ip_violations.pop(ip, None)
         
-        # Clean up expired blacklists (already done in _is_blacklisted)
-        expired_ips = [ip for ip, expiration in self.blacklisted_ips.items() 
-                      if now > expiration]
+        # Clean up expired blacklists (also done lazily in _is_blacklisted)
+        expired_ips = self._blacklist_expiry.expire(now_ts)
         for ip in expired_ips:
-            del self.blacklisted_ips[ip]
+            self.blacklisted_ips.pop(ip, None)
+            self._shared_verified_at.pop(ip, None)
+            self._unpublished_bans.pop(ip, None)
         
         if expired_ips:
             logger.info(f"Cleaned up {len(expired_ips)} expired blacklist entries")
     
+    async def _cleanup_shared(self) -> None:
+        """Purge expired bans from the shared blacklist, once per cleanup interval."""
+        now = time.monotonic()
+        if self.shared_blacklist is None or now < self.next_shared_purge:
+            return
+        self.next_shared_purge = now + self.cleanup_interval.total_seconds()
+        try:
+            await self.shared_blacklist.purge_expired(time.time())
+        except Exception as e:
+            logger.error(f"Shared blacklist cleanup failed: {e}")
+    
     def _is_invalid_status(self, status_code: int) -> bool:
         """Determine if a status code represents an invalid request."""
         # These status codes indicate client errors that should count as violations
@@ -169,9 +404,10 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
         
         # Periodic cleanup
         self._cleanup_old_data()
+        await self._cleanup_shared()
         
         # Check if IP is blacklisted
-        if self._is_blacklisted(client_ip):
+        if await self._check_blacklist(client_ip):
             logger.warning(f"Blocked request from blacklisted IP {client_ip} to {request.url.path}")
             return JSONResponse(
                 status_code=429,  # Too Many Requests
@@ -192,14 +428,14 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
             
             # Check if this was an invalid request
             if self._is_invalid_status(response.status_code):
-                self._record_violation(client_ip, response.status_code, request.url.path)
+                await self._record_violation_shared(client_ip, response.status_code, request.url.path)
             
             return response
             
         except HTTPException as http_exc:
             # Record violations for HTTP exceptions
             if self._is_invalid_status(http_exc.status_code):
-                self._record_violation(client_ip, http_exc.status_code, request.url.path)
+                await self._record_violation_shared(client_ip, http_exc.status_code, request.url.path)
             
             # Re-raise the exception to maintain normal error handling
             raise http_exc
@@ -224,7 +460,7 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
         }
         
         violation_counts = {
-            ip: len([v for v in violations if now - v < timedelta(hours=1)])
+            ip: len([v for v in violations if now - v < self.violation_window])
             for ip, violations in self.ip_violations.items()
         }
         
@@ -234,21 +470,46 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
             "total_tracked_ips": len(self.ip_violations),
             "config": {
                 "max_violations": self.max_violations,
-                "blacklist_duration_hours": self.blacklist_duration.total_seconds() / 3600
+                "blacklist_duration_hours": self.blacklist_duration.total_seconds() / 3600,
+                "violation_window_minutes": self.violation_window.total_seconds() / 60,
+                "shared_blacklist": self.shared_blacklist is not None
             }
         }
     
     def remove_ip_from_blacklist(self, ip: str) -> bool:
-        """Manually remove an IP from the blacklist. Returns True if IP was blacklisted."""
-        if ip in self.blacklisted_ips:
-            del self.blacklisted_ips[ip]
+        """Manually remove an IP from this process's blacklist. Returns True if IP was blacklisted."""
+        if self._drop_local_blacklist(ip):
             logger.info(f"IP {ip} manually removed from blacklist")
             return True
         return False
     
-    def add_ip_to_blacklist(self, ip: str, duration_hours: int = None) -> None:
-        """Manually add an IP to the blacklist."""
+    async def remove_ip_from_blacklist_shared(self, ip: str) -> bool:
+        """
+        Remove an IP locally and from the shared blacklist. Other workers stop
+        enforcing the ban when they next recheck it (within
+        ``shared_recheck_seconds``). Returns True if IP was blacklisted.
+        """
+        removed = self.remove_ip_from_blacklist(ip)
+        if self.shared_blacklist is not None:
+            try:
+                removed = await self.shared_blacklist.remove(ip) or removed
+            except Exception as e:
+                logger.error(f"Failed to remove {ip} from shared blacklist: {e}")
+        return removed
+    
+    def add_ip_to_blacklist(self, ip: str, duration_hours: int = None) -> datetime:
+        """Manually add an IP to this process's blacklist. Returns the ban's expiration."""
         duration = timedelta(hours=duration_hours) if duration_hours else self.blacklist_duration
         expiration = datetime.now() + duration
-        self.blacklisted_ips[ip] = expiration
-        logger.warning(f"IP {ip} manually added to blacklist until {expiration}")
\ No newline at end of file
+        self._set_local_blacklist(ip, expiration)
+        logger.warning(f"IP {ip} manually added to blacklist until {expiration}")
+        return expiration
+    
+    async def add_ip_to_blacklist_shared(self, ip: str, duration_hours: int = None) -> None:
+        """
+        Add an IP locally and to the shared blacklist, so every worker enforces
+        the ban. Without a shared blacklist this is ``add_ip_to_blacklist``.
+        """
+        expiration = self.add_ip_to_blacklist(ip, duration_hours)
+        if self.shared_blacklist is not None:
+            await self._publish_ban(ip, expiration)
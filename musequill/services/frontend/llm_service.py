@@ -1,6 +1,7 @@
 import asyncio
+import contextlib
 import logging
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 import json
 import sys
 from pathlib import Path
@@ -13,6 +14,9 @@ sys.path.insert(0, str(project_root))
 from langchain_ollama import OllamaLLM
 from langchain.schema import BaseMessage, HumanMessage, SystemMessage
 
+from musequill.services.backend.llm.scheduler import Priority, scheduled, scheduler_slots, shared_scheduler
+from musequill.services.backend.utils.payloads import JsonStreamScanner, scan_json
+
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,9 @@ class LLMService:
         self.model_name = model_name
         self.base_url = base_url
         self.llm = None
+        # A user is waiting on every call made here: INTERACTIVE, ahead of other calls in this process
+        slots = scheduler_slots()
+        self.scheduler = shared_scheduler(slots) if slots > 0 else None
         
     async def initialize(self):
         """Initialize LLM connection."""
@@ -41,6 +48,17 @@ class LLMService:
             logger.error(f"Failed to initialize LLM: {e}")
             raise
 
+    async def _invoke(self, prompt: str) -> str:
+        """Blocking completion of ``prompt`` in the interactive scheduler class."""
+        return await scheduled(self.scheduler, lambda: asyncio.to_thread(self.llm.invoke, prompt),
+                               Priority.INTERACTIVE)
+
+    def _interactive_slot(self):
+        """Scheduler slot for a streamed call (a no-op without a scheduler)."""
+        if self.scheduler is None:
+            return contextlib.nullcontext()
+        return self.scheduler.slot(Priority.INTERACTIVE)
+
     async def analyze_concept(self, concept: str, additional_notes: str) -> Dict[str, Any]:
         """Analyze book concept and recommend genres/subgenres using one-shot learning."""
         from musequill.models.book.genre import GenreMapping, GenreType, SubGenreType
@@ -95,13 +113,9 @@ class LLMService:
         try:
             # response = await self.llm_client.generate_response(prompt)
             
-            response = await asyncio.to_thread(self.llm.invoke, prompt)
+            response = await self._invoke(prompt)
             # Extract JSON from response if it's wrapped in text
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            if start >= 0 and end > start:
-                response = response[start:end]
-            result = json.loads(response)
+            result = scan_json(response)
             
             # Validate that recommended combinations are valid
             validated_combinations = self._validate_genre_recommendations(
@@ -351,29 +365,18 @@ class LLMService:
         """
         
         try:
-            response = await asyncio.to_thread(self.llm.invoke, prompt)
-            # Parse JSON response (basic parsing for POC)
-            import json
+            response = await self._invoke(prompt)
             # Extract JSON from response if it's wrapped in text
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
-            else:
-                # Fallback if JSON parsing fails
-                return {"genre_signals": ["general"], "audience_signals": ["adult"], 
-                       "setting_signals": ["contemporary"], "tone_signals": ["neutral"], 
-                       "complexity": "moderate"}
+            return scan_json(response)
         except Exception as e:
             logger.error(f"Error analyzing concept: {e}")
             return {"genre_signals": ["general"], "audience_signals": ["adult"], 
                    "setting_signals": ["contemporary"], "tone_signals": ["neutral"], 
                    "complexity": "moderate"}
     
-    async def suggest_options(self, step_name: str, concept: str, previous_selections: Dict[str, str], 
-                            available_options: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Get LLM suggestions for wizard step options."""
+    def _build_suggestion_prompt(self, step_name: str, concept: str, previous_selections: Dict[str, str],
+                                 available_options: List[Dict[str, Any]]) -> str:
+        """Build the option-scoring prompt shared by the blocking and streaming paths."""
         
         # Format previous selections
         selections_text = "\n".join([f"- {k}: {v}" for k, v in previous_selections.items()])
@@ -382,7 +385,7 @@ class LLMService:
         options_text = "\n".join([f"- {opt['id']}: {opt['name']} - {opt.get('description', '')}" 
                                  for opt in available_options])
         
-        prompt = f"""
+        return f"""
         You are helping a user create a commercially successful book. 
         
         Book concept: "{concept}"
@@ -413,32 +416,85 @@ class LLMService:
             "general_reasoning": "Overall reasoning for these recommendations"
         }}
         """
+
+    def _fallback_suggestions(self, available_options: List[Dict[str, Any]], score: int,
+                              reasoning: str, general_reasoning: str) -> Dict[str, Any]:
+        """Default recommendations used when the LLM response is unusable."""
+        return {
+            "recommendations": [
+                {"option_id": opt["id"], "score": score, "reasoning": reasoning}
+                for opt in available_options[:3]
+            ],
+            "general_reasoning": general_reasoning
+        }
+
+    def _parse_suggestions(self, response: str, available_options: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Parse a complete suggestions response, falling back to defaults."""
+        try:
+            return scan_json(response)
+        except json.JSONDecodeError:
+            pass
+        # Fallback - return top 3 options with default scores
+        return self._fallback_suggestions(
+            available_options, 80, "Good commercial option",
+            "These options offer good commercial potential."
+        )
+
+    async def suggest_options(self, step_name: str, concept: str, previous_selections: Dict[str, str], 
+                            available_options: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Get LLM suggestions for wizard step options."""
+        prompt = self._build_suggestion_prompt(step_name, concept, previous_selections, available_options)
         
         try:
-            response = await asyncio.to_thread(self.llm.invoke, prompt)
-            import json
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
-            else:
-                # Fallback - return top 3 options with default scores
-                return {
-                    "recommendations": [
-                        {"option_id": opt["id"], "score": 80, "reasoning": "Good commercial option"}
-                        for opt in available_options[:3]
-                    ],
-                    "general_reasoning": "These options offer good commercial potential."
-                }
+            response = await self._invoke(prompt)
+            return self._parse_suggestions(response, available_options)
         except Exception as e:
             logger.error(f"Error getting LLM suggestions: {e}")
             # Return fallback recommendations
-            return {
-                "recommendations": [
-                    {"option_id": opt["id"], "score": 70, "reasoning": "Recommended option"}
-                    for opt in available_options[:3]
-                ],
-                "general_reasoning": "Standard commercial recommendations."
-            }
+            return self._fallback_suggestions(
+                available_options, 70, "Recommended option",
+                "Standard commercial recommendations."
+            )
 
+    async def stream_suggest_options(self, step_name: str, concept: str, previous_selections: Dict[str, str],
+                                     available_options: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream LLM suggestions for wizard step options.
+        
+        Yields ``{"type": "recommendation", "recommendation": {...}}`` as soon as
+        each recommendation object is closed in the token stream, then a final
+        ``{"type": "complete", "suggestions": {...}}`` carrying the full parsed
+        result (or the fallback recommendations on failure).
+        """
+        prompt = self._build_suggestion_prompt(step_name, concept, previous_selections, available_options)
+        # top-level object (1) -> recommendations array (2) -> item (3)
+        scanner = JsonStreamScanner(capture_depth=3)
+        chunks: List[str] = []
+        
+        try:
+            async with self._interactive_slot():
+                async for chunk in self.llm.astream(prompt):
+                    chunks.append(chunk)
+                    for item_text in scanner.feed(chunk):
+                        try:
+                            recommendation = json.loads(item_text)
+                        except json.JSONDecodeError:
+                            continue
+                        if isinstance(recommendation, dict) and "option_id" in recommendation:
+                            yield {"type": "recommendation", "recommendation": recommendation}
+                    if scanner.complete:
+                        # Stop generation as soon as the response object closes
+                        break
+            scanner.finish()
+            if scanner.complete:
+                suggestions = scanner.value
+            else:
+                suggestions = self._parse_suggestions("".join(chunks), available_options)
+        except Exception as e:
+            logger.error(f"Error streaming LLM suggestions: {e}")
+            suggestions = self._fallback_suggestions(
+                available_options, 70, "Recommended option",
+                "Standard commercial recommendations."
+            )
+        
+        yield {"type": "complete", "suggestions": suggestions}
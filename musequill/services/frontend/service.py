@@ -17,7 +17,9 @@ Features:
 
 Endpoints:
     /wizard/start - Initialize new wizard session
+    /wizard/start/stream - Same as /wizard/start, streamed as Server-Sent Events
     /wizard/step/{step} - Process wizard steps
+    /wizard/step/{step}/stream - Same as /wizard/step/{step}, streamed as Server-Sent Events
     /wizard/session/{session_id} - Get session state
     /health - Health check
     /models/info - Model information
@@ -26,13 +28,17 @@ Endpoints:
     /metrics - Service metrics
 """
 
+import asyncio
+import json
 import logging
+import os
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 
 from fastapi import FastAPI, HTTPException, Depends, Request, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer
 import sys
 from pathlib import Path
@@ -190,6 +196,99 @@ async def get_optional_token(token: Optional[str] = Depends(security)):
     """Optional token for admin endpoints."""
     return token
 
+# ============================================================================
+# Server-Sent Events Helpers
+# ============================================================================
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Disable nginx buffering so events flush immediately
+}
+
+def format_sse(event: str, data: Any) -> str:
+    """Serialize one Server-Sent Event frame."""
+    if hasattr(data, "dict"):
+        data = data.dict()
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+def validate_concept_request(request: BookConceptRequest) -> None:
+    """Validate a wizard start request."""
+    # Validate concept length
+    if len(request.concept.strip()) < 10:
+        raise HTTPException(
+            status_code=422, 
+            detail="Book concept must be at least 10 characters long"
+        )
+    
+    if len(request.concept.strip()) > 1000:
+        raise HTTPException(
+            status_code=422,
+            detail="Book concept must be less than 1000 characters"
+        )
+
+async def analyze_concept_with_fallback(request: BookConceptRequest) -> Dict[str, Any]:
+    """Analyze the concept with the LLM, falling back to defaults on failure."""
+    try:
+        concept_analysis = await llm_service.analyze_concept(
+            concept=request.concept, 
+            additional_notes=request.additional_notes
+        )
+        service_metrics.record_llm_call(True)
+    except Exception as e:
+        logger.warning(f"LLM analysis failed: {e}")
+        service_metrics.record_llm_call(False)
+        # Provide fallback analysis
+        concept_analysis = {
+            "genre_signals": ["general"],
+            "target_audience": "adult",
+            "reasoning": "Analysis unavailable - using defaults"
+        }
+    return concept_analysis
+
+def start_wizard_session(request: BookConceptRequest) -> WizardSession:
+    """Create a wizard session for a validated concept request."""
+    session_id = session_manager.create_session(request.concept)
+    service_metrics.record_wizard_session_created()
+    
+    session = session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=500, detail="Failed to create session")
+    
+    # Store additional notes if provided
+    if request.additional_notes:
+        session.additional_inputs["initial_notes"] = request.additional_notes
+    return session
+
+def prepare_wizard_step(step_number: int, request: WizardStepRequest) -> WizardSession:
+    """Validate a step request and apply its inputs to the session."""
+    # Validate step number
+    if step_number < 1 or step_number > 9:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Invalid step number: {step_number}. Must be between 1 and 9."
+        )
+    
+    # Get session
+    session = session_manager.get_session(request.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    # Store additional input if provided
+    if request.additional_input:
+        step_name = step_processor.steps.get(step_number - 1, {}).get("name", f"step_{step_number - 1}")
+        session.additional_inputs[step_name] = request.additional_input
+    
+    # Update current step
+    session.current_step = step_number
+    return session
+
+def complete_wizard_step(session: WizardSession, step_number: int) -> None:
+    """Bookkeeping after a step has been processed."""
+    # Check if this is the final step
+    if step_number == 9:  # Assuming 9 is the final step
+        session.is_complete = True
+        service_metrics.record_wizard_session_completed()
+
 # ============================================================================
 # FastAPI Application
 # ============================================================================
@@ -207,14 +306,18 @@ def create_app() -> FastAPI:
     )
     
     # Add IP blacklisting middleware
+    # Set BLACKLIST_REDIS_URL to share bans across all workers
+    blacklist_redis_url = os.getenv("BLACKLIST_REDIS_URL")
     blacklist_middleware = IPBlacklistMiddleware(
         app, 
         max_violations=3,  # Block after 3 invalid requests
-        blacklist_duration_hours=24  # Block for 24 hours
+        blacklist_duration_hours=24,  # Block for 24 hours
+        redis_url=blacklist_redis_url
     )
     app.add_middleware(IPBlacklistMiddleware, 
                       max_violations=3, 
-                      blacklist_duration_hours=24)
+                      blacklist_duration_hours=24,
+                      redis_url=blacklist_redis_url)
     
     # Add timing middleware
     app.middleware("http")(add_timing_header)
@@ -375,6 +478,15 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=503, detail="Blacklist middleware not available")
         
         status = blacklist_middleware.get_blacklist_status()
+        if blacklist_middleware.shared_blacklist is not None:
+            try:
+                shared = await blacklist_middleware.shared_blacklist.active(time.time())
+                status["shared_blacklists"] = {
+                    ip: datetime.fromtimestamp(expires_at).isoformat()
+                    for ip, expires_at in shared.items()
+                }
+            except Exception as e:
+                logger.error(f"Failed to read shared blacklist: {e}")
         return StandardResponse(
             success=True,
             message="Blacklist status retrieved",
@@ -387,7 +499,7 @@ def create_app() -> FastAPI:
         if blacklist_middleware is None:
             raise HTTPException(status_code=503, detail="Blacklist middleware not available")
         
-        removed = blacklist_middleware.remove_ip_from_blacklist(ip)
+        removed = await blacklist_middleware.remove_ip_from_blacklist_shared(ip)
         return StandardResponse(
             success=True,
             message=f"IP {ip} {'removed from' if removed else 'was not in'} blacklist",
@@ -426,58 +538,24 @@ def create_app() -> FastAPI:
         try:
             logger.info(f"Starting wizard with concept: {request.concept[:50]}...")
             
-            # Validate concept length
-            if len(request.concept.strip()) < 10:
-                raise HTTPException(
-                    status_code=422, 
-                    detail="Book concept must be at least 10 characters long"
-                )
-            
-            if len(request.concept.strip()) > 1000:
-                raise HTTPException(
-                    status_code=422,
-                    detail="Book concept must be less than 1000 characters"
-                )
+            validate_concept_request(request)
             
             # Create new session
-            session_id = session_manager.create_session(request.concept)
-            service_metrics.record_wizard_session_created()
+            session = start_wizard_session(request)
             
             # Analyze concept with LLM
-            try:
-                concept_analysis = await llm_service.analyze_concept(
-                    concept=request.concept, 
-                    additional_notes=request.additional_notes
-                )
-                service_metrics.record_llm_call(True)
-            except Exception as e:
-                logger.warning(f"LLM analysis failed: {e}")
-                service_metrics.record_llm_call(False)
-                # Provide fallback analysis
-                concept_analysis = {
-                    "genre_signals": ["general"],
-                    "target_audience": "adult",
-                    "reasoning": "Analysis unavailable - using defaults"
-                }
+            concept_analysis = await analyze_concept_with_fallback(request)
             
             # Process first step (genre selection)
-            session = session_manager.get_session(session_id)
-            if not session:
-                raise HTTPException(status_code=500, detail="Failed to create session")
-            
-            # Store additional notes if provided
-            if request.additional_notes:
-                session.additional_inputs["initial_notes"] = request.additional_notes
-            
             step_response = await step_processor.process_step(session, 1)
             
-            logger.info(f"New wizard session started successfully: {session_id}")
+            logger.info(f"New wizard session started successfully: {session.session_id}")
             
             return StandardResponse(
                 success=True,
                 message="Wizard session started successfully",
                 data={
-                    "session_id": session_id,
+                    "session_id": session.session_id,
                     "concept_analysis": concept_analysis,
                     "first_step": step_response.dict()
                 }
@@ -490,37 +568,50 @@ def create_app() -> FastAPI:
             logger.error(f"Error starting wizard: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
+    @app.post("/wizard/start/stream")
+    async def start_wizard_stream(request: BookConceptRequest):
+        """
+        Start a new wizard session, streaming results as Server-Sent Events.
+        
+        Events: ``session`` (session id), ``options`` (static genre options),
+        ``recommendation`` (one per LLM recommendation), ``concept_analysis``,
+        ``complete`` (final first step) and ``error``.
+        """
+        logger.info(f"Starting streamed wizard with concept: {request.concept[:50]}...")
+        
+        # Validate before streaming so failures still map to HTTP status codes
+        validate_concept_request(request)
+        session = start_wizard_session(request)
+        
+        async def event_stream() -> AsyncIterator[str]:
+            yield format_sse("session", {"session_id": session.session_id})
+            
+            # Concept analysis runs alongside the step 1 suggestions
+            analysis_task = asyncio.create_task(analyze_concept_with_fallback(request))
+            try:
+                async for update in step_processor.stream_step(session, 1):
+                    yield format_sse(update["event"], update["data"])
+                yield format_sse("concept_analysis", await analysis_task)
+                logger.info(f"New streamed wizard session started successfully: {session.session_id}")
+            except Exception as e:
+                logger.error(f"Error streaming wizard start: {e}")
+                yield format_sse("error", {"error": str(e)})
+            finally:
+                if not analysis_task.done():
+                    analysis_task.cancel()
+        
+        return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+    
     @app.post("/wizard/step/{step_number}")
     async def process_wizard_step(step_number: int, request: WizardStepRequest):
         """Process a wizard step."""
         try:
-            # Validate step number
-            if step_number < 1 or step_number > 9:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Invalid step number: {step_number}. Must be between 1 and 9."
-                )
-            
-            # Get session
-            session = session_manager.get_session(request.session_id)
-            if not session:
-                raise HTTPException(status_code=404, detail="Session not found")
-            
-            # Store additional input if provided
-            if request.additional_input:
-                step_name = step_processor.steps.get(step_number - 1, {}).get("name", f"step_{step_number - 1}")
-                session.additional_inputs[step_name] = request.additional_input
-            
-            # Update current step
-            session.current_step = step_number
+            session = prepare_wizard_step(step_number, request)
             
             # Process step
             step_response = await step_processor.process_step(session, step_number, request.selection)
             
-            # Check if this is the final step
-            if step_number == 9:  # Assuming 9 is the final step
-                session.is_complete = True
-                service_metrics.record_wizard_session_completed()
+            complete_wizard_step(session, step_number)
             
             logger.info(f"Processed step {step_number} for session {request.session_id}")
             
@@ -537,6 +628,33 @@ def create_app() -> FastAPI:
             logger.error(f"Error processing step {step_number}: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
+    @app.post("/wizard/step/{step_number}/stream")
+    async def process_wizard_step_stream(step_number: int, request: WizardStepRequest):
+        """
+        Process a wizard step, streaming results as Server-Sent Events.
+        
+        Events: ``options`` (static options, emitted immediately),
+        ``recommendation`` (one per LLM recommendation), ``complete``
+        (final step response) and ``error``.
+        """
+        # Surface invalid steps as HTTP errors before the stream starts, and
+        # before the session is touched
+        if step_number not in step_processor.steps:
+            raise HTTPException(status_code=400, detail="Invalid step number")
+        session = prepare_wizard_step(step_number, request)
+        
+        async def event_stream() -> AsyncIterator[str]:
+            try:
+                async for update in step_processor.stream_step(session, step_number, request.selection):
+                    yield format_sse(update["event"], update["data"])
+                complete_wizard_step(session, step_number)
+                logger.info(f"Streamed step {step_number} for session {request.session_id}")
+            except Exception as e:
+                logger.error(f"Error streaming step {step_number}: {e}")
+                yield format_sse("error", {"error": str(e)})
+        
+        return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+    
     @app.get("/wizard/session/{session_id}")
     async def get_wizard_session(session_id: str):
         """Get current wizard session state."""
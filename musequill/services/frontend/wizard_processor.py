@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 
 from fastapi import FastAPI, HTTPException, Depends
 import sys
@@ -55,6 +55,61 @@ class WizardStepProcessor:
                           selection: Optional[str] = None) -> WizardStepResponse:
         """Process a wizard step and return response with options."""
         
+        step_definition = self._prepare_step(session, step_number, selection)
+        if step_definition is None:
+            return await self._process_static_step(session, step_number)
+        
+        # Get LLM suggestions
+        llm_suggestions = await self.llm_service.suggest_options(
+            step_definition["step_name"], session.concept, session.selections,
+            step_definition["available_options"]
+        )
+        
+        return self._build_step_response(session, step_definition, llm_suggestions)
+    
+    async def stream_step(self, session: WizardSession, step_number: int,
+                          selection: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a wizard step as a sequence of streaming events.
+        
+        The static options are emitted first as an ``options`` event (scored at
+        the neutral default), followed by one ``recommendation`` event per LLM
+        recommendation as it arrives, and finally a ``complete`` event holding
+        the same ``WizardStepResponse`` that ``process_step`` would return.
+        """
+        step_definition = self._prepare_step(session, step_number, selection)
+        if step_definition is None:
+            step_response = await self._process_static_step(session, step_number)
+            yield {"event": "complete", "data": step_response}
+            return
+        
+        empty_suggestions = {"recommendations": [], "general_reasoning": None}
+        yield {
+            "event": "options",
+            "data": self._build_step_response(session, step_definition, empty_suggestions)
+        }
+        
+        llm_suggestions = empty_suggestions
+        async for update in self.llm_service.stream_suggest_options(
+            step_definition["step_name"], session.concept, session.selections,
+            step_definition["available_options"]
+        ):
+            if update["type"] == "recommendation":
+                yield {"event": "recommendation", "data": update["recommendation"]}
+            else:
+                llm_suggestions = update["suggestions"]
+        
+        yield {
+            "event": "complete",
+            "data": self._build_step_response(session, step_definition, llm_suggestions)
+        }
+    
+    def _prepare_step(self, session: WizardSession, step_number: int,
+                      selection: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Validate the step, store the previous selection and return the step
+        definition, or None for steps that need no LLM scoring.
+        """
         step_config = self.steps.get(step_number)
         if not step_config:
             raise HTTPException(status_code=400, detail="Invalid step number")
@@ -66,57 +121,43 @@ class WizardStepProcessor:
         
         # Get options for current step
         if step_number == 1:
-            return await self._process_genre_selection(session)
+            return self._genre_selection_step(session)
         elif step_number == 2:
-            return await self._process_target_audience(session)
+            return self._target_audience_step(session)
         elif step_number == 3:
-            return await self._process_writing_style(session)
+            return self._writing_style_step(session)
         elif step_number == 4:
-            return await self._process_book_length(session)
+            return self._book_length_step(session)
         elif step_number == 5:
-            return await self._process_story_structure(session)
+            return self._story_structure_step(session)
         elif step_number == 6:
-            return await self._process_world_building(session)
-        elif step_number == 7:
-            return await self._process_content_preferences(session)
-        elif step_number == 8:
-            return await self._process_final_summary(session)
+            return self._world_building_step(session)
+        elif step_number in (7, 8):
+            return None
         else:
             raise HTTPException(status_code=400, detail="Invalid step")
     
-    async def _process_genre_selection(self, session: WizardSession) -> WizardStepResponse:
-        """Process genre selection step."""
-        # Get high-demand genres for commercial focus
-        commercial_genres = [
-            GenreType.ROMANCE, GenreType.FANTASY, GenreType.MYSTERY, 
-            GenreType.THRILLER, GenreType.ROMANTASY, GenreType.YOUNG_ADULT
-        ]
-        
-        # Convert to options format
-        available_options = [
-            {
-                "id": genre.value,
-                "name": genre.display_name,
-                "description": f"Commercial appeal: {'High' if genre.is_high_demand else 'Medium'}"
-            }
-            for genre in commercial_genres
-        ]
-        
-        # Get LLM suggestions
-        llm_suggestions = await self.llm_service.suggest_options(
-            "Genre Selection", session.concept, session.selections, available_options
-        )
+    async def _process_static_step(self, session: WizardSession, step_number: int) -> WizardStepResponse:
+        """Process steps whose content does not depend on the LLM."""
+        if step_number == 7:
+            return await self._process_content_preferences(session)
+        return await self._process_final_summary(session)
+    
+    def _build_step_response(self, session: WizardSession, step_definition: Dict[str, Any],
+                             llm_suggestions: Dict[str, Any]) -> WizardStepResponse:
+        """Merge LLM scores into the step's static options."""
+        market_appeal = step_definition.get("market_appeal", {})
         
         # Enhance options with LLM scores
         enhanced_options = []
-        for opt in available_options:
+        for opt in step_definition["available_options"]:
             llm_rec = next((r for r in llm_suggestions["recommendations"] if r["option_id"] == opt["id"]), None)
             enhanced_options.append(WizardOption(
                 id=opt["id"],
                 name=opt["name"],
                 description=opt["description"],
                 recommendation_score=llm_rec["score"] if llm_rec else 50,
-                market_appeal="High" if GenreType(opt["id"]).is_high_demand else "Medium"
+                market_appeal=market_appeal.get(opt["id"])
             ))
         
         # Sort by recommendation score
@@ -124,16 +165,45 @@ class WizardStepProcessor:
         
         return WizardStepResponse(
             session_id=session.session_id,
-            step_number=1,
-            step_name="Genre Selection",
-            question="What genre best describes your book concept?",
+            step_number=step_definition["step_number"],
+            step_name=step_definition["step_name"],
+            question=step_definition["question"],
             options=enhanced_options,
             llm_reasoning=llm_suggestions.get("general_reasoning"),
             is_final_step=False
         )
     
-    async def _process_target_audience(self, session: WizardSession) -> WizardStepResponse:
-        """Process target audience selection."""
+    def _genre_selection_step(self, session: WizardSession) -> Dict[str, Any]:
+        """Define the genre selection step."""
+        # Get high-demand genres for commercial focus
+        commercial_genres = [
+            GenreType.ROMANCE, GenreType.FANTASY, GenreType.MYSTERY, 
+            GenreType.THRILLER, GenreType.ROMANTASY, GenreType.YOUNG_ADULT
+        ]
+        
+        # Convert to options format
+        available_options = [
+            {
+                "id": genre.value,
+                "name": genre.display_name,
+                "description": f"Commercial appeal: {'High' if genre.is_high_demand else 'Medium'}"
+            }
+            for genre in commercial_genres
+        ]
+        
+        return {
+            "step_number": 1,
+            "step_name": "Genre Selection",
+            "question": "What genre best describes your book concept?",
+            "available_options": available_options,
+            "market_appeal": {
+                genre.value: "High" if genre.is_high_demand else "Medium"
+                for genre in commercial_genres
+            }
+        }
+    
+    def _target_audience_step(self, session: WizardSession) -> Dict[str, Any]:
+        """Define the target audience step."""
         # Basic audience options
         available_options = [
             {"id": "adult", "name": "Adult", "description": "Ages 18+ - Full range of themes and complexity"},
@@ -141,34 +211,15 @@ class WizardStepProcessor:
             {"id": "new_adult", "name": "New Adult", "description": "Ages 18-25 - College/early career themes"}
         ]
         
-        llm_suggestions = await self.llm_service.suggest_options(
-            "Target Audience", session.concept, session.selections, available_options
-        )
-        
-        enhanced_options = []
-        for opt in available_options:
-            llm_rec = next((r for r in llm_suggestions["recommendations"] if r["option_id"] == opt["id"]), None)
-            enhanced_options.append(WizardOption(
-                id=opt["id"],
-                name=opt["name"],
-                description=opt["description"],
-                recommendation_score=llm_rec["score"] if llm_rec else 50
-            ))
-        
-        enhanced_options.sort(key=lambda x: x.recommendation_score or 0, reverse=True)
-        
-        return WizardStepResponse(
-            session_id=session.session_id,
-            step_number=2,
-            step_name="Target Audience",
-            question="Who is your target audience?",
-            options=enhanced_options,
-            llm_reasoning=llm_suggestions.get("general_reasoning"),
-            is_final_step=False
-        )
+        return {
+            "step_number": 2,
+            "step_name": "Target Audience",
+            "question": "Who is your target audience?",
+            "available_options": available_options
+        }
     
-    async def _process_writing_style(self, session: WizardSession) -> WizardStepResponse:
-        """Process writing style selection."""
+    def _writing_style_step(self, session: WizardSession) -> Dict[str, Any]:
+        """Define the writing style step."""
         # Get commercial writing styles
         commercial_styles = [
             WritingStyle.CONVERSATIONAL, WritingStyle.CONTEMPORARY, WritingStyle.ACCESSIBLE,
@@ -193,34 +244,15 @@ class WizardStepProcessor:
             for style in commercial_styles[:6]  # Limit to 6 options
         ]
         
-        llm_suggestions = await self.llm_service.suggest_options(
-            "Writing Style", session.concept, session.selections, available_options
-        )
-        
-        enhanced_options = []
-        for opt in available_options:
-            llm_rec = next((r for r in llm_suggestions["recommendations"] if r["option_id"] == opt["id"]), None)
-            enhanced_options.append(WizardOption(
-                id=opt["id"],
-                name=opt["name"],
-                description=opt["description"],
-                recommendation_score=llm_rec["score"] if llm_rec else 50
-            ))
-        
-        enhanced_options.sort(key=lambda x: x.recommendation_score or 0, reverse=True)
-        
-        return WizardStepResponse(
-            session_id=session.session_id,
-            step_number=3,
-            step_name="Writing Style",
-            question="What writing style appeals to you?",
-            options=enhanced_options,
-            llm_reasoning=llm_suggestions.get("general_reasoning"),
-            is_final_step=False
-        )
+        return {
+            "step_number": 3,
+            "step_name": "Writing Style",
+            "question": "What writing style appeals to you?",
+            "available_options": available_options
+        }
     
-    async def _process_book_length(self, session: WizardSession) -> WizardStepResponse:
-        """Process book length selection."""
+    def _book_length_step(self, session: WizardSession) -> Dict[str, Any]:
+        """Define the book length step."""
         # Commercial length options
         commercial_lengths = [
             BookLength.SHORT_NOVEL, BookLength.STANDARD_NOVEL, 
@@ -236,34 +268,15 @@ class WizardStepProcessor:
             for length in commercial_lengths
         ]
         
-        llm_suggestions = await self.llm_service.suggest_options(
-            "Book Length", session.concept, session.selections, available_options
-        )
-        
-        enhanced_options = []
-        for opt in available_options:
-            llm_rec = next((r for r in llm_suggestions["recommendations"] if r["option_id"] == opt["id"]), None)
-            enhanced_options.append(WizardOption(
-                id=opt["id"],
-                name=opt["name"],
-                description=opt["description"],
-                recommendation_score=llm_rec["score"] if llm_rec else 50
-            ))
-        
-        enhanced_options.sort(key=lambda x: x.recommendation_score or 0, reverse=True)
-        
-        return WizardStepResponse(
-            session_id=session.session_id,
-            step_number=4,
-            step_name="Book Length",
-            question="What length are you targeting?",
-            options=enhanced_options,
-            llm_reasoning=llm_suggestions.get("general_reasoning"),
-            is_final_step=False
-        )
+        return {
+            "step_number": 4,
+            "step_name": "Book Length",
+            "question": "What length are you targeting?",
+            "available_options": available_options
+        }
     
-    async def _process_story_structure(self, session: WizardSession) -> WizardStepResponse:
-        """Process story structure selection."""
+    def _story_structure_step(self, session: WizardSession) -> Dict[str, Any]:
+        """Define the story structure step."""
         # Commercial structures
         commercial_structures = [
             StoryStructure.THREE_ACT, StoryStructure.HERO_JOURNEY,
@@ -279,34 +292,15 @@ class WizardStepProcessor:
             for structure in commercial_structures
         ]
         
-        llm_suggestions = await self.llm_service.suggest_options(
-            "Story Structure", session.concept, session.selections, available_options
-        )
-        
-        enhanced_options = []
-        for opt in available_options:
-            llm_rec = next((r for r in llm_suggestions["recommendations"] if r["option_id"] == opt["id"]), None)
-            enhanced_options.append(WizardOption(
-                id=opt["id"],
-                name=opt["name"],
-                description=opt["description"],
-                recommendation_score=llm_rec["score"] if llm_rec else 50
-            ))
-        
-        enhanced_options.sort(key=lambda x: x.recommendation_score or 0, reverse=True)
-        
-        return WizardStepResponse(
-            session_id=session.session_id,
-            step_number=5,
-            step_name="Story Structure",
-            question="Which narrative structure do you prefer?",
-            options=enhanced_options,
-            llm_reasoning=llm_suggestions.get("general_reasoning"),
-            is_final_step=False
-        )
+        return {
+            "step_number": 5,
+            "step_name": "Story Structure",
+            "question": "Which narrative structure do you prefer?",
+            "available_options": available_options
+        }
     
-    async def _process_world_building(self, session: WizardSession) -> WizardStepResponse:
-        """Process world building selection."""
+    def _world_building_step(self, session: WizardSession) -> Dict[str, Any]:
+        """Define the world building step."""
         # Get world types based on genre
         selected_genre = session.selections.get("genre_selection", "")
         
@@ -326,31 +320,12 @@ class WizardStepProcessor:
             for world in world_options
         ]
         
-        llm_suggestions = await self.llm_service.suggest_options(
-            "World Building", session.concept, session.selections, available_options
-        )
-        
-        enhanced_options = []
-        for opt in available_options:
-            llm_rec = next((r for r in llm_suggestions["recommendations"] if r["option_id"] == opt["id"]), None)
-            enhanced_options.append(WizardOption(
-                id=opt["id"],
-                name=opt["name"],
-                description=opt["description"],
-                recommendation_score=llm_rec["score"] if llm_rec else 50
-            ))
-        
-        enhanced_options.sort(key=lambda x: x.recommendation_score or 0, reverse=True)
-        
-        return WizardStepResponse(
-            session_id=session.session_id,
-            step_number=6,
-            step_name="World Building",
-            question="What type of setting interests you?",
-            options=enhanced_options,
-            llm_reasoning=llm_suggestions.get("general_reasoning"),
-            is_final_step=False
-        )
+        return {
+            "step_number": 6,
+            "step_name": "World Building",
+            "question": "What type of setting interests you?",
+            "available_options": available_options
+        }
     
     async def _process_content_preferences(self, session: WizardSession) -> WizardStepResponse:
         """Process content preferences (free text input)."""
@@ -3,8 +3,11 @@ from __future__ import annotations
 import os
 import requests
 
+from musequill.services.backend.llm.endpoint_pool import endpoint_urls, shared_pool
+
 # ---- Config via env vars (override as needed) ----
 OLLAMA_HOST        = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_POOL        = shared_pool(endpoint_urls(OLLAMA_HOST))  # OLLAMA_BASE_URLS lists several nodes
 OLLAMA_MODEL       = os.environ.get("OLLAMA_MODEL_NAME", "llama3.3:70b")
 OLLAMA_TIMEOUT     = float(os.environ.get("OLLAMA_TIMEOUT", "2400"))   # seconds
 OLLAMA_NUM_CTX     = int(os.environ.get("OLLAMA_NUM_CTX", "8192"))
@@ -24,25 +27,39 @@ DEFAULT_OPTIONS = {
     # "mirostat": 2, "mirostat_tau": 5.0, "mirostat_eta": 0.1,
 }
 
-def llm(prompt: str, **options) -> str:
-    url = f"{OLLAMA_HOST.rstrip('/')}/api/generate"
+def llm(prompt: str, *, model: str | None = None, keep_alive: str | None = None,
+        format: dict | str | None = None, **options) -> str:
+    """
+    `keep_alive` keeps the model loaded between calls; `format` is "json" or a
+    JSON Schema for structured output. Everything else goes into `options`.
+    """
     payload = {
-        "model": OLLAMA_MODEL,
+        "model": model or OLLAMA_MODEL,
         "prompt": prompt,
         "stream": False,
         "options": {**DEFAULT_OPTIONS, **options},
     }
-    try:
-        r = requests.post(url, json=payload, timeout=OLLAMA_TIMEOUT)
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    if format is not None:
+        payload["format"] = format
+
+    def send(base_url: str) -> requests.Response:
+        r = requests.post(f"{base_url}/api/generate", json=payload, timeout=OLLAMA_TIMEOUT)
         r.raise_for_status()
+        return r
+
+    try:
+        r = OLLAMA_POOL.call(payload["model"], send)
     except requests.exceptions.ConnectionError as e:
-        raise RuntimeError(f"Cannot reach Ollama at {url}. Is it running?") from e
+        raise RuntimeError(f"Cannot reach Ollama at {e.request.url if e.request else OLLAMA_HOST}. "
+                           f"Is it running?") from e
     except requests.exceptions.Timeout as e:
         raise RuntimeError(f"Ollama request timed out after {OLLAMA_TIMEOUT}s.") from e
     except requests.HTTPError as e:
         try:
-            detail = r.json()
+            detail = e.response.json()
         except Exception:
-            detail = r.text
-        raise RuntimeError(f"Ollama error {r.status_code}: {detail}") from e
+            detail = e.response.text
+        raise RuntimeError(f"Ollama error {e.response.status_code}: {detail}") from e
     return (r.json().get("response") or "").strip()
\ No newline at end of file
@@ -1,7 +1,10 @@
 # qa_session.py
 from __future__ import annotations
+import hashlib
 import json
-from typing import Any, Dict, List, Union, Callable
+from typing import Any, Dict, List, Optional, Tuple, Union, Callable
+
+from musequill.services.backend.utils.payloads import scan_json
 
 Context = Union[str, Dict[str, Any], List[Any]]
 
@@ -16,6 +19,17 @@ Rules:
 - If a list is requested, return a comma-separated list with no extra text.
 """
 
+BATCH_INSTRUCTIONS = """Answer every numbered question below from the CONTEXT blocks above.
+Apply the same rules to each answer. Return ONLY JSON: {"answers": ["<answer 1>", "<answer 2>", ...]}
+with exactly one string per question, in order.
+"""
+
+# (context fingerprint, question) -> answer, shared by every session over the same contexts
+ANSWER_CACHE: Dict[Tuple[str, str], str] = {}
+
+# How long Ollama keeps the model (and the evaluated context prefix) loaded between questions
+DEFAULT_KEEP_ALIVE = "15m"
+
 def _format_context_block(name: str, data: Context) -> str:
     if isinstance(data, (dict, list)):
         body = json.dumps(data, ensure_ascii=False, indent=2)
@@ -26,17 +40,59 @@ def _format_context_block(name: str, data: Context) -> str:
     return f"<CONTEXT id='{name}' type='{kind}'>\n{body}\n</CONTEXT>"
 
 class QASession:
-    def __init__(self, llm_fn: Callable[..., str], *, model: str | None = None):
+    def __init__(self,
+                 llm_fn: Callable[..., str],
+                 *,
+                 model: str | None = None,
+                 cache: Optional[Dict[Tuple[str, str], str]] = None,
+                 keep_alive: str | None = DEFAULT_KEEP_ALIVE):
         """
-        llm_fn: your callable like llm(prompt, temperature=..., top_p=..., model=...)
+        llm_fn: your callable like llm(prompt, temperature=..., top_p=..., model=..., keep_alive=..., format=...)
+        cache: answer cache keyed by (context fingerprint, question); defaults to the shared ANSWER_CACHE
+        keep_alive: passed to Ollama so the model and the shared context prefix stay warm between calls
         """
         self.llm = llm_fn
         self.model = model
+        self.cache = ANSWER_CACHE if cache is None else cache
+        self.keep_alive = keep_alive
         self._contexts: List[str] = []
+        self._fingerprint: str | None = None
 
     def add_context(self, name: str, data: Context) -> None:
         """Add any text or JSON blob as a named context block."""
         self._contexts.append(_format_context_block(name, data))
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the instructions and context blocks; keys the answer cache."""
+        if self._fingerprint is None:
+            h = hashlib.sha256(SYSTEM_INSTRUCTIONS.encode("utf-8"))
+            for block in self._contexts:
+                h.update(block.encode("utf-8"))
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def _prefix(self) -> str:
+        # Identical across questions, so Ollama can reuse the evaluated prefix while the model stays loaded
+        return f"{SYSTEM_INSTRUCTIONS}\n\n{''.join(self._contexts)}\n\n"
+
+    def _call(self, prompt: str, **options: Any) -> str:
+        if self.keep_alive is not None:
+            options["keep_alive"] = self.keep_alive
+        return self.llm(prompt, model=self.model, **options).strip()
+
+    @staticmethod
+    def _clean(raw: str, default: str) -> str:
+        # Keep only the first line/token span, strip quotes and trailing punctuation.
+        lines = str(raw).strip().splitlines()
+        ans = lines[0].strip().strip(" .,:;\"'`") if lines else ""
+        if not ans:
+            ans = default
+        # Enforce the "unknown" contract
+        if ans.lower().startswith("i don't know") or "not provided" in ans.lower():
+            ans = default
+        return ans
 
     def ask(self,
             question: str,
@@ -50,27 +106,78 @@ class QASession:
         Ask a question and get a short, extractive answer.
         If not answerable from context, returns `default`.
         """
-        prompt = (
-            f"{SYSTEM_INSTRUCTIONS}\n\n"
-            f"{''.join(self._contexts)}\n\n"
-            f"Question: {question}\n"
-            f"Answer:"
-        )
+        key = (self.fingerprint, question)
+        if key in self.cache:
+            return self.cache[key]
 
-        raw = self.llm(
-            prompt,
+        raw = self._call(
+            f"{self._prefix()}Question: {question}\nAnswer:",
             temperature=temperature,
             top_p=top_p,
             repeat_penalty=repeat_penalty,
             num_predict=num_predict,
-            model=self.model
-        ).strip()
-
-        # Keep only the first line/token span, strip quotes and trailing punctuation.
-        ans = raw.splitlines()[0].strip().strip(" .,:;\"'`")
-        if not ans:
-            ans = default
-        # Enforce the "unknown" contract
-        if ans.lower().startswith("i don't know") or "not provided" in ans.lower():
-            ans = default
+        )
+        ans = self._clean(raw, default)
+        self.cache[key] = ans
         return ans
+
+    def ask_many(self,
+                 questions: List[str],
+                 *,
+                 default: str = "unknown",
+                 temperature: float = 0.1,
+                 top_p: float = 0.9,
+                 repeat_penalty: float = 1.15,
+                 num_predict_per_question: int = 32) -> Dict[str, str]:
+        """
+        Answer several questions over the same contexts in one structured-output call.
+
+        Cached answers are reused; the rest go out as one numbered batch whose
+        reply is constrained to {"answers": [...]}. Questions the batch reply
+        does not cover fall back to ask().
+        """
+        questions = list(dict.fromkeys(questions))
+        answers: Dict[str, str] = {}
+        pending = []
+        for q in questions:
+            key = (self.fingerprint, q)
+            if key in self.cache:
+                answers[q] = self.cache[key]
+            else:
+                pending.append(q)
+
+        if len(pending) == 1:
+            answers[pending[0]] = self.ask(pending[0], default=default, temperature=temperature,
+                                           top_p=top_p, repeat_penalty=repeat_penalty,
+                                           num_predict=num_predict_per_question)
+            pending = []
+
+        if pending:
+            numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(pending, start=1))
+            schema = {
+                "type": "object",
+                "properties": {"answers": {"type": "array", "items": {"type": "string"},
+                                           "minItems": len(pending), "maxItems": len(pending)}},
+                "required": ["answers"],
+            }
+            raw = self._call(
+                f"{self._prefix()}{BATCH_INSTRUCTIONS}\nQuestions:\n{numbered}\nJSON:",
+                temperature=temperature,
+                top_p=top_p,
+                repeat_penalty=repeat_penalty,
+                num_predict=16 + num_predict_per_question * len(pending),
+                format=schema,
+            )
+            try:
+                batch = scan_json(raw, "{").get("answers") or []
+            except (json.JSONDecodeError, AttributeError):
+                batch = []
+            if isinstance(batch, list) and len(batch) == len(pending):
+                for q, raw_answer in zip(pending, batch):
+                    answers[q] = self.cache[(self.fingerprint, q)] = self._clean(raw_answer, default)
+                pending = []
+
+        for q in pending:
+            answers[q] = self.ask(q, default=default, temperature=temperature, top_p=top_p,
+                                  repeat_penalty=repeat_penalty, num_predict=num_predict_per_question)
+        return answers
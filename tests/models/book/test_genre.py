@@ -466,7 +466,40 @@ class TestGenreMapping:
         for subgenre in all_mapped_subgenres:
             parent_genre = GenreMapping.get_genre_for_subgenre(subgenre)
             assert parent_genre is not None, f"Subgenre {subgenre} has no parent genre"
-    
+
+    def test_reverse_index_matches_linear_scan(self):
+        """Test that the reverse index agrees with scanning the mapping in order."""
+        for subgenre in SubGenreType:
+            expected = [genre for genre, subgenres in GenreMapping.GENRE_SUBGENRE_MAP.items()
+                        if subgenre in subgenres]
+            assert GenreMapping.get_all_genres_for_subgenre(subgenre) == expected
+            assert GenreMapping.get_genre_for_subgenre(subgenre) == (expected[0] if expected else None)
+
+    def test_cached_views_return_fresh_lists(self):
+        """Test that callers cannot corrupt the cached combination views."""
+        combinations = GenreMapping.get_all_combinations()
+        total = len(combinations)
+        combinations.clear()
+        assert len(GenreMapping.get_all_combinations()) == total
+
+        subgenres = GenreMapping.get_subgenres_list(GenreType.ROMANCE)
+        subgenres.append(SubGenreType.COZY_MYSTERY)
+        assert SubGenreType.COZY_MYSTERY not in GenreMapping.get_subgenres_list(GenreType.ROMANCE)
+
+    def test_search_combinations_composite_filter(self):
+        """Test that genre + AI-friendly filters intersect and keep canonical order."""
+        all_combos = GenreMapping.get_all_combinations()
+        ai_keys = {(c.genre, c.subgenre) for c in GenreMapping.get_ai_friendly_combinations()}
+        expected = [c for c in all_combos
+                    if c.genre == GenreType.ROMANCE and (c.genre, c.subgenre) in ai_keys]
+
+        result = GenreMapping.search_combinations(genre_filter=GenreType.ROMANCE, ai_friendly=True)
+        assert result == expected
+        assert len(result) == 2
+        assert GenreMapping.search_combinations(ai_friendly=True) == [
+            c for c in all_combos if (c.genre, c.subgenre) in ai_keys
+        ]
+
     def test_no_empty_genre_mappings(self):
         """Test that no genre has empty subgenre set."""
         for genre, subgenres in GenreMapping.GENRE_SUBGENRE_MAP.items():
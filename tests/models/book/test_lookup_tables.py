@@ -0,0 +1,207 @@
+"""
+Tests for musequill.models.book.lookup_tables module.
+
+Test file: tests/models/book/test_lookup_tables.py
+Module under test: musequill/models/book/lookup_tables.py
+
+Run from project root: pytest tests/models/book/test_lookup_tables.py -v -s
+"""
+
+import importlib
+import pkgutil
+import sys
+import time
+from enum import Enum
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Type
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import musequill.models.book as book_models
+from musequill.models.book.lookup_tables import alias_table, frozen_lookup_tables
+
+
+def _model_enums() -> List[Type[Enum]]:
+    """Every Enum defined in the musequill.models.book modules."""
+    enums = []
+    for module_info in pkgutil.walk_packages(book_models.__path__, book_models.__name__ + "."):
+        module = importlib.import_module(module_info.name)
+        for obj in vars(module).values():
+            if isinstance(obj, type) and issubclass(obj, Enum) and obj.__module__ == module.__name__:
+                enums.append(obj)
+    return enums
+
+
+MODEL_ENUMS = _model_enums()
+
+
+@frozen_lookup_tables
+class Color(str, Enum):
+    RED = "red"
+    LIGHT_BLUE = "light_blue"
+
+    @property
+    def display_name(self) -> str:
+        names = {self.RED: "Red", self.LIGHT_BLUE: "Light Blue"}
+        return names[self]
+
+    @property
+    def tags(self) -> List[str]:
+        tags = {self.RED: ["warm"], self.LIGHT_BLUE: ["cool", "pale"]}
+        return tags[self]
+
+    @alias_table
+    def _fuzzy_aliases(cls) -> Dict[str, 'Color']:
+        return {"crimson": cls.RED, "sky": cls.LIGHT_BLUE}
+
+
+class TestFrozenLookupTables:
+    """Test the class decorator on a small enum."""
+
+    def test_properties_match_original_values(self):
+        assert Color.RED.display_name == "Red"
+        assert Color.LIGHT_BLUE.tags == ["cool", "pale"]
+
+    def test_list_properties_return_fresh_copies(self):
+        tags = Color.RED.tags
+        tags.append("mutated")
+        assert Color.RED.tags == ["warm"]
+        assert isinstance(Color.RED.tags, list)
+
+    def test_indexes(self):
+        assert Color._MEMBERS == (Color.RED, Color.LIGHT_BLUE)
+        assert Color._VALUE_INDEX["light_blue"] is Color.LIGHT_BLUE
+        assert Color._DISPLAY_NAME_INDEX["light blue"] is Color.LIGHT_BLUE
+        assert isinstance(Color._VALUE_INDEX, MappingProxyType)
+
+    def test_alias_table_is_frozen_and_shared(self):
+        aliases = Color._fuzzy_aliases
+        assert aliases["sky"] is Color.LIGHT_BLUE
+        assert aliases is Color._fuzzy_aliases
+        with pytest.raises(TypeError):
+            aliases["new"] = Color.RED
+
+    def test_original_getter_is_preserved(self):
+        original = vars(Color)["display_name"].fget.__wrapped__
+        assert original(Color.RED) == "Red"
+
+
+class TestModelEnumTables:
+    """Check every decorated model enum against its original property getters."""
+
+    def test_all_model_enums_are_decorated(self):
+        assert MODEL_ENUMS
+        for enum_cls in MODEL_ENUMS:
+            assert hasattr(enum_cls, "_VALUE_INDEX"), f"{enum_cls.__name__} is not decorated"
+
+    @pytest.mark.parametrize("enum_cls", MODEL_ENUMS, ids=lambda e: e.__name__)
+    def test_tables_match_original_getters(self, enum_cls):
+        for name, attr in vars(enum_cls).items():
+            if not isinstance(attr, property):
+                continue
+            original = getattr(attr.fget, "__wrapped__", None)
+            if original is None:
+                continue
+            for member in enum_cls:
+                assert getattr(member, name) == original(member), f"{enum_cls.__name__}.{member.name}.{name}"
+
+    @pytest.mark.parametrize("enum_cls", MODEL_ENUMS, ids=lambda e: e.__name__)
+    def test_from_string_round_trips_values(self, enum_cls):
+        if not hasattr(enum_cls, "from_string"):
+            pytest.skip("no from_string")
+        for member in enum_cls:
+            assert enum_cls.from_string(member.value) is member
+
+
+class TestLookupTablePerformance:
+    """Benchmark precomputed tables against the original property getters."""
+
+    def test_property_tables_speedup(self):
+        """Read every property of every member across all model modules."""
+        rounds = 20
+        original_time = 0.0
+        table_time = 0.0
+        report = []
+
+        for enum_cls in MODEL_ENUMS:
+            accessors = []
+            for name, attr in vars(enum_cls).items():
+                if isinstance(attr, property) and hasattr(attr.fget, "__wrapped__"):
+                    accessors.append((attr.fget.__wrapped__, attr.fget))
+            if not accessors:
+                continue
+            members = list(enum_cls)
+
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for original, _table in accessors:
+                    for member in members:
+                        original(member)
+            enum_original = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for _original, table in accessors:
+                    for member in members:
+                        table(member)
+            enum_table = time.perf_counter() - start
+
+            original_time += enum_original
+            table_time += enum_table
+            report.append(f"{enum_cls.__module__.rsplit('.', 1)[-1]}.{enum_cls.__name__}: "
+                          f"{enum_original * 1000:.1f}ms -> {enum_table * 1000:.1f}ms")
+
+        print("\n" + "\n".join(report))
+        print(f"TOTAL: {original_time * 1000:.1f}ms -> {table_time * 1000:.1f}ms "
+              f"({original_time / max(table_time, 1e-9):.1f}x)")
+
+    def test_getters_run_once_per_member(self):
+        """Decoration evaluates each getter once per member; reads never call it again."""
+        calls = []
+
+        class Shade(str, Enum):
+            DARK = "dark"
+            LIGHT = "light"
+
+            @property
+            def label(self) -> str:
+                calls.append(self)
+                return self.value.title()
+
+        Shade = frozen_lookup_tables(Shade)
+        assert calls == [Shade.DARK, Shade.LIGHT]
+        for _ in range(100):
+            assert Shade.LIGHT.label == "Light"
+        assert len(calls) == 2
+
+        for enum_cls in MODEL_ENUMS:
+            for name, attr in vars(enum_cls).items():
+                if isinstance(attr, property) and hasattr(attr.fget, "__wrapped__"):
+                    for member in enum_cls:
+                        value = getattr(member, name)
+                        if not isinstance(value, list):
+                            assert getattr(member, name) is value, f"{enum_cls.__name__}.{name} is recomputed"
+
+    def test_from_string_alias_table_built_once(self, monkeypatch):
+        """from_string on aliases no longer rebuilds the alias dict per call."""
+        inputs = ["sci-fi", "ya", "love story", "mg", "noir"]
+        from musequill.models.book.genre import GenreType
+
+        table = vars(GenreType)["_fuzzy_aliases"]
+        builds = []
+        builder = table.builder
+        monkeypatch.setattr(table, "builder", lambda cls: builds.append(cls) or builder(cls))
+        aliases = GenreType._fuzzy_aliases
+        for _ in range(2000):
+            for value in inputs:
+                try:
+                    GenreType.from_string(value)
+                except ValueError:
+                    pass
+        assert builds == []
+        assert GenreType._fuzzy_aliases is aliases
@@ -0,0 +1,115 @@
+"""
+Tests for musequill.services.backend.writers.artifact_cache module.
+
+Test file: tests/services/backend/test_artifact_cache.py
+Module under test: musequill/services/backend/writers/artifact_cache.py
+
+Run from project root: pytest tests/services/backend/test_artifact_cache.py -v -s
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from pydantic import BaseModel
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.writers.artifact_cache import ArtifactCache, cached_fragment, fingerprint
+from musequill.services.backend.writers.context_manager import EnhancedContextManager
+
+
+class Plan(BaseModel):
+    title: str
+    themes: List[str]
+
+
+class Counter:
+    def __init__(self, render):
+        self.render, self.calls = render, 0
+
+    def __call__(self, obj):
+        self.calls += 1
+        return self.render(obj)
+
+
+class TestArtifactCache:
+    """Render once per artifact, by identity or equal content."""
+
+    def test_same_object_renders_once(self):
+        cache, render = ArtifactCache(), Counter(lambda p: f"{p.title}: {', '.join(p.themes)}")
+        plan = Plan(title="Salt", themes=["loss", "tide"])
+        assert {cache.get("plan", plan, render) for _ in range(5)} == {"Salt: loss, tide"}
+        assert render.calls == 1 and (cache.hits, cache.misses) == (4, 1)
+
+    def test_equal_copy_reuses_rendering(self):
+        cache, render = ArtifactCache(), Counter(str)
+        cache.get("constraints", {"tone": "warm", "pov": {"type": "third"}}, render)
+        cache.get("constraints", {"pov": {"type": "third"}, "tone": "warm"}, render)
+        cache.get("constraints", {"tone": "cold", "pov": {"type": "third"}}, render)
+        assert render.calls == 2 and len(cache) == 2
+
+    def test_names_are_separate(self):
+        cache = ArtifactCache()
+        plan = Plan(title="Salt", themes=[])
+        assert cache.get("a", plan, lambda p: "A") == "A"
+        assert cache.get("b", plan, lambda p: "B") == "B"
+
+    def test_clear_after_in_place_edit(self):
+        cache, plan = ArtifactCache(), Plan(title="Salt", themes=[])
+        cache.get("title", plan, lambda p: p.title)
+        plan.title = "Brine"
+        assert cache.get("title", plan, lambda p: p.title) == "Salt"
+        cache.clear()
+        assert cache.get("title", plan, lambda p: p.title) == "Brine"
+
+    def test_fingerprint(self):
+        assert fingerprint(Plan(title="a", themes=["x"])) == fingerprint(Plan(title="a", themes=["x"]))
+        assert fingerprint({"a": 1, "b": [Plan(title="a", themes=[])]}) != fingerprint({"a": 1})
+        assert fingerprint("text") != fingerprint("other")
+
+    def test_cached_fragment_without_cache(self):
+        assert cached_fragment({}, "x", 3, lambda n: n * 2) == 6
+        cache = ArtifactCache()
+        assert cached_fragment({"artifact_cache": cache}, "x", "ab", str.upper) == "AB"
+        assert cache.misses == 1
+
+    def test_context_manager_shares_one_cache(self, tmp_path):
+        manager = EnhancedContextManager("book", base_dir=str(tmp_path))
+        plan = Plan(title="Salt", themes=[])
+        contexts = [manager._build_traditional_context(plan, "summary", {}, None, None) for _ in range(3)]
+        assert all(ctx["artifact_cache"] is manager.artifact_cache for ctx in contexts)
+
+
+class TestArtifactCachePerformance:
+    """Summaries rendered for every critique pass of a book versus once per artifact."""
+
+    def test_renders_once_per_run(self):
+        book = Plan(title="Salt", themes=[f"theme {i}" for i in range(2000)])
+        briefs = [Plan(title=f"Chapter {i}", themes=["beat"] * 50) for i in range(30)]
+
+        def slow_summary(p):
+            return "\n".join(f"- {t}" for t in p.themes)
+
+        passes = 3
+        uncached = Counter(slow_summary)
+        start = time.perf_counter()
+        for brief in briefs:
+            for _ in range(passes):
+                uncached(book), uncached(brief)
+        uncached_time = time.perf_counter() - start
+
+        cache, cached = ArtifactCache(), Counter(slow_summary)
+        start = time.perf_counter()
+        for brief in briefs:
+            for _ in range(passes):
+                cache.get("book", book, cached), cache.get("brief", brief, cached)
+        cached_time = time.perf_counter() - start
+
+        print(f"\n{len(briefs)} chapters x {passes} passes: renders {uncached.calls} -> {cached.calls}, "
+              f"{uncached_time * 1000:.1f}ms -> {cached_time * 1000:.1f}ms")
+        assert cached.calls == 1 + len(briefs)
+        assert uncached.calls == 2 * passes * len(briefs)
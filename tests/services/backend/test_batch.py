@@ -0,0 +1,206 @@
+"""
+Tests for musequill.services.backend.batch module.
+
+Test file: tests/services/backend/test_batch.py
+Module under test: musequill/services/backend/batch.py
+
+Run from project root: pytest tests/services/backend/test_batch.py -v -s
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.batch import (
+    BatchResources,
+    BatchRunner,
+    BookJob,
+    LLMPool,
+    Stage,
+    load_manifest,
+)
+
+
+class FakeLLM:
+    """Stands in for LLMService: initialise, then generate after a delay."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.initialized = False
+        self.calls = 0
+
+    async def initialize(self):
+        self.initialized = True
+
+    async def generate(self, prompt, max_tokens=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"response": "ok"}
+
+
+def _jobs(n):
+    return [BookJob(template=f"book{i}", template_data={}) for i in range(n)]
+
+
+def _resources(tmp_path, size=2, delay=0.0):
+    services = []
+
+    def factory():
+        services.append(FakeLLM(delay))
+        return services[-1]
+
+    return BatchResources(LLMPool(factory, size), output_root=tmp_path), services
+
+
+class Tracker:
+    """Records how many books are inside each stage (and any stage) at once and the order of entries."""
+
+    def __init__(self):
+        self.active = {}
+        self.peak = {}
+        self.peak_total = 0
+        self.events = []
+
+    def stage(self, name, delay, use_llm=False, fail_for=()):
+        async def run(job, resources):
+            self.active[name] = self.active.get(name, 0) + 1
+            self.peak[name] = max(self.peak.get(name, 0), self.active[name])
+            self.peak_total = max(self.peak_total, sum(self.active.values()))
+            self.events.append((job.template, name))
+            try:
+                if job.template in fail_for:
+                    raise ValueError("bad template")
+                if use_llm:
+                    async with resources.llm() as llm:
+                        await llm.generate("prompt")
+                else:
+                    await asyncio.sleep(delay)
+            finally:
+                self.active[name] -= 1
+        return run
+
+
+class TestManifest:
+    """Test manifest parsing."""
+
+    def test_names_and_copies(self, tmp_path):
+        (tmp_path / "bunny.json").write_text('{"book": {"title": "B"}}')
+        (tmp_path / "romance.json").write_text('{"book": {"title": "R"}}')
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"templates": ["bunny", {"template": "romance", "copies": 2}]}))
+        jobs = load_manifest(manifest, templates_dir=tmp_path)
+        assert [j.template for j in jobs] == ["bunny", "romance", "romance"]
+        assert len({j.book_id for j in jobs}) == 3
+
+    def test_missing_template(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text('["nope"]')
+        with pytest.raises(FileNotFoundError):
+            load_manifest(manifest, templates_dir=tmp_path)
+
+
+class TestBatchRunner:
+    """Test stage interleaving, backpressure and the progress report."""
+
+    def test_stage_limits_and_interleaving(self, tmp_path):
+        tracker = Tracker()
+        resources, services = _resources(tmp_path, size=2, delay=0.02)
+        stages = [
+            Stage("prepare", tracker.stage("prepare", 0.01), limit=8),
+            Stage("draft", tracker.stage("draft", 0, use_llm=True), limit=2),
+            Stage("research", tracker.stage("research", 0.03), limit=1),
+        ]
+        runner = BatchRunner(_jobs(6), stages, resources, max_active_books=4,
+                             report_path=tmp_path / "report.json")
+
+        async def go():
+            await resources.llm_pool.start(warm_up=False)
+            return await runner.run()
+
+        jobs = asyncio.run(go())
+        assert all(j.status == "done" for j in jobs)
+        assert tracker.peak["research"] == 1
+        assert tracker.peak["draft"] <= 2
+        assert tracker.peak["prepare"] <= 4  # admission caps books in flight
+        # Book 0 is researching before the last admitted book has drafted
+        first_research = tracker.events.index(("book0", "research"))
+        assert ("book3", "draft") in tracker.events[first_research:]
+        assert sum(s.calls for s in services) == 6
+
+        report = json.loads((tmp_path / "report.json").read_text())
+        assert report["counts"]["done"] == 6
+        assert report["books"][0]["completed"] == ["prepare", "draft", "research"]
+
+    def test_failed_book_does_not_stop_batch(self, tmp_path):
+        tracker = Tracker()
+        resources, _ = _resources(tmp_path)
+        stages = [
+            Stage("prepare", tracker.stage("prepare", 0, fail_for={"book1"})),
+            Stage("finish", tracker.stage("finish", 0)),
+        ]
+        jobs = asyncio.run(BatchRunner(_jobs(3), stages, resources).run())
+        assert [j.status for j in jobs] == ["done", "failed", "done"]
+        assert jobs[1].error == "prepare: bad template"
+        assert ("book1", "finish") not in tracker.events
+
+    def test_pool_warm_up_and_lease(self, tmp_path):
+        resources, services = _resources(tmp_path, size=3)
+
+        async def go():
+            await resources.llm_pool.start()
+            async with resources.llm() as a, resources.llm() as b:
+                assert a is not b
+        asyncio.run(go())
+        assert len(services) == 3
+        assert all(s.initialized for s in services)
+        assert sum(s.calls for s in services) == 1
+
+
+class TestBatchPerformance:
+    """Compare one-book-at-a-time runs against the interleaved batch."""
+
+    def test_interleaving_beats_sequential(self, tmp_path):
+        books, llm_delay, io_delay = 8, 0.03, 0.06
+
+        def stages(tracker):
+            return [
+                Stage("summary", tracker.stage("summary", 0, use_llm=True), limit=2),
+                Stage("research", tracker.stage("research", io_delay), limit=2),
+                Stage("plan", tracker.stage("plan", 0, use_llm=True), limit=2),
+            ]
+
+        seq_tracker, batch_tracker = Tracker(), Tracker()
+
+        async def sequential():
+            # The old flow: a fresh service per book, nothing overlaps
+            for job in _jobs(books):
+                resources, _ = _resources(tmp_path, size=1, delay=llm_delay)
+                await resources.llm_pool.start()
+                await BatchRunner([job], stages(seq_tracker), resources).run()
+
+        async def batched():
+            resources, _ = _resources(tmp_path, size=2, delay=llm_delay)
+            await resources.llm_pool.start()
+            await BatchRunner(_jobs(books), stages(batch_tracker), resources, max_active_books=4).run()
+
+        start = time.perf_counter()
+        asyncio.run(sequential())
+        seq = time.perf_counter() - start
+        start = time.perf_counter()
+        asyncio.run(batched())
+        batch = time.perf_counter() - start
+
+        print(f"\n{books} books: sequential {seq:.2f}s, batched {batch:.2f}s "
+              f"(peak books in stages: {seq_tracker.peak_total} -> {batch_tracker.peak_total})")
+        assert seq_tracker.peak_total == 1
+        # Books share stages up to each stage's limit and sit in different stages at once
+        assert batch_tracker.peak["summary"] == 2 and max(batch_tracker.peak.values()) == 2
+        assert batch_tracker.peak_total > 2
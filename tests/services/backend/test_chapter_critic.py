@@ -0,0 +1,95 @@
+"""
+Tests for the tiered critique in musequill.services.backend.writers.chapter_critic.
+
+Test file: tests/services/backend/test_chapter_critic.py
+Module under test: musequill/services/backend/writers/chapter_critic.py
+
+Run from project root: pytest tests/services/backend/test_chapter_critic.py -v
+"""
+
+import asyncio
+import json
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("langchain_ollama")
+pytest.importorskip("pydantic_settings")
+
+from musequill.services.backend.writers.chapter_critic import ChapterCritic
+from musequill.services.backend.writers.critique_screening import FAST, FULL
+
+TARGET_WORDS = 1000
+ACCEPT = {
+    "overall_score": 0.92,
+    "axes": [{"axis": "Voice", "score": 0.9, "rationale": "Consistent."}],
+    "red_flags": [],
+    "suggestions": [],
+    "keep_as_is": True,
+}
+
+
+class FakeLLM:
+    """Answers every generate call with ``reply`` (a dict is sent as JSON text, or an error result)."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+
+    async def update_default_parameters(self, **kwargs):
+        pass
+
+    async def generate(self, prompt):
+        self.calls += 1
+        if isinstance(self.reply, dict) and "error" in self.reply:
+            return self.reply
+        text = json.dumps(self.reply) if isinstance(self.reply, dict) else self.reply
+        return {"response": text}
+
+
+def _chapter(words=TARGET_WORDS):
+    rng = random.Random(44)
+    out, written = ["# Chapter 1", ""], 0
+    while written < words:
+        out.append("### Scene")
+        for _ in range(4):
+            n = rng.randint(8, 16)
+            out.append(" ".join("".join(rng.choice("abcdefghij") for _ in range(6)) for _ in range(n)).capitalize() + ".")
+            out.append("")
+            written += n
+    return "\n".join(out)
+
+
+def _critique(critic):
+    brief = SimpleNamespace(meta=SimpleNamespace(target_words=TARGET_WORDS))
+    return asyncio.run(critic.critique_once(
+        current_chapter=_chapter(), previous_chapter=None, story_so_far_summary="",
+        book_model="Book model", chapter_plan=brief, book_plan="Book plan",
+    ))
+
+
+class TestFastTier:
+    """The screening model settles clear cases; anything it cannot judge goes to the full critic."""
+
+    def test_clear_pass_settles_at_fast(self):
+        full, fast = FakeLLM(ACCEPT), FakeLLM(ACCEPT)
+        critic = ChapterCritic(full, fast_llm=fast)
+        result = _critique(critic)
+        assert result.tier == FAST and fast.calls == 1 and full.calls == 0
+
+    @pytest.mark.parametrize("reply", [{"error": "model 'tiny' not found"}, "I liked this chapter a lot."])
+    def test_failed_screening_escalates_to_full(self, reply):
+        full, fast = FakeLLM(ACCEPT), FakeLLM(reply)
+        critic = ChapterCritic(full, fast_llm=fast)
+        result = _critique(critic)
+        assert result.tier == FULL and full.calls == 1
+        assert critic.stats.fast_escalate == 1 and critic.stats.full == 1
+        assert result.findings.overall_score == ACCEPT["overall_score"]
+        assert result.revised_text == _chapter()
@@ -0,0 +1,154 @@
+"""
+Tests for musequill.services.backend.writers.chapter_patch module.
+
+Test file: tests/services/backend/test_chapter_patch.py
+Module under test: musequill/services/backend/writers/chapter_patch.py
+
+Run from project root: pytest tests/services/backend/test_chapter_patch.py -v -s
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.utils import scan_json
+from musequill.services.backend.writers.chapter_feedback import ChapterFeedback, create_patch_prompt
+from musequill.services.backend.writers.chapter_patch import (
+    PatchEdit,
+    PatchError,
+    RevisionStats,
+    apply_patch,
+    apply_patch_response,
+    parse_patch,
+    patchable,
+    render_with_ids,
+    split_blocks,
+)
+
+CHAPTER = """# Chapter 1: Salt
+
+### The Dock
+
+Mira waited at the dock while the tide turned.
+
+The sun cast dappled shadows across the boards.
+
+### The Storm
+
+Rain came in sideways off the bay.
+
+Tobias laughed at nothing."""
+
+_rng = random.Random(45)
+WORDS = ["".join(_rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(_rng.randint(2, 8)))
+         for _ in range(3000)]
+
+
+def _long_chapter(rng, words=2500):
+    out, written = ["# Chapter 2: Long"], 0
+    while written < words:
+        out.append("### Scene")
+        for _ in range(5):
+            n = rng.randint(40, 90)
+            out.append(" ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + ".")
+            written += n
+    return "\n\n".join(out)
+
+
+class TestBlocks:
+    """Paragraph ids."""
+
+    def test_split_and_render(self):
+        blocks = split_blocks(CHAPTER)
+        assert len(blocks) == 7 and blocks[0] == "# Chapter 1: Salt"
+        rendered = render_with_ids(CHAPTER)
+        assert rendered.startswith("[P1] # Chapter 1: Salt\n\n[P2] ### The Dock")
+        assert "[P7] Tobias laughed at nothing." in rendered
+
+    def test_patchable(self):
+        assert patchable(2400, 2500) and not patchable(1200, 2500)
+        assert patchable(100, None)
+
+
+class TestApplyPatch:
+    """Applying and validating edits."""
+
+    def test_replace_delete_insert(self):
+        patched = apply_patch(CHAPTER, [
+            PatchEdit("replace", "P4", "Light fell through the gaps in the boards."),
+            PatchEdit("delete", "P7"),
+            PatchEdit("insert_after", "P6", "Mira pulled her hood up."),
+        ])
+        assert "dappled" not in patched and "Tobias" not in patched
+        assert patched.endswith("Rain came in sideways off the bay.\n\nMira pulled her hood up.")
+        assert patched.startswith("# Chapter 1: Salt\n\n### The Dock")
+
+    def test_insert_at_start(self):
+        patched = apply_patch(CHAPTER, [PatchEdit("insert_after", "P0", "An epigraph.")])
+        assert patched.startswith("An epigraph.\n\n# Chapter 1")
+
+    @pytest.mark.parametrize("edits, message", [
+        ([PatchEdit("replace", "P99", "x")], "unknown block id"),
+        ([PatchEdit("delete", "P0")], "unknown block id"),
+        ([PatchEdit("replace", "P4", "x"), PatchEdit("delete", "P4")], "conflicting"),
+        ([PatchEdit("replace", f"P{i}", "x") for i in (3, 4, 6, 7)], "patch edits 4 of 7"),
+        ([PatchEdit("delete", "P1")], "H1 titles"),
+        ([PatchEdit("replace", "P4", "word " * 40)], "changed length"),
+        ([], "empty"),
+    ])
+    def test_rejected(self, edits, message):
+        with pytest.raises(PatchError, match=message):
+            apply_patch(CHAPTER, edits)
+
+    def test_parse_model_output(self):
+        raw = 'Sure! {"edits": [{"op": "Replace", "id": "[p4]", "text": "New light."}]} Done.'
+        edits = parse_patch(scan_json(raw))
+        assert edits == [PatchEdit("replace", "P4", "New light.")]
+        assert parse_patch([{"op": "delete", "id": "P5"}]) == [PatchEdit("delete", "P5")]
+        for bad in (None, {"edits": "no"}, [{"op": "rewrite", "id": "P1"}], [{"op": "replace", "id": "P1"}]):
+            with pytest.raises(PatchError):
+                parse_patch(bad)
+
+
+def test_patch_prompt_lists_ids_and_feedback():
+    brief = SimpleNamespace(
+        meta=SimpleNamespace(chapter_number=1, chapter_title="Salt", target_words=40),
+        narrative_beats=["arrival"],
+    )
+    feedback = ChapterFeedback(0.6, "", "", "", "Too many cliches", "", ["Cut the dappled light"], [], "high",
+                               flagged_passages=['"dappled" at line 7'])
+    prompt = create_patch_prompt(CHAPTER, feedback, {"chapter_brief": brief}, 1)
+    assert "[P4] The sun cast dappled shadows" in prompt
+    assert "Cut the dappled light" in prompt and '"dappled" at line 7' in prompt
+    assert '"edits"' in prompt
+
+
+class TestPatchOutputSize:
+    """Output needed for a typical two-paragraph critique: patch vs full rewrite."""
+
+    def test_order_of_magnitude_smaller(self):
+        rng = random.Random(7)
+        stats = RevisionStats()
+        for _ in range(10):
+            chapter = _long_chapter(rng)
+            blocks = split_blocks(chapter)
+            targets = rng.sample([i for i, b in enumerate(blocks, 1) if not b.startswith("#")], 2)
+            edits = [{"op": "replace", "id": f"P{i}",
+                      "text": " ".join(rng.choice(WORDS) for _ in range(len(blocks[i - 1].split())))}
+                     for i in targets]
+            response = json.dumps({"edits": edits})
+            patched = apply_patch_response(chapter, json.loads(response))
+            assert len(split_blocks(patched)) == len(blocks)
+            stats.record_patch(response, chapter)
+
+        print(f"\n{stats.patched} revisions: patch output {stats.patch_chars} chars vs "
+              f"{stats.chapter_chars} for full rewrites ({stats.output_reduction:.1f}x smaller)")
+        assert stats.output_reduction >= 10
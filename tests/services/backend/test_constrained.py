@@ -0,0 +1,245 @@
+"""
+Tests for musequill.services.backend.planner.constrained module.
+
+Test file: tests/services/backend/test_constrained.py
+Module under test: musequill/services/backend/planner/constrained.py
+
+Run from project root: pytest tests/services/backend/test_constrained.py -v -s
+"""
+
+import json
+import sys
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("jsonschema")
+pytest.importorskip("pydantic")
+pytest.importorskip("requests")
+
+import book_plan
+from musequill.services.backend.planner import book_planner
+from musequill.services.backend.planner.book_plan import BookPlan
+from musequill.services.backend.planner.constrained import RepairStats, ollama_format_schema
+
+
+def _valid_plan() -> Dict[str, Any]:
+    return {
+        "project": {
+            "title": "T", "author": "A",
+            "audience": {"type": "children", "age": "7-12"},
+            "length_words": "40,000–60,000",
+            "pov": {"type": "third_person_objective", "rule": "observable only"},
+            "tone": "warm", "pace": "fast",
+        },
+        "logline": "L",
+        "themes": ["Courage"],
+        "world_bible": {"core_locales": [], "soft_magic_rules": [], "safety_dial": "mild"},
+        "characters": {"protagonist": {"name": "P", "species": "bunny", "observable_traits": [],
+                                       "skills_progression": []}, "mythic_figures": []},
+        "hero_journey_beats": [],
+        "pacing_targets": {"act_I": {}, "act_II": {}, "act_III": {}},
+        "chapter_outline": [
+            {"ch": i, "title": f"Chapter {i}", "act": "I", "setting": "s", "figure": None,
+             "external_goal": "g", "obstacle": "o", "turn": "t", "cliffhanger": "c", "words": "1.6–2.2k"}
+            for i in range(1, 13)
+        ],
+        "setups_payoffs": [],
+        "style_guide": {"voice": [], "dialogue_rules": [], "objective_pov_guardrails": []},
+        "research_briefs": [],
+        "risks": [],
+        "production_notes": {"artifacts": [], "milestones": []},
+    }
+
+
+class MockOllama:
+    """
+    Local stand-in for the Ollama HTTP API.
+
+    With a constrained ``format`` schema (refs inlined)
+    the mock returns a valid plan, as grammar-restricted decoding would. Without
+    one it behaves like a free-running model: prose plus a plan with a malformed
+    ``words`` range, fixed only by a repair call.
+    """
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+
+    def _constrained(self, payload: Dict[str, Any]) -> bool:
+        fmt = payload.get("format")
+        return isinstance(fmt, dict) and "$defs" not in json.dumps(fmt)
+
+    def post(self, url: str, payload: Dict[str, Any], timeout: int) -> str:
+        self.calls.append(payload)
+        if self._constrained(payload):
+            return json.dumps(_valid_plan())
+        broken = deepcopy(_valid_plan())
+        broken["chapter_outline"][0]["words"] = "about two thousand"
+        return "Here is the plan:\n" + json.dumps(broken)
+
+    def chat(self, messages: list, format_payload: Any) -> str:
+        self.calls.append({"messages": messages, "format": format_payload})
+        if "Fragment: chapter_outline[0]" in messages[-1]["content"]:
+            # Fragment repair: answer with just the corrected chapter entry
+            return json.dumps({"fragment": _valid_plan()["chapter_outline"][0]})
+        return json.dumps(_valid_plan())
+
+
+@pytest.fixture
+def mock_ollama(monkeypatch):
+    mock = MockOllama()
+    monkeypatch.setattr(book_planner, "_post", mock.post)
+    monkeypatch.setattr(book_planner, "_ollama_chat", mock.chat)
+    monkeypatch.setattr(book_planner.time, "sleep", lambda seconds: None)
+    return mock
+
+
+class TestOllamaFormatSchema:
+    """Test the derived constrained-decoding schema."""
+
+    def test_inlines_refs_and_drops_annotations(self):
+        schema = BookPlan.model_json_schema()
+        derived = ollama_format_schema(schema)
+        text = json.dumps(derived)
+        assert "$ref" not in text
+        assert "$defs" not in text
+        assert '"description"' not in text
+        # Property *names* such as "title" are kept
+        assert "title" in derived["properties"]["project"]["properties"]
+        assert len(text) < len(json.dumps(schema))
+
+    def test_required_kept_as_declared(self):
+        schema = BookPlan.model_json_schema()
+        derived = ollama_format_schema(schema)
+        item = derived["properties"]["chapter_outline"]["items"]
+        declared = schema["$defs"][schema["properties"]["chapter_outline"]["items"]["$ref"].split("/")[-1]]
+        assert item["required"] == declared["required"]
+        assert item["properties"]["words"]["pattern"]
+        optional = {"type": "object", "properties": {"a": {"type": "string"}, "b": {"type": "integer"}}}
+        assert "required" not in ollama_format_schema(optional)
+
+    def test_data_values_keep_annotation_named_keys(self):
+        locked = {"title": "The Map", "default": {"title": "x"}, "description": "kept"}
+        schema = {
+            "type": "object",
+            "title": "Root",
+            "properties": {
+                "canon": {"const": locked, "default": locked},
+                "choice": {"enum": [{"title": "a"}, {"title": "b"}], "description": "drop me"},
+                "either": {"anyOf": [{"type": "string", "title": "S"}, {"const": {"title": "n"}}]},
+            },
+        }
+        derived = ollama_format_schema(schema)
+        assert "title" not in derived
+        assert derived["properties"]["canon"] == {"const": locked}
+        assert derived["properties"]["choice"] == {"enum": [{"title": "a"}, {"title": "b"}]}
+        assert derived["properties"]["either"] == {"anyOf": [{"type": "string"}, {"const": {"title": "n"}}]}
+
+    def test_root_planner_locks_survive(self):
+        book_model = {"title": "The Map", "genre": {"type": "fantasy", "description": "quest"}}
+        run_schema = book_plan.specialize_schema(
+            base_schema=book_plan.base_book_plan_schema(), book_model=book_model, blueprint={},
+            summary_text="s", tone="warm", pace="fast", expected_chapters=24,
+            locked_act_counts=book_plan.ACT_CHAPTER_SPLIT, locked_word_targets={"I": 1, "II": 1, "III": 1},
+        )
+        derived = ollama_format_schema(run_schema)
+        assert derived["properties"]["canon"]["properties"]["book_model"]["const"] == book_model
+
+    def test_recursive_ref_collapses(self):
+        schema = {
+            "$defs": {"Node": {"type": "object", "properties": {"child": {"$ref": "#/$defs/Node"}}}},
+            "$ref": "#/$defs/Node",
+        }
+        derived = ollama_format_schema(schema)
+        assert derived["properties"]["child"] == {"type": "object"}
+
+    def test_source_schema_untouched(self):
+        schema = BookPlan.model_json_schema()
+        snapshot = json.dumps(schema, sort_keys=True)
+        ollama_format_schema(schema)
+        assert json.dumps(schema, sort_keys=True) == snapshot
+
+
+class TestRepairStats:
+    """Test the generation/repair counters."""
+
+    def test_counts_regenerated_bytes_after_first_generation(self):
+        stats = RepairStats()
+        stats.start_plan()
+        stats.record_generation("abcd")
+        stats.record_generation("xy", repair=True)
+        assert stats.generations == 2
+        assert stats.repairs == 1
+        assert stats.bytes_generated == 6
+        assert stats.bytes_regenerated == 2
+        assert stats.attempts_per_plan == [2]
+
+
+class TestConstrainedPlanning:
+    """Compare the constrained path with the legacy fallback using a mock LLM."""
+
+    def test_constrained_plan_needs_one_generation(self, mock_ollama, monkeypatch):
+        monkeypatch.setattr(book_planner, "STRUCTURED_OK", True)
+        stats = RepairStats()
+        plan = book_planner.plan_book({}, {}, {}, "notes", "summary", stats=stats)
+
+        assert isinstance(plan, BookPlan)
+        assert stats.generations == 1
+        assert stats.repairs == 0
+        assert stats.bytes_regenerated == 0
+        assert stats.attempts_per_plan == [1]
+        assert isinstance(mock_ollama.calls[0]["format"], dict)
+
+    def test_unconstrained_plan_pays_for_repairs(self, mock_ollama, monkeypatch):
+        monkeypatch.setattr(book_planner, "STRUCTURED_OK", False)
+        stats = RepairStats()
+        plan = book_planner.plan_book({}, {}, {}, "notes", "summary", stats=stats)
+
+        assert isinstance(plan, BookPlan)
+        assert stats.repairs == 1
+        assert stats.validation_failures == 1
+        assert stats.bytes_regenerated > 0
+        print(f"\nunconstrained: {stats.as_dict()}")
+
+    def test_fragment_repair_regenerates_one_chapter(self, mock_ollama, monkeypatch):
+        monkeypatch.setattr(book_planner, "STRUCTURED_OK", False)
+        stats = RepairStats()
+        plan = book_planner.plan_book({}, {}, {}, "notes", "summary", stats=stats)
+
+        assert plan.chapter_outline[0].words == "1.6–2.2k"
+        repair_call = mock_ollama.calls[-1]
+        repair_prompt = repair_call["messages"][-1]["content"]
+        assert "Fragment: chapter_outline[0]" in repair_prompt
+        assert stats.repairs == 1
+
+        # The full-plan repair prompt carries the whole plan and schema; the fragment one does not
+        fragment_bytes = len(repair_prompt) + len(json.dumps({"fragment": _valid_plan()["chapter_outline"][0]}))
+        full_bytes = len(json.dumps(_valid_plan())) * 2 + len(json.dumps(BookPlan.model_json_schema()))
+        print(f"\nfragment repair: ~{fragment_bytes}B vs full-plan repair ~{full_bytes}B")
+        assert fragment_bytes * 5 < full_bytes
+
+
+class TestRootPlannerStats:
+    """The top-level book_plan.py planner records into the same counters."""
+
+    def test_failed_attempts_are_counted(self, monkeypatch):
+        monkeypatch.setattr(book_plan, "_post_json", lambda path, payload, timeout: "I cannot do that.")
+        monkeypatch.setattr(book_plan.time, "sleep", lambda seconds: None)
+        stats = RepairStats()
+        with pytest.raises(RuntimeError):
+            book_plan.plan_book(book_model={}, blueprint={}, research={}, planning_text="p",
+                                summary_text="s", stats=stats)
+        # Each attempt: constrained chat, coercion chat, /api/generate fallback
+        assert stats.generations == 3 * book_plan.MAX_RETRIES
+        assert stats.validation_failures == book_plan.MAX_RETRIES
+        assert stats.attempts_per_plan == [3 * book_plan.MAX_RETRIES]
+        assert stats.accepted == 0
+
+    def test_defaults_to_shared_planner_stats(self):
+        assert book_plan.PLANNER_STATS is book_planner.PLANNER_STATS
@@ -0,0 +1,108 @@
+"""
+Tests for musequill.services.backend.llm.context_sizing module.
+
+Test file: tests/services/backend/test_context_sizing.py
+Module under test: musequill/services/backend/llm/context_sizing.py
+
+Run from project root: pytest tests/services/backend/test_context_sizing.py -v -s
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.llm.context_sizing import (
+    CTX_BUCKETS,
+    ContextSizer,
+    PromptTokenCounter,
+)
+
+
+def _prompt(tokens, chars_per_token=3.5):
+    """A prompt the uncalibrated counter measures at about ``tokens``."""
+    return "x" * int(tokens * chars_per_token / 1.05)
+
+
+class TestPromptTokenCounter:
+    """Estimates, calibration against Ollama's counts, and the tokenizer fallback."""
+
+    def test_calibrates_towards_reported_counts(self):
+        counter = PromptTokenCounter()
+        text = "word " * 4000  # 20000 chars
+        before = counter.count(text)
+        for _ in range(5):
+            counter.calibrate(text, 4500)  # ~4.4 chars per token
+        assert abs(counter.chars_per_token - 20000 / 4500) < 0.01
+        assert counter.count(text) < before
+        assert counter.count(text) >= 4500  # the margin keeps estimates on the safe side
+
+    def test_ignores_cached_prefix_counts(self):
+        counter = PromptTokenCounter()
+        counter.calibrate("word " * 4000, 12)   # prefix reused; only a few tokens evaluated
+        counter.calibrate("word " * 4000, None)
+        assert counter.chars_per_token == 3.5 and counter.samples == 0
+
+    def test_unavailable_tokenizer_falls_back(self):
+        counter = PromptTokenCounter("meta-llama/not-installed-here")
+        assert not counter.exact
+        assert counter.count("abc" * 100) > 0
+
+
+class TestContextSizer:
+    """Bucketed windows, runner reuse and truncation warnings."""
+
+    def test_smallest_fitting_bucket(self):
+        sizer = ContextSizer()
+        size = sizer.size(_prompt(1000), num_predict=1500)
+        assert size.num_ctx == 4096 and size.num_predict == 1500 and not size.warnings
+        assert ContextSizer().size(_prompt(1000)).num_ctx == 8192  # default response reserve
+
+    def test_caller_window_is_a_floor(self):
+        assert ContextSizer().size(_prompt(500), 500, min_ctx=16384).num_ctx == 16384
+        assert ContextSizer(max_ctx=8192).size(_prompt(500), 500, min_ctx=32768).num_ctx == 8192
+
+    def test_keeps_loaded_window_until_far_oversized(self):
+        sizer = ContextSizer()
+        assert sizer.size(_prompt(6000), 4000).num_ctx == 16384
+        assert sizer.size(_prompt(3000), 1500).num_ctx == 16384   # fits, 2x of 8192: keep
+        assert sizer.size(_prompt(500), 1000).num_ctx == 2048     # 8x oversized: shrink
+        assert sizer.size(_prompt(3000), 3000).num_ctx == 8192    # grows when needed
+
+    def test_cuts_num_predict_to_fit(self):
+        size = ContextSizer(max_ctx=8192).size(_prompt(6000), num_predict=4000)
+        assert size.num_ctx == 8192
+        assert size.num_predict == 8192 - size.prompt_tokens
+        assert "may be truncated" in size.warnings[0]
+
+    def test_warns_when_prompt_exceeds_window(self):
+        size = ContextSizer(max_ctx=4096).size(_prompt(5000), num_predict=500)
+        assert size.num_ctx == 4096 and "will truncate" in size.warnings[0]
+
+
+class TestContextSizingReloads:
+    """Runner reloads over a chapter-writing session: exact-fit windows vs bucketed, sticky ones."""
+
+    def test_bucketed_windows_reuse_the_runner(self):
+        rng = random.Random(48)
+        # Drafts, critiques and patch calls with prompts that grow as the book does
+        calls = []
+        for chapter in range(30):
+            base = 3000 + chapter * 60
+            calls += [(base + rng.randint(0, 400), 4000), (base + rng.randint(800, 1600), 1500),
+                      (base + rng.randint(0, 400), 1500)]
+
+        exact_fit = [-(-(tokens + predict) // 256) * 256 for tokens, predict in calls]
+        sizer = ContextSizer()
+        bucketed = [sizer.size(_prompt(tokens), predict).num_ctx for tokens, predict in calls]
+
+        reloads = lambda sizes: sum(1 for a, b in zip(sizes, sizes[1:]) if a != b)
+        print(f"\n{len(calls)} calls: runner reloads exact-fit {reloads(exact_fit)}, bucketed {reloads(bucketed)}; "
+              f"mean num_ctx {sum(bucketed) / len(bucketed):.0f}; calls Ollama's default 2048 window would "
+              f"truncate: {sum(1 for t, p in calls if t + p > 2048)}")
+        assert reloads(bucketed) <= 2 < reloads(exact_fit)
+        assert set(bucketed) <= set(CTX_BUCKETS) and max(bucketed) < 32768
+        assert all(n >= t + p for n, (t, p) in zip(bucketed, calls))
@@ -0,0 +1,137 @@
+"""
+Tests for musequill.services.backend.writers.critique_screening module.
+
+Test file: tests/services/backend/test_critique_screening.py
+Module under test: musequill/services/backend/writers/critique_screening.py
+
+Run from project root: pytest tests/services/backend/test_critique_screening.py -v -s
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.writers.critique_screening import (
+    FAST,
+    FULL,
+    LOCAL,
+    CritiqueTierStats,
+    ScreeningPolicy,
+    screen_chapter,
+)
+
+BANNED = ["we must be careful", "voice low and mysterious"]
+
+_rng = random.Random(44)
+WORDS = ["".join(_rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(_rng.randint(2, 8)))
+         for _ in range(5000)]
+
+
+def _chapter(rng, words, extra=""):
+    out, written = ["# Chapter", ""], 0
+    while written < words:
+        out.append("### Scene")
+        for _ in range(4):
+            n = rng.randint(8, 16)
+            out.append(" ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + ".")
+            out.append("")
+            written += n
+    return "\n".join(out) + extra
+
+
+class TestScreenChapter:
+    """Local metrics and red flags."""
+
+    def test_clean_chapter(self):
+        screen = screen_chapter(_chapter(random.Random(1), 1000), 1000, BANNED)
+        assert not screen.red_flags
+        assert screen.overall_score == 1.0
+        assert set(screen.axis_scores) == {"Length", "Repetition", "Banned phrases", "Structure"}
+
+    def test_red_flags_match_the_critic_checks(self):
+        line = "The same long line repeated in the chapter text."
+        text = _chapter(random.Random(2), 400, f"\n{line}\n{line}\nShe said we must be careful.")
+        screen = screen_chapter(text, 1000, BANNED)
+        assert screen.red_flags[0].startswith("Word count ") and "for target 1000" in screen.red_flags[0]
+        assert screen.red_flags[1].startswith("Detected repeated lines: 1 samples")
+        assert screen.red_flags[2] == "Banned n-grams present: ['we must be careful']"
+        assert screen.red_flags[3].startswith('Banned n-gram "we must be careful" at line ')
+        assert screen.axis_scores["Banned phrases"] == 0.0
+        assert screen.overall_score < 0.75
+
+    def test_no_target(self):
+        screen = screen_chapter(_chapter(random.Random(3), 300), None, [])
+        assert "Length" not in screen.axis_scores and not screen.red_flags
+
+
+class TestScreeningPolicy:
+    """Which tier settles a pass."""
+
+    def test_local_red_flags_go_straight_to_revision(self):
+        screen = screen_chapter(_chapter(random.Random(4), 200), 1000, BANNED)
+        assert ScreeningPolicy().settle_local(screen, allow_red_flags=False) is False
+        # When red flags do not force a rewrite, a model has to judge
+        assert ScreeningPolicy().settle_local(screen, allow_red_flags=True) is None
+
+    def test_local_accept_is_opt_in(self):
+        screen = screen_chapter(_chapter(random.Random(5), 1000), 1000, BANNED)
+        assert ScreeningPolicy().settle_local(screen, False) is None
+        assert ScreeningPolicy(local_accept_score=0.95).settle_local(screen, False) is True
+
+    def test_fast_band(self):
+        policy = ScreeningPolicy()
+        assert policy.settle_fast(0.9, accepted=True) is True
+        assert policy.settle_fast(0.9, accepted=False) is None
+        assert policy.settle_fast(0.7, accepted=True) is None
+        assert policy.settle_fast(0.4, accepted=False) is False
+
+
+class TestCritiqueTierStats:
+    """Counters and the avoided-call total."""
+
+    def test_record(self):
+        stats = CritiqueTierStats()
+        stats.record(LOCAL, False)
+        stats.record(FAST, True)
+        stats.fast_escalate += 1
+        stats.record(FULL, False)
+        assert stats.to_dict() == {
+            "local_accept": 0, "local_revise": 1, "fast_accept": 1, "fast_revise": 0,
+            "fast_escalate": 1, "full": 1, "passes": 3, "full_calls_avoided": 2,
+        }
+
+
+class TestTieredCritiqueSimulation:
+    """Route a batch of drafts through the tiers and count full-critic calls."""
+
+    def test_full_critic_calls_avoided(self):
+        rng = random.Random(6)
+        policy = ScreeningPolicy()
+        stats = CritiqueTierStats()
+        for i in range(60):
+            # A third of drafts miss length or use a banned phrase, as first drafts do
+            words = 1000 if i % 3 else rng.choice([500, 1600])
+            extra = "\nWe must be careful." if i % 10 == 1 else ""
+            screen = screen_chapter(_chapter(rng, words, extra), 1000, BANNED)
+            verdict = policy.settle_local(screen, allow_red_flags=False)
+            if verdict is not None:
+                stats.record(LOCAL, verdict)
+                continue
+            # Stand-in fast model: spread of overall scores
+            fast_score = rng.uniform(0.4, 1.0)
+            verdict = policy.settle_fast(fast_score, accepted=fast_score >= 0.8)
+            if verdict is not None:
+                stats.record(FAST, verdict)
+            else:
+                stats.fast_escalate += 1
+                stats.record(FULL, rng.random() < 0.5)
+
+        print(f"\n{stats.passes} critique passes: {stats.to_dict()}; "
+              f"full-critic calls {stats.full} instead of {stats.passes}")
+        assert stats.passes == 60
+        assert stats.local_revise >= 20
+        assert stats.full_calls_avoided > stats.passes / 2
@@ -0,0 +1,279 @@
+"""
+Tests for musequill.services.backend.llm.endpoint_pool module.
+
+Test file: tests/services/backend/test_endpoint_pool.py
+Module under test: musequill/services/backend/llm/endpoint_pool.py
+
+Run from project root: pytest tests/services/backend/test_endpoint_pool.py -v -s
+"""
+
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.llm.endpoint_pool import (
+    EndpointPool,
+    endpoint_urls,
+    is_retryable,
+    shared_pool,
+)
+from musequill.services.backend.planner import book_planner
+
+MODEL = "llama3.3:70b"
+
+
+class FakeOllamaNode:
+    """
+    One Ollama node on a local port: /api/ps lists loaded models, /api/generate
+    and /api/chat answer after ``latency`` seconds, plus ``load_time`` the first
+    time a model is used. At most ``capacity`` requests run at once; the rest
+    queue. ``fail_with`` makes every request answer with that HTTP status.
+    """
+
+    def __init__(self, latency=0.02, load_time=0.0, capacity=1, loaded=()):
+        self.latency = latency
+        self.load_time = load_time
+        self.loaded = set(loaded)
+        self.fail_with = None
+        self.requests = 0
+        self._slots = threading.Semaphore(capacity)
+        self._lock = threading.Lock()
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if node.fail_with:
+                    return self._reply(node.fail_with, {"error": "unavailable"})
+                self._reply(200, {"models": [{"name": m} for m in sorted(node.loaded)]})
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with node._lock:
+                    node.requests += 1
+                if node.fail_with:
+                    return self._reply(node.fail_with, {"error": "runner crashed"})
+                with node._slots:
+                    if payload["model"] not in node.loaded:
+                        time.sleep(node.load_time)
+                        node.loaded.add(payload["model"])
+                    time.sleep(node.latency)
+                text = json.dumps({"node": node.url})
+                if self.path == "/api/chat":
+                    return self._reply(200, {"message": {"role": "assistant", "content": text}, "done": True})
+                self._reply(200, {"response": text, "done": True})
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def nodes():
+    started = []
+
+    def start(count, **kwargs):
+        started.extend(FakeOllamaNode(**kwargs) for _ in range(count))
+        return started[-count:]
+
+    yield start
+    for node in started:
+        node.stop()
+
+
+def _generate(base_url, model=MODEL):
+    r = requests.post(f"{base_url}/api/generate", json={"model": model, "prompt": "hi"}, timeout=10)
+    r.raise_for_status()
+    return r.json()["response"]
+
+
+class TestEndpointUrls:
+    """Endpoint configuration from the environment."""
+
+    def test_list_wins_and_is_deduplicated(self, monkeypatch):
+        monkeypatch.setenv("OLLAMA_BASE_URLS", "http://a:11434/, http://b:11434,http://a:11434")
+        assert endpoint_urls("http://c:11434") == ("http://a:11434", "http://b:11434")
+
+    def test_falls_back_to_single_url(self, monkeypatch):
+        monkeypatch.delenv("OLLAMA_BASE_URLS", raising=False)
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://gpu:11434")
+        assert endpoint_urls("http://c:11434") == ("http://c:11434",)
+        assert endpoint_urls() == ("http://gpu:11434",)
+
+
+class TestRouting:
+    """Least-outstanding choice, model affinity and failure handling."""
+
+    def test_is_retryable(self):
+        response = requests.Response()
+        response.status_code = 503
+        assert is_retryable(requests.ConnectionError("refused"))
+        assert is_retryable(requests.ConnectTimeout("no answer to SYN"))
+        assert is_retryable(ConnectionRefusedError())
+        assert is_retryable(requests.HTTPError(response=response))
+        response.status_code = 404
+        assert not is_retryable(requests.HTTPError(response=response))
+        assert not is_retryable(ValueError("bad prompt"))
+
+    def test_read_timeouts_are_not_retried(self):
+        # The node took the request and is still generating; resending restarts the generation
+        assert not is_retryable(requests.ReadTimeout("read timed out"))
+        assert not is_retryable(TimeoutError())
+        pool = EndpointPool(["http://a", "http://b"])
+        calls = []
+
+        def slow(base_url):
+            calls.append(base_url)
+            raise requests.ReadTimeout("read timed out")
+
+        with pytest.raises(requests.ReadTimeout):
+            pool.call(MODEL, slow)
+        assert len(calls) == 1
+
+    def test_least_outstanding(self):
+        pool = EndpointPool(["http://a", "http://b", "http://c"])
+        with pool.lease(MODEL) as first, pool.lease(MODEL) as second, pool.lease(MODEL) as third:
+            assert len({first.url, second.url, third.url}) == 3
+        assert [e.outstanding for e in pool.endpoints] == [0, 0, 0]
+
+    def test_affinity_within_slack(self):
+        pool = EndpointPool(["http://a", "http://b"], affinity_slack=2)
+        pool.endpoints[1].models.add(MODEL)
+        pool.endpoints[1].outstanding = 2
+        assert pool.choose(MODEL).url == "http://b"        # warm, two more in flight: wait for it
+        pool.endpoints[1].outstanding = 3
+        assert pool.choose(MODEL).url == "http://a"        # too far behind: load it elsewhere
+        assert pool.choose("other-model").url == "http://a"
+
+    def test_circuit_opens_and_recovers(self):
+        pool = EndpointPool(["http://a", "http://b"], failure_threshold=2, cooldown=0.05)
+        a = pool.endpoints[0]
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                with pool.lease(MODEL, exclude=["http://b"]):
+                    raise requests.ConnectionError("refused")
+        assert pool.stats()[0]["open"]
+        assert all(pool.choose(MODEL).url == "http://b" for _ in range(3))
+        time.sleep(0.06)
+        with pool.lease(MODEL, exclude=["http://b"]) as endpoint:
+            assert endpoint is a
+        assert a.failures == 0 and MODEL in a.models
+
+    def test_request_errors_do_not_count_against_the_node(self):
+        pool = EndpointPool(["http://a"], failure_threshold=1)
+        with pytest.raises(ValueError):
+            with pool.lease(MODEL):
+                raise ValueError("unparseable response")
+        assert not pool.stats()[0]["open"]
+
+
+class TestAgainstFakeNodes:
+    """The pool routing real HTTP calls to local fake Ollama nodes."""
+
+    def test_retries_on_another_node(self, nodes):
+        down, up = nodes(2)
+        down.fail_with = 500
+        pool = EndpointPool([down.url, up.url], failure_threshold=1)
+        for _ in range(4):
+            assert json.loads(pool.call(MODEL, _generate))["node"] == up.url
+        assert down.requests == 1   # its circuit opened after the first failure
+
+    def test_dead_node_is_skipped(self, nodes):
+        alive, dead = nodes(2)
+        dead.stop()
+        pool = EndpointPool([dead.url, alive.url])
+        results = [pool.call(MODEL, _generate) for _ in range(3)]
+        assert all(json.loads(r)["node"] == alive.url for r in results)
+
+    def test_non_retryable_errors_propagate(self, nodes):
+        (node,) = nodes(1)
+        node.fail_with = 404
+        pool = EndpointPool([node.url])
+        with pytest.raises(requests.HTTPError):
+            pool.call(MODEL, _generate)
+
+    def test_probe_learns_loaded_models(self, nodes):
+        warm, cold = nodes(2, loaded=())
+        warm.loaded.add(MODEL)
+        pool = EndpointPool([cold.url, warm.url])
+        assert pool.probe_all() == {cold.url: True, warm.url: True}
+        assert pool.choose(MODEL).url == warm.url
+
+    def test_shared_pool_probes_several_nodes(self, nodes):
+        warm, cold = nodes(2)
+        warm.loaded.add(MODEL)
+        pool = shared_pool((cold.url, warm.url))
+        assert pool._health_thread is not None and pool._health_thread.daemon
+        deadline = time.monotonic() + 5
+        while MODEL not in pool.endpoints[1].models and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.choose(MODEL).url == warm.url
+        assert shared_pool((warm.url,))._health_thread is None
+
+    def test_planner_posts_through_the_pool(self, nodes, monkeypatch):
+        first, second = nodes(2)
+        pool = EndpointPool([first.url, second.url])
+        monkeypatch.setattr(book_planner, "OLLAMA_POOL", pool)
+        first.fail_with = 503
+        payload = {"model": MODEL, "messages": [], "stream": False}
+        assert json.loads(book_planner._post("/api/chat", payload, 10))["node"] == second.url
+        assert json.loads(book_planner._post("/api/generate", {"model": MODEL}, 10))["node"] == second.url
+        assert sum(e["served"] for e in pool.stats()) == 2
+
+
+class TestPoolBenchmark:
+    """Throughput of a burst of chapter calls: one node against a pool of three."""
+
+    def test_pool_spreads_load(self, nodes):
+        single = nodes(1, latency=0.05, load_time=0.1)
+        pooled = nodes(3, latency=0.05, load_time=0.1)
+
+        def run(pool, requests_count=24, workers=6):
+            latencies = []
+
+            def one(_):
+                start = time.perf_counter()
+                pool.call(MODEL, _generate)
+                latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(workers) as executor:
+                list(executor.map(one, range(requests_count)))
+            latencies.sort()
+            return time.perf_counter() - start, latencies[int(len(latencies) * 0.95) - 1]
+
+        single_wall, single_p95 = run(EndpointPool([n.url for n in single]))
+        pooled_wall, pooled_p95 = run(EndpointPool([n.url for n in pooled]))
+        print(f"\n24 requests, 6 concurrent: 1 node {single_wall:.2f}s (p95 {single_p95:.2f}s), "
+              f"3 nodes {pooled_wall:.2f}s (p95 {pooled_p95:.2f}s), "
+              f"{single_wall / pooled_wall:.1f}x throughput; per-node {[n.requests for n in pooled]}")
+        assert pooled_wall * 1.8 < single_wall
+        assert min(n.requests for n in pooled) >= 4
+        # Each node loads the model once; affinity keeps it from being loaded again elsewhere
+        assert all(MODEL in n.loaded for n in pooled)
@@ -0,0 +1,149 @@
+"""
+Tests for musequill.services.backend.lazy_exports module.
+
+Test file: tests/services/backend/test_lazy_exports.py
+Module under test: musequill/services/backend/lazy_exports.py
+
+Run from project root: pytest tests/services/backend/test_lazy_exports.py -v -s
+"""
+
+import re
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+BACKEND = project_root / "musequill" / "services" / "backend"
+
+LAZY_PACKAGES = [
+    "musequill.services.backend.prompts",
+    "musequill.services.backend.writers",
+    "musequill.services.backend.researcher",
+    "musequill.services.backend.context",
+    "musequill.services.backend.integration",
+    "musequill.services.backend.validators",
+    "musequill.services.backend.llm",
+    "musequill.services.backend.store.vector",
+    "musequill.services.backend.store.inmem",
+    "musequill.services.backend.utils",
+]
+
+
+def _package_dir(package: str) -> Path:
+    return project_root.joinpath(*package.split("."))
+
+
+def _exports(package: str) -> Dict[str, str]:
+    """Read the _EXPORTS table without importing the package."""
+    source = (_package_dir(package) / "__init__.py").read_text()
+    return dict(re.findall(r'"(\w+)":\s+"\.(\w+)"', source))
+
+
+def _importtime(code: str) -> Dict[str, int]:
+    """Run code under -X importtime and return cumulative microseconds per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=project_root, capture_output=True, text=True, check=True
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)", line)
+        if match:
+            timings[match.group(2)] = int(match.group(1))
+    return timings
+
+
+@pytest.fixture
+def lazy_package(tmp_path, monkeypatch):
+    """A throwaway package using lazy_exports."""
+    package = tmp_path / "lazypkg"
+    package.mkdir()
+    (package / "__init__.py").write_text(textwrap.dedent("""
+        from musequill.services.backend.lazy_exports import lazy_exports
+
+        _EXPORTS = {
+            "Heavy": ".heavy",
+        }
+
+        __all__ = list(_EXPORTS)
+
+        __getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+    """))
+    (package / "heavy.py").write_text("class Heavy:\n    pass\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazypkg"
+    for name in [name for name in sys.modules if name.startswith("lazypkg")]:
+        del sys.modules[name]
+
+
+class TestLazyExports:
+    """Test the __getattr__/__dir__ pair on a small package."""
+
+    def test_submodule_loads_on_first_access(self, lazy_package):
+        import importlib
+        package = importlib.import_module(lazy_package)
+        assert f"{lazy_package}.heavy" not in sys.modules
+
+        heavy_cls = package.Heavy
+        assert f"{lazy_package}.heavy" in sys.modules
+        assert heavy_cls.__name__ == "Heavy"
+        # Cached on the package after the first lookup
+        assert vars(package)["Heavy"] is heavy_cls
+
+    def test_from_import(self, lazy_package):
+        namespace = {}
+        exec(f"from {lazy_package} import Heavy", namespace)
+        assert namespace["Heavy"].__name__ == "Heavy"
+
+    def test_unknown_attribute(self, lazy_package):
+        import importlib
+        package = importlib.import_module(lazy_package)
+        with pytest.raises(AttributeError):
+            package.Missing
+
+    def test_dir_lists_exports(self, lazy_package):
+        import importlib
+        package = importlib.import_module(lazy_package)
+        assert "Heavy" in dir(package)
+
+
+class TestBackendPackages:
+    """Check the backend package export tables."""
+
+    @pytest.mark.parametrize("package", LAZY_PACKAGES)
+    def test_exports_are_defined_in_their_modules(self, package):
+        exports = _exports(package)
+        assert exports
+        for name, module in exports.items():
+            source = (_package_dir(package) / f"{module}.py").read_text()
+            pattern = rf"^(class|def|async def)\s+{name}\b|^{name}\s*[:=]|^\s*{name},?\s*$|import.*\b{name}\b"
+            assert re.search(pattern, source, re.M), f"{package}.{name} not found in {module}.py"
+
+    @pytest.mark.parametrize("package", LAZY_PACKAGES)
+    def test_import_does_not_load_submodules(self, package):
+        timings = _importtime(f"import {package}")
+        loaded = [name for name in timings if name.startswith(package + ".")]
+        assert not loaded, f"importing {package} eagerly loaded {loaded}"
+
+
+class TestColdStartPerformance:
+    """Benchmark package cold-start with python -X importtime."""
+
+    def test_package_import_time(self):
+        code = "; ".join(f"import {package}" for package in LAZY_PACKAGES)
+        timings = _importtime(code)
+
+        report = [f"{package}: {timings.get(package, 0) / 1000:.1f}ms" for package in LAZY_PACKAGES]
+        total = sum(timings.get(package, 0) for package in LAZY_PACKAGES)
+        print("\n" + "\n".join(report))
+        print(f"TOTAL: {total / 1000:.1f}ms")
+
+        # Without lazy exports these imports pull in LangChain, Tavily and ChromaDB
+        assert total < 500_000
@@ -0,0 +1,88 @@
+"""
+Tests for musequill.services.backend.llm.ollama_client module.
+
+Test file: tests/services/backend/test_ollama_client.py
+Module under test: musequill/services/backend/llm/ollama_client.py
+
+Run from project root: pytest tests/services/backend/test_ollama_client.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("langchain_ollama")
+pytest.importorskip("pydantic_settings")
+
+from musequill.services.backend.llm.ollama_client import LLMService
+from musequill.services.backend.llm.ollama_config import OllamaConfig
+
+PROMPT = "Summarise chapter 3 in one line."
+
+
+class FakeOllamaLLM:
+    """Records what reaches the model; answers like OllamaLLM.generate / astream."""
+
+    base_url = "http://fake:11434"
+    num_ctx = 4096
+    num_predict = 512
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, prompts):
+        self.prompts.extend(prompts)
+        info = {"prompt_eval_count": 12, "eval_count": 5, "done_reason": "stop"}
+        return SimpleNamespace(generations=[[SimpleNamespace(text="Done.", generation_info=info)]])
+
+    async def astream(self, prompt):
+        self.prompts.append(prompt)
+        for chunk in ('{"ok": ', "true}", " trailing"):
+            yield chunk
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("OLLAMA_SCHEDULER_SLOTS", "0")
+    service = LLMService(OllamaConfig())
+    fake = FakeOllamaLLM()
+    service.llm = fake
+    monkeypatch.setattr(service, "_llm_for", lambda **overrides: fake)
+    service.sized = []
+    original = service.sizer.size
+
+    def size(prompt, *args, **kwargs):
+        service.sized.append(prompt)
+        return original(prompt, *args, **kwargs)
+
+    monkeypatch.setattr(service.sizer, "size", size)
+    return service
+
+
+class TestPromptCoercion:
+    """Callers pass ``[prompt]``; the model and the sizer must see one string."""
+
+    @pytest.mark.parametrize("prompt", [PROMPT, [PROMPT]])
+    def test_generate(self, service, prompt):
+        result = asyncio.run(service.generate(prompt))
+        assert "error" not in result and result["response"] == "Done."
+        assert service.llm.prompts == [PROMPT]
+        assert service.sized == [PROMPT]
+
+    @pytest.mark.parametrize("prompt", [PROMPT, [PROMPT]])
+    def test_generate_json(self, service, prompt):
+        result = asyncio.run(service.generate_json(prompt))
+        assert result["json"] == {"ok": True} and result["stopped_early"]
+        assert service.llm.prompts == [PROMPT]
+        assert service.sized == [PROMPT]
+
+    def test_list_items_are_joined(self, service):
+        asyncio.run(service.generate(["Part one.", "Part two."]))
+        assert service.llm.prompts == ["Part one.\nPart two."]
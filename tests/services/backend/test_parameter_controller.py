@@ -0,0 +1,168 @@
+"""
+Tests for the performance store and ParameterController in
+musequill.services.backend.writers.dynamic_parameter_system.
+
+Test file: tests/services/backend/test_parameter_controller.py
+Module under test: musequill/services/backend/writers/dynamic_parameter_system.py
+
+Run from project root: pytest tests/services/backend/test_parameter_controller.py -v -s
+"""
+
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.writers.chapter_patch import REWRITE_MAX_TOKENS
+from musequill.services.backend.writers.dynamic_parameter_system import (
+    ChapterRun,
+    ParameterController,
+    PerformanceStore,
+    replay_benchmark,
+)
+
+TARGET_WORDS = 1500
+PROMPT_TOKENS = 3000
+
+
+def _run(temperature=0.8, num_ctx=8192, num_predict=2593, attempts=1, accepted=True, wall_time=60.0,
+         complexity="medium", chapter=1):
+    return ChapterRun(
+        book_id="book", chapter=chapter, complexity=complexity, target_words=TARGET_WORDS,
+        temperature=temperature, num_ctx=num_ctx, num_predict=num_predict, max_retries=3,
+        attempts=attempts, final_score=0.9 if accepted else 0.7, accepted=accepted,
+        prompt_tokens=PROMPT_TOKENS, tokens=PROMPT_TOKENS + num_predict, wall_time=wall_time,
+    )
+
+
+def _brief(scenes=2):
+    scene = SimpleNamespace(characters_on_stage=["Mira", "Tobias"])
+    return SimpleNamespace(meta=SimpleNamespace(target_words=TARGET_WORDS), scenes=[scene] * scenes,
+                           narrative_beats=["a", "b", "c"], chapter_specific_beats=[])
+
+
+class TestPerformanceStore:
+    """Persisted runs across books."""
+
+    def test_round_trip_skips_torn_lines(self, tmp_path):
+        path = str(tmp_path / "perf" / "performance_history.jsonl")
+        store = PerformanceStore(path)
+        store.record(_run(chapter=1))
+        store.record(_run(chapter=2, accepted=False, attempts=3))
+        with open(path, "a") as f:
+            f.write('{"book_id": "torn"')
+        loaded = PerformanceStore(path)
+        assert [r.chapter for r in loaded.runs] == [1, 2]
+        assert loaded.runs[1].attempts == 3 and not loaded.runs[1].accepted
+
+    def test_in_memory(self, tmp_path):
+        store = PerformanceStore(None)
+        store.record(_run())
+        assert len(store) == 1
+
+
+class TestParameterController:
+    """Plans from history, and the heuristic default without it."""
+
+    def test_no_history_keeps_writer_defaults(self):
+        plan = ParameterController(PerformanceStore(None)).plan(_brief(), PROMPT_TOKENS)
+        assert (plan.temperature, plan.revision_temperature, plan.max_retries) == (0.8, 0.7, 3)
+        assert plan.num_ctx >= PROMPT_TOKENS + plan.num_predict
+        assert plan.generation_params()["max_tokens"] == plan.num_predict
+
+    def test_no_history_does_not_truncate_long_chapters(self):
+        controller = ParameterController(PerformanceStore(None))
+        for target_words in (1500, 3000, 3750):
+            plan = controller.plan(_brief(), PROMPT_TOKENS, target_words=target_words)
+            # The largest ratio, up to the rewrite budget (less the ratio's rounding)
+            longest = min(REWRITE_MAX_TOKENS, int(2.0 * target_words * 1.33))
+            assert longest * 0.99 <= plan.num_predict <= longest
+
+    def test_candidates_fit_the_prompt(self):
+        controller = ParameterController(PerformanceStore(None))
+        for _, num_ctx, ratio in controller.candidates(14000, TARGET_WORDS):
+            assert num_ctx >= 14000 + ratio * TARGET_WORDS * 1.33 * 0.9
+        # Long chapters hit the num_predict cap, so the ratios collapse to one
+        assert len({ratio for _, _, ratio in controller.candidates(1000, 7000)}) == 1
+
+    def test_prefers_faster_time_to_acceptance(self):
+        store = PerformanceStore(None)
+        for i in range(10):
+            # 0.8: fast attempts but rarely accepted; 0.7: slower attempts, usually accepted
+            store.record(_run(temperature=0.8, attempts=3, accepted=i % 5 == 0, wall_time=150))
+            store.record(_run(temperature=0.7, attempts=1, accepted=True, wall_time=70))
+        controller = ParameterController(store, exploration=0)
+        plan = controller.plan(_brief(), PROMPT_TOKENS)
+        assert (plan.temperature, plan.num_ctx, plan.num_predict) == (0.7, 8192, 2593)
+        assert plan.samples == 10 and plan.max_retries <= 2
+        assert plan.accept_rate > 0.8
+
+    def test_untried_settings_scale_latency_with_num_predict(self):
+        store = PerformanceStore(None)
+        for _ in range(5):
+            store.record(_run(num_predict=2593, wall_time=100))
+        controller = ParameterController(store)
+        runs = store.runs
+        _, short, _ = controller.estimate((0.9, 8192, 1.3), runs, 2593)
+        _, long, _ = controller.estimate((0.9, 8192, 2.0), runs, 3990)
+        assert abs(long / short - 3990 / 2593) < 1e-6
+
+    def test_retry_budget(self):
+        controller = ParameterController(PerformanceStore(None), max_retry_budget=5, target_success=0.9)
+        assert controller.retry_budget(0.95) == 1
+        assert controller.retry_budget(0.5) == 4
+        assert controller.retry_budget(0.05) == 5
+
+
+# ----------------------------
+# Offline replay: simulated books, recorded, then replayed
+# ----------------------------
+
+TRUE_ACCEPT = {0.7: 0.55, 0.8: 0.35, 0.9: 0.25}
+
+
+def _simulate(controller, rng, chapters):
+    """Write chapters in a toy world where low num_predict truncates and each token costs time."""
+    for chapter in range(chapters):
+        complexity = rng.choice(["low", "medium", "high"])
+        plan = controller.plan(None, PROMPT_TOKENS, target_words=TARGET_WORDS, complexity=complexity)
+        ratio = plan.num_predict / (TARGET_WORDS * 1.33)
+        p = TRUE_ACCEPT[plan.temperature] * (0.5 if ratio < 1.5 else 1.0) + (0.05 if plan.num_ctx > 8192 else 0)
+        seconds = plan.num_predict * 0.03 + plan.num_ctx / 1000 * 2
+        attempts, accepted = 0, False
+        while attempts < plan.max_retries and not accepted:
+            attempts += 1
+            accepted = rng.random() < p
+        controller.store.record(ChapterRun(
+            book_id=f"book{chapter // 25}", chapter=chapter % 25 + 1, complexity=complexity,
+            target_words=TARGET_WORDS, temperature=plan.temperature, num_ctx=plan.num_ctx,
+            num_predict=plan.num_predict, max_retries=plan.max_retries, attempts=attempts,
+            final_score=0.9 if accepted else 0.7, accepted=accepted, prompt_tokens=PROMPT_TOKENS,
+            tokens=attempts * (PROMPT_TOKENS + plan.num_predict),
+            wall_time=attempts * seconds * rng.uniform(0.9, 1.1), recorded_at=chapter,
+        ))
+
+
+class TestReplayBenchmark:
+    """The learned controller against the fixed defaults, over recorded runs."""
+
+    def test_controller_beats_fixed_defaults(self, tmp_path):
+        store = PerformanceStore(str(tmp_path / "performance_history.jsonl"))
+        _simulate(ParameterController(store, exploration=0.5, seed=1), random.Random(2), 300)
+
+        default = ParameterController(PerformanceStore(None)).plan(None, PROMPT_TOKENS, TARGET_WORDS, "medium")
+        baseline = (default.temperature, default.num_ctx, round(default.num_predict / (TARGET_WORDS * 1.33), 1))
+        report = replay_benchmark(
+            PerformanceStore(store.path).runs,
+            lambda history: ParameterController(history, exploration=0),
+            baseline=baseline,
+        )
+        print(f"\nReplay of {report['chapters']} recorded chapters ({report['evaluated']} scored): "
+              f"fixed defaults {report['baseline_seconds'] / 3600:.1f}h, controller "
+              f"{report['controller_seconds'] / 3600:.1f}h to acceptable chapters ({report['speedup']:.1f}x)")
+        assert report["evaluated"] > 250
+        assert report["speedup"] > 1.5
@@ -0,0 +1,184 @@
+"""
+Tests for musequill.services.backend.utils.payloads module.
+
+Test file: tests/services/backend/test_payloads.py
+Module under test: musequill/services/backend/utils/payloads.py
+
+Run from project root: pytest tests/services/backend/test_payloads.py -v -s
+"""
+
+import json
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.utils.payloads import (
+    JsonStreamScanner,
+    extract_json_array_from_response,
+    extract_json_from_response,
+    scan_json,
+)
+
+
+def _feed_tokens(scanner: JsonStreamScanner, text: str, size: int = 4) -> list:
+    captured = []
+    for i in range(0, len(text), size):
+        captured.extend(scanner.feed(text[i:i + size]))
+        if scanner.complete:
+            break
+    return captured
+
+
+class TestJsonStreamScanner:
+    """Test the incremental scanner."""
+
+    @pytest.mark.parametrize("text, expected", [
+        ('{"key": "value", "number": 42}', {"key": "value", "number": 42}),
+        ('```json\n{"status": "success", "data": [1, 2, 3]}\n```', {"status": "success", "data": [1, 2, 3]}),
+        ('Here is the result: {"message": "Hello World"} and that\'s it.', {"message": "Hello World"}),
+        ('{"text": "a } inside", "b": "{"}', {"text": "a } inside", "b": "{"}),
+        ('{"quote": "she said \\"}\\" loudly"}', {"quote": 'she said "}" loudly'}),
+        ('{"path": "C:\\\\"}', {"path": "C:\\"}),
+    ])
+    def test_extracts_first_object(self, text, expected):
+        assert scan_json(text) == expected
+
+    def test_skips_invalid_candidates(self):
+        text = 'Fill in {placeholder} and [x} first. {"real": true} {"second": 1}'
+        assert scan_json(text) == {"real": True}
+
+    def test_streamed_tokens_match_one_shot(self):
+        text = 'Sure! ```json\n{"a": "}\\"{", "b": [{"c": 1}, {"d": "]"}]}\n``` done'
+        for size in (1, 2, 3, 7, len(text)):
+            scanner = JsonStreamScanner()
+            _feed_tokens(scanner, text, size)
+            assert scanner.complete
+            assert scanner.value == scan_json(text)
+            assert scanner.text == '{"a": "}\\"{", "b": [{"c": 1}, {"d": "]"}]}'
+
+    def test_stops_when_value_closes(self):
+        scanner = JsonStreamScanner()
+        scanner.feed('{"a": 1}')
+        assert scanner.complete
+        assert scanner.feed(' {"b": 2}') == []
+        assert scanner.value == {"a": 1}
+
+    def test_incomplete_stream(self):
+        scanner = JsonStreamScanner()
+        scanner.feed('{"a": [1, 2')
+        assert not scanner.complete
+        with pytest.raises(json.JSONDecodeError):
+            scan_json('{"a": [1, 2')
+
+    def test_capture_depth_emits_nested_values(self):
+        text = '{"recommendations": [{"option_id": "a", "r": "}"}, {"option_id": "b"}], "general": "x"}'
+        scanner = JsonStreamScanner(capture_depth=3)
+        captured = _feed_tokens(scanner, text, 5)
+        assert [json.loads(item) for item in captured] == [
+            {"option_id": "a", "r": "}"}, {"option_id": "b"}
+        ]
+        assert scanner.value["general"] == "x"
+
+    def test_restarts_after_unbalanced_opener(self):
+        text = 'Note {oops, the plan: {"a": [1, {"b": 2}]} thanks'
+        assert scan_json(text) == {"a": [1, {"b": 2}]}
+        assert extract_json_array_from_response('[unclosed then [1, 2]') == [1, 2]
+        for size in (1, 3, len(text)):
+            scanner = JsonStreamScanner()
+            _feed_tokens(scanner, text, size)
+            assert not scanner.complete          # the stray "{" is still open
+            scanner.finish()
+            assert scanner.value == {"a": [1, {"b": 2}]}
+
+    def test_finish_recaptures_nested_values(self):
+        scanner = JsonStreamScanner(capture_depth=2)
+        _feed_tokens(scanner, '{ stray {"r": [{"id": 1}], "s": {"id": 2}}', 3)
+        assert [json.loads(item) for item in scanner.finish()] == [[{"id": 1}], {"id": 2}]
+        assert scanner.complete
+
+    def test_array_opening(self):
+        assert scan_json('items: [1, [2, "]"], 3] then ]', '[') == [1, [2, "]"], 3]
+        assert scan_json('note [x] {"a": [1]}', '{[') == {"a": [1]}
+
+
+class TestExtractHelpers:
+    """Test the response extraction helpers built on the scanner."""
+
+    def test_extract_json_from_response(self):
+        assert extract_json_from_response('```json\n{"key": "value"}\n```') == {"key": "value"}
+        assert extract_json_from_response('') is None
+        assert extract_json_from_response('No JSON here') is None
+        assert extract_json_from_response(None) is None
+
+    def test_extract_json_array_from_response(self):
+        assert extract_json_array_from_response('[{"a": 1}, {"b": 2}] and more ]') == [{"a": 1}, {"b": 2}]
+        assert extract_json_array_from_response('no array') is None
+
+
+def _count_joined(monkeypatch) -> list:
+    """Patch JsonStreamScanner._slice to add up the buffered characters each slice joins."""
+    joined = [0]
+    original = JsonStreamScanner._slice
+
+    def counting_slice(self, start, end):
+        first = bisect_right(self._chunk_starts, start) - 1
+        last = bisect_left(self._chunk_starts, end, first) - 1
+        joined[0] += sum(len(chunk) for chunk in self._chunks[first:last + 1])
+        return original(self, start, end)
+
+    monkeypatch.setattr(JsonStreamScanner, "_slice", counting_slice)
+    return joined
+
+
+class TestScannerPerformance:
+    """Benchmark the scanner on a large planner-sized response."""
+
+    def test_large_streamed_response(self, monkeypatch):
+        payload = {
+            "chapters": [
+                {"number": i, "title": f"Chapter {i}", "summary": "A {brace} and \"quote\" " * 20,
+                 "beats": [f"beat {j}" for j in range(10)]}
+                for i in range(200)
+            ]
+        }
+        text = "Here is the plan:\n```json\n" + json.dumps(payload) + "\n```\nLet me know!"
+        joined = _count_joined(monkeypatch)
+
+        start = time.perf_counter()
+        scanner = JsonStreamScanner()
+        _feed_tokens(scanner, text, 16)
+        streamed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        one_shot = extract_json_from_response(text)
+        single = time.perf_counter() - start
+
+        print(f"\n{len(text) / 1024:.0f}KB: streamed {streamed * 1000:.1f}ms, one-shot {single * 1000:.1f}ms")
+        assert scanner.value == payload
+        assert one_shot == payload
+        # The value is sliced out of the buffered chunks once per parse
+        assert joined[0] <= 2 * (len(text) + 16)
+
+    def test_captures_stay_linear_in_stream_length(self, monkeypatch):
+        joined = _count_joined(monkeypatch)
+
+        def stream(items):
+            text = json.dumps({"recommendations": [{"option_id": str(i), "reasoning": "x" * 200}
+                                                   for i in range(items)]})
+            scanner = JsonStreamScanner(capture_depth=3)
+            joined[0] = 0
+            captured = _feed_tokens(scanner, text, 8)
+            assert len(captured) == items and scanner.complete
+            return joined[0], len(text)
+
+        (small, small_len), (large, large_len) = stream(250), stream(4000)
+        print(f"\n250 items: {small} characters joined, 4000 items: {large}")
+        # Each capture joins only the chunks it spans; re-joining the whole buffer grew quadratically
+        assert small <= 3 * small_len and large <= 3 * large_len
@@ -0,0 +1,155 @@
+"""
+Tests for musequill.services.backend.validators.plan_repair module.
+
+Test file: tests/services/backend/test_plan_repair.py
+Module under test: musequill/services/backend/validators/plan_repair.py
+
+Run from project root: pytest tests/services/backend/test_plan_repair.py -v -s
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("pydantic")
+
+from musequill.services.backend.validators import (
+    PlanBaselines,
+    ValidationIssue,
+    validate_plan_against_baselines,
+)
+from musequill.services.backend.validators.plan_repair import PlanFragmentRepairer, fragment_path
+
+LONG = "A specific, concrete description that is comfortably above the minimum length."
+
+
+def _plan() -> Dict[str, Any]:
+    return {
+        "project": {"title": "The Ledger", "author": "J. Doe", "genre": "Literary"},
+        "logline": "An accountant confronts an old debt.",
+        "themes": ["obligation", "self-honesty"],
+        "world_bible": {"setting": "Manhattan, New York"},
+        "characters": {
+            "Noah Bennett": {"description": "Accountant", "goals": ["Repay the debt"]},
+            "Ava Kline": {"description": "Therapist", "goals": ["Help Noah"]},
+        },
+        "hero_journey_beats": [{"beat": f"Beat {i}", "description": "d"} for i in range(6)],
+        "chapter_outline": [
+            {"chapter": i, "title": f"Chapter title {i}", "description": LONG} for i in range(1, 13)
+        ],
+    }
+
+
+def _baselines() -> PlanBaselines:
+    return PlanBaselines(
+        title="The Ledger", author="J. Doe", allowed_genres={"Literary"},
+        forbidden_terms={"dragon"}, min_characters=2, min_chapters=12, min_beats=6,
+    )
+
+
+class FragmentLLM:
+    """Answers fragment prompts with a fixed value per fragment label."""
+
+    def __init__(self, answers: Dict[str, Any]):
+        self.answers = answers
+        self.prompts: List[str] = []
+
+    def __call__(self, prompt: str, fragment) -> str:
+        self.prompts.append(prompt)
+        return "Sure:\n" + json.dumps({"fragment": self.answers[fragment.label]})
+
+
+class TestFragmentPaths:
+    """Test issue path -> fragment mapping."""
+
+    def test_fragment_path_granularity(self):
+        plan = _plan()
+        assert fragment_path(plan, ("chapter_outline", 3, "title")) == ("chapter_outline", 3)
+        assert fragment_path(plan, ("characters", "Ava Kline", "goals", 0)) == ("characters", "Ava Kline")
+        assert fragment_path(plan, ("project", "genre")) == ("project",)
+        assert fragment_path(plan, ("logline",)) == ("logline",)
+        assert fragment_path(plan, ()) is None
+
+    def test_validator_issues_carry_paths(self):
+        plan = _plan()
+        plan["chapter_outline"][4]["description"] = "short"
+        plan["chapter_outline"][7]["title"] = ""
+        result = validate_plan_against_baselines(plan, _baselines())
+        paths = {p for issue in result.issues for p in issue.paths}
+        assert ("chapter_outline", 7, "title") in paths
+
+        plan["chapter_outline"][7]["title"] = "Fine"
+        result = validate_plan_against_baselines(plan, _baselines())
+        short = next(i for i in result.issues if i.code == "style.chapter.desc.short")
+        assert short.paths == [("chapter_outline", 4)]
+
+    def test_nested_fragments_merge_into_parent(self):
+        repairer = PlanFragmentRepairer(baselines=_baselines())
+        plan = _plan()
+        issues = [
+            ValidationIssue("error", "schema.invalid", "goals too short", [("characters", "Ava Kline", "goals")]),
+            ValidationIssue("error", "structure.characters.min", "need 3", [("characters",)]),
+        ]
+        fragments, unresolved = repairer.fragments(plan, issues)
+        assert not unresolved
+        assert [f.path for f in fragments] == [("characters",)]
+        assert fragments[0].problems == ["need 3", "goals too short"]
+
+
+class TestFragmentRepair:
+    """Test regenerating and splicing fragments."""
+
+    def test_repairs_only_failing_chapters(self):
+        baselines = _baselines()
+        plan = _plan()
+        plan["chapter_outline"][2]["description"] = "Too short."
+        plan["chapter_outline"][9]["description"] = "Dragon attack."
+        plan["project"]["title"] = "Wrong Title"
+        result = validate_plan_against_baselines(plan, baselines)
+        assert not result.is_valid
+
+        llm = FragmentLLM({
+            "chapter_outline[2]": {"chapter": 99, "title": "The audit", "description": LONG},
+            "chapter_outline[9]": {"chapter": 10, "title": "The reckoning", "description": LONG},
+        })
+        outcome = asyncio.run(PlanFragmentRepairer(baselines=baselines).repair(plan, result.issues, llm))
+
+        assert outcome.applicable
+        assert outcome.fixed == [("project", "title")]
+        assert sorted(outcome.repaired) == [("chapter_outline", 2), ("chapter_outline", 9)]
+        assert outcome.plan["chapter_outline"][2]["chapter"] == 3  # pinned
+        assert plan["project"]["title"] == "Wrong Title"  # input untouched
+        assert validate_plan_against_baselines(outcome.plan, baselines).is_valid
+
+        full_plan_chars = len(json.dumps(plan))
+        print(f"\nfragment prompts: {[len(p) for p in llm.prompts]} chars vs full plan {full_plan_chars}")
+        assert outcome.approx_tokens < 600
+
+    def test_whole_plan_errors_are_not_applicable(self):
+        plan = _plan()
+        plan["chapter_outline"][1]["chapter"] = 1  # duplicate numbers: model-level error, no loc
+        result = validate_plan_against_baselines(plan, _baselines())
+        outcome = PlanFragmentRepairer(baselines=_baselines()).repair_sync(
+            plan, result.issues, lambda prompt, fragment: pytest.fail("no LLM call expected"))
+        assert not outcome.applicable
+        assert outcome.unresolved
+
+    def test_unusable_answer_is_reported(self):
+        plan = _plan()
+        plan["logline"] = "x" * 400
+        baselines = _baselines()
+        baselines.max_logline_chars = 280
+        result = validate_plan_against_baselines(plan, baselines)
+        outcome = PlanFragmentRepairer(baselines=baselines).repair_sync(
+            plan, result.issues, lambda prompt, fragment: "I cannot help with that.")
+        assert outcome.failed == [("logline",)]
+        assert not outcome.changed
+        assert outcome.plan["logline"] == plan["logline"]
@@ -0,0 +1,120 @@
+"""
+Tests for musequill.services.backend.process_results module.
+
+Test file: tests/services/backend/test_process_results.py
+Module under test: musequill/services/backend/process_results.py
+
+Run from project root: pytest tests/services/backend/test_process_results.py -v -s
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend import process_results
+from musequill.services.backend.process_results import (
+    NearDuplicateIndex,
+    extract_research_results_by_category,
+    is_similar_content,
+)
+
+_rng = random.Random(5)
+WORDS = ["".join(_rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(_rng.randint(2, 9)))
+         for _ in range(3000)]
+
+
+def _pairwise_reference(research_results):
+    """The original quadratic filter: compare each answer with every kept one."""
+    out = {}
+    for category, items in research_results["detailed_results"].items():
+        kept = []
+        for item in items:
+            for result in item["search_results"]:
+                answer = result["tavily_answer"]
+                if not any(is_similar_content(answer, existing) for existing in kept):
+                    kept.append(answer)
+        out[category] = kept
+    return out
+
+
+def _research_dump(total: int, categories: int = 10, seed: int = 11):
+    rng = random.Random(seed)
+    bases = [" ".join(rng.choice(WORDS) for _ in range(30)) for _ in range(total // 5)]
+    detailed = {f"category_{c}": [] for c in range(categories)}
+    for i in range(total):
+        text = list(rng.choice(bases))
+        # Light edits produce near-duplicates of the base answer
+        for _ in range(rng.randint(0, 6)):
+            pos = rng.randrange(len(text))
+            text[pos] = rng.choice("abcdefghij ")
+        answer = "".join(text)
+        detailed[f"category_{i % categories}"].append({"search_results": [{"tavily_answer": answer}]})
+    return {"detailed_results": detailed}
+
+
+class TestNearDuplicateIndex:
+    """Test the LSH filter against the pairwise definition."""
+
+    def test_keeps_first_of_similar_texts(self):
+        index = NearDuplicateIndex()
+        assert index.add("The quick brown fox jumps over the lazy dog near the river bank.")
+        assert not index.add("The quick brown fox jumped over the lazy dog near the river bank!")
+        assert index.add("Completely unrelated answer about interest rates and bond markets.")
+
+    def test_scopes_are_independent(self):
+        index = NearDuplicateIndex()
+        assert index.add("Same answer text", scope="medical")
+        assert index.add("Same answer text", scope="finance")
+        assert not index.add("same answer text  ", scope="finance")
+
+    def test_invalid_input(self):
+        assert extract_research_results_by_category(None) == {}
+        assert extract_research_results_by_category({"detailed_results": []}) == {}
+
+    def test_matches_pairwise_filter(self):
+        dump = _research_dump(300)
+        assert extract_research_results_by_category(dump) == _pairwise_reference(dump)
+
+
+class TestProcessResultsPerformance:
+    """Benchmark on a 5k-answer research dump."""
+
+    def test_5k_answer_dump(self, monkeypatch):
+        comparisons = [0]
+
+        class CountingMatcher(process_results.SequenceMatcher):
+            def __init__(self, *args, **kwargs):
+                comparisons[0] += 1
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(process_results, "SequenceMatcher", CountingMatcher)
+
+        # The pairwise filter is timed on 1k answers; at 5k it would take minutes
+        small = _research_dump(1000)
+        start = time.perf_counter()
+        expected = _pairwise_reference(small)
+        pairwise = time.perf_counter() - start
+        pairwise_comparisons, comparisons[0] = comparisons[0], 0
+        start = time.perf_counter()
+        assert extract_research_results_by_category(small) == expected
+        indexed_small = time.perf_counter() - start
+        indexed_comparisons, comparisons[0] = comparisons[0], 0
+
+        dump = _research_dump(5000)
+        start = time.perf_counter()
+        result = extract_research_results_by_category(dump)
+        indexed = time.perf_counter() - start
+
+        kept = sum(len(v) for v in result.values())
+        print(f"\n1000 answers: pairwise {pairwise:.2f}s ({pairwise_comparisons} comparisons), "
+              f"MinHash/LSH {indexed_small:.2f}s ({indexed_comparisons} comparisons)"
+              f"\n5000 answers -> {kept} kept: MinHash/LSH {indexed:.2f}s, {comparisons[0]} comparisons "
+              f"(pairwise extrapolated ~{pairwise * 25:.0f}s)")
+        # LSH candidates replace the comparison with every kept answer
+        assert indexed_comparisons * 10 < pairwise_comparisons
+        assert comparisons[0] < 5000           # under one comparison per answer
@@ -0,0 +1,204 @@
+"""
+Tests for musequill.services.backend.writers.repetition_index module.
+
+Test file: tests/services/backend/test_repetition_index.py
+Module under test: musequill/services/backend/writers/repetition_index.py
+
+Run from project root: pytest tests/services/backend/test_repetition_index.py -v -s
+"""
+
+import random
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.writers import repetition_index as ri
+from musequill.services.backend.writers.chapter_feedback import evaluate_chapter_quality_with_feedback
+from musequill.services.backend.writers.context_manager import EnhancedContextManager
+from musequill.services.backend.writers.repetition_index import RepetitionIndex
+from musequill.services.backend.writers.text_profile import ChapterTextProfile, text_profile
+
+_rng = random.Random(43)
+WORDS = ["".join(_rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(_rng.randint(2, 8)))
+         for _ in range(5000)]
+RECYCLED = [
+    "the sun cast dappled shadows across the quiet courtyard",
+    "her heart hammered against her ribs like a caged bird",
+    "a cold wind carried the smell of salt and smoke",
+]
+
+
+def _chapter(rng, words=2500, planted=()):
+    sentences = []
+    while sum(len(s.split()) for s in sentences) < words:
+        sentences.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))).capitalize() + ".")
+    for phrase in planted:
+        sentences.insert(rng.randrange(len(sentences)), phrase.capitalize() + ".")
+    return "\n\n".join(" ".join(sentences[i:i + 4]) for i in range(0, len(sentences), 4))
+
+
+class TestNgramHashes:
+    """The profile's hashes line up with its n-grams."""
+
+    def test_equal_phrases_equal_hashes(self):
+        p = ChapterTextProfile("one two three four. One two three four!")
+        hashes = p.ngram_hashes(4)
+        assert len(hashes) == len(p.tokens) - 3
+        assert hashes[0] == hashes[4] and len(set(hashes)) == 4
+        assert p.repeated_ngrams(4, 2) == ["one two three four"]
+
+    def test_short_text(self):
+        assert len(ChapterTextProfile("too short").ngram_hashes(4)) == 0
+
+
+class TestRepetitionIndex:
+    """Cross-chapter matching, re-indexing, the memory bound and snapshots."""
+
+    def test_recycled_run_is_merged_and_attributed(self):
+        index = RepetitionIndex()
+        index.add(_chapter(random.Random(1), 800, RECYCLED[:1]), 1)
+        report = index.check(_chapter(random.Random(2), 800, RECYCLED[:1]), 2)
+        assert [(r.phrase, r.chapter) for r in report.recycled] == [(RECYCLED[0], 1)]
+        assert not report.excessive_recycling
+
+    def test_own_chapter_is_not_recycling(self):
+        index = RepetitionIndex()
+        text = _chapter(random.Random(3), 500)
+        index.add(text, 4)
+        assert not index.check(text, 4).recycled
+        assert index.check(text, 5).recycled
+
+    def test_reindex_replaces_chapter(self):
+        index = RepetitionIndex()
+        index.add(_chapter(random.Random(4), 500, RECYCLED), 1)
+        index.add(_chapter(random.Random(5), 500), 1)
+        assert index.chapters == [1]
+        assert not index.check(_chapter(random.Random(6), 500, RECYCLED), 2).recycled
+
+    def test_memory_bound_drops_oldest_chapters(self):
+        index = RepetitionIndex(max_grams=1200)
+        for number in range(1, 5):
+            index.add(_chapter(random.Random(number), 500), number)
+        assert len(index) <= 1200
+        assert index.chapters == [3, 4]
+
+    def test_snapshot_round_trip(self, tmp_path):
+        path = str(tmp_path / "index.bin")
+        index = RepetitionIndex()
+        index.add(_chapter(random.Random(7), 600, RECYCLED), 3)
+        index.save(path)
+        loaded = RepetitionIndex.load(path)
+        assert loaded.chapters == [3] and len(loaded) == len(index)
+        assert len(loaded.check(_chapter(random.Random(8), 600, RECYCLED), 4).recycled) == 3
+        # A different n-gram size cannot reuse the hashes
+        assert len(RepetitionIndex.load(path, n=5)) == 0
+        assert len(RepetitionIndex.load(str(tmp_path / "missing.bin"))) == 0
+
+    def test_truncated_snapshot_loads_empty(self, tmp_path):
+        path = tmp_path / "index.bin"
+        index = RepetitionIndex()
+        index.add(_chapter(random.Random(7), 600, RECYCLED), 3)
+        index.add(_chapter(random.Random(8), 600), 4)
+        index.save(str(path))
+        data = path.read_bytes()
+        # Cut inside a segment header, between hashes and inside one
+        for cut in (ri._HEADER.size + 3, len(data) - 8 * 100, len(data) - 3):
+            path.write_bytes(data[:cut])
+            loaded = RepetitionIndex.load(str(path))
+            assert len(loaded) == 0 and loaded.chapters == []
+        (tmp_path / "repetition_index_book.bin").write_bytes(data[:len(data) // 2])
+        assert len(EnhancedContextManager("book", base_dir=str(tmp_path)).repetition_index) == 0
+
+    def test_context_manager_persists_index(self, tmp_path):
+        manager = EnhancedContextManager("book", base_dir=str(tmp_path))
+        manager.update_after_chapter_completion(
+            _chapter(random.Random(9), 600, RECYCLED),
+            {"chapter_number": 1, "chapter_title": "One", "summary": "", "word_count": 600},
+            {},
+        )
+        reloaded = EnhancedContextManager("book", base_dir=str(tmp_path))
+        report = reloaded.check_repetition(_chapter(random.Random(10), 600, RECYCLED), 2)
+        assert report.excessive_recycling
+
+    def test_feedback_flags_recycling(self):
+        index = RepetitionIndex()
+        index.add(_chapter(random.Random(11), 600, RECYCLED), 1)
+        text = _chapter(random.Random(12), 600, RECYCLED)
+        brief = SimpleNamespace(scenes=[1])
+        base, _ = evaluate_chapter_quality_with_feedback(text, "qa", brief, {}, 600, 600)
+        score, feedback = evaluate_chapter_quality_with_feedback(
+            text, "qa", brief, {}, 600, 600, repetition=index.check(text, 2),
+        )
+        assert score < base
+        assert len(feedback.flagged_passages) == 3
+        assert "(already used in chapter 1)" in feedback.flagged_passages[0]
+
+
+# ----------------------------
+# Benchmark: string n-gram dicts vs the hashed index over a manuscript
+# ----------------------------
+
+def _string_grams(text, n):
+    words = re.findall(r"[A-Za-z']+", text.lower())
+    grams = {}
+    for g in (" ".join(words[i:i + n]) for i in range(len(words) - n + 1)):
+        grams[g] = grams.get(g, 0) + 1
+    return grams
+
+
+class TestRepetitionIndexPerformance:
+    """Cross-chapter checks over a 100k-word manuscript: recall, time and memory."""
+
+    def test_100k_word_manuscript(self):
+        rng = random.Random(99)
+        chapters = [_chapter(rng, 2500, [RECYCLED[i % 3]] if i else RECYCLED) for i in range(40)]
+        total_words = sum(ChapterTextProfile(c).word_count for c in chapters)
+        assert total_words >= 100_000
+
+        # Old gate: per-chapter 4-gram string dicts; nothing carries between chapters
+        start = time.perf_counter()
+        old_flags = 0
+        for chapter in chapters:
+            old_flags += sum(1 for c in _string_grams(chapter, 4).values() if c >= 3)
+        old_time = time.perf_counter() - start
+
+        # Keeping every chapter's 6-gram strings for cross-chapter lookups
+        tracemalloc.start()
+        seen = {}
+        for number, chapter in enumerate(chapters, 1):
+            for g in _string_grams(chapter, ri.DEFAULT_NGRAM):
+                seen[g] = number
+        string_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        text_profile.cache_clear()
+        index = RepetitionIndex()
+        found = 0
+        start = time.perf_counter()
+        for number, chapter in enumerate(chapters, 1):
+            found += len(index.check(chapter, number).recycled)
+            index.add(chapter, number)
+        new_time = time.perf_counter() - start
+
+        text_profile.cache_clear()
+        tracemalloc.start()
+        measured = RepetitionIndex()
+        for number, chapter in enumerate(chapters, 1):
+            measured.add(chapter, number)
+        text_profile.cache_clear()
+        index_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        print(f"\n{len(chapters)} chapters / {total_words} words: recycled phrases found "
+              f"old 0, index {found} of 39; per-chapter time old {old_time:.2f}s "
+              f"(intra only), index {new_time:.2f}s (intra + cross-chapter); "
+              f"cross-chapter memory strings {string_bytes / 1e6:.1f}MB, index {index_bytes / 1e6:.1f}MB")
+        assert found == 39
+        assert index_bytes < string_bytes
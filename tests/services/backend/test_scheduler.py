@@ -0,0 +1,259 @@
+"""
+Tests for musequill.services.backend.llm.scheduler module.
+
+Test file: tests/services/backend/test_scheduler.py
+Module under test: musequill/services/backend/llm/scheduler.py
+
+Run from project root: pytest tests/services/backend/test_scheduler.py -v -s
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.llm.scheduler import (
+    DeadlineExceeded,
+    LLMScheduler,
+    Priority,
+    current_scope,
+    request_scope,
+    scheduled,
+    scheduler_slots,
+)
+
+
+async def _fill(scheduler, priority=Priority.PIPELINE, book_id=None):
+    """Occupy a slot until the returned event is set."""
+    release = asyncio.Event()
+    entered = asyncio.Event()
+
+    async def hold():
+        async with scheduler.slot(priority, book_id):
+            entered.set()
+            await release.wait()
+
+    task = asyncio.create_task(hold())
+    await entered.wait()
+    return release, task
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestAdmission:
+    """Priority order, class caps and per-book turns."""
+
+    def test_most_urgent_class_first(self):
+        async def main():
+            scheduler = LLMScheduler(slots=1)
+            release, holder = await _fill(scheduler)
+            order = []
+
+            async def request(priority):
+                async with scheduler.slot(priority):
+                    order.append(priority)
+
+            tasks = [asyncio.create_task(request(p))
+                     for p in (Priority.BATCH, Priority.PIPELINE, Priority.INTERACTIVE)]
+            await _settle()
+            assert scheduler.queued() == 3
+            release.set()
+            await asyncio.gather(holder, *tasks)
+            return order
+
+        assert asyncio.run(main()) == [Priority.INTERACTIVE, Priority.PIPELINE, Priority.BATCH]
+
+    def test_slot_reserved_for_interactive(self):
+        async def main():
+            scheduler = LLMScheduler(slots=3)
+            first, first_holder = await _fill(scheduler, Priority.PIPELINE)
+            second, second_holder = await _fill(scheduler, Priority.BATCH)
+            waiting = asyncio.create_task(scheduler.run(lambda: asyncio.sleep(1), Priority.BATCH))
+            await _settle()
+            assert scheduler.running == 2 and scheduler.queued(Priority.BATCH) == 1
+            async with scheduler.slot(Priority.INTERACTIVE):
+                assert scheduler.running == 3
+            first.set()
+            second.set()
+            waiting.cancel()
+            await asyncio.gather(first_holder, second_holder, waiting, return_exceptions=True)
+
+        asyncio.run(main())
+
+    def test_no_reserve_with_two_slots(self):
+        async def main():
+            scheduler = LLMScheduler(slots=2)
+            holders = [await _fill(scheduler, Priority.PIPELINE) for _ in range(2)]
+            assert scheduler.running == 2 and scheduler.reserved == 0
+            for release, _ in holders:
+                release.set()
+            await asyncio.gather(*(holder for _, holder in holders))
+
+        asyncio.run(main())
+        assert LLMScheduler(slots=2, reserved=1).reserved == 1
+        assert LLMScheduler(slots=1, reserved=1).reserved == 0
+
+    def test_off_unless_configured(self, monkeypatch):
+        monkeypatch.delenv("OLLAMA_SCHEDULER_SLOTS", raising=False)
+        assert scheduler_slots() == 0
+        monkeypatch.setenv("OLLAMA_SCHEDULER_SLOTS", "4")
+        assert scheduler_slots() == 4
+
+    def test_books_take_turns(self):
+        async def main():
+            scheduler = LLMScheduler(slots=1)
+            release, holder = await _fill(scheduler)
+            order = []
+
+            async def request(book_id):
+                async with scheduler.slot(Priority.PIPELINE, book_id):
+                    order.append(book_id)
+
+            tasks = [asyncio.create_task(request("a")) for _ in range(4)]
+            tasks += [asyncio.create_task(request("b")) for _ in range(2)]
+            await _settle()
+            release.set()
+            await asyncio.gather(holder, *tasks)
+            return order
+
+        assert asyncio.run(main()) == ["a", "b", "a", "b", "a", "a"]
+
+
+class TestDeadlinesAndCancellation:
+    """Requests leave the queue cleanly however they end."""
+
+    def test_deadline_while_queued(self):
+        async def main():
+            scheduler = LLMScheduler(slots=1)
+            release, holder = await _fill(scheduler)
+            with pytest.raises(DeadlineExceeded):
+                async with scheduler.slot(Priority.PIPELINE, deadline=time.monotonic() + 0.02):
+                    pass
+            assert scheduler.queued() == 0
+            release.set()
+            await holder
+            return scheduler
+
+        scheduler = asyncio.run(main())
+        assert scheduler.metrics[Priority.PIPELINE].expired == 1
+        assert scheduler.running == 0
+
+    def test_deadline_while_running(self):
+        async def main():
+            scheduler = LLMScheduler(slots=1)
+            with pytest.raises(DeadlineExceeded):
+                await scheduler.run(lambda: asyncio.sleep(1), deadline=time.monotonic() + 0.02)
+            return scheduler
+
+        scheduler = asyncio.run(main())
+        assert scheduler.running == 0 and scheduler.metrics[Priority.PIPELINE].expired == 1
+
+    def test_cancelled_waiter_leaves_the_queue(self):
+        async def main():
+            scheduler = LLMScheduler(slots=1)
+            release, holder = await _fill(scheduler)
+            waiter = asyncio.create_task(scheduler.run(lambda: asyncio.sleep(1)))
+            await _settle()
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            assert scheduler.queued() == 0
+            release.set()
+            await holder
+            # The freed slot is usable
+            await scheduler.run(lambda: asyncio.sleep(0))
+            return scheduler
+
+        scheduler = asyncio.run(main())
+        assert scheduler.metrics[Priority.PIPELINE].cancelled == 1
+        assert scheduler.metrics[Priority.PIPELINE].completed == 2
+
+    def test_cancel_book(self):
+        async def main():
+            scheduler = LLMScheduler(slots=1)
+            running = asyncio.create_task(scheduler.run(lambda: asyncio.sleep(1), book_id="gone"))
+            queued = asyncio.create_task(scheduler.run(lambda: asyncio.sleep(1), book_id="gone"))
+            other = asyncio.create_task(scheduler.run(lambda: asyncio.sleep(0), book_id="kept"))
+            await _settle()
+            assert scheduler.cancel_book("gone") == 2
+            results = await asyncio.gather(running, queued, other, return_exceptions=True)
+            return scheduler, results
+
+        scheduler, results = asyncio.run(main())
+        assert [type(r) for r in results[:2]] == [asyncio.CancelledError] * 2
+        assert results[2] is None and scheduler.running == 0 and scheduler.queued() == 0
+
+
+class TestRequestScope:
+    """Priority, book and deadline carried by context."""
+
+    def test_nested_scopes_inherit_and_tighten(self):
+        with request_scope(Priority.BATCH, book_id="b1", timeout=10):
+            outer = current_scope()
+            with request_scope(timeout=60):
+                assert current_scope() == outer      # a later deadline does not extend the outer one
+            with request_scope(Priority.INTERACTIVE, timeout=1):
+                inner = current_scope()
+                assert inner.book_id == "b1" and inner.priority == Priority.INTERACTIVE
+                assert inner.deadline < outer.deadline
+        assert current_scope().priority is None
+
+    def test_scheduled_uses_the_scope(self):
+        async def main():
+            scheduler = LLMScheduler(slots=1)
+            with request_scope(Priority.BATCH, book_id="b1"):
+                await scheduled(scheduler, lambda: asyncio.sleep(0))
+            await scheduled(scheduler, lambda: asyncio.sleep(0), Priority.INTERACTIVE)
+            assert await scheduled(None, lambda: asyncio.sleep(0, "direct")) == "direct"
+            return scheduler.stats()
+
+        stats = asyncio.run(main())
+        assert stats["classes"]["batch"]["completed"] == 1
+        assert stats["classes"]["interactive"]["completed"] == 1
+        assert stats["classes"]["pipeline"]["submitted"] == 0
+
+
+class TestSchedulerBenchmark:
+    """Interactive calls made while the same process drafts chapters, with and without priorities."""
+
+    def test_interactive_latency(self):
+        chapter_seconds, click_seconds = 0.3, 0.01
+
+        async def workload(classify):
+            scheduler = LLMScheduler(slots=3)
+            clicks = []
+
+            async def chapter(book):
+                await scheduler.run(lambda: asyncio.sleep(chapter_seconds), classify(Priority.PIPELINE), book)
+
+            async def click():
+                start = time.monotonic()
+                await scheduler.run(lambda: asyncio.sleep(click_seconds), classify(Priority.INTERACTIVE))
+                clicks.append(time.monotonic() - start)
+
+            chapters = [asyncio.create_task(chapter(f"book{i % 3}")) for i in range(6)]
+            for _ in range(8):
+                await asyncio.sleep(0.05)
+                await click()
+            await asyncio.gather(*chapters)
+            return sorted(clicks), scheduler.stats()
+
+        fifo, _ = asyncio.run(workload(lambda p: Priority.PIPELINE))
+        prioritized, stats = asyncio.run(workload(lambda p: p))
+        p95 = lambda xs: xs[int(len(xs) * 0.95) - 1]
+        interactive = stats["classes"]["interactive"]
+        # Timings are reported, not asserted; ordering is covered by TestAdmission
+        print(f"\ninteractive call latency, 6 chapter drafts in flight in one process: single queue p95 "
+              f"{p95(fifo) * 1000:.0f}ms, priority classes p95 {p95(prioritized) * 1000:.0f}ms (queue wait p95 "
+              f"{interactive['queue_wait']['p95'] * 1000:.0f}ms, service p95 "
+              f"{interactive['service_time']['p95'] * 1000:.0f}ms)")
+        assert interactive["completed"] == 8
+        assert stats["classes"]["pipeline"]["completed"] == 6
@@ -0,0 +1,148 @@
+"""
+Tests for musequill.services.backend.planner.schema_registry module.
+
+Test file: tests/services/backend/test_schema_registry.py
+Module under test: musequill/services/backend/planner/schema_registry.py
+
+Run from project root: pytest tests/services/backend/test_schema_registry.py -v -s
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+jsonschema = pytest.importorskip("jsonschema")
+pydantic = pytest.importorskip("pydantic")
+
+from pydantic import BaseModel, ValidationError
+
+from musequill.services.backend.planner import schema_registry
+from musequill.services.backend.planner.book_plan import BookPlan
+from musequill.services.backend.planner.schema_registry import SchemaRegistry, schema_key
+from musequill.services.backend.planner.schema_util import _json_skeleton
+
+SIMPLE_SCHEMA = {
+    "type": "object",
+    "properties": {"name": {"type": "string"}, "count": {"type": "integer"}},
+    "required": ["name"],
+    "additionalProperties": False,
+}
+
+
+class TestSchemaRegistry:
+    """Test compile-once behaviour and validation results."""
+
+    def test_same_content_compiles_once(self):
+        registry = SchemaRegistry()
+        reordered = {key: SIMPLE_SCHEMA[key] for key in reversed(list(SIMPLE_SCHEMA))}
+        first = registry.get(SIMPLE_SCHEMA)
+        assert registry.get(json.loads(json.dumps(SIMPLE_SCHEMA))) is first
+        assert registry.get(reordered) is first
+        assert len(registry) == 1
+        assert schema_key(SIMPLE_SCHEMA) == schema_key(reordered)
+
+    def test_skeleton_matches_schema_util(self):
+        compiled = SchemaRegistry().get(SIMPLE_SCHEMA)
+        assert compiled.skeleton == _json_skeleton(SIMPLE_SCHEMA)
+
+    def test_custom_skeleton_builder(self):
+        compiled = SchemaRegistry(skeleton_builder=lambda schema: "{}").get(SIMPLE_SCHEMA)
+        assert compiled.skeleton == "{}"
+
+    def test_validate_matches_jsonschema(self):
+        compiled = SchemaRegistry().get(SIMPLE_SCHEMA)
+        assert compiled.validate({"name": "x"}) == {"name": "x"}
+        with pytest.raises(jsonschema.ValidationError):
+            compiled.validate({"name": 3})
+        with pytest.raises(jsonschema.ValidationError):
+            compiled.validate({"name": "x", "extra": True})
+
+    def test_invalid_schema_raises(self):
+        with pytest.raises(jsonschema.SchemaError):
+            SchemaRegistry().get({"type": "not-a-type"})
+
+    def test_registry_keeps_its_own_copy(self):
+        schema = json.loads(json.dumps(SIMPLE_SCHEMA))
+        compiled = SchemaRegistry().get(schema)
+        schema["required"].append("count")
+        assert compiled.validate({"name": "x"}) == {"name": "x"}
+
+    def test_for_model_attaches_type_adapter(self):
+        registry = SchemaRegistry()
+        compiled = registry.for_model(BookPlan)
+        assert registry.for_model(BookPlan) is compiled
+        assert registry.get(BookPlan.model_json_schema(), BookPlan) is compiled
+        assert compiled.adapter is not None
+        with pytest.raises(jsonschema.ValidationError):
+            compiled.validate({"logline": "missing everything else"})
+
+
+    def test_model_is_part_of_the_key(self):
+        class Named(BaseModel):
+            name: str
+            count: int = 0
+
+        class Strict(BaseModel):
+            name: str
+            count: int
+
+        registry = SchemaRegistry()
+        plain = registry.get(SIMPLE_SCHEMA)
+        named = registry.get(SIMPLE_SCHEMA, Named)
+        strict = registry.get(SIMPLE_SCHEMA, Strict)
+        assert plain.adapter is None and named is not strict
+        assert named.validator is plain.validator and len(registry) == 1
+        assert isinstance(named.validate({"name": "x"}), Named)
+        with pytest.raises(ValidationError):
+            strict.validate({"name": "x"})
+        assert registry.get(SIMPLE_SCHEMA) is plain
+
+    def test_same_object_skips_hashing(self, monkeypatch):
+        registry = SchemaRegistry()
+        first = registry.get(SIMPLE_SCHEMA)
+        monkeypatch.setattr(schema_registry, "schema_key", lambda schema: pytest.fail("re-hashed"))
+        assert registry.get(SIMPLE_SCHEMA) is first
+
+
+class TestSchemaRegistryPerformance:
+    """Benchmark repeated validation setup against compiling once."""
+
+    def test_repeated_validation_speedup(self, monkeypatch):
+        schema = BookPlan.model_json_schema()
+        instance = {"logline": "x"}
+        rounds = 30
+        checks = []
+        check_schema = jsonschema.Draft202012Validator.check_schema
+        monkeypatch.setattr(schema_registry.Draft202012Validator, "check_schema",
+                            lambda s: checks.append(s) or check_schema(s))
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            jsonschema.Draft202012Validator.check_schema(schema)
+            list(jsonschema.Draft202012Validator(schema).iter_errors(instance))
+            _json_skeleton(schema)
+        uncached = time.perf_counter() - start
+
+        assert len(checks) == rounds
+
+        skeletons = []
+        registry = SchemaRegistry(skeleton_builder=lambda s: skeletons.append(s) or _json_skeleton(s))
+        start = time.perf_counter()
+        for _ in range(rounds):
+            compiled = registry.get(json.loads(json.dumps(schema)))   # a fresh dict per attempt
+            list(compiled.validator.iter_errors(instance))
+            compiled.skeleton
+        cached = time.perf_counter() - start
+
+        print(f"\n{rounds} attempts: uncached {uncached * 1000:.1f}ms -> registry {cached * 1000:.1f}ms "
+              f"({uncached / max(cached, 1e-9):.1f}x)")
+        # Meta-schema check, validator and skeleton: once for all attempts
+        assert len(checks) == rounds + 1 and len(skeletons) == 1
+        assert registry.get(schema) is compiled and len(registry) == 1
@@ -0,0 +1,110 @@
+"""
+Tests for musequill.services.backend.utils.term_matcher and validators.plan_index.
+
+Test file: tests/services/backend/test_term_matcher.py
+Modules under test: musequill/services/backend/utils/term_matcher.py,
+                    musequill/services/backend/validators/plan_index.py
+
+Run from project root: pytest tests/services/backend/test_term_matcher.py -v -s
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.utils.term_matcher import TermMatcher
+
+
+def _naive(terms, text):
+    lowered = text.lower()
+    return {t for t in terms if t and t.lower() in lowered}
+
+
+class TestTermMatcher:
+    """Test the Aho-Corasick matcher against plain substring checks."""
+
+    def test_overlapping_and_nested_terms(self):
+        matcher = TermMatcher(["he", "she", "his", "hers"])
+        hits = matcher.find_all("ushers")
+        assert sorted(hits) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+    def test_case_insensitive_with_original_spelling(self):
+        matcher = TermMatcher(["New York", "NYC", ""])
+        assert matcher.present("Moving to new york, then nyc.") == {"New York", "NYC"}
+        assert len(matcher) == 2
+
+    def test_offsets_point_at_match(self):
+        text = "The Dragon and the time portal"
+        for start, end, term in TermMatcher(["dragon", "time portal"]).finditer(text):
+            assert text[start:end].lower() == term
+
+    def test_empty_matcher(self):
+        matcher = TermMatcher([])
+        assert not matcher
+        assert matcher.find_all("anything") == []
+
+    def test_matches_naive_on_random_text(self):
+        rng = random.Random(7)
+        alphabet = "abc "
+        terms = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(30)]
+        matcher = TermMatcher(terms)
+        for _ in range(200):
+            text = "".join(rng.choice(alphabet + "AB") for _ in range(rng.randint(0, 40)))
+            assert matcher.present(text) == _naive(terms, text)
+
+
+class TestPlanTextIndex:
+    """Test the validator's single-pass plan index."""
+
+    def test_forbidden_terms_reported_by_section(self):
+        pytest.importorskip("pydantic")
+        from musequill.services.backend.validators import PlanBaselines, validate_plan_against_baselines
+
+        plan = {
+            "project": {"title": "T", "author": "A", "genre": "Literary"},
+            "logline": "A quiet story.",
+            "world_bible": {"setting": "Manhattan"},
+            "characters": {"Noah": {"description": "Clerk", "goals": ["Find the dragon"]}},
+            "hero_journey_beats": [{"beat": "Call", "description": "d"}],
+            "chapter_outline": [
+                {"chapter": 1, "title": "One", "description": "Nothing odd."},
+                {"chapter": 2, "title": "Two", "description": "A Spaceship lands."},
+            ],
+        }
+        baselines = PlanBaselines(forbidden_terms={"dragon", "spaceship"},
+                                  preferred_setting_keywords={"manhattan"}, min_chapters=1, min_beats=1)
+        result = validate_plan_against_baselines(plan, baselines)
+        issue = next(i for i in result.issues if i.code == "consistency.forbidden.terms")
+        assert issue.paths == [("characters", "Noah"), ("chapter_outline", 1)]
+        assert "chapter_outline[1]" in issue.message
+        assert not any(i.code == "completeness.setting.bias" for i in result.issues)
+
+
+class TestTermMatcherPerformance:
+    """Benchmark one automaton pass against one substring scan per term."""
+
+    def test_many_terms_single_pass(self):
+        rng = random.Random(3)
+        words = ["".join(rng.choice("abcdefghij") for _ in range(6)) for _ in range(400)]
+        text = " ".join(rng.choice(words) for _ in range(40000))
+        terms = words[:200] + ["zzzzzz"] * 1 + [w + "q" for w in words[:200]]
+
+        start = time.perf_counter()
+        expected = _naive(terms, text)
+        naive = time.perf_counter() - start
+
+        matcher = TermMatcher(terms)
+        start = time.perf_counter()
+        found = matcher.present(text)
+        single = time.perf_counter() - start
+
+        print(f"\n{len(terms)} terms over {len(text) // 1024}KB: naive {naive * 1000:.1f}ms, "
+              f"automaton {single * 1000:.1f}ms")
+        assert found == expected
@@ -0,0 +1,295 @@
+"""
+Tests for musequill.services.backend.writers.text_profile module.
+
+Test file: tests/services/backend/test_text_profile.py
+Module under test: musequill/services/backend/writers/text_profile.py
+
+Run from project root: pytest tests/services/backend/test_text_profile.py -v -s
+"""
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.writers import book_terms
+from musequill.services.backend.writers.book_terms import (
+    BANNED as BANNED_KIND, CHARACTER, THREAD, BookTermMatcher, describe_hits,
+)
+from musequill.services.backend.writers.chapter_feedback import evaluate_chapter_quality_with_feedback
+from musequill.services.backend.writers.context_manager import EnhancedContextManager
+from musequill.services.backend.writers.text_profile import ChapterTextProfile, text_profile
+
+BANNED = ["the sun cast dappled shadows", "we must be careful", "voice low and mysterious"]
+NAMES = ["Mira", "Tobias", "Aunt Lou", "Captain Reyes"]
+THREADS = [{"thread": "The missing lighthouse key"}, {"thread": "Reyes owes the guild"}]
+BOOK = BookTermMatcher(BANNED, NAMES, [t["thread"] for t in THREADS])
+
+_rng = random.Random(21)
+WORDS = ["".join(_rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(_rng.randint(2, 8)))
+         for _ in range(4000)] + ["don't", "it's"] + [n.split()[0] for n in NAMES]
+
+
+def _chapter(rng, number, words=2500):
+    out = [f"# Chapter {number}: {rng.choice(WORDS).title()}", ""]
+    written = 0
+    while written < words:
+        out.append(f"### Scene {len(out)}")
+        for _ in range(rng.randint(3, 6)):
+            sentences = []
+            for _ in range(rng.randint(2, 5)):
+                n = rng.randint(6, 18)
+                sentence = " ".join(rng.choice(WORDS) for _ in range(n)).capitalize()
+                if rng.random() < 0.3:
+                    sentence = f'"{sentence}," said {rng.choice(NAMES)}'
+                sentences.append(sentence + rng.choice([".", ".", "!", "?", "..."]))
+                written += n
+            out.append(" ".join(sentences))
+            out.append("")
+    return "\n".join(out)
+
+
+class TestChapterTextProfile:
+    """Test the profile's counts against direct computations."""
+
+    def test_counts(self):
+        text = '# Chapter 1: Start\n\n### One\nHe said, "Go." She didn\'t!\nAnd then...\n\n### Two\nEnd'
+        p = ChapterTextProfile(text)
+        assert p.h1_count == 1 and p.h3_count == 2
+        assert p.paragraph_count == 3
+        assert p.quote_count == 2 and p.comma_count == 1
+        assert p.sentence_marks == text.count(".") + text.count("!") + text.count("?")
+        assert p.word_count == 13  # "didn't" is one word
+        assert p.sentence_count == 4
+        assert text[slice(*p.sentence_spans[0])].endswith('"Go.')
+
+    def test_scene_headings_are_not_titles(self):
+        # "### " contains "# ", which the old substring count mistook for a second H1
+        p = ChapterTextProfile("# Title\n\n### Scene\ntext\n### Scene two\nmore")
+        assert p.h1_count == 1 and p.h3_count == 2
+
+    def test_ngrams_and_repeats(self):
+        line = "The lantern swung in the wind all night long."
+        p = ChapterTextProfile("\n".join([line] * 3 + ["short", "short"]))
+        assert p.ngrams(4)["the lantern swung in"] == 3
+        assert "the lantern swung in" in p.repeated_ngrams(4, 3)
+        assert p.repeated_lines(25) == [line]
+
+    def test_contains_is_case_insensitive_and_ordered(self):
+        p = ChapterTextProfile("WE MUST BE CAREFUL, said Mira.")
+        assert p.contains(["mira", "", "we must be careful", "tobias"]) == ["mira", "we must be careful"]
+
+    def test_profile_is_shared(self):
+        text = _chapter(random.Random(1), 1, 200)
+        assert text_profile(text) is text_profile(text)
+
+
+class TestBookTermMatcher:
+    """One scan finds banned phrases, names and thread keys with their offsets."""
+
+    TEXT = "Captain Reyes said we must be careful.\nThe missing lighthouse key was gone. MIRA nodded."
+
+    def test_hits_have_offsets_and_kinds(self):
+        hits = BOOK.scan(self.TEXT)
+        assert hits.terms(CHARACTER) == ["Captain Reyes", "Mira"]
+        assert hits.terms(THREAD) == ["The missing lighthou"]
+        (banned,) = hits.of(BANNED_KIND)
+        assert self.TEXT[banned.start:banned.end] == "we must be careful"
+        assert [h.start for h in hits.hits] == sorted(h.start for h in hits.hits)
+
+    def test_overlapping_terms_and_shared_kinds(self):
+        matcher = BookTermMatcher(banned=["reyes owes"], characters=["Reyes", "reyes owes"])
+        hits = matcher.scan("Reyes owes money.")
+        assert sorted((h.term, h.kind) for h in hits.hits) == [
+            ("Reyes", CHARACTER), ("reyes owes", BANNED_KIND), ("reyes owes", CHARACTER),
+        ]
+
+    def test_automaton_agrees_with_direct_search(self, monkeypatch):
+        text = _chapter(random.Random(4), 1, 1500) + self.TEXT
+        direct = BOOK.scan(text).hits
+        monkeypatch.setattr(book_terms, "DIRECT_SEARCH_MAX_TERMS", 0)
+        assert BOOK.scan(text).hits == direct
+        assert direct
+
+    def test_describe_hits(self):
+        hits = BOOK.scan(self.TEXT).of(BANNED_KIND)
+        (line,) = describe_hits(self.TEXT, hits, context=10)
+        assert line.startswith('"we must be careful" at line 1, chars 19-37')
+        assert "[we must be careful]" in line
+
+    def test_profile_caches_hits_per_matcher(self):
+        p = ChapterTextProfile(self.TEXT)
+        assert p.term_hits(BOOK) is p.term_hits(BOOK)
+        assert [h.term for h in p.phrase_hits(["MIRA", "nobody"])] == ["MIRA"]
+
+    def test_context_manager_reuses_matcher(self, tmp_path):
+        manager = EnhancedContextManager("book", base_dir=str(tmp_path))
+        continuity = {"character_states": {"Mira": {}}, "active_plot_threads": THREADS}
+        first = manager.term_matcher(BANNED, continuity)
+        assert manager.term_matcher(list(BANNED), dict(continuity)) is first
+        continuity["character_states"]["Tobias"] = {}
+        assert manager.term_matcher(BANNED, continuity) is not first
+
+
+class TestGatesReadProfile:
+    """The gates agree with the profile."""
+
+    def test_needs_revision(self):
+        from chapter_writer import needs_revision
+
+        text = _chapter(random.Random(2), 1, 1000) + "\nThe sun cast dappled shadows."
+        issues = needs_revision(text, BANNED, text_profile(text).word_count)
+        assert issues == ["banned phrases used: the sun cast dappled shadows."]
+
+    def test_feedback_continuity(self):
+        text = _chapter(random.Random(3), 1, 800) + "\nMira found the missing lighthouse key."
+        brief = SimpleNamespace(scenes=[1, 2])
+        _, feedback = evaluate_chapter_quality_with_feedback(
+            text, "qa", brief, {}, 800, 800,
+            {"character_states": {n: {} for n in NAMES}, "active_plot_threads": THREADS},
+        )
+        assert "Appears to advance existing plot threads" in feedback.strengths
+
+    def test_feedback_with_book_matcher_locates_banned(self):
+        text = _chapter(random.Random(3), 1, 800) + "\nMira said we must be careful near the missing lighthouse key."
+        continuity = {"character_states": {n: {} for n in NAMES}, "active_plot_threads": THREADS}
+        _, feedback = evaluate_chapter_quality_with_feedback(
+            text, "qa", SimpleNamespace(scenes=[1]), {}, 800, 800, continuity, term_matcher=BOOK,
+        )
+        assert "Appears to advance existing plot threads" in feedback.strengths
+        assert len(feedback.flagged_passages) == 1
+        assert feedback.flagged_passages[0].startswith('"we must be careful" at line ')
+
+    def test_revision_prompt_points_at_hits(self):
+        from chapter_writer import revision_prompt
+
+        text = "# Chapter 1\n\nShe whispered, voice low and mysterious, then left."
+        prompt = revision_prompt(text, ["banned phrases used"], {"meta": {"target_words": 100}}, BANNED)
+        assert '"voice low and mysterious" at line 3, chars' in prompt
+
+
+# ----------------------------
+# Benchmark: full-text scans per set of gate checks
+# ----------------------------
+
+class _Counter:
+    n = 0
+
+
+def _counted(text, counter):
+    """A str whose full-text scanning methods (and re calls on it) are counted."""
+
+    class Counted(str):
+        def lower(self):
+            counter.n += 1
+            return Counted(str.lower(self))
+
+        def count(self, *args):
+            counter.n += 1
+            return str.count(self, *args)
+
+        def split(self, *args):
+            counter.n += 1
+            return str.split(self, *args)
+
+        def splitlines(self, *args):
+            counter.n += 1
+            return str.splitlines(self, *args)
+
+        def __contains__(self, sub):
+            counter.n += 1
+            return str.__contains__(self, sub)
+
+    return Counted(text), Counted
+
+
+def _old_gates(text):
+    """The gate checks as they were before the profile: each helper scans on its own."""
+    # writers/chapter_writer.needs_revision
+    len(re.findall(r"\b\w+\b", text))
+    words = re.findall(r"[A-Za-z']+", text.lower())
+    grams = {}
+    for g in (" ".join(words[i:i + 4]) for i in range(len(words) - 3)):
+        grams[g] = grams.get(g, 0) + 1
+    low = text.lower()
+    [p for p in BANNED if p.lower() in low]
+    text.count("# ")
+    "###" in text
+    # chapter_critic local checks
+    len(re.findall(r"\b\w+\b", text))
+    [ln.strip() for ln in text.splitlines() if ln.strip()]
+    lower = text.lower()
+    [n for n in BANNED if n.lower() in lower]
+    # enhanced_chapter_writer.count_words
+    len(text.split())
+    # chapter_feedback.evaluate_chapter_quality_with_feedback
+    text.count("# "), text.count("### "), len(text.strip()), text.count('"')
+    len([p for p in text.split("\n\n") if p.strip()])
+    text.count(".") + text.count("!") + text.count("?"), text.count(",")
+    sum(1 for n in NAMES if n.lower() in text.lower())
+    any(t["thread"].lower()[:20] in text.lower() for t in THREADS)
+
+
+def _new_gates(text):
+    p = text_profile(text)
+    p.word_count, p.repeated_ngrams(4, 3), p.contains(BANNED), p.h1_count, p.h3_count
+    p.repeated_lines(25), p.contains(BANNED), p.word_count
+    p.h1_count, p.h3_count, p.content_chars, p.quote_count, p.paragraph_count
+    p.sentence_marks, p.comma_count
+    hits = p.term_hits(BOOK)
+    hits.terms(CHARACTER), hits.terms(THREAD), hits.of(BANNED_KIND)
+
+
+class TestTextProfilePerformance:
+    """Count full-text scans and report the time of all gates over a 100k-word manuscript."""
+
+    def test_100k_word_manuscript(self, monkeypatch):
+        rng = random.Random(8)
+        chapters = [_chapter(rng, i + 1) for i in range(40)]
+        total_words = sum(ChapterTextProfile(c).word_count for c in chapters)
+        assert total_words >= 100_000
+
+        counter = _Counter()
+        classes = []
+        for name in ("findall", "finditer", "search"):
+            original = getattr(re, name)
+
+            def wrapper(pattern, string, *args, _original=original, **kwargs):
+                if classes and isinstance(string, classes[0]):
+                    counter.n += 1
+                return _original(pattern, string, *args, **kwargs)
+            monkeypatch.setattr(re, name, wrapper)
+
+        scans = {}
+        for label, gates in (("old", _old_gates), ("profile", _new_gates)):
+            text_profile.cache_clear()
+            counter.n = 0
+            text, cls = _counted(chapters[0], counter)
+            classes[:] = [cls]
+            gates(text)
+            scans[label] = counter.n
+        monkeypatch.undo()
+
+        timings = {}
+        for label, gates in (("old", _old_gates), ("profile", _new_gates)):
+            runs = []
+            for _ in range(3):
+                text_profile.cache_clear()
+                start = time.perf_counter()
+                for chapter in chapters:
+                    gates(chapter)
+                runs.append(time.perf_counter() - start)
+            timings[label] = min(runs)
+
+        print(f"\n{len(chapters)} chapters / {total_words} words: full-text scans per chapter "
+              f"{scans['old']} -> {scans['profile']} ({scans['old'] - scans['profile']} removed); "
+              f"old gates {timings['old']:.2f}s, profile {timings['profile']:.2f}s")
+        # Scan counts are deterministic; the timings are only reported, since wall-clock
+        # comparisons fail on a loaded machine
+        assert scans["profile"] < scans["old"]
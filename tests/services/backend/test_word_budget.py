@@ -0,0 +1,123 @@
+"""
+Tests for musequill.services.backend.planner.word_budget module.
+
+Test file: tests/services/backend/test_word_budget.py
+Module under test: musequill/services/backend/planner/word_budget.py
+
+Run from project root: pytest tests/services/backend/test_word_budget.py -v -s
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from musequill.services.backend.planner.word_budget import allocate_words
+
+
+def _greedy_reference(target, counts, minimum=300):
+    """The original rebalancer: scale, round, then nudge one word at a time."""
+    ratio = target / sum(counts)
+    scaled = [max(minimum, int(round(c * ratio))) for c in counts]
+    diff = target - sum(scaled)
+    order = sorted(range(len(counts)), key=lambda i: counts[i], reverse=True)
+    sign = 1 if diff > 0 else -1
+    for i in range(abs(diff)):
+        idx = order[i % len(order)]
+        scaled[idx] = max(minimum, scaled[idx] + sign)
+    return scaled
+
+
+class TestAllocateWords:
+    """Test exactness, bounds and proportionality."""
+
+    def test_exact_total_and_proportional(self):
+        assert allocate_words(10000, [1, 1, 2]) == [2500, 2500, 5000]
+        assert allocate_words(10, [1, 1, 1]) == [4, 3, 3]
+
+    def test_bounds_respected(self):
+        out = allocate_words(10000, [1, 1, 8], minimum=1000, maximum=5000)
+        assert out == [2500, 2500, 5000]
+        assert sum(out) == 10000
+
+    def test_minimum_lifts_small_weights(self):
+        out = allocate_words(3000, [0, 100, 900], minimum=300)
+        assert out[0] == 300 and sum(out) == 3000 and out[2] > out[1] >= 300
+
+    def test_unreachable_totals_pin_to_bound(self):
+        assert allocate_words(500, [1, 1, 1], minimum=300) == [300, 300, 300]
+        assert allocate_words(9000, [1, 2], maximum=2000) == [2000, 2000]
+
+    def test_degenerate_inputs(self):
+        assert allocate_words(100, []) == []
+        assert allocate_words(9, [0, 0, 0]) == [3, 3, 3]
+        with pytest.raises(ValueError):
+            allocate_words(100, [1], minimum=10, maximum=5)
+
+    def test_random_allocations_are_exact(self):
+        rng = random.Random(9)
+        for _ in range(500):
+            n = rng.randint(1, 40)
+            weights = [rng.choice([0, rng.random() * 10]) for _ in range(n)]
+            lo = rng.randint(0, 500)
+            hi = rng.choice([None, lo + rng.randint(0, 3000)])
+            total = rng.randint(n * lo, n * (hi if hi is not None else lo + 3000))
+            out = allocate_words(total, weights, minimum=lo, maximum=hi)
+            assert sum(out) == total
+            assert all(x >= lo and (hi is None or x <= hi) for x in out)
+
+
+class TestEnforceWordBudget:
+    """Test the root planner's per-act rebalance."""
+
+    def test_acts_hit_targets_exactly(self):
+        pytest.importorskip("requests")
+        from book_plan import enforce_word_budget
+
+        plan = {
+            "pacing": {"word_targets": {"I": 10000, "II": 7001, "III": 2999}},
+            "chapter_plan": [
+                {"ch": 1, "act": "I", "word_count": 1000},
+                {"ch": 2, "act": "I", "word_count": 3000},
+                {"ch": 3, "act": "II", "word_count": 0},
+                {"ch": 4, "act": "II", "word_count": 0},
+                {"ch": 5, "act": "III", "word_count": 50},
+                {"ch": 6, "act": "III", "word_count": 5000},
+            ],
+        }
+        out = enforce_word_budget(plan)["chapter_plan"]
+        by_act = {}
+        for ch in out:
+            by_act[ch["act"]] = by_act.get(ch["act"], 0) + ch["word_count"]
+        assert by_act == {"I": 10000, "II": 7001, "III": 2999}
+        assert [ch["word_count"] for ch in out] == [2500, 7500, 3501, 3500, 300, 2699]
+
+
+class TestWordBudgetPerformance:
+    """Benchmark against the one-word-at-a-time rebalancer."""
+
+    def test_clamped_budget_shift(self):
+        # Half the chapters are tiny, so the 300-word floor eats into the target
+        rng = random.Random(4)
+        counts = [rng.choice([rng.randint(10, 200), rng.randint(2000, 9000)]) for _ in range(2000)]
+        target = 900 * len(counts)
+
+        start = time.perf_counter()
+        greedy = _greedy_reference(target, counts)
+        greedy_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exact = allocate_words(target, counts, minimum=300)
+        exact_s = time.perf_counter() - start
+
+        print(f"\n{len(counts)} chapters, {target} words: greedy {greedy_s * 1000:.1f}ms "
+              f"(off by {sum(greedy) - target}), largest-remainder {exact_s * 1000:.1f}ms")
+        assert sum(exact) == target
+        assert sum(greedy) != target
+        assert exact_s < greedy_s
@@ -0,0 +1,201 @@
+"""
+Tests for musequill.services.frontend.ip_blacklist_middleware module.
+
+Test file: tests/services/frontend/test_ip_blacklist_middleware.py
+Module under test: musequill/services/frontend/ip_blacklist_middleware.py
+
+Run from project root: pytest tests/services/frontend/test_ip_blacklist_middleware.py -v
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("fastapi")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from musequill.services.frontend.ip_blacklist_middleware import ExpiryWheel, IPBlacklistMiddleware
+
+IP = "203.0.113.7"
+
+
+class InMemorySharedBlacklist:
+    """Same interface as RedisSharedBlacklist, over a dict shared by the test's workers."""
+
+    def __init__(self):
+        self.bans = {}
+        self.lookups = 0
+        self.purges = 0
+        self.down = False
+
+    async def add(self, ip, expires_at):
+        if self.down:
+            raise ConnectionError("redis unavailable")
+        self.bans[ip] = max(expires_at, self.bans.get(ip, 0))
+
+    async def remove(self, ip):
+        return self.bans.pop(ip, None) is not None
+
+    async def get_expiration(self, ip, now):
+        self.lookups += 1
+        expires_at = self.bans.get(ip)
+        return expires_at if expires_at is not None and expires_at > now else None
+
+    async def purge_expired(self, now):
+        self.purges += 1
+        expired = [ip for ip, expires_at in self.bans.items() if expires_at <= now]
+        for ip in expired:
+            del self.bans[ip]
+        return len(expired)
+
+    async def active(self, now):
+        return {ip: t for ip, t in self.bans.items() if t > now}
+
+
+def _worker(store, **kwargs):
+    middleware = IPBlacklistMiddleware(FastAPI(), max_violations=3, **kwargs)
+    middleware.shared_blacklist = store
+    return middleware
+
+
+async def _ban(middleware, ip=IP):
+    for _ in range(middleware.max_violations):
+        await middleware._record_violation_shared(ip, 404, "/nope")
+
+
+class TestExpiryWheel:
+    """Slot-bucketed expiry."""
+
+    def test_expires_due_keys_only(self):
+        wheel = ExpiryWheel(resolution=10)
+        wheel.schedule("a", 5)
+        wheel.schedule("b", 15)
+        wheel.schedule("c", 17)
+        assert wheel.expire(4) == []
+        assert sorted(wheel.expire(16)) == ["a", "b"]   # "c" shares b's slot but is not yet due
+        assert "c" in wheel and len(wheel) == 1
+        assert wheel.expire(30) == ["c"]
+        assert len(wheel) == 0
+
+    def test_reschedule_and_cancel(self):
+        wheel = ExpiryWheel(resolution=10)
+        wheel.schedule("a", 5)
+        wheel.schedule("a", 25)          # the entry in the first slot goes stale
+        wheel.schedule("b", 6)
+        assert wheel.cancel("b") and not wheel.cancel("b")
+        assert wheel.expire(10) == []
+        assert wheel.deadline("a") == 25
+        assert wheel.expire(25) == ["a"]
+
+
+class TestSharedBlacklist:
+    """Bans and unbans seen by every worker sharing one blacklist."""
+
+    def test_ban_on_one_worker_blocks_on_another(self):
+        store = InMemorySharedBlacklist()
+        first, second = _worker(store), _worker(store)
+
+        async def main():
+            await _ban(first)
+            assert IP in store.bans
+            return await second._check_blacklist(IP)
+
+        assert asyncio.run(main())
+        assert IP in second.blacklisted_ips
+
+    def test_unban_reaches_every_worker(self):
+        store = InMemorySharedBlacklist()
+        first, second = _worker(store, shared_recheck_seconds=0.05), _worker(store, shared_recheck_seconds=0.05)
+
+        async def main():
+            await _ban(first)
+            assert await second._check_blacklist(IP)
+            assert await second.remove_ip_from_blacklist_shared(IP)   # e.g. the admin endpoint's worker
+            blocked_now = await first._check_blacklist(IP)
+            await asyncio.sleep(0.06)
+            return blocked_now, await first._check_blacklist(IP)
+
+        blocked_now, blocked_after_recheck = asyncio.run(main())
+        assert blocked_now                     # the local copy is trusted briefly...
+        assert not blocked_after_recheck       # ...then Redis says the ban is gone
+        assert IP not in first.blacklisted_ips
+
+    def test_local_copy_avoids_lookups_within_recheck_window(self):
+        store = InMemorySharedBlacklist()
+        worker = _worker(store, shared_recheck_seconds=60)
+
+        async def main():
+            await _ban(worker)
+            for _ in range(5):
+                assert await worker._check_blacklist(IP)
+
+        asyncio.run(main())
+        assert store.lookups == 0
+
+    def test_manual_ban_is_shared_and_outlives_the_recheck(self):
+        store = InMemorySharedBlacklist()
+        first, second = _worker(store, shared_recheck_seconds=0), _worker(store, shared_recheck_seconds=0)
+
+        async def main():
+            await first.add_ip_to_blacklist_shared(IP, duration_hours=1)
+            return [await first._check_blacklist(IP) for _ in range(3)], await second._check_blacklist(IP)
+
+        first_checks, second_check = asyncio.run(main())
+        assert first_checks == [True] * 3 and second_check
+        assert IP in store.bans and store.lookups == 4
+
+    def test_unpublished_ban_is_kept_and_published_later(self):
+        store = InMemorySharedBlacklist()
+        worker = _worker(store, shared_recheck_seconds=0)
+        store.down = True
+
+        async def main():
+            await _ban(worker)
+            assert IP not in store.bans
+            store.down = False
+            return await worker._check_blacklist(IP)
+
+        assert asyncio.run(main())
+        assert IP in store.bans and IP in worker.blacklisted_ips
+
+    def test_purge_runs_once_per_interval(self):
+        store = InMemorySharedBlacklist()
+        worker = _worker(store)
+        store.bans["198.51.100.1"] = time.time() - 1
+
+        async def main():
+            for _ in range(3):
+                await worker._cleanup_shared()
+            worker.next_shared_purge = 0.0          # interval elapsed
+            await worker._cleanup_shared()
+
+        asyncio.run(main())
+        assert store.purges == 2 and not store.bans
+
+
+class TestMiddlewareRequests:
+    """End-to-end through a FastAPI app."""
+
+    def test_blocks_after_violations(self):
+        app = FastAPI()
+
+        @app.get("/ok")
+        async def ok():
+            return {"ok": True}
+
+        app.add_middleware(IPBlacklistMiddleware, max_violations=3)
+        client = TestClient(app)
+        headers = {"X-Forwarded-For": IP}
+        assert [client.get("/missing", headers=headers).status_code for _ in range(3)] == [404] * 3
+        blocked = client.get("/ok", headers=headers)
+        assert blocked.status_code == 429 and "blocked_until" in blocked.json()["details"]
+        assert client.get("/ok", headers={"X-Forwarded-For": "192.0.2.1"}).status_code == 200
@@ -0,0 +1,154 @@
+"""
+Tests for the Server-Sent Events wizard endpoints in
+musequill.services.frontend.service and the streaming paths behind them.
+
+Test file: tests/services/frontend/test_wizard_stream.py
+Module under test: musequill/services/frontend/service.py
+
+Run from project root: pytest tests/services/frontend/test_wizard_stream.py -v
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("fastapi")
+pytest.importorskip("langchain_ollama")
+
+from fastapi.testclient import TestClient
+
+from musequill.services.frontend import service
+
+CONCEPT = "A lighthouse keeper finds a map that redraws itself every night."
+RECOMMENDATIONS = {
+    "recommendations": [
+        {"option_id": "fantasy", "score": 92, "reasoning": "Magical map"},
+        {"option_id": "mystery", "score": 81, "reasoning": "Hidden meaning"},
+    ],
+    "general_reasoning": "Speculative hook with a puzzle.",
+}
+
+
+class FakeLLM:
+    """Stands in for OllamaLLM: blocking invoke and a chunked token stream."""
+
+    def __init__(self, response=RECOMMENDATIONS, chunk_size=7):
+        self.text = json.dumps(response) + "\nTrailing prose that is never needed."
+        self.chunk_size = chunk_size
+        self.streamed = 0
+
+    def invoke(self, prompt):
+        return json.dumps({"recommended_combinations": []})
+
+    async def astream(self, prompt):
+        for i in range(0, len(self.text), self.chunk_size):
+            self.streamed += 1
+            yield self.text[i:i + self.chunk_size]
+
+
+def _events(body):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeLLM()
+    monkeypatch.setattr(service.llm_service, "llm", fake)
+    # Startup events are not run, so the fake LLM is never replaced
+    client = TestClient(service.create_app())
+    client.fake_llm = fake
+    return client
+
+
+def _start(client):
+    response = client.post("/wizard/start/stream", json={"concept": CONCEPT})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return _events(response.text)
+
+
+class TestWizardStartStream:
+    """/wizard/start/stream"""
+
+    def test_event_sequence(self, client):
+        events = _start(client)
+        names = [name for name, _ in events]
+        assert names[:2] == ["session", "options"]
+        assert names.count("recommendation") == 2
+        assert names[-2:] == ["complete", "concept_analysis"]
+
+        data = dict(events)
+        assert all(option["recommendation_score"] == 50 for option in data["options"]["options"])
+        complete = data["complete"]
+        assert complete["options"][0]["id"] == "fantasy"
+        assert complete["options"][0]["recommendation_score"] == 92
+        assert complete["llm_reasoning"] == RECOMMENDATIONS["general_reasoning"]
+
+    def test_stream_stops_once_the_json_closes(self, client):
+        _start(client)
+        json_chunks = -(-len(json.dumps(RECOMMENDATIONS)) // client.fake_llm.chunk_size)
+        assert client.fake_llm.streamed <= json_chunks + 1
+
+    def test_short_concept_rejected_before_streaming(self, client):
+        response = client.post("/wizard/start/stream", json={"concept": "short"})
+        assert response.status_code == 422
+
+
+class TestWizardStepStream:
+    """/wizard/step/{n}/stream"""
+
+    def test_step_with_selection(self, client):
+        session_id = _start(client)[0][1]["session_id"]
+        response = client.post("/wizard/step/2/stream", json={"session_id": session_id, "selection": "fantasy"})
+        events = _events(response.text)
+        assert [name for name, _ in events][0] == "options" and events[-1][0] == "complete"
+        session = service.session_manager.get_session(session_id)
+        assert session.current_step == 2
+        assert session.selections["genre_selection"] == "fantasy"
+
+    def test_static_step_completes_without_llm(self, client):
+        session_id = _start(client)[0][1]["session_id"]
+        streamed = client.fake_llm.streamed
+        events = _events(client.post("/wizard/step/7/stream", json={"session_id": session_id}).text)
+        assert [name for name, _ in events] == ["complete"]
+        assert client.fake_llm.streamed == streamed
+
+    def test_invalid_step_leaves_the_session_untouched(self, client):
+        session_id = _start(client)[0][1]["session_id"]
+        session = service.session_manager.get_session(session_id)
+        step = session.current_step
+        response = client.post("/wizard/step/9/stream",
+                               json={"session_id": session_id, "additional_input": "ignored"})
+        assert response.status_code == 400
+        assert session.current_step == step
+        assert "final_summary" not in session.additional_inputs
+
+    def test_unknown_session(self, client):
+        response = client.post("/wizard/step/2/stream", json={"session_id": "missing"})
+        assert response.status_code == 404
+
+
+class TestStreamSuggestOptions:
+    """LLMService.stream_suggest_options on its own."""
+
+    def test_fallback_when_stream_is_not_json(self, monkeypatch):
+        monkeypatch.setattr(service.llm_service, "llm", FakeLLM(response="no json here"))
+        options = [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}]
+
+        async def collect():
+            return [u async for u in service.llm_service.stream_suggest_options("Step", CONCEPT, {}, options)]
+
+        updates = asyncio.run(collect())
+        assert [u["type"] for u in updates] == ["complete"]
+        assert [r["option_id"] for r in updates[0]["suggestions"]["recommendations"]] == ["a", "b"]
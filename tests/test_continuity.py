@@ -0,0 +1,176 @@
+"""
+Tests for the top-level continuity module (incremental story-so-far summaries).
+
+Test file: tests/test_continuity.py
+Module under test: continuity.py
+
+Run from project root: pytest tests/test_continuity.py -v
+"""
+
+import glob
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Tuple
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import continuity
+
+BOOK_MODEL = SimpleNamespace(
+    structure=SimpleNamespace(type="hero_journey"),
+    pov=SimpleNamespace(type="third_person_objective"),
+    audience=SimpleNamespace(type="children", age="7-12"),
+)
+
+
+def _chapter(num: int, body_words: int = 900) -> str:
+    qa = f"```qa\n- Pip reaches landmark {num}\n- The map loses square {num}\n```"
+    body = " ".join(f"word{num}_{i}" for i in range(body_words))
+    return f"# Chapter {num}: Stop {num}\n\n{body}\n\n{qa}\n"
+
+
+# ---- previous implementation (baseline continuity.py), kept as the reference ----
+
+def _legacy_load_previous_chapters(manuscript_dir: str, upto_chapter_num: int) -> List[Tuple[int, str]]:
+    files = sorted(glob.glob(os.path.join(manuscript_dir, "Chapter_*.md")))
+    out = []
+    for path in files:
+        try:
+            num = int(os.path.basename(path).split("_")[1].split(".")[0])
+        except Exception:
+            continue
+        if num < upto_chapter_num:
+            with open(path, "r", encoding="utf-8") as f:
+                out.append((num, f.read()))
+    return sorted(out, key=lambda x: x[0])
+
+
+def _legacy_build_summary_prompt(book_model, prior_summaries_bullets, chapter_snippets, max_words) -> str:
+    recent = chapter_snippets[-3:] if chapter_snippets else []
+    recent_blocks = []
+    for num, txt in recent:
+        qa = continuity._extract_qa(txt)
+        recent_blocks.append(f"### Chapter {num}\n"
+                             f"- Key progress (from qa):\n{qa if qa else '(no qa)'}\n"
+                             f"- Snippet (first ~400 chars):\n{txt[:400]}")
+
+    pov_type = book_model.pov.type
+    return f"""Summarize the story so far for continuity.
+
+# Canon (for guardrails; do not invent beyond this)
+- Structure: {book_model.structure.type}
+- POV: {pov_type} (keep summary objective; no character inner thoughts)
+- Audience: {book_model.audience.type} {book_model.audience.age}
+
+# Prior continuity (carry forward, compress if needed)
+{prior_summaries_bullets}
+
+# Recent chapters
+{chr(10).join(recent_blocks)}
+
+# Output (strict; <= {max_words} words):
+Write concise bullets covering only facts established on-page:
+- Current protagonist goal and constraints (timers, promises, obligations)
+- Irreversible changes (gains/losses, revealed info, changed relationships)
+- Active allies/antagonists and their status
+- Inventory/boons/skills/rules that matter
+- Unresolved hooks/foreshadowing to pay off
+- Locations reached + next clear destination if any
+- Tone/motifs in play (1–2 items)
+Do not critique or speculate. No inner monologue. End with: 'Next immediate objective: …'"""
+
+
+def _legacy_make_story_to_date_summary(llm_fn, book_model, manuscript_dir, upto_chapter_num,
+                                       max_words=250, prior_summary_path=None) -> str:
+    prev = _legacy_load_previous_chapters(manuscript_dir, upto_chapter_num)
+    if not prev:
+        return ""
+    prior_summaries_bullets = ""
+    if prior_summary_path and os.path.exists(prior_summary_path):
+        with open(prior_summary_path, "r", encoding="utf-8") as f:
+            prior_summaries_bullets = f.read().strip()
+    prompt = _legacy_build_summary_prompt(book_model, prior_summaries_bullets, prev, max_words)
+    summary = llm_fn(prompt, temperature=0.2, top_p=0.9, top_k=40)
+    if prior_summary_path:
+        os.makedirs(os.path.dirname(prior_summary_path), exist_ok=True)
+        with open(prior_summary_path, "w", encoding="utf-8") as f:
+            f.write(summary.strip())
+    return summary.strip()
+
+
+class RecordingLLM:
+    """Deterministic llm_fn: the summary is a function of the prompt, and every prompt is kept."""
+
+    def __init__(self):
+        self.prompts: List[str] = []
+
+    def __call__(self, prompt: str, **kwargs) -> str:
+        self.prompts.append(prompt)
+        return f"- summary #{len(self.prompts)} of a {len(prompt)}-char prompt\nNext immediate objective: go on  "
+
+
+def _write_book(manuscript_dir: Path, llm_fn, summarize, chapters: int = 6, **kwargs) -> List[str]:
+    """Write chapters one at a time, summarising after each as write_all_chapters_with_qc does."""
+    manuscript_dir.mkdir(parents=True, exist_ok=True)
+    summaries = []
+    for num in range(1, chapters + 1):
+        (manuscript_dir / f"Chapter_{num:02d}.md").write_text(_chapter(num), encoding="utf-8")
+        summaries.append(summarize(llm_fn, BOOK_MODEL, str(manuscript_dir), num + 1, 280, **kwargs))
+    return summaries
+
+
+class TestMatchesPreviousImplementation:
+    """With a single act, the incremental summarizer sends the same prompts and returns the same text."""
+
+    def test_same_prompts_and_summaries(self, tmp_path):
+        legacy_llm, new_llm = RecordingLLM(), RecordingLLM()
+        legacy = _write_book(tmp_path / "legacy", legacy_llm, _legacy_make_story_to_date_summary,
+                             prior_summary_path=str(tmp_path / "legacy_summaries" / "story.md"))
+        new = _write_book(tmp_path / "new", new_llm, continuity.make_story_to_date_summary,
+                          prior_summary_path=str(tmp_path / "new_summaries" / "story.md"))
+        assert new_llm.prompts == legacy_llm.prompts
+        assert new == legacy
+        assert (tmp_path / "new_summaries" / "story.md").read_text() == legacy[-1]
+
+    def test_first_chapter_has_nothing_to_summarise(self, tmp_path):
+        llm = RecordingLLM()
+        assert continuity.make_story_to_date_summary(llm, BOOK_MODEL, str(tmp_path), 1) == ""
+        assert _legacy_make_story_to_date_summary(llm, BOOK_MODEL, str(tmp_path), 1) == ""
+        assert llm.prompts == []
+
+
+class TestIncremental:
+    """Only new or changed chapters cost reads and LLM calls."""
+
+    def test_one_call_per_new_chapter_and_cache_survives_restart(self, tmp_path):
+        llm = RecordingLLM()
+        summaries = _write_book(tmp_path, llm, continuity.make_story_to_date_summary)
+        assert len(llm.prompts) == 6
+
+        # A new process reads the on-disk cache: no LLM calls, same summary
+        restarted = continuity.StorySoFar(str(tmp_path))
+        assert restarted.summary(llm, BOOK_MODEL, 7, 280) == summaries[-1]
+        assert len(llm.prompts) == 6
+
+    def test_edited_chapter_resummarises_from_there(self, tmp_path):
+        llm = RecordingLLM()
+        _write_book(tmp_path, llm, continuity.make_story_to_date_summary)
+        (tmp_path / "Chapter_04.md").write_text(_chapter(4) + "\nA late edit.\n", encoding="utf-8")
+        before = len(llm.prompts)
+        continuity.make_story_to_date_summary(llm, BOOK_MODEL, str(tmp_path), 7, 280)
+        assert len(llm.prompts) - before == 3    # chapters 4, 5 and 6
+
+    def test_acts_close_into_the_book_summary(self, tmp_path):
+        llm = RecordingLLM()
+        acts = {1: "I", 2: "I", 3: "II", 4: "II"}
+        _write_book(tmp_path, llm, continuity.make_story_to_date_summary, chapters=4, acts=acts)
+        summary = continuity.make_story_to_date_summary(llm, BOOK_MODEL, str(tmp_path), 5, 280, acts=acts)
+        assert summary.startswith("## Act I (complete)\n") and "\n\n## Current act\n" in summary
+        assert "Summarize the current act so far" in llm.prompts[-1]
+        assert "# Earlier acts (context only; do not repeat)" in llm.prompts[-1]
@@ -0,0 +1,148 @@
+"""
+Tests for batched, cached extractive QA (poc.qa_session) and its use in chapter planning.
+
+Test file: tests/test_qa_session.py
+Module under test: poc/qa_session.py, chapter_planner.py
+
+Run from project root: pytest tests/test_qa_session.py -v
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import chapter_planner
+from poc import llm_ollama
+from poc.qa_session import QASession
+
+CORPUS = {"figures": [{"name": "Selkie"}, {"name": "Kelpie"}], "locales": [], "topics": []}
+
+
+class FakeLLM:
+    """
+    Answers "Who is X" with "a creature called X". Batched calls (``format``
+    set) reply with {"answers": [...]} unless ``broken_batch`` is set.
+    """
+
+    def __init__(self, broken_batch=False):
+        self.calls = []
+        self.broken_batch = broken_batch
+
+    @staticmethod
+    def _answer(question):
+        m = re.fullmatch(r"Who is ([A-Z]\w*)", question)
+        return f"a creature called {m.group(1)}" if m else "Pip"
+
+    def __call__(self, prompt, **kwargs):
+        self.calls.append((prompt, kwargs))
+        if "format" in kwargs:
+            if self.broken_batch:
+                return "Sorry, here you go: Selkie is a seal person."
+            questions = re.findall(r"^\d+\. (.+)$", prompt.split("Questions:\n", 1)[1], re.M)
+            return json.dumps({"answers": [self._answer(q) for q in questions]})
+        question = prompt.rsplit("Question: ", 1)[1].split("\n", 1)[0]
+        return f"{self._answer(question)}.\nExtra line"
+
+
+def _session(llm, cache=None):
+    qa = QASession(llm, cache={} if cache is None else cache)
+    qa.add_context("research_character", json.dumps(CORPUS))
+    return qa
+
+
+class TestAskMany:
+    """One structured call per batch, cached per context fingerprint."""
+
+    def test_one_call_for_the_batch(self):
+        llm = FakeLLM()
+        answers = _session(llm).ask_many(["Who is Selkie", "Who is Kelpie", "Who is Selkie"])
+        assert answers == {"Who is Selkie": "a creature called Selkie", "Who is Kelpie": "a creature called Kelpie"}
+        assert len(llm.calls) == 1
+        prompt, kwargs = llm.calls[0]
+        assert kwargs["format"]["properties"]["answers"]["minItems"] == 2
+        assert kwargs["keep_alive"] == "15m"
+
+    def test_cache_is_shared_by_sessions_over_the_same_context(self):
+        llm, cache = FakeLLM(), {}
+        _session(llm, cache).ask_many(["Who is Selkie", "Who is Kelpie"])
+        again = _session(llm, cache)
+        assert again.ask("Who is Kelpie") == "a creature called Kelpie"
+        assert again.ask_many(["Who is Selkie", "Who is Kelpie"])["Who is Selkie"] == "a creature called Selkie"
+        assert len(llm.calls) == 1
+
+        other = QASession(llm, cache=cache)
+        other.add_context("research_character", "different corpus")
+        assert other.fingerprint != again.fingerprint
+        other.ask("Who is Selkie")
+        assert len(llm.calls) == 2
+
+    def test_unusable_batch_reply_falls_back_to_single_questions(self):
+        llm = FakeLLM(broken_batch=True)
+        answers = _session(llm).ask_many(["Who is Selkie", "Who is Kelpie"])
+        assert answers["Who is Kelpie"] == "a creature called Kelpie"
+        assert len(llm.calls) == 3
+        assert all("format" not in kwargs for _, kwargs in llm.calls[1:])
+
+    def test_prefix_is_identical_across_calls(self):
+        llm = FakeLLM()
+        qa = _session(llm)
+        qa.ask("Who is Selkie")
+        qa.ask_many(["Who is Kelpie", "Who is Nessie"])
+        first, second = (prompt for prompt, _ in llm.calls)
+        prefix = first.split("Question: ", 1)[0]
+        assert second.startswith(prefix)
+
+
+class TestChapterPlanner:
+    """chapter_planner routes its QA through the batched session."""
+
+    def test_normalize_research_describes_figures_in_one_call(self, monkeypatch):
+        llm = FakeLLM()
+        monkeypatch.setattr(chapter_planner, "llm", llm)
+        monkeypatch.setattr("poc.qa_session.ANSWER_CACHE", {})
+        research = chapter_planner._normalize_research({"figures": ["Nessie"]}, CORPUS)
+        assert [f["name"] for f in research["figures"]] == [
+            "Nessie - a creature called Nessie",
+            "Selkie - a creature called Selkie",
+            "Kelpie - a creature called Kelpie",
+        ]
+        assert len(llm.calls) == 1
+
+    def test_guess_protagonist_asks_both_questions_together(self, monkeypatch):
+        llm = FakeLLM()
+        monkeypatch.setattr(chapter_planner, "llm", llm)
+        monkeypatch.setattr("poc.qa_session.ANSWER_CACHE", {})
+        assert chapter_planner._guess_protagonist_name({}, "Pip the bunny finds a map.") == "Pip - Pip"
+        assert len(llm.calls) == 1
+
+
+class TestLlmOllamaPayload:
+    """keep_alive, format and model are request fields, not sampling options."""
+
+    def test_request_fields(self, monkeypatch):
+        sent = {}
+
+        class Response:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"response": " ok "}
+
+        def post(url, json=None, timeout=None):
+            sent.update(json)
+            return Response()
+
+        monkeypatch.setattr(llm_ollama.requests, "post", post)
+        llm_ollama.llm("hi", model="small", keep_alive="15m", format={"type": "object"}, temperature=0.1)
+        assert sent["model"] == "small" and sent["keep_alive"] == "15m"
+        assert sent["format"] == {"type": "object"}
+        assert sent["options"]["temperature"] == 0.1
+        assert not {"keep_alive", "format", "model"} & set(sent["options"])